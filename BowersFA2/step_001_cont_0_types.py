@@ -0,0 +1,6 @@
+import smartpy as sp
+
+tstorage = sp.record(admin=sp.address, claimable=sp.big_map[sp.address, sp.mutez], ledger=sp.big_map[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), sp.nat], listings=sp.big_map[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), sp.record(max_qty=sp.nat, min_bps=sp.nat, price=sp.mutez).layout(("max_qty", ("min_bps", "price")))], metadata=sp.big_map[sp.string, sp.bytes], min_offer_per_unit_mutez=sp.mutez, next_offer_id=sp.nat, next_token_id=sp.nat, offers=sp.big_map[sp.nat, sp.record(active=sp.bool, buyer=sp.address, expiry=sp.timestamp, rejected_count=sp.nat, remaining_amount=sp.mutez, remaining_qty=sp.nat, required_rejections=sp.nat, token_id=sp.nat, unit_price=sp.mutez).layout(("active", ("buyer", ("expiry", ("rejected_count", ("remaining_amount", ("remaining_qty", ("required_rejections", ("token_id", "unit_price")))))))))], operators=sp.big_map[sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id"))), sp.unit], royalty_bps=sp.nat, royalty_recipient=sp.address, token_metadata=sp.big_map[sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes]).layout(("token_id", "token_info"))]).layout(("admin", ("claimable", ("ledger", ("listings", ("metadata", ("min_offer_per_unit_mutez", ("next_offer_id", ("next_token_id", ("offers", ("operators", ("royalty_bps", ("royalty_recipient", "token_metadata")))))))))))))
+tparameter = sp.variant(accept_offer=sp.record(accept_qty=sp.nat, offer_id=sp.nat).layout(("accept_qty", "offer_id")), balance_of=sp.record(callback=sp.contract[sp.list[sp.record(balance=sp.nat, request=sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id"))).layout(("balance", "request"))]], requests=sp.list[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id"))]).layout(("callback", "requests")), buy=sp.record(owner=sp.address, qty=sp.nat, token_id=sp.nat).layout(("owner", ("qty", "token_id"))), close_offer=sp.nat, make_offer=sp.record(expiry=sp.timestamp, qty=sp.nat, required_rejections=sp.nat, token_id=sp.nat).layout(("expiry", ("qty", ("required_rejections", "token_id")))), mint=sp.record(supply=sp.nat, to_=sp.address, token_info=sp.map[sp.string, sp.bytes]).layout(("supply", ("to_", "token_info"))), reject_offer=sp.nat, set_listing=sp.record(max_qty=sp.nat, min_bps=sp.nat, price=sp.mutez, token_id=sp.nat).layout(("max_qty", ("min_bps", ("price", "token_id")))), transfer=sp.list[sp.record(from_=sp.address, txs=sp.list[sp.record(amount=sp.nat, to_=sp.address, token_id=sp.nat).layout(("amount", ("to_", "token_id")))]).layout(("from_", "txs"))], update_operators=sp.list[sp.variant(add_operator=sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id"))), remove_operator=sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id")))).layout(("add_operator", "remove_operator"))], withdraw=sp.unit).layout(((("accept_offer", "balance_of"), ("buy", ("close_offer", "make_offer"))), (("mint", ("reject_offer", "set_listing")), ("transfer", ("update_operators", "withdraw")))))
+tprivates = { }
+tviews = { }
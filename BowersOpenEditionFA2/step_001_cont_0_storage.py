@@ -0,0 +1 @@
+sp.record(admin = sp.address('tz1UyQDepgtUBnWjyzzonqeDwaiWoQzRKSP5'), claimable = {}, ledger = {}, listings = {}, metadata = {'' : sp.bytes('0x68747470733a2f2f6578616d706c652e636f6d')}, min_offer_per_unit_mutez = sp.mutez(1000), next_offer_id = 0, next_token_id = 0, offers = {}, operators = {}, royalty_bps = 500, royalty_recipient = sp.address('tz1UyQDepgtUBnWjyzzonqeDwaiWoQzRKSP5'), token_config = {}, token_metadata = {})
\ No newline at end of file
@@ -17,21 +17,56 @@ def main():
     BalanceOfRequestType: type = sp.record(owner=sp.address, token_id=sp.nat)
     BalanceOfResponseType: type = sp.record(request=BalanceOfRequestType, balance=sp.nat)
     LedgerKeyType: type = sp.record(owner=sp.address, token_id=sp.nat)
+    SupplyType: type = sp.record(total_supply=sp.nat, holders=sp.nat)
     OperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address, token_id=sp.nat)
     BlacklistKeyType: type = sp.record(owner=sp.address, token_id=sp.nat, blocked=sp.address)
-    AllowlistKeyType: type = sp.record(token_id=sp.nat, address=sp.address)
+    # epoch is the token's allowlist_epoch when the entry was written; older epochs are stale.
+    AllowlistKeyType: type = sp.record(token_id=sp.nat, epoch=sp.nat, address=sp.address)
     AllowlistEntryType: type = sp.record(max_qty=sp.nat, minted=sp.nat, price_override=sp.option[sp.mutez])
+    # Merkle allowlist proof. The leaf is blake2b(pack((address, (max_qty, price_override))));
+    # path holds the sibling hashes from leaf to root, tagged with the side they sit on.
+    MerkleStepType: type = sp.variant(left=sp.bytes, right=sp.bytes)
+    AllowlistProofType: type = sp.record(max_qty=sp.nat, price_override=sp.option[sp.mutez], path=sp.list[MerkleStepType])
     OperatorParamType: type = sp.variant(add_operator=OperatorKeyType, remove_operator=OperatorKeyType)
+    AllOperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address)
+    AllOperatorParamType: type = sp.variant(add_operator=AllOperatorKeyType, remove_operator=AllOperatorKeyType)
     TransferTxType: type = sp.record(to_=sp.address, token_id=sp.nat, amount=sp.nat)
     TransferBatchItemType: type = sp.record(from_=sp.address, txs=sp.list[TransferTxType])
+    BuyItemType: type = sp.record(owner=sp.address, token_id=sp.nat, qty=sp.nat)
+    RoyaltyType: type = sp.record(royalty_recipient=sp.address, royalty_bps=sp.nat)
+    AcceptItemType: type = sp.record(offer_id=sp.nat, accept_qty=sp.nat)
 
     TokenConfigType: type = sp.record(
+        creator=sp.address,
+        mint_price=sp.mutez,
+        max_supply=sp.option[sp.nat],
+        allowlist_end=sp.option[sp.timestamp],
+        allowlist_epoch=sp.nat,
+        royalty_recipient=sp.address,
+        royalty_bps=sp.nat,
+        min_offer_per_unit_mutez=sp.mutez,
+    )
+
+    # Hot per-token mint state, split from token_config so a mint only rewrites this record.
+    TokenStateType: type = sp.record(minted=sp.nat, mint_paused=sp.bool, mint_end=sp.option[sp.timestamp], proceeds=sp.mutez)
+
+    # get_mint_quote result: remaining counts are before the quoted mint, None when uncapped.
+    MintQuoteType: type = sp.record(total=sp.mutez, allowlist_remaining=sp.option[sp.nat], supply_remaining=sp.option[sp.nat])
+    # _mint_check result: the quote, the allowlist entry a mint bumps (None outside the allowlist
+    # phase), and the token's creator and mint state.
+    MintCheckType: type = sp.record(
+        quote=MintQuoteType,
+        allowlist_key=sp.option[AllowlistKeyType],
+        creator=sp.address,
+        state=TokenStateType,
+    )
+
+    CreateTokenParamType: type = sp.record(
+        metadata_uri=sp.bytes,
         creator=sp.address,
         mint_price=sp.mutez,
         mint_end=sp.option[sp.timestamp],
-        mint_paused=sp.bool,
         max_supply=sp.option[sp.nat],
-        minted=sp.nat,
         allowlist_end=sp.option[sp.timestamp],
         royalty_recipient=sp.address,
         royalty_bps=sp.nat,
@@ -49,15 +84,32 @@ def main():
             self.data.admin = admin
             self.data.metadata = metadata
             self.data.ledger = sp.cast(sp.big_map(), sp.big_map[LedgerKeyType, sp.nat])
+            self.data.token_supply = sp.cast(sp.big_map(), sp.big_map[sp.nat, SupplyType])
             self.data.token_metadata = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes])])
+            # Optional shared base URI: when set, tokens store only a URI suffix (or nothing) and
+            # TZIP-12 metadata is served by the token_metadata off-chain view.
+            self.data.base_uri = sp.bytes("0x")
+            self.data.token_uri_suffix = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.bytes])
             self.data.token_config = sp.cast(sp.big_map(), sp.big_map[sp.nat, TokenConfigType])
+            self.data.token_state = sp.cast(sp.big_map(), sp.big_map[sp.nat, TokenStateType])
             self.data.token_allowlist = sp.cast(sp.big_map(), sp.big_map[AllowlistKeyType, AllowlistEntryType])
+            # Merkle allowlists: one root per token; per-address minted counts are written on first mint.
+            self.data.allowlist_root = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.bytes])
+            self.data.allowlist_minted = sp.cast(sp.big_map(), sp.big_map[AllowlistKeyType, sp.nat])
             self.data.operators = sp.cast(sp.big_map(), sp.big_map[OperatorKeyType, sp.unit])
+            self.data.all_operators = sp.cast(sp.big_map(), sp.big_map[AllOperatorKeyType, sp.unit])
             self.data.next_token_id = sp.nat(0)
             self.data.listings = sp.cast(sp.big_map(), sp.big_map[LedgerKeyType, ListingType])
             self.data.offers = sp.cast(sp.big_map(), sp.big_map[sp.nat, OfferType])
             self.data.next_offer_id = sp.nat(0)
             self.data.claimable = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.mutez])
+            # Secondary-sale payout mode: when true, implicit accounts are paid during the sale,
+            # and contracts keep collecting through claimable and withdraw.
+            self.data.direct_payout = False
+            # When on, mint revenue, at the allowlist or the public price, stays in
+            # token_state.proceeds until the creator calls withdraw_token_proceeds; minting then
+            # leaves claimable untouched.
+            self.data.accrue_proceeds = False
             self.data.blacklist = sp.cast(sp.big_map(), sp.big_map[BlacklistKeyType, sp.unit])
             self.data.contract_blocklist = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.unit])
 
@@ -87,33 +139,87 @@ def main():
                         assert op in self.data.operators, "NO_OP"
                         del self.data.operators[op]
 
+        @sp.entrypoint
+        def update_all_operators(self, actions):
+            # Owner-level operators: one entry approves the operator for all of the owner's tokens.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(actions, sp.list[AllOperatorParamType])
+            for action in actions:
+                match action:
+                    case add_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        self.data.all_operators[op] = ()
+                    case remove_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        assert op in self.data.all_operators, "NO_OP"
+                        del self.data.all_operators[op]
+
         @sp.entrypoint
         def transfer(self, batch):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(batch, sp.list[TransferBatchItemType])
+            # Balances touched by the batch are read from the ledger once and written back once at
+            # the end; addresses cleared against contract_blocklist are not looked up again.
+            balances = sp.cast({}, sp.map[LedgerKeyType, sp.nat])
+            # Recipients that held none of the token before this batch; the holder delta for each
+            # token is taken from the final balances rather than per transfer.
+            fresh = sp.cast(set(), sp.set[LedgerKeyType])
+            cleared = sp.cast(set(), sp.set[sp.address])
             for item in batch:
                 from_ = item.from_
-                for tx in item.txs:
+                if not (from_ in cleared):
                     assert not (from_ in self.data.contract_blocklist), "BLOCKED"
-                    assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
-                    if from_ != sp.sender:
-                        assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                    cleared.add(from_)
+                # Checked once per batch item; per-token entries are only read without an owner-level
+                # operator, once per token.
+                all_tokens = from_ == sp.sender
+                if not all_tokens:
+                    all_tokens = sp.record(owner=from_, operator=sp.sender) in self.data.all_operators
+                approved = sp.cast(set(), sp.set[sp.nat])
+                for tx in item.txs:
+                    if not (tx.to_ in cleared):
+                        assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
+                        cleared.add(tx.to_)
+                    if not all_tokens:
+                        if not (tx.token_id in approved):
+                            assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                            approved.add(tx.token_id)
                     assert tx.amount > 0, "BAD_AMOUNT"
                     fk = sp.record(owner=from_, token_id=tx.token_id)
-                    fb = self.data.ledger.get(fk, default=sp.nat(0))
+                    fb = balances.get(fk, default=sp.nat(0))
+                    if not (fk in balances):
+                        fb = self.data.ledger.get(fk, default=sp.nat(0))
                     assert fb >= tx.amount, "LOW_BAL"
                     nfb = sp.as_nat(fb - tx.amount)
+                    balances[fk] = nfb
                     if nfb == 0:
-                        if fk in self.data.ledger:
-                            del self.data.ledger[fk]
                         if fk in self.data.listings:
                             del self.data.listings[fk]
-                    else:
-                        self.data.ledger[fk] = nfb
                     tk = sp.record(owner=tx.to_, token_id=tx.token_id)
-                    tb = self.data.ledger.get(tk, default=sp.nat(0))
-                    self.data.ledger[tk] = tb + tx.amount
-                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, a=tx.amount), tag="xfer")
+                    tb = balances.get(tk, default=sp.nat(0))
+                    if not (tk in balances):
+                        tb = self.data.ledger.get(tk, default=sp.nat(0))
+                        if tb == 0:
+                            fresh.add(tk)
+                    balances[tk] = tb + tx.amount
+                    # Activity events (xfer, mint, buy, accept, list, offer, close) share one set of short keys;
+                    # event-schemas.json maps each to its field name.
+                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, q=tx.amount), tag="xfer")
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            for entry in balances.items():
+                tid = entry.key.token_id
+                if entry.value == 0:
+                    del self.data.ledger[entry.key]
+                    if not (entry.key in fresh):
+                        holders[tid] = holders.get(tid, default=0) - 1
+                else:
+                    self.data.ledger[entry.key] = entry.value
+                    if entry.key in fresh:
+                        holders[tid] = holders.get(tid, default=0) + 1
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
 
         @sp.entrypoint
         def set_admin(self, new_admin):
@@ -121,47 +227,80 @@ def main():
             sp.cast(new_admin, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.admin = new_admin
+            sp.emit(new_admin, tag="admin")
 
-        # ---- Token factories ----
+        @sp.entrypoint
+        def set_direct_payout(self, direct):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(direct, sp.bool)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.direct_payout = direct
+            sp.emit(direct, tag="direct_payout")
 
         @sp.entrypoint
-        def create_token(self, params):
+        def set_accrue_proceeds(self, accrue):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
-            sp.cast(
-                params,
-                sp.record(
-                    metadata_uri=sp.bytes,
-                    creator=sp.address,
-                    mint_price=sp.mutez,
-                    mint_end=sp.option[sp.timestamp],
-                    max_supply=sp.option[sp.nat],
-                    allowlist_end=sp.option[sp.timestamp],
-                    royalty_recipient=sp.address,
-                    royalty_bps=sp.nat,
-                    min_offer_per_unit_mutez=sp.mutez,
-                ),
-            )
+            sp.cast(accrue, sp.bool)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.accrue_proceeds = accrue
+            sp.emit(accrue, tag="accrue_proceeds")
+
+        @sp.entrypoint
+        def set_base_uri(self, base_uri):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(base_uri, sp.bytes)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.base_uri = base_uri
+            sp.emit(base_uri, tag="base_uri")
+
+        # ---- Token factories ----
+
+        @sp.private(with_storage="read-write", with_operations=True)
+        def _create_token(self, params):
+            # One spec, validated and stored under next_token_id; create_token and create_tokens
+            # both go through here.
+            sp.cast(params, CreateTokenParamType)
             assert params.royalty_bps <= 10_000, "BPS_TOO_HIGH"
 
             tid = self.data.next_token_id
             self.data.next_token_id += 1
 
-            token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
-            self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            if self.data.base_uri == sp.bytes("0x"):
+                token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
+                self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            else:
+                if params.metadata_uri != sp.bytes("0x"):
+                    self.data.token_uri_suffix[tid] = params.metadata_uri
 
-            self.data.token_config[tid] = sp.record(
+            cfg = sp.record(
                 creator=params.creator,
                 mint_price=params.mint_price,
-                mint_end=params.mint_end,
-                mint_paused=False,
                 max_supply=params.max_supply,
-                minted=sp.nat(0),
                 allowlist_end=params.allowlist_end,
+                allowlist_epoch=sp.nat(0),
                 royalty_recipient=params.royalty_recipient,
                 royalty_bps=params.royalty_bps,
                 min_offer_per_unit_mutez=params.min_offer_per_unit_mutez,
             )
+            self.data.token_config[tid] = cfg
+            self.data.token_state[tid] = sp.record(minted=sp.nat(0), mint_paused=False, mint_end=params.mint_end, proceeds=sp.mutez(0))
+            sp.emit(sp.record(token_id=tid, config=cfg, mint_end=params.mint_end), tag="token_created")
+
+        @sp.entrypoint
+        def create_token(self, params):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(params, CreateTokenParamType)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self._create_token(params)
+
+        @sp.entrypoint
+        def create_tokens(self, specs):
+            # Batch create_token: consecutive ids from next_token_id.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(specs, sp.list[CreateTokenParamType])
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            for params in specs:
+                self._create_token(params)
 
         @sp.entrypoint
         def set_mint_price(self, params):
@@ -172,26 +311,29 @@ def main():
             cfg = self.data.token_config[params.token_id]
             cfg.mint_price = params.mint_price
             self.data.token_config[params.token_id] = cfg
+            sp.emit(sp.record(token_id=params.token_id, mint_price=params.mint_price), tag="mint_price")
 
         @sp.entrypoint
         def set_mint_end(self, params):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(params, sp.record(token_id=sp.nat, mint_end=sp.option[sp.timestamp]))
             assert sp.sender == self.data.admin, "NOT_ADMIN"
-            assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
-            cfg = self.data.token_config[params.token_id]
-            cfg.mint_end = params.mint_end
-            self.data.token_config[params.token_id] = cfg
+            assert params.token_id in self.data.token_state, "TOKEN_UNDEFINED"
+            st = self.data.token_state[params.token_id]
+            st.mint_end = params.mint_end
+            self.data.token_state[params.token_id] = st
+            sp.emit(sp.record(token_id=params.token_id, mint_end=params.mint_end), tag="mint_end")
 
         @sp.entrypoint
         def set_mint_paused(self, params):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(params, sp.record(token_id=sp.nat, paused=sp.bool))
             assert sp.sender == self.data.admin, "NOT_ADMIN"
-            assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
-            cfg = self.data.token_config[params.token_id]
-            cfg.mint_paused = params.paused
-            self.data.token_config[params.token_id] = cfg
+            assert params.token_id in self.data.token_state, "TOKEN_UNDEFINED"
+            st = self.data.token_state[params.token_id]
+            st.mint_paused = params.paused
+            self.data.token_state[params.token_id] = st
+            sp.emit(sp.record(token_id=params.token_id, paused=params.paused), tag="mint_paused")
 
         # ---- Allowlist ----
 
@@ -201,20 +343,41 @@ def main():
             sp.cast(params, sp.record(token_id=sp.nat, entries=sp.list[AllowlistEntryParam]))
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
+            epoch = self.data.token_config[params.token_id].allowlist_epoch
             for e in params.entries:
-                key = sp.record(token_id=params.token_id, address=e.address)
+                key = sp.record(token_id=params.token_id, epoch=epoch, address=e.address)
                 self.data.token_allowlist[key] = sp.record(
                     max_qty=e.max_qty, minted=sp.nat(0), price_override=e.price_override)
+            sp.emit(sp.record(token_id=params.token_id, epoch=epoch, entries=params.entries), tag="allowlist")
 
         @sp.entrypoint
         def clear_allowlist(self, token_id):
+            # Ends the allowlist phase. The epoch bump orphans every entry and minted count at once
+            # (stale keys can be pruned); a Merkle root is dropped.
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(token_id, sp.nat)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             assert token_id in self.data.token_config, "TOKEN_UNDEFINED"
             cfg = self.data.token_config[token_id]
             cfg.allowlist_end = None
+            cfg.allowlist_epoch += 1
+            self.data.token_config[token_id] = cfg
+            if token_id in self.data.allowlist_root:
+                del self.data.allowlist_root[token_id]
+            sp.emit(sp.record(token_id=token_id, epoch=cfg.allowlist_epoch), tag="allowlist_cleared")
+
+        @sp.entrypoint
+        def reset_allowlist(self, token_id):
+            # Restarts the allowlist phase: a new epoch resets every minted count and per-address
+            # entry in one write. A Merkle root is kept, so the same list can run again.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(token_id, sp.nat)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            assert token_id in self.data.token_config, "TOKEN_UNDEFINED"
+            cfg = self.data.token_config[token_id]
+            cfg.allowlist_epoch += 1
             self.data.token_config[token_id] = cfg
+            sp.emit(sp.record(token_id=token_id, epoch=cfg.allowlist_epoch), tag="allowlist_reset")
 
         @sp.entrypoint
         def set_allowlist_end(self, params):
@@ -225,51 +388,136 @@ def main():
             cfg = self.data.token_config[params.token_id]
             cfg.allowlist_end = params.allowlist_end
             self.data.token_config[params.token_id] = cfg
+            sp.emit(sp.record(token_id=params.token_id, allowlist_end=params.allowlist_end), tag="allowlist_end")
 
-        # ---- Minting ----
+        @sp.entrypoint
+        def set_allowlist_root(self, params):
+            # Merkle mode: one root replaces per-address entries; None removes it.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(params, sp.record(token_id=sp.nat, root=sp.option[sp.bytes]))
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
+            if params.root.is_some():
+                self.data.allowlist_root[params.token_id] = params.root.unwrap_some()
+            else:
+                del self.data.allowlist_root[params.token_id]
+            sp.emit(sp.record(token_id=params.token_id, root=params.root), tag="allowlist_root")
 
         @sp.entrypoint
-        def mint_editions(self, params):
-            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, to_=sp.address))
+        def prune_allowlist(self, keys):
+            # Permissionless cleanup of entries and minted counts left behind by a past epoch.
+            # Keys from the current epoch or for unknown tokens are skipped.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(keys, sp.list[AllowlistKeyType])
+            for key in keys:
+                if key.token_id in self.data.token_config:
+                    if key.epoch < self.data.token_config[key.token_id].allowlist_epoch:
+                        del self.data.token_allowlist[key]
+                        del self.data.allowlist_minted[key]
+
+        # ---- Minting ----
+
+        @sp.private(with_storage="read-only")
+        def _mint_check(self, params):
+            # Checks shared by mint_editions and get_mint_quote: supply cap, mint window, allowlist
+            # entry or Merkle proof for buyer, and the price. allowlist_key is the entry a mint bumps.
+            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, buyer=sp.address, proof=sp.option[AllowlistProofType]))
             assert params.qty > 0, "BAD_QTY"
-            assert not (params.to_ in self.data.contract_blocklist), "BLOCKED"
-            assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
+            assert params.token_id in self.data.token_state, "TOKEN_UNDEFINED"
+            st = self.data.token_state[params.token_id]
             cfg = self.data.token_config[params.token_id]
 
+            supply_remaining = sp.cast(None, sp.option[sp.nat])
             ms = cfg.max_supply
             if ms.is_some():
                 cap = ms.unwrap_some()
-                assert cfg.minted + params.qty <= cap, "MAX_SUPPLY"
+                assert st.minted + params.qty <= cap, "MAX_SUPPLY"
+                supply_remaining = sp.Some(sp.as_nat(cap - st.minted))
 
-            me = cfg.mint_end
+            me = st.mint_end
             if me.is_some():
                 assert sp.now <= me.unwrap_some(), "MINT_CLOSED"
-            assert not cfg.mint_paused, "MINT_CLOSED"
+            assert not st.mint_paused, "MINT_CLOSED"
 
             price_per = cfg.mint_price
+            allowlist_remaining = sp.cast(None, sp.option[sp.nat])
+            allowlist_key = sp.cast(None, sp.option[AllowlistKeyType])
             al_end = cfg.allowlist_end
             if al_end.is_some():
                 if sp.now < al_end.unwrap_some():
-                    key = sp.record(token_id=params.token_id, address=sp.sender)
-                    assert key in self.data.token_allowlist, "NOT_ALLOWLISTED"
-                    entry = self.data.token_allowlist[key]
-                    assert entry.minted + params.qty <= entry.max_qty, "ALLOWLIST_CAP"
-                    po = entry.price_override
+                    key = sp.record(token_id=params.token_id, epoch=cfg.allowlist_epoch, address=params.buyer)
+                    max_qty = sp.nat(0)
+                    al_minted = sp.nat(0)
+                    po = sp.cast(None, sp.option[sp.mutez])
+                    if params.proof.is_some():
+                        proof = params.proof.unwrap_some()
+                        node = sp.blake2b(sp.pack((params.buyer, (proof.max_qty, proof.price_override))))
+                        for step in proof.path:
+                            match step:
+                                case left(h):
+                                    node = sp.blake2b(h + node)
+                                case right(h):
+                                    node = sp.blake2b(node + h)
+                        assert self.data.allowlist_root.get(params.token_id, error="NOT_ALLOWLISTED") == node, "BAD_PROOF"
+                        max_qty = proof.max_qty
+                        al_minted = self.data.allowlist_minted.get(key, default=sp.nat(0))
+                        po = proof.price_override
+                    else:
+                        assert key in self.data.token_allowlist, "NOT_ALLOWLISTED"
+                        entry = self.data.token_allowlist[key]
+                        max_qty = entry.max_qty
+                        al_minted = entry.minted
+                        po = entry.price_override
+                    assert al_minted + params.qty <= max_qty, "ALLOWLIST_CAP"
+                    allowlist_remaining = sp.Some(sp.as_nat(max_qty - al_minted))
+                    allowlist_key = sp.Some(key)
                     if po.is_some():
                         price_per = po.unwrap_some()
-                    entry.minted = entry.minted + params.qty
-                    self.data.token_allowlist[key] = entry
+            total = sp.split_tokens(price_per, params.qty, 1)
+            return sp.cast(
+                sp.record(
+                    quote=sp.record(total=total, allowlist_remaining=allowlist_remaining, supply_remaining=supply_remaining),
+                    allowlist_key=allowlist_key,
+                    creator=cfg.creator,
+                    state=st,
+                ),
+                MintCheckType,
+            )
 
-            total_price = sp.split_tokens(price_per, params.qty, 1)
+        @sp.entrypoint
+        def mint_editions(self, params):
+            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, to_=sp.address, proof=sp.option[AllowlistProofType]))
+            assert not (params.to_ in self.data.contract_blocklist), "BLOCKED"
+            chk = self._mint_check(sp.record(token_id=params.token_id, qty=params.qty, buyer=sp.sender, proof=params.proof))
+            total_price = chk.quote.total
             assert sp.amount == total_price, "BAD_PAYMENT"
 
+            if chk.allowlist_key.is_some():
+                key = chk.allowlist_key.unwrap_some()
+                if params.proof.is_some():
+                    self.data.allowlist_minted[key] = self.data.allowlist_minted.get(key, default=sp.nat(0)) + params.qty
+                else:
+                    entry = self.data.token_allowlist[key]
+                    entry.minted += params.qty
+                    self.data.token_allowlist[key] = entry
+
+            st = chk.state
             lk = sp.record(owner=params.to_, token_id=params.token_id)
-            self.data.ledger[lk] = self.data.ledger.get(lk, default=sp.nat(0)) + params.qty
-            self.data.claimable[cfg.creator] = self.data.claimable.get(cfg.creator, default=sp.mutez(0)) + total_price
+            lb = self.data.ledger.get(lk, default=sp.nat(0))
+            self.data.ledger[lk] = lb + params.qty
+            sup = self.data.token_supply.get(params.token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0)))
+            sup.total_supply += params.qty
+            if lb == 0:
+                sup.holders += 1
+            self.data.token_supply[params.token_id] = sup
+            if self.data.accrue_proceeds:
+                st.proceeds += total_price
+            else:
+                self.data.claimable[chk.creator] = self.data.claimable.get(chk.creator, default=sp.mutez(0)) + total_price
 
-            cfg.minted = cfg.minted + params.qty
-            self.data.token_config[params.token_id] = cfg
-            sp.emit(sp.record(token_id=params.token_id, to_=params.to_, qty=params.qty, paid=total_price), tag="mint")
+            st.minted = st.minted + params.qty
+            self.data.token_state[params.token_id] = st
+            sp.emit(sp.record(i=params.token_id, t=params.to_, q=params.qty, p=total_price, a=sp.fst(sp.ediv(total_price, params.qty).unwrap_some()), c=chk.creator), tag="mint")
 
         # ---- Marketplace ----
 
@@ -285,6 +533,8 @@ def main():
             else:
                 assert params.min_bps <= 10_000, "BPS_TOO_HIGH"
                 self.data.listings[pk] = sp.record(price=params.price, max_qty=params.max_qty, min_bps=params.min_bps)
+            # A zero price is a delisting.
+            sp.emit(sp.record(o=sp.sender, i=params.token_id, u=params.price, m=params.max_qty, n=params.min_bps), tag="list")
 
         @sp.entrypoint
         def buy(self, params):
@@ -305,8 +555,21 @@ def main():
             rr = cfg.royalty_recipient
             ry = sp.split_tokens(tp, cfg.royalty_bps, 10_000)
             po = tp - ry
-            self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
-            self.data.claimable[params.owner] = self.data.claimable.get(params.owner, default=sp.mutez(0)) + po
+            if self.data.direct_payout:
+                # One transfer per implicit payee; a contract may not accept tez, so it is credited.
+                payouts = sp.cast({}, sp.map[sp.address, sp.mutez])
+                if ry > sp.mutez(0):
+                    payouts[rr] = ry
+                payouts[params.owner] = payouts.get(params.owner, default=sp.mutez(0)) + po
+                for payout in payouts.items():
+                    if payout.value > sp.mutez(0):
+                        if sp.is_implicit_account(payout.key).is_some():
+                            sp.send(payout.key, payout.value)
+                        else:
+                            self.data.claimable[payout.key] = self.data.claimable.get(payout.key, default=sp.mutez(0)) + payout.value
+            else:
+                self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
+                self.data.claimable[params.owner] = self.data.claimable.get(params.owner, default=sp.mutez(0)) + po
             nfb = sp.as_nat(fb - params.qty)
             if nfb == 0:
                 if pk in self.data.ledger:
@@ -318,7 +581,75 @@ def main():
             tk = sp.record(owner=sp.sender, token_id=params.token_id)
             tb = self.data.ledger.get(tk, default=sp.nat(0))
             self.data.ledger[tk] = tb + params.qty
-            sp.emit(sp.record(b=sp.sender, o=params.owner, i=params.token_id, q=params.qty), tag="buy")
+            if (nfb == 0) != (tb == 0):
+                sup = self.data.token_supply[params.token_id]
+                if tb == 0:
+                    sup.holders += 1
+                else:
+                    sup.holders = sp.as_nat(sup.holders - 1)
+                self.data.token_supply[params.token_id] = sup
+            # u: unit price, p: total paid, r / y: royalty recipient / amount (also on "accept").
+            sp.emit(sp.record(b=sp.sender, o=params.owner, i=params.token_id, q=params.qty, u=lst.price, p=tp, r=rr, y=ry), tag="buy")
+
+        @sp.entrypoint
+        def buy_many(self, params):
+            # Sweep of secondary listings for one payment equal to expected_total; a failing item
+            # reverts the batch, so a buyer never ends up with part of a cart.
+            sp.cast(params, sp.record(items=sp.list[BuyItemType], expected_total=sp.mutez))
+            assert not (sp.sender in self.data.contract_blocklist), "BLOCKED"
+            assert sp.amount == params.expected_total, "WRONG_PRICE"
+            royalties = sp.cast({}, sp.map[sp.nat, RoyaltyType])
+            credits = sp.cast({}, sp.map[sp.address, sp.mutez])
+            bought = sp.cast({}, sp.map[sp.nat, sp.nat])
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            total = sp.mutez(0)
+            for item in params.items:
+                assert item.qty > 0, "BAD_QTY"
+                assert not (sp.record(owner=item.owner, token_id=item.token_id, blocked=sp.sender) in self.data.blacklist), "BLACKLISTED"
+                pk = sp.record(owner=item.owner, token_id=item.token_id)
+                assert pk in self.data.listings, "NOT_FOR_SALE"
+                lst = self.data.listings[pk]
+                if lst.max_qty > 0:
+                    assert item.qty <= lst.max_qty, "MAX_QTY"
+                fb = self.data.ledger.get(pk, default=sp.nat(0))
+                assert fb >= item.qty, "NO_BAL"
+                tp = sp.split_tokens(lst.price, item.qty, 1)
+                if not (item.token_id in royalties):
+                    rc = self.data.token_config[item.token_id]
+                    royalties[item.token_id] = sp.record(royalty_recipient=rc.royalty_recipient, royalty_bps=rc.royalty_bps)
+                roy = royalties[item.token_id]
+                ry = sp.split_tokens(tp, roy.royalty_bps, 10_000)
+                credits[roy.royalty_recipient] = credits.get(roy.royalty_recipient, default=sp.mutez(0)) + ry
+                credits[item.owner] = credits.get(item.owner, default=sp.mutez(0)) + (tp - ry)
+                total += tp
+                nfb = sp.as_nat(fb - item.qty)
+                if nfb == 0:
+                    holders[item.token_id] = holders.get(item.token_id, default=0) - 1
+                    if pk in self.data.ledger:
+                        del self.data.ledger[pk]
+                    if pk in self.data.listings:
+                        del self.data.listings[pk]
+                else:
+                    self.data.ledger[pk] = nfb
+                bought[item.token_id] = bought.get(item.token_id, default=sp.nat(0)) + item.qty
+                sp.emit(sp.record(b=sp.sender, o=item.owner, i=item.token_id, q=item.qty, u=lst.price, p=tp, r=roy.royalty_recipient, y=ry), tag="buy")
+            assert total == params.expected_total, "WRONG_PRICE"
+            for credit in credits.items():
+                if credit.value > sp.mutez(0):
+                    if self.data.direct_payout and sp.is_implicit_account(credit.key).is_some():
+                        sp.send(credit.key, credit.value)
+                    else:
+                        self.data.claimable[credit.key] = self.data.claimable.get(credit.key, default=sp.mutez(0)) + credit.value
+            for b in bought.items():
+                tk = sp.record(owner=sp.sender, token_id=b.key)
+                tb = self.data.ledger.get(tk, default=sp.nat(0))
+                if tb == 0:
+                    holders[b.key] = holders.get(b.key, default=0) + 1
+                self.data.ledger[tk] = tb + b.value
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
 
         @sp.entrypoint
         def make_offer(self, params):
@@ -336,26 +667,44 @@ def main():
             self.data.offers[oid] = sp.record(
                 token_id=params.token_id, buyer=sp.sender, unit_price=up,
                 remaining_qty=params.qty, expiry=params.expiry)
+            sp.emit(sp.record(id=oid, b=sp.sender, i=params.token_id, u=up, q=params.qty, e=params.expiry), tag="offer")
 
         @sp.entrypoint
         def close_offer(self, offer_id):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(offer_id, sp.nat)
-            o = self.data.offers[offer_id]
-            assert o.remaining_qty > 0, "NOT_ACTIVE"
+            o = self.data.offers.get(offer_id, error="NOT_ACTIVE")
             if o.buyer != sp.sender:
                 assert sp.now > o.expiry, "NO_AUTH"
             refund = sp.split_tokens(o.unit_price, o.remaining_qty, 1)
             self.data.claimable[o.buyer] = self.data.claimable.get(o.buyer, default=sp.mutez(0)) + refund
-            o.remaining_qty = sp.nat(0)
-            self.data.offers[offer_id] = o
+            del self.data.offers[offer_id]
+            sp.emit(sp.record(id=offer_id, b=o.buyer, p=refund), tag="close")
+
+        @sp.entrypoint
+        def prune_offers(self, offer_ids):
+            # The offer-side counterpart of prune_allowlist: any sender may delete bids past their
+            # expiry. Refunds are summed per bidder, and ids that are missing or live are skipped.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(offer_ids, sp.list[sp.nat])
+            refunds = sp.cast({}, sp.map[sp.address, sp.mutez])
+            for oid in offer_ids:
+                if oid in self.data.offers:
+                    o = self.data.offers[oid]
+                    if o.remaining_qty == 0 or sp.now > o.expiry:
+                        refund = sp.split_tokens(o.unit_price, o.remaining_qty, 1)
+                        refunds[o.buyer] = refunds.get(o.buyer, default=sp.mutez(0)) + refund
+                        del self.data.offers[oid]
+                        sp.emit(sp.record(id=oid, b=o.buyer, p=refund), tag="close")
+            for r in refunds.items():
+                if r.value > sp.mutez(0):
+                    self.data.claimable[r.key] = self.data.claimable.get(r.key, default=sp.mutez(0)) + r.value
 
         @sp.entrypoint
         def accept_offer(self, params):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(params, sp.record(offer_id=sp.nat, accept_qty=sp.nat))
-            o = self.data.offers[params.offer_id]
-            assert o.remaining_qty > 0, "NOT_ACTIVE"
+            o = self.data.offers.get(params.offer_id, error="NOT_ACTIVE")
             assert sp.now <= o.expiry, "OFFER_EXPIRED"
             assert params.accept_qty > 0, "BAD_ACCEPT_QTY"
             assert params.accept_qty <= o.remaining_qty, "OVER_QTY"
@@ -377,8 +726,21 @@ def main():
             rr = cfg.royalty_recipient
             ry = sp.split_tokens(pt, cfg.royalty_bps, 10_000)
             po = pt - ry
-            self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
-            self.data.claimable[sp.sender] = self.data.claimable.get(sp.sender, default=sp.mutez(0)) + po
+            if self.data.direct_payout:
+                # Escrowed bid funds go directly to implicit payees; contract payees are credited.
+                payouts = sp.cast({}, sp.map[sp.address, sp.mutez])
+                if ry > sp.mutez(0):
+                    payouts[rr] = ry
+                payouts[sp.sender] = payouts.get(sp.sender, default=sp.mutez(0)) + po
+                for payout in payouts.items():
+                    if payout.value > sp.mutez(0):
+                        if sp.is_implicit_account(payout.key).is_some():
+                            sp.send(payout.key, payout.value)
+                        else:
+                            self.data.claimable[payout.key] = self.data.claimable.get(payout.key, default=sp.mutez(0)) + payout.value
+            else:
+                self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
+                self.data.claimable[sp.sender] = self.data.claimable.get(sp.sender, default=sp.mutez(0)) + po
             nfb = sp.as_nat(fb - params.accept_qty)
             if nfb == 0:
                 if fk in self.data.ledger:
@@ -390,9 +752,95 @@ def main():
             tk = sp.record(owner=o.buyer, token_id=tid)
             tb = self.data.ledger.get(tk, default=sp.nat(0))
             self.data.ledger[tk] = tb + params.accept_qty
+            if (nfb == 0) != (tb == 0):
+                sup = self.data.token_supply[tid]
+                if tb == 0:
+                    sup.holders += 1
+                else:
+                    sup.holders = sp.as_nat(sup.holders - 1)
+                self.data.token_supply[tid] = sup
             o.remaining_qty = sp.as_nat(o.remaining_qty - params.accept_qty)
-            self.data.offers[params.offer_id] = o
-            sp.emit(sp.record(id=params.offer_id, o=sp.sender, q=params.accept_qty), tag="accept")
+            if o.remaining_qty == 0:
+                del self.data.offers[params.offer_id]
+            else:
+                self.data.offers[params.offer_id] = o
+            sp.emit(sp.record(id=params.offer_id, o=sp.sender, q=params.accept_qty, b=o.buyer, i=tid, u=o.unit_price, p=pt, r=rr, y=ry), tag="accept")
+
+        @sp.entrypoint
+        def accept_offers(self, items):
+            # Fills many bids for the sender in one operation; ledger and claimable updates are
+            # merged per key, and the balance check runs once per token after the loop.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(items, sp.list[AcceptItemType])
+            assert sp.len(items) > 0, "NO_ITEMS"
+            royalties = sp.cast({}, sp.map[sp.nat, RoyaltyType])
+            credits = sp.cast({}, sp.map[sp.address, sp.mutez])
+            sold = sp.cast({}, sp.map[sp.nat, sp.nat])
+            deliveries = sp.cast({}, sp.map[LedgerKeyType, sp.nat])
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            proceeds = sp.mutez(0)
+            for item in items:
+                o = self.data.offers.get(item.offer_id, error="NOT_ACTIVE")
+                assert sp.now <= o.expiry, "OFFER_EXPIRED"
+                assert item.accept_qty > 0, "BAD_ACCEPT_QTY"
+                assert item.accept_qty <= o.remaining_qty, "OVER_QTY"
+                tid = o.token_id
+                assert not (o.buyer in self.data.contract_blocklist), "BLOCKED"
+                assert not (sp.record(owner=sp.sender, token_id=tid, blocked=o.buyer) in self.data.blacklist), "BLACKLISTED"
+                pt = sp.split_tokens(o.unit_price, item.accept_qty, 1)
+                assert pt > sp.mutez(0), "PAY_ZERO"
+                fk = sp.record(owner=sp.sender, token_id=tid)
+                if fk in self.data.listings:
+                    lst = self.data.listings[fk]
+                    if lst.min_bps > 0:
+                        lt = sp.split_tokens(lst.price, item.accept_qty, 1)
+                        ft = sp.split_tokens(lt, lst.min_bps, 10_000)
+                        assert pt >= ft, "LOW_BID"
+                if not (tid in royalties):
+                    rc = self.data.token_config[tid]
+                    royalties[tid] = sp.record(royalty_recipient=rc.royalty_recipient, royalty_bps=rc.royalty_bps)
+                roy = royalties[tid]
+                ry = sp.split_tokens(pt, roy.royalty_bps, 10_000)
+                credits[roy.royalty_recipient] = credits.get(roy.royalty_recipient, default=sp.mutez(0)) + ry
+                proceeds += pt - ry
+                sold[tid] = sold.get(tid, default=sp.nat(0)) + item.accept_qty
+                tk = sp.record(owner=o.buyer, token_id=tid)
+                deliveries[tk] = deliveries.get(tk, default=sp.nat(0)) + item.accept_qty
+                o.remaining_qty = sp.as_nat(o.remaining_qty - item.accept_qty)
+                if o.remaining_qty == 0:
+                    del self.data.offers[item.offer_id]
+                else:
+                    self.data.offers[item.offer_id] = o
+                sp.emit(sp.record(id=item.offer_id, o=sp.sender, q=item.accept_qty, b=o.buyer, i=tid, u=o.unit_price, p=pt, r=roy.royalty_recipient, y=ry), tag="accept")
+            credits[sp.sender] = credits.get(sp.sender, default=sp.mutez(0)) + proceeds
+            for s in sold.items():
+                fk = sp.record(owner=sp.sender, token_id=s.key)
+                fb = self.data.ledger.get(fk, default=sp.nat(0))
+                assert fb >= s.value, "LOW_BAL"
+                nfb = sp.as_nat(fb - s.value)
+                if nfb == 0:
+                    holders[s.key] = holders.get(s.key, default=0) - 1
+                    if fk in self.data.ledger:
+                        del self.data.ledger[fk]
+                    if fk in self.data.listings:
+                        del self.data.listings[fk]
+                else:
+                    self.data.ledger[fk] = nfb
+            for d in deliveries.items():
+                db = self.data.ledger.get(d.key, default=sp.nat(0))
+                if db == 0:
+                    holders[d.key.token_id] = holders.get(d.key.token_id, default=0) + 1
+                self.data.ledger[d.key] = db + d.value
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
+            for credit in credits.items():
+                if credit.value > sp.mutez(0):
+                    if self.data.direct_payout and sp.is_implicit_account(credit.key).is_some():
+                        sp.send(credit.key, credit.value)
+                    else:
+                        self.data.claimable[credit.key] = self.data.claimable.get(credit.key, default=sp.mutez(0)) + credit.value
 
         @sp.entrypoint
         def block_address(self, address):
@@ -400,6 +848,7 @@ def main():
             sp.cast(address, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.contract_blocklist[address] = ()
+            sp.emit(sp.record(address=address, blocked=True), tag="blocklist")
 
         @sp.entrypoint
         def unblock_address(self, address):
@@ -408,6 +857,7 @@ def main():
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             if address in self.data.contract_blocklist:
                 del self.data.contract_blocklist[address]
+            sp.emit(sp.record(address=address, blocked=False), tag="blocklist")
 
         @sp.entrypoint
         def blacklist_address(self, params):
@@ -415,6 +865,7 @@ def main():
             sp.cast(params, sp.record(token_id=sp.nat, blocked=sp.address))
             assert self.data.ledger.get(sp.record(owner=sp.sender, token_id=params.token_id), default=sp.nat(0)) > 0, "NOT_OWNER"
             self.data.blacklist[sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked)] = ()
+            sp.emit(sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked, active=True), tag="blacklist")
 
         @sp.entrypoint
         def unblacklist_address(self, params):
@@ -424,22 +875,101 @@ def main():
             key = sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked)
             if key in self.data.blacklist:
                 del self.data.blacklist[key]
+            sp.emit(sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked, active=False), tag="blacklist")
 
         @sp.entrypoint
         def withdraw(self):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             amount = self.data.claimable.get(sp.sender, default=sp.mutez(0))
             assert amount > sp.mutez(0), "NO_FUNDS"
-            self.data.claimable[sp.sender] = sp.mutez(0)
+            del self.data.claimable[sp.sender]
+            sp.send(sp.sender, amount)
+
+        @sp.entrypoint
+        def withdraw_for(self, recipients):
+            # Pays each listed wallet its whole claimable balance, e.g. a keeper settling creators
+            # after an allowlist drop. Contract addresses keep their balance for withdraw: a
+            # contract that rejects tez would otherwise fail the batch for everyone.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(recipients, sp.list[sp.address])
+            for recipient in recipients:
+                if sp.is_implicit_account(recipient).is_some():
+                    if recipient in self.data.claimable:
+                        amount = self.data.claimable[recipient]
+                        del self.data.claimable[recipient]
+                        if amount > sp.mutez(0):
+                            sp.send(recipient, amount)
+
+        @sp.entrypoint
+        def withdraw_token_proceeds(self, token_ids):
+            # One payment for what the given tokens accrued across allowlist and public phases;
+            # every token must belong to the sender and the total must be non-zero.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(token_ids, sp.list[sp.nat])
+            amount = sp.mutez(0)
+            for token_id in token_ids:
+                assert token_id in self.data.token_state, "TOKEN_UNDEFINED"
+                assert self.data.token_config[token_id].creator == sp.sender, "NOT_CREATOR"
+                st = self.data.token_state[token_id]
+                amount += st.proceeds
+                st.proceeds = sp.mutez(0)
+                self.data.token_state[token_id] = st
+            assert amount > sp.mutez(0), "NO_FUNDS"
             sp.send(sp.sender, amount)
 
         # ---- Views ----
 
+        @sp.offchain_view
+        def token_metadata(self, token_id):
+            """TZIP-12 token metadata: the stored token_info, else base_uri + suffix (default: the decimal token id)."""
+            sp.cast(token_id, sp.nat)
+            if token_id in self.data.token_metadata:
+                return self.data.token_metadata[token_id]
+            else:
+                assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+                suffix = self.data.token_uri_suffix.get(token_id, default=sp.bytes("0x"))
+                if suffix == sp.bytes("0x"):
+                    digits = sp.bytes("0x30313233343536373839")
+                    qr = sp.ediv(token_id, 10).unwrap_some()
+                    suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some()
+                    n = sp.fst(qr)
+                    while n > 0:
+                        qr = sp.ediv(n, 10).unwrap_some()
+                        suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some() + suffix
+                        n = sp.fst(qr)
+                return sp.record(
+                    token_id=token_id,
+                    token_info={"": self.data.base_uri + suffix, "decimals": sp.bytes("0x30")},
+                )
+
         @sp.onchain_view
         def get_balance(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat))
             return self.data.ledger.get(sp.record(owner=params.owner, token_id=params.token_id), default=sp.nat(0))
 
+        @sp.onchain_view
+        def get_balances(self, requests):
+            sp.cast(requests, sp.list[LedgerKeyType])
+            balances = []
+            for req in requests:
+                balances.push(self.data.ledger.get(req, default=sp.nat(0)))
+            return reversed(balances)
+
+        @sp.onchain_view
+        def total_supply(self, token_id):
+            sp.cast(token_id, sp.nat)
+            assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+            return self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))).total_supply
+
+        @sp.onchain_view
+        def get_token_supplies(self, token_ids):
+            # Per-token supply and holder counts, answered from counters instead of a ledger scan.
+            sp.cast(token_ids, sp.list[sp.nat])
+            supplies = []
+            for token_id in token_ids:
+                supplies.push(self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))))
+            return reversed(supplies)
+
         @sp.onchain_view
         def get_offer(self, offer_id):
             sp.cast(offer_id, sp.nat)
@@ -448,18 +978,37 @@ def main():
         @sp.onchain_view
         def is_operator(self, params):
             sp.cast(params, sp.record(owner=sp.address, operator=sp.address, token_id=sp.nat))
-            return sp.record(owner=params.owner, operator=params.operator, token_id=params.token_id) in self.data.operators
+            return (sp.record(owner=params.owner, operator=params.operator) in self.data.all_operators) or (
+                sp.record(owner=params.owner, operator=params.operator, token_id=params.token_id) in self.data.operators
+            )
 
         @sp.onchain_view
         def get_listing(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat))
             return self.data.listings[sp.record(owner=params.owner, token_id=params.token_id)]
 
+        @sp.onchain_view
+        def get_listings(self, keys):
+            # Batched get_listing that answers None for a key with no listing instead of failing.
+            sp.cast(keys, sp.list[LedgerKeyType])
+            listings = []
+            for key in keys:
+                listings.push(self.data.listings.get_opt(key))
+            return reversed(listings)
+
         @sp.onchain_view
         def get_claimable(self, addr):
             sp.cast(addr, sp.address)
             return self.data.claimable.get(addr, default=sp.mutez(0))
 
+        @sp.onchain_view
+        def get_claimables(self, addrs):
+            sp.cast(addrs, sp.list[sp.address])
+            amounts = []
+            for addr in addrs:
+                amounts.push(self.data.claimable.get(addr, default=sp.mutez(0)))
+            return reversed(amounts)
+
         @sp.onchain_view
         def is_blacklisted(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat, blocked=sp.address))
@@ -470,12 +1019,44 @@ def main():
             sp.cast(token_id, sp.nat)
             return self.data.token_config[token_id]
 
+        @sp.onchain_view
+        def get_token_configs(self, token_ids):
+            sp.cast(token_ids, sp.list[sp.nat])
+            configs = []
+            for token_id in token_ids:
+                configs.push(self.data.token_config.get_opt(token_id))
+            return reversed(configs)
+
+        @sp.onchain_view
+        def get_token_state(self, token_id):
+            sp.cast(token_id, sp.nat)
+            return self.data.token_state[token_id]
+
         @sp.onchain_view
         def is_allowlisted(self, params):
             sp.cast(params, sp.record(token_id=sp.nat, address=sp.address))
-            key = sp.record(token_id=params.token_id, address=params.address)
+            key = sp.record(
+                token_id=params.token_id,
+                epoch=self.data.token_config[params.token_id].allowlist_epoch,
+                address=params.address,
+            )
             return key in self.data.token_allowlist
 
+        @sp.onchain_view
+        def get_allowlist_minted(self, params):
+            sp.cast(params, sp.record(token_id=sp.nat, address=sp.address))
+            key = sp.record(
+                token_id=params.token_id,
+                epoch=self.data.token_config[params.token_id].allowlist_epoch,
+                address=params.address,
+            )
+            return self.data.allowlist_minted.get(key, default=sp.nat(0))
+
+        @sp.onchain_view
+        def get_mint_quote(self, params):
+            """What mint_editions would charge buyer for qty editions now, failing where it would."""
+            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, buyer=sp.address, proof=sp.option[AllowlistProofType]))
+            return self._mint_check(params).quote
 
 def bytes_of_string(s):
     return sp.bytes("0x" + s.encode("utf-8").hex())
@@ -513,4 +1094,577 @@ def test():
         _sender=admin,
     )
 
-    c.mint_editions(token_id=0, qty=2, to_=bob.address, _sender=bob, _amount=sp.mutez(0))
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.mutez(0))
+
+    specs = [
+        sp.record(
+            metadata_uri=bytes_of_string("ipfs://QmBatch%d" % i),
+            creator=alice.address,
+            mint_price=sp.tez(1),
+            mint_end=None,
+            max_supply=sp.Some(10 + i),
+            allowlist_end=sp.Some(sp.timestamp(100)),
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            min_offer_per_unit_mutez=sp.mutez(100000),
+        )
+        for i in range(3)
+    ]
+    c.create_tokens(specs, _sender=bob, _valid=False, _exception="NOT_ADMIN")
+    c.create_tokens(specs, _sender=admin)
+    scenario.verify(c.data.next_token_id == 4)
+    scenario.verify(c.data.token_config[3].max_supply == sp.Some(12))
+
+    # Two items on the same listing: the second drains it, so ledger entry and listing go.
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy_many(
+        items=[sp.record(owner=bob.address, token_id=0, qty=1), sp.record(owner=bob.address, token_id=0, qty=1)],
+        expected_total=sp.tez(2),
+        _sender=alice,
+        _amount=sp.tez(2),
+    )
+    scenario.verify(c.data.ledger[sp.record(owner=alice.address, token_id=0)] == 2)
+    scenario.verify(~c.data.ledger.contains(sp.record(owner=bob.address, token_id=0)))
+    scenario.verify(~c.data.listings.contains(sp.record(owner=bob.address, token_id=0)))
+    scenario.verify(c.data.claimable[admin.address] == sp.mutez(100_000))
+
+    # The same offer twice in one batch: the second fill sees the first one's remaining_qty.
+    c.make_offer(token_id=0, qty=2, expiry=sp.timestamp(1000), _sender=bob, _amount=sp.mutez(400_000))
+    c.accept_offers(
+        [sp.record(offer_id=0, accept_qty=1), sp.record(offer_id=0, accept_qty=2)],
+        _sender=alice,
+        _valid=False,
+        _exception="OVER_QTY",
+    )
+    c.accept_offers(
+        [sp.record(offer_id=0, accept_qty=1), sp.record(offer_id=0, accept_qty=1)],
+        _sender=alice,
+    )
+    scenario.verify(~c.data.ledger.contains(sp.record(owner=alice.address, token_id=0)))
+    scenario.verify(c.data.ledger[sp.record(owner=bob.address, token_id=0)] == 2)
+    scenario.verify(~c.data.offers.contains(0))
+    scenario.verify(c.data.claimable[admin.address] == sp.mutez(120_000))
+
+
+@sp.add_test()
+def test_base_uri():
+    # With a base URI set, new tokens store only a suffix (or nothing) and their
+    # TZIP-12 metadata is rebuilt by the token_metadata off-chain view.
+    scenario = sp.test_scenario("BowersAllowlist_base_uri", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    c = main.BowersAllowlistFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmFull"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=sp.Some(10),
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(100000),
+        _sender=admin,
+    )
+
+    base = bytes_of_string("ipfs://QmBase/")
+    c.set_base_uri(base, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_base_uri(base, _sender=admin)
+    for _ in range(11):
+        c.create_token(
+            metadata_uri=sp.bytes("0x"),
+            creator=alice.address,
+            mint_price=sp.tez(1),
+            mint_end=None,
+            max_supply=sp.Some(10),
+            allowlist_end=sp.Some(sp.timestamp(100)),
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            min_offer_per_unit_mutez=sp.mutez(100000),
+            _sender=admin,
+        )
+    c.create_token(
+        metadata_uri=bytes_of_string("custom.json"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=sp.Some(10),
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(100000),
+        _sender=admin,
+    )
+
+    scenario.verify(c.token_metadata(0).token_info[""] == bytes_of_string("ipfs://QmFull"))
+    scenario.verify(~c.data.token_metadata.contains(1))
+    scenario.verify(~c.data.token_uri_suffix.contains(1))
+    scenario.verify(c.token_metadata(1).token_info[""] == base + bytes_of_string("1"))
+    scenario.verify(c.token_metadata(11).token_info[""] == base + bytes_of_string("11"))
+    scenario.verify(c.token_metadata(11).token_info["decimals"] == sp.bytes("0x30"))
+    scenario.verify(c.token_metadata(12).token_info[""] == base + bytes_of_string("custom.json"))
+
+
+@sp.add_test()
+def test_merkle_allowlist():
+    # Merkle mode: one root per token, proofs supplied at mint, minted counts written lazily.
+    scenario = sp.test_scenario("BowersAllowlist_merkle_allowlist", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersAllowlistFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmExample"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=sp.Some(10),
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(100000),
+        _sender=admin,
+    )
+
+    def leaf(account, max_qty, price_override):
+        return scenario.compute(sp.blake2b(sp.pack((account.address, (sp.nat(max_qty), price_override)))))
+
+    free = sp.Some(sp.tez(0))
+    full = sp.cast(None, sp.option[sp.mutez])
+    l_bob, l_alice, l_carol = leaf(bob, 2, free), leaf(alice, 1, full), leaf(carol, 1, full)
+    # Three leaves: the odd one is promoted unchanged to the next level.
+    n_01 = scenario.compute(sp.blake2b(l_bob + l_alice))
+    root = scenario.compute(sp.blake2b(n_01 + l_carol))
+    bob_proof = sp.record(max_qty=2, price_override=free, path=[sp.variant.right(l_alice), sp.variant.right(l_carol)])
+    alice_proof = sp.record(max_qty=1, price_override=full, path=[sp.variant.left(l_bob), sp.variant.right(l_carol)])
+    carol_proof = sp.record(max_qty=1, price_override=full, path=[sp.variant.left(n_01)])
+
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=sp.Some(bob_proof), _sender=bob, _valid=False, _exception="NOT_ALLOWLISTED")
+    c.set_allowlist_root(token_id=0, root=sp.Some(root), _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_allowlist_root(token_id=0, root=sp.Some(root), _sender=admin)
+
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=sp.Some(bob_proof), _sender=bob, _amount=sp.mutez(0))
+    scenario.verify(c.data.allowlist_minted[sp.record(token_id=0, epoch=0, address=bob.address)] == 2)
+    scenario.verify(~c.data.token_allowlist.contains(sp.record(token_id=0, epoch=0, address=bob.address)))
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=sp.Some(bob_proof), _sender=bob, _valid=False, _exception="ALLOWLIST_CAP")
+
+    # A proof only verifies for the sender and the exact (max_qty, price_override) it was built for.
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=sp.Some(bob_proof), _sender=alice, _valid=False, _exception="BAD_PROOF")
+    c.mint_editions(
+        token_id=0, qty=1, to_=alice.address, proof=sp.Some(sp.record(max_qty=5, price_override=full, path=alice_proof.path)),
+        _sender=alice, _amount=sp.tez(1), _valid=False, _exception="BAD_PROOF",
+    )
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=sp.Some(alice_proof), _sender=alice, _amount=sp.mutez(0), _valid=False, _exception="BAD_PAYMENT")
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=sp.Some(alice_proof), _sender=alice, _amount=sp.tez(1))
+    c.mint_editions(token_id=0, qty=1, to_=carol.address, proof=sp.Some(carol_proof), _sender=carol, _amount=sp.tez(1))
+    scenario.verify(c.data.ledger[sp.record(owner=carol.address, token_id=0)] == 1)
+
+    # Without a proof the per-address big_map is consulted as before.
+    c.mint_editions(token_id=0, qty=1, to_=carol.address, proof=None, _sender=carol, _amount=sp.tez(1), _valid=False, _exception="NOT_ALLOWLISTED")
+    c.set_allowlist_root(token_id=0, root=None, _sender=admin)
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=sp.Some(bob_proof), _sender=bob, _valid=False, _exception="NOT_ALLOWLISTED")
+
+
+@sp.add_test()
+def test_allowlist_epochs():
+    # Entries and minted counts are keyed by the token's allowlist epoch: reset and clear are O(1),
+    # stale keys are ignored and can be pruned by anyone.
+    scenario = sp.test_scenario("BowersAllowlist_allowlist_epochs", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersAllowlistFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmExample"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=sp.Some(10),
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(100000),
+        _sender=admin,
+    )
+
+    c.set_allowlist(
+        token_id=0,
+        entries=[sp.record(address=bob.address, max_qty=2, price_override=sp.Some(sp.tez(0)))],
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.mutez(0))
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _valid=False, _exception="ALLOWLIST_CAP")
+
+    c.reset_allowlist(0, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.reset_allowlist(0, _sender=admin)
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _valid=False, _exception="NOT_ALLOWLISTED")
+    c.set_allowlist(
+        token_id=0,
+        entries=[sp.record(address=bob.address, max_qty=1, price_override=sp.Some(sp.tez(0)))],
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.mutez(0))
+    scenario.verify(c.data.token_allowlist[sp.record(token_id=0, epoch=1, address=bob.address)].minted == 1)
+
+    # A Merkle root survives reset_allowlist, so the same list runs again with fresh counts.
+    full = sp.cast(None, sp.option[sp.mutez])
+    root = scenario.compute(sp.blake2b(sp.pack((alice.address, (sp.nat(1), full)))))
+    alice_proof = sp.Some(sp.record(max_qty=1, price_override=full, path=[]))
+    c.set_allowlist_root(token_id=0, root=sp.Some(root), _sender=admin)
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=alice_proof, _sender=alice, _amount=sp.tez(1))
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=alice_proof, _sender=alice, _amount=sp.tez(1), _valid=False, _exception="ALLOWLIST_CAP")
+    c.reset_allowlist(0, _sender=admin)
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=alice_proof, _sender=alice, _amount=sp.tez(1))
+    scenario.verify(c.data.allowlist_minted[sp.record(token_id=0, epoch=2, address=alice.address)] == 1)
+
+    # Stale keys are removed; current-epoch keys and unknown tokens are skipped.
+    c.prune_allowlist(
+        [
+            sp.record(token_id=0, epoch=0, address=bob.address),
+            sp.record(token_id=0, epoch=1, address=bob.address),
+            sp.record(token_id=0, epoch=1, address=alice.address),
+            sp.record(token_id=0, epoch=2, address=alice.address),
+            sp.record(token_id=7, epoch=0, address=bob.address),
+        ],
+        _sender=carol,
+    )
+    scenario.verify(~c.data.token_allowlist.contains(sp.record(token_id=0, epoch=0, address=bob.address)))
+    scenario.verify(~c.data.token_allowlist.contains(sp.record(token_id=0, epoch=1, address=bob.address)))
+    scenario.verify(~c.data.allowlist_minted.contains(sp.record(token_id=0, epoch=1, address=alice.address)))
+    scenario.verify(c.data.allowlist_minted[sp.record(token_id=0, epoch=2, address=alice.address)] == 1)
+
+    # clear_allowlist ends the phase and drops the root; minting falls back to the public price.
+    c.clear_allowlist(0, _sender=admin)
+    scenario.verify(~c.data.allowlist_root.contains(0))
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(1))
+
+
+@sp.add_test()
+def test_mint_quote():
+    # get_mint_quote returns the exact amount mint_editions demands, for list entries, Merkle
+    # proofs and the public phase, with allowlist and supply headroom.
+    scenario = sp.test_scenario("BowersAllowlist_mint_quote", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersAllowlistFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmExample"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=sp.Some(10),
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(100000),
+        _sender=admin,
+    )
+    c.set_allowlist(
+        token_id=0,
+        entries=[sp.record(address=bob.address, max_qty=3, price_override=sp.Some(sp.mutez(500_000)))],
+        _sender=admin,
+    )
+    full = sp.cast(None, sp.option[sp.mutez])
+    root = scenario.compute(sp.blake2b(sp.pack((carol.address, (sp.nat(2), full)))))
+    carol_proof = sp.Some(sp.record(max_qty=2, price_override=full, path=[]))
+    c.set_allowlist_root(token_id=0, root=sp.Some(root), _sender=admin)
+
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.mutez(500_000))
+    scenario.verify_equal(
+        c.get_mint_quote(sp.record(token_id=0, qty=2, buyer=bob.address, proof=None)),
+        sp.record(total=sp.tez(1), allowlist_remaining=sp.Some(2), supply_remaining=sp.Some(9)),
+    )
+    scenario.verify_equal(
+        c.get_mint_quote(sp.record(token_id=0, qty=2, buyer=carol.address, proof=carol_proof)),
+        sp.record(total=sp.tez(2), allowlist_remaining=sp.Some(2), supply_remaining=sp.Some(9)),
+    )
+    c.mint_editions(token_id=0, qty=2, to_=carol.address, proof=carol_proof, _sender=carol, _amount=sp.tez(2))
+    scenario.verify(c.data.allowlist_minted[sp.record(token_id=0, epoch=0, address=carol.address)] == 2)
+
+    # After the allowlist phase the quote is the public price.
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=None, _sender=alice, _amount=sp.tez(1), _now=sp.timestamp(100))
+    scenario.verify_equal(
+        c.get_mint_quote(sp.record(token_id=0, qty=3, buyer=bob.address, proof=None)),
+        sp.record(total=sp.tez(3), allowlist_remaining=None, supply_remaining=sp.Some(6)),
+    )
+
+
+@sp.add_test()
+def test_withdraw_for():
+    # Sale and mint proceeds are paid out by anyone; a contract royalty recipient is
+    # skipped and keeps its balance for withdraw.
+    scenario = sp.test_scenario("BowersAllowlist_withdraw_for", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersAllowlistFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmExample"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        allowlist_end=None,
+        royalty_recipient=c.address,
+        royalty_bps=1000,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(1))
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy(owner=bob.address, token_id=0, qty=1, _sender=alice, _amount=sp.tez(1))
+
+    c.withdraw_for([bob.address], _sender=alice, _amount=sp.tez(1), _valid=False, _exception="NO_TEZ")
+    # Seller and creator are implicit and get paid; the royalty owed to the contract is left.
+    c.withdraw_for([bob.address, alice.address, c.address, bob.address], _sender=alice)
+    scenario.verify(~c.data.claimable.contains(bob.address))
+    scenario.verify(~c.data.claimable.contains(alice.address))
+    scenario.verify(c.data.claimable[c.address] == sp.mutez(100000))
+    scenario.verify(c.balance == sp.mutez(100000))
+
+
+@sp.add_test()
+def test_prune_offers():
+    # Expired bids are removed by any sender with their escrow refunded; a live bid survives.
+    scenario = sp.test_scenario("BowersAllowlist_prune_offers", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersAllowlistFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmExample"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        allowlist_end=None,
+        royalty_recipient=alice.address,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(100), _sender=bob, _amount=sp.tez(1))
+    c.make_offer(token_id=0, qty=3, expiry=sp.timestamp(1000), _sender=alice, _amount=sp.tez(3))
+
+    c.prune_offers([0, 1], _sender=admin, _amount=sp.mutez(1), _valid=False, _exception="NO_TEZ")
+    c.prune_offers([5, 0, 1], _sender=admin, _now=sp.timestamp(101))
+    scenario.verify(~c.data.offers.contains(0))
+    scenario.verify(c.data.offers.contains(1))
+    scenario.verify(c.data.claimable[bob.address] == sp.tez(1))
+    c.close_offer(0, _sender=bob, _valid=False, _exception="NOT_ACTIVE")
+
+
+@sp.add_test()
+def test_token_proceeds():
+    # Allowlist-price and public mints both accrue on the token while accrual is on; only the
+    # creator can sweep them.
+    scenario = sp.test_scenario("BowersAllowlist_token_proceeds", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersAllowlistFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmExample"),
+        creator=alice.address,
+        mint_price=sp.tez(2),
+        mint_end=None,
+        max_supply=None,
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=alice.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.set_allowlist(
+        token_id=0,
+        entries=[sp.record(address=bob.address, max_qty=2, price_override=sp.Some(sp.tez(1)))],
+        _sender=admin,
+    )
+    c.set_accrue_proceeds(True, _sender=admin)
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(2), _now=sp.timestamp(50))
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(2), _now=sp.timestamp(150))
+    scenario.verify(c.data.token_state[0].proceeds == sp.tez(4))
+    scenario.verify(~c.data.claimable.contains(alice.address))
+
+    c.withdraw_token_proceeds([0], _sender=bob, _valid=False, _exception="NOT_CREATOR")
+    c.withdraw_token_proceeds([1], _sender=alice, _valid=False, _exception="TOKEN_UNDEFINED")
+    c.withdraw_token_proceeds([0], _sender=alice)
+    scenario.verify(c.data.token_state[0].proceeds == sp.mutez(0))
+    scenario.verify(c.balance == sp.mutez(0))
+
+
+@sp.add_test()
+def test_direct_payout():
+    # With direct payout on, a sale and a filled bid pay the implicit seller immediately; the
+    # contract royalty recipient is credited.
+    scenario = sp.test_scenario("BowersAllowlist_direct_payout", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersAllowlistFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmExample"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        allowlist_end=None,
+        royalty_recipient=c.address,
+        royalty_bps=1000,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(2))
+    c.set_direct_payout(True, _sender=bob, _valid=False, _exception="NOT_ADMIN")
+    c.set_direct_payout(True, _sender=admin)
+
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy(owner=bob.address, token_id=0, qty=1, _sender=alice, _amount=sp.tez(1))
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(1000), _sender=alice, _amount=sp.tez(2))
+    c.accept_offer(offer_id=0, accept_qty=1, _sender=bob)
+    scenario.verify(~c.data.claimable.contains(bob.address))
+    scenario.verify(c.data.claimable[c.address] == sp.mutez(300000))
+    scenario.verify(c.balance == sp.tez(2) + sp.mutez(300000))
+
+    # A zero royalty gives a contract recipient no claimable entry.
+    vault = sp.address("KT1Tezooo1zzSmartPyzzSTATiCzzzyfC8eF")
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmExample"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        allowlist_end=None,
+        royalty_recipient=vault,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.mint_editions(token_id=1, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(2))
+    c.set_listing(token_id=1, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy(owner=bob.address, token_id=1, qty=1, _sender=alice, _amount=sp.tez(1))
+    c.make_offer(token_id=1, qty=1, expiry=sp.timestamp(1000), _sender=alice, _amount=sp.tez(1))
+    c.accept_offer(offer_id=1, accept_qty=1, _sender=bob)
+    scenario.verify(~c.data.claimable.contains(vault))
+    c.make_offer(token_id=1, qty=1, expiry=sp.timestamp(1000), _sender=bob, _amount=sp.tez(1))
+    c.accept_offers([], _sender=alice, _valid=False, _exception="NO_ITEMS")
+    c.accept_offers([sp.record(offer_id=2, accept_qty=1)], _sender=alice)
+    scenario.verify(~c.data.claimable.contains(vault))
+
+
+@sp.add_test()
+def test_batch_views():
+    # Balances, claimables, listings and token configs for many keys in one view call each.
+    scenario = sp.test_scenario("BowersAllowlist_batch_views", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersAllowlistFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmExample"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=sp.Some(10),
+        allowlist_end=None,
+        royalty_recipient=alice.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=3, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(3))
+    c.set_listing(token_id=0, price=sp.tez(2), max_qty=1, min_bps=0, _sender=bob)
+
+    bob_0 = sp.record(owner=bob.address, token_id=0)
+    alice_0 = sp.record(owner=alice.address, token_id=0)
+    scenario.verify_equal(c.get_balances([alice_0, bob_0]), [0, 3])
+    scenario.verify_equal(c.get_claimables([bob.address, alice.address, alice.address]), [sp.mutez(0), sp.tez(3), sp.tez(3)])
+    scenario.verify_equal(c.get_listings([bob_0, alice_0]), [sp.Some(sp.record(price=sp.tez(2), max_qty=1, min_bps=0)), None])
+    scenario.verify_equal(c.get_token_configs([1, 0]), [None, sp.Some(c.get_token_config(0))])
+
+
+@sp.add_test()
+def test_supply_counters():
+    # Allowlist and public mints both count toward supply; a transfer to oneself leaves the
+    # holder count alone, and selling out drops the seller.
+    scenario = sp.test_scenario("BowersAllowlist_supply_counters", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersAllowlistFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmExample"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=alice.address,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.set_allowlist(token_id=0, entries=[sp.record(address=bob.address, max_qty=2, price_override=None)], _sender=admin)
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(2), _now=sp.timestamp(10))
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=None, _sender=alice, _amount=sp.tez(1), _now=sp.timestamp(200))
+    scenario.verify_equal(c.get_token_supplies([0]), [sp.record(total_supply=3, holders=2)])
+
+    c.transfer([sp.record(from_=bob.address, txs=[sp.record(to_=bob.address, token_id=0, amount=2)])], _sender=bob)
+    scenario.verify(c.data.token_supply[0].holders == 2)
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy(owner=bob.address, token_id=0, qty=2, _sender=alice, _amount=sp.tez(2))
+    scenario.verify_equal(c.get_token_supplies([0]), [sp.record(total_supply=3, holders=1)])
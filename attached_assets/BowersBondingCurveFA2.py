@@ -14,42 +14,106 @@ def main():
     BalanceOfRequestType: type = sp.record(owner=sp.address, token_id=sp.nat)
     BalanceOfResponseType: type = sp.record(request=BalanceOfRequestType, balance=sp.nat)
     LedgerKeyType: type = sp.record(owner=sp.address, token_id=sp.nat)
+    SupplyType: type = sp.record(total_supply=sp.nat, holders=sp.nat)
     OperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address, token_id=sp.nat)
     BlacklistKeyType: type = sp.record(owner=sp.address, token_id=sp.nat, blocked=sp.address)
     OperatorParamType: type = sp.variant(add_operator=OperatorKeyType, remove_operator=OperatorKeyType)
+    AllOperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address)
+    AllOperatorParamType: type = sp.variant(add_operator=AllOperatorKeyType, remove_operator=AllOperatorKeyType)
     TransferTxType: type = sp.record(to_=sp.address, token_id=sp.nat, amount=sp.nat)
     TransferBatchItemType: type = sp.record(from_=sp.address, txs=sp.list[TransferTxType])
+    BuyItemType: type = sp.record(owner=sp.address, token_id=sp.nat, qty=sp.nat)
+    RoyaltyType: type = sp.record(royalty_recipient=sp.address, royalty_bps=sp.nat)
+    AcceptItemType: type = sp.record(offer_id=sp.nat, accept_qty=sp.nat)
 
     TokenConfigType: type = sp.record(
+        creator=sp.address,
+        base_price=sp.mutez,
+        price_increment=sp.mutez,
+        step_size=sp.nat,
+        max_supply=sp.nat,
+        royalty_recipient=sp.address,
+        royalty_bps=sp.nat,
+        min_offer_per_unit_mutez=sp.mutez,
+    )
+
+    # Hot per-token mint state, split from token_config so a mint only rewrites this record.
+    TokenStateType: type = sp.record(minted=sp.nat, mint_paused=sp.bool, mint_end=sp.option[sp.timestamp], proceeds=sp.mutez)
+
+    # get_mint_quote result: remaining counts are before the quoted mint, None when uncapped.
+    MintQuoteType: type = sp.record(total=sp.mutez, allowlist_remaining=sp.option[sp.nat], supply_remaining=sp.option[sp.nat])
+    # _mint_check result: the quote plus the token's creator and mint state.
+    MintCheckType: type = sp.record(quote=MintQuoteType, creator=sp.address, state=TokenStateType)
+
+    CreateTokenParamType: type = sp.record(
+        metadata_uri=sp.bytes,
         creator=sp.address,
         base_price=sp.mutez,
         price_increment=sp.mutez,
         step_size=sp.nat,
         max_supply=sp.nat,
         mint_end=sp.option[sp.timestamp],
-        mint_paused=sp.bool,
-        minted=sp.nat,
         royalty_recipient=sp.address,
         royalty_bps=sp.nat,
         min_offer_per_unit_mutez=sp.mutez,
     )
 
+    # Bonding-curve pricing: edition e costs base_price + price_increment * (e // step_size).
+    # step_index_sum(n) is the sum of (e // step_size) over e in [0, n): the k complete steps
+    # contribute step_size * (0 + 1 + ... + (k - 1)) and the partial step contributes r * k.
+    def step_index_sum(p):
+        sp.cast(p, sp.record(n=sp.nat, step_size=sp.nat))
+        qr = sp.ediv(p.n, p.step_size).unwrap_some()
+        k = sp.fst(qr)
+        r = sp.snd(qr)
+        return p.step_size * sp.fst(sp.ediv(sp.as_nat(k * k - k), 2).unwrap_some()) + r * k
+
+    # Exact total for editions [minted, minted + qty), in O(1) instead of one step per edition.
+    def curve_total(p):
+        sp.cast(
+            p,
+            sp.record(
+                minted=sp.nat,
+                qty=sp.nat,
+                base_price=sp.mutez,
+                price_increment=sp.mutez,
+                step_size=sp.nat,
+            ),
+        )
+        hi = step_index_sum(sp.record(n=p.minted + p.qty, step_size=p.step_size))
+        lo = step_index_sum(sp.record(n=p.minted, step_size=p.step_size))
+        return sp.split_tokens(p.base_price, p.qty, 1) + sp.split_tokens(p.price_increment, sp.as_nat(hi - lo), 1)
+
     class BowersBondingCurveFA2(sp.Contract):
         def __init__(self, admin, metadata):
             self.data.admin = admin
             self.data.metadata = metadata
             self.data.ledger = sp.cast(sp.big_map(), sp.big_map[LedgerKeyType, sp.nat])
+            self.data.token_supply = sp.cast(sp.big_map(), sp.big_map[sp.nat, SupplyType])
             self.data.token_metadata = sp.cast(
                 sp.big_map(),
                 sp.big_map[sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes])],
             )
+            # Optional shared base URI: when set, tokens store only a URI suffix (or nothing) and
+            # TZIP-12 metadata is served by the token_metadata off-chain view.
+            self.data.base_uri = sp.bytes("0x")
+            self.data.token_uri_suffix = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.bytes])
             self.data.token_config = sp.cast(sp.big_map(), sp.big_map[sp.nat, TokenConfigType])
+            self.data.token_state = sp.cast(sp.big_map(), sp.big_map[sp.nat, TokenStateType])
             self.data.operators = sp.cast(sp.big_map(), sp.big_map[OperatorKeyType, sp.unit])
+            self.data.all_operators = sp.cast(sp.big_map(), sp.big_map[AllOperatorKeyType, sp.unit])
             self.data.next_token_id = sp.nat(0)
             self.data.listings = sp.cast(sp.big_map(), sp.big_map[LedgerKeyType, ListingType])
             self.data.offers = sp.cast(sp.big_map(), sp.big_map[sp.nat, OfferType])
             self.data.next_offer_id = sp.nat(0)
             self.data.claimable = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.mutez])
+            # When set, buy and accept_offer pay implicit sellers and royalty recipients within
+            # the sale instead of through claimable; a contract payee is still credited.
+            self.data.direct_payout = False
+            # Curve mints are frequent and small, so their proceeds can instead be summed in
+            # token_state.proceeds (rewritten by every mint) and swept by the creator with
+            # withdraw_token_proceeds.
+            self.data.accrue_proceeds = False
             self.data.blacklist = sp.cast(sp.big_map(), sp.big_map[BlacklistKeyType, sp.unit])
             self.data.contract_blocklist = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.unit])
 
@@ -77,33 +141,87 @@ def main():
                         assert op in self.data.operators, "NO_OP"
                         del self.data.operators[op]
 
+        @sp.entrypoint
+        def update_all_operators(self, actions):
+            # Owner-level operators: one entry approves the operator for all of the owner's tokens.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(actions, sp.list[AllOperatorParamType])
+            for action in actions:
+                match action:
+                    case add_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        self.data.all_operators[op] = ()
+                    case remove_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        assert op in self.data.all_operators, "NO_OP"
+                        del self.data.all_operators[op]
+
         @sp.entrypoint
         def transfer(self, batch):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(batch, sp.list[TransferBatchItemType])
+            # Balances touched by the batch are read from the ledger once and written back once at
+            # the end; addresses cleared against contract_blocklist are not looked up again.
+            balances = sp.cast({}, sp.map[LedgerKeyType, sp.nat])
+            # Empty-before-batch recipients: at write-back a fresh key with a balance adds a holder,
+            # and a key emptied by the batch removes one unless it was fresh.
+            fresh = sp.cast(set(), sp.set[LedgerKeyType])
+            cleared = sp.cast(set(), sp.set[sp.address])
             for item in batch:
                 from_ = item.from_
-                for tx in item.txs:
+                if not (from_ in cleared):
                     assert not (from_ in self.data.contract_blocklist), "BLOCKED"
-                    assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
-                    if from_ != sp.sender:
-                        assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                    cleared.add(from_)
+                # Checked once per batch item; per-token entries are only read without an owner-level
+                # operator, once per token.
+                all_tokens = from_ == sp.sender
+                if not all_tokens:
+                    all_tokens = sp.record(owner=from_, operator=sp.sender) in self.data.all_operators
+                approved = sp.cast(set(), sp.set[sp.nat])
+                for tx in item.txs:
+                    if not (tx.to_ in cleared):
+                        assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
+                        cleared.add(tx.to_)
+                    if not all_tokens:
+                        if not (tx.token_id in approved):
+                            assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                            approved.add(tx.token_id)
                     assert tx.amount > 0, "BAD_AMOUNT"
                     fk = sp.record(owner=from_, token_id=tx.token_id)
-                    fb = self.data.ledger.get(fk, default=sp.nat(0))
+                    fb = balances.get(fk, default=sp.nat(0))
+                    if not (fk in balances):
+                        fb = self.data.ledger.get(fk, default=sp.nat(0))
                     assert fb >= tx.amount, "LOW_BAL"
                     nfb = sp.as_nat(fb - tx.amount)
+                    balances[fk] = nfb
                     if nfb == 0:
-                        if fk in self.data.ledger:
-                            del self.data.ledger[fk]
                         if fk in self.data.listings:
                             del self.data.listings[fk]
-                    else:
-                        self.data.ledger[fk] = nfb
                     tk = sp.record(owner=tx.to_, token_id=tx.token_id)
-                    tb = self.data.ledger.get(tk, default=sp.nat(0))
-                    self.data.ledger[tk] = tb + tx.amount
-                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, a=tx.amount), tag="xfer")
+                    tb = balances.get(tk, default=sp.nat(0))
+                    if not (tk in balances):
+                        tb = self.data.ledger.get(tk, default=sp.nat(0))
+                        if tb == 0:
+                            fresh.add(tk)
+                    balances[tk] = tb + tx.amount
+                    # Activity events (xfer, mint, buy, accept, list, offer, close) share one set of short keys;
+                    # event-schemas.json maps each to its field name.
+                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, q=tx.amount), tag="xfer")
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            for entry in balances.items():
+                tid = entry.key.token_id
+                if entry.value == 0:
+                    del self.data.ledger[entry.key]
+                    if not (entry.key in fresh):
+                        holders[tid] = holders.get(tid, default=0) - 1
+                else:
+                    self.data.ledger[entry.key] = entry.value
+                    if entry.key in fresh:
+                        holders[tid] = holders.get(tid, default=0) + 1
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
 
         @sp.entrypoint
         def set_admin(self, new_admin):
@@ -111,28 +229,39 @@ def main():
             sp.cast(new_admin, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.admin = new_admin
+            sp.emit(new_admin, tag="admin")
 
-        # ---- Bonding curve: create_token, mint_editions ----
+        @sp.entrypoint
+        def set_direct_payout(self, direct):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(direct, sp.bool)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.direct_payout = direct
+            sp.emit(direct, tag="direct_payout")
 
         @sp.entrypoint
-        def create_token(self, params):
+        def set_accrue_proceeds(self, accrue):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
-            sp.cast(
-                params,
-                sp.record(
-                    metadata_uri=sp.bytes,
-                    creator=sp.address,
-                    base_price=sp.mutez,
-                    price_increment=sp.mutez,
-                    step_size=sp.nat,
-                    max_supply=sp.nat,
-                    mint_end=sp.option[sp.timestamp],
-                    royalty_recipient=sp.address,
-                    royalty_bps=sp.nat,
-                    min_offer_per_unit_mutez=sp.mutez,
-                ),
-            )
+            sp.cast(accrue, sp.bool)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.accrue_proceeds = accrue
+            sp.emit(accrue, tag="accrue_proceeds")
+
+        @sp.entrypoint
+        def set_base_uri(self, base_uri):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(base_uri, sp.bytes)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.base_uri = base_uri
+            sp.emit(base_uri, tag="base_uri")
+
+        # ---- Bonding curve: create_token, mint_editions ----
+
+        @sp.private(with_storage="read-write", with_operations=True)
+        def _create_token(self, params):
+            # One spec, validated and stored under next_token_id; create_token and create_tokens
+            # both go through here.
+            sp.cast(params, CreateTokenParamType)
             assert params.step_size > 0, "STEP_ZERO"
             assert params.max_supply > 0, "ZERO_SUPPLY"
             assert params.royalty_bps <= 10_000, "BPS_TOO_HIGH"
@@ -140,77 +269,125 @@ def main():
             tid = self.data.next_token_id
             self.data.next_token_id += 1
 
-            token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
-            self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            if self.data.base_uri == sp.bytes("0x"):
+                token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
+                self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            else:
+                if params.metadata_uri != sp.bytes("0x"):
+                    self.data.token_uri_suffix[tid] = params.metadata_uri
 
-            self.data.token_config[tid] = sp.record(
+            cfg = sp.record(
                 creator=params.creator,
                 base_price=params.base_price,
                 price_increment=params.price_increment,
                 step_size=params.step_size,
                 max_supply=params.max_supply,
-                mint_end=params.mint_end,
-                mint_paused=False,
-                minted=sp.nat(0),
                 royalty_recipient=params.royalty_recipient,
                 royalty_bps=params.royalty_bps,
                 min_offer_per_unit_mutez=params.min_offer_per_unit_mutez,
             )
+            self.data.token_config[tid] = cfg
+            self.data.token_state[tid] = sp.record(minted=sp.nat(0), mint_paused=False, mint_end=params.mint_end, proceeds=sp.mutez(0))
+            sp.emit(sp.record(token_id=tid, config=cfg, mint_end=params.mint_end), tag="token_created")
+
+        @sp.entrypoint
+        def create_token(self, params):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(params, CreateTokenParamType)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self._create_token(params)
+
+        @sp.entrypoint
+        def create_tokens(self, specs):
+            # Batch create_token: consecutive ids from next_token_id.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(specs, sp.list[CreateTokenParamType])
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            for params in specs:
+                self._create_token(params)
 
         @sp.entrypoint
         def set_mint_paused(self, params):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(params, sp.record(token_id=sp.nat, paused=sp.bool))
             assert sp.sender == self.data.admin, "NOT_ADMIN"
-            assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
-            cfg = self.data.token_config[params.token_id]
-            cfg.mint_paused = params.paused
-            self.data.token_config[params.token_id] = cfg
+            assert params.token_id in self.data.token_state, "TOKEN_UNDEFINED"
+            st = self.data.token_state[params.token_id]
+            st.mint_paused = params.paused
+            self.data.token_state[params.token_id] = st
+            sp.emit(sp.record(token_id=params.token_id, paused=params.paused), tag="mint_paused")
 
         @sp.entrypoint
         def set_mint_end(self, params):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(params, sp.record(token_id=sp.nat, mint_end=sp.option[sp.timestamp]))
             assert sp.sender == self.data.admin, "NOT_ADMIN"
-            assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
-            cfg = self.data.token_config[params.token_id]
-            cfg.mint_end = params.mint_end
-            self.data.token_config[params.token_id] = cfg
+            assert params.token_id in self.data.token_state, "TOKEN_UNDEFINED"
+            st = self.data.token_state[params.token_id]
+            st.mint_end = params.mint_end
+            self.data.token_state[params.token_id] = st
+            sp.emit(sp.record(token_id=params.token_id, mint_end=params.mint_end), tag="mint_end")
 
-        @sp.entrypoint
-        def mint_editions(self, params):
-            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, to_=sp.address))
+        @sp.private(with_storage="read-only")
+        def _mint_check(self, params):
+            # Supply cap, mint window and curve price for qty editions; mint_editions charges the
+            # quote and get_mint_quote returns it.
+            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat))
             assert params.qty > 0, "BAD_QTY"
-            assert not (params.to_ in self.data.contract_blocklist), "BLOCKED"
-            assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
+            assert params.token_id in self.data.token_state, "TOKEN_UNDEFINED"
+            st = self.data.token_state[params.token_id]
             cfg = self.data.token_config[params.token_id]
 
-            assert cfg.minted + params.qty <= cfg.max_supply, "MAX_SUPPLY"
-            me = cfg.mint_end
+            assert st.minted + params.qty <= cfg.max_supply, "MAX_SUPPLY"
+            me = st.mint_end
             if me.is_some():
                 assert sp.now <= me.unwrap_some(), "MINT_CLOSED"
-            assert not cfg.mint_paused, "MINT_CLOSED"
+            assert not st.mint_paused, "MINT_CLOSED"
 
-            total = sp.mutez(0)
-            i = sp.nat(0)
-            while i < params.qty:
-                edition_index = cfg.minted + i
-                step_index = sp.fst(sp.ediv(edition_index, cfg.step_size).unwrap_some())
-                total = total + cfg.base_price + sp.split_tokens(cfg.price_increment, step_index, 1)
-                i += 1
+            total = curve_total(
+                sp.record(
+                    minted=st.minted,
+                    qty=params.qty,
+                    base_price=cfg.base_price,
+                    price_increment=cfg.price_increment,
+                    step_size=cfg.step_size,
+                )
+            )
+            return sp.cast(
+                sp.record(
+                    quote=sp.record(total=total, allowlist_remaining=None, supply_remaining=sp.Some(sp.as_nat(cfg.max_supply - st.minted))),
+                    creator=cfg.creator,
+                    state=st,
+                ),
+                MintCheckType,
+            )
 
+        @sp.entrypoint
+        def mint_editions(self, params):
+            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, to_=sp.address))
+            assert not (params.to_ in self.data.contract_blocklist), "BLOCKED"
+            chk = self._mint_check(sp.record(token_id=params.token_id, qty=params.qty))
+            total = chk.quote.total
             assert sp.amount == total, "BAD_PAYMENT"
 
-            self.data.ledger[sp.record(owner=params.to_, token_id=params.token_id)] = (
-                self.data.ledger.get(sp.record(owner=params.to_, token_id=params.token_id), default=sp.nat(0))
-                + params.qty
-            )
-            self.data.claimable[cfg.creator] = (
-                self.data.claimable.get(cfg.creator, default=sp.mutez(0)) + total
-            )
-            cfg.minted = cfg.minted + params.qty
-            self.data.token_config[params.token_id] = cfg
-            sp.emit(sp.record(token_id=params.token_id, to_=params.to_, qty=params.qty, paid=total), tag="mint")
+            st = chk.state
+            lk = sp.record(owner=params.to_, token_id=params.token_id)
+            lb = self.data.ledger.get(lk, default=sp.nat(0))
+            self.data.ledger[lk] = lb + params.qty
+            sup = self.data.token_supply.get(params.token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0)))
+            sup.total_supply += params.qty
+            if lb == 0:
+                sup.holders += 1
+            self.data.token_supply[params.token_id] = sup
+            if self.data.accrue_proceeds:
+                st.proceeds += total
+            else:
+                self.data.claimable[chk.creator] = (
+                    self.data.claimable.get(chk.creator, default=sp.mutez(0)) + total
+                )
+            st.minted = st.minted + params.qty
+            self.data.token_state[params.token_id] = st
+            sp.emit(sp.record(i=params.token_id, t=params.to_, q=params.qty, p=total, a=sp.fst(sp.ediv(total, params.qty).unwrap_some()), c=chk.creator), tag="mint")
 
         # ---- Listings, buy, offers, blacklist, withdraw (same as Marketplace) ----
 
@@ -226,6 +403,8 @@ def main():
             else:
                 assert params.min_bps <= 10_000, "BPS_TOO_HIGH"
                 self.data.listings[pk] = sp.record(price=params.price, max_qty=params.max_qty, min_bps=params.min_bps)
+            # A zero price is a delisting.
+            sp.emit(sp.record(o=sp.sender, i=params.token_id, u=params.price, m=params.max_qty, n=params.min_bps), tag="list")
 
         @sp.entrypoint
         def buy(self, params):
@@ -246,8 +425,22 @@ def main():
             rr = cfg.royalty_recipient
             ry = sp.split_tokens(tp, cfg.royalty_bps, 10_000)
             po = tp - ry
-            self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
-            self.data.claimable[params.owner] = self.data.claimable.get(params.owner, default=sp.mutez(0)) + po
+            if self.data.direct_payout:
+                # Transfers go only to implicit accounts; crediting contracts keeps a payee that
+                # refuses tez from failing the sale.
+                payouts = sp.cast({}, sp.map[sp.address, sp.mutez])
+                if ry > sp.mutez(0):
+                    payouts[rr] = ry
+                payouts[params.owner] = payouts.get(params.owner, default=sp.mutez(0)) + po
+                for payout in payouts.items():
+                    if payout.value > sp.mutez(0):
+                        if sp.is_implicit_account(payout.key).is_some():
+                            sp.send(payout.key, payout.value)
+                        else:
+                            self.data.claimable[payout.key] = self.data.claimable.get(payout.key, default=sp.mutez(0)) + payout.value
+            else:
+                self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
+                self.data.claimable[params.owner] = self.data.claimable.get(params.owner, default=sp.mutez(0)) + po
             nfb = sp.as_nat(fb - params.qty)
             if nfb == 0:
                 if pk in self.data.ledger:
@@ -259,7 +452,75 @@ def main():
             tk = sp.record(owner=sp.sender, token_id=params.token_id)
             tb = self.data.ledger.get(tk, default=sp.nat(0))
             self.data.ledger[tk] = tb + params.qty
-            sp.emit(sp.record(b=sp.sender, o=params.owner, i=params.token_id, q=params.qty), tag="buy")
+            if (nfb == 0) != (tb == 0):
+                sup = self.data.token_supply[params.token_id]
+                if tb == 0:
+                    sup.holders += 1
+                else:
+                    sup.holders = sp.as_nat(sup.holders - 1)
+                self.data.token_supply[params.token_id] = sup
+            # u: unit price, p: total paid, r / y: royalty recipient / amount (also on "accept").
+            sp.emit(sp.record(b=sp.sender, o=params.owner, i=params.token_id, q=params.qty, u=lst.price, p=tp, r=rr, y=ry), tag="buy")
+
+        @sp.entrypoint
+        def buy_many(self, params):
+            # Resale sweep: a buyer takes several listings in one call instead of minting at the
+            # curve's rising price. All items fill or none do; payees are credited once each.
+            sp.cast(params, sp.record(items=sp.list[BuyItemType], expected_total=sp.mutez))
+            assert not (sp.sender in self.data.contract_blocklist), "BLOCKED"
+            assert sp.amount == params.expected_total, "WRONG_PRICE"
+            royalties = sp.cast({}, sp.map[sp.nat, RoyaltyType])
+            credits = sp.cast({}, sp.map[sp.address, sp.mutez])
+            bought = sp.cast({}, sp.map[sp.nat, sp.nat])
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            total = sp.mutez(0)
+            for item in params.items:
+                assert item.qty > 0, "BAD_QTY"
+                assert not (sp.record(owner=item.owner, token_id=item.token_id, blocked=sp.sender) in self.data.blacklist), "BLACKLISTED"
+                pk = sp.record(owner=item.owner, token_id=item.token_id)
+                assert pk in self.data.listings, "NOT_FOR_SALE"
+                lst = self.data.listings[pk]
+                if lst.max_qty > 0:
+                    assert item.qty <= lst.max_qty, "MAX_QTY"
+                fb = self.data.ledger.get(pk, default=sp.nat(0))
+                assert fb >= item.qty, "NO_BAL"
+                tp = sp.split_tokens(lst.price, item.qty, 1)
+                if not (item.token_id in royalties):
+                    rc = self.data.token_config[item.token_id]
+                    royalties[item.token_id] = sp.record(royalty_recipient=rc.royalty_recipient, royalty_bps=rc.royalty_bps)
+                roy = royalties[item.token_id]
+                ry = sp.split_tokens(tp, roy.royalty_bps, 10_000)
+                credits[roy.royalty_recipient] = credits.get(roy.royalty_recipient, default=sp.mutez(0)) + ry
+                credits[item.owner] = credits.get(item.owner, default=sp.mutez(0)) + (tp - ry)
+                total += tp
+                nfb = sp.as_nat(fb - item.qty)
+                if nfb == 0:
+                    holders[item.token_id] = holders.get(item.token_id, default=0) - 1
+                    if pk in self.data.ledger:
+                        del self.data.ledger[pk]
+                    if pk in self.data.listings:
+                        del self.data.listings[pk]
+                else:
+                    self.data.ledger[pk] = nfb
+                bought[item.token_id] = bought.get(item.token_id, default=sp.nat(0)) + item.qty
+                sp.emit(sp.record(b=sp.sender, o=item.owner, i=item.token_id, q=item.qty, u=lst.price, p=tp, r=roy.royalty_recipient, y=ry), tag="buy")
+            assert total == params.expected_total, "WRONG_PRICE"
+            for credit in credits.items():
+                if credit.value > sp.mutez(0):
+                    if self.data.direct_payout and sp.is_implicit_account(credit.key).is_some():
+                        sp.send(credit.key, credit.value)
+                    else:
+                        self.data.claimable[credit.key] = self.data.claimable.get(credit.key, default=sp.mutez(0)) + credit.value
+            for b in bought.items():
+                tk = sp.record(owner=sp.sender, token_id=b.key)
+                tb = self.data.ledger.get(tk, default=sp.nat(0))
+                if tb == 0:
+                    holders[b.key] = holders.get(b.key, default=0) + 1
+                self.data.ledger[tk] = tb + b.value
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
 
         @sp.entrypoint
         def make_offer(self, params):
@@ -277,26 +538,45 @@ def main():
             self.data.offers[oid] = sp.record(
                 token_id=params.token_id, buyer=sp.sender, unit_price=up,
                 remaining_qty=params.qty, expiry=params.expiry)
+            sp.emit(sp.record(id=oid, b=sp.sender, i=params.token_id, u=up, q=params.qty, e=params.expiry), tag="offer")
 
         @sp.entrypoint
         def close_offer(self, offer_id):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(offer_id, sp.nat)
-            o = self.data.offers[offer_id]
-            assert o.remaining_qty > 0, "NOT_ACTIVE"
+            o = self.data.offers.get(offer_id, error="NOT_ACTIVE")
             if o.buyer != sp.sender:
                 assert sp.now > o.expiry, "NO_AUTH"
             refund = sp.split_tokens(o.unit_price, o.remaining_qty, 1)
             self.data.claimable[o.buyer] = self.data.claimable.get(o.buyer, default=sp.mutez(0)) + refund
-            o.remaining_qty = sp.nat(0)
-            self.data.offers[offer_id] = o
+            del self.data.offers[offer_id]
+            sp.emit(sp.record(id=offer_id, b=o.buyer, p=refund), tag="close")
+
+        @sp.entrypoint
+        def prune_offers(self, offer_ids):
+            # Curve tokens keep trading after mint-out, so stale bids pile up; anyone can delete the
+            # expired ones. Escrow returns to each bidder's claimable in one write, and missing or
+            # live ids are passed over.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(offer_ids, sp.list[sp.nat])
+            refunds = sp.cast({}, sp.map[sp.address, sp.mutez])
+            for oid in offer_ids:
+                if oid in self.data.offers:
+                    o = self.data.offers[oid]
+                    if o.remaining_qty == 0 or sp.now > o.expiry:
+                        refund = sp.split_tokens(o.unit_price, o.remaining_qty, 1)
+                        refunds[o.buyer] = refunds.get(o.buyer, default=sp.mutez(0)) + refund
+                        del self.data.offers[oid]
+                        sp.emit(sp.record(id=oid, b=o.buyer, p=refund), tag="close")
+            for r in refunds.items():
+                if r.value > sp.mutez(0):
+                    self.data.claimable[r.key] = self.data.claimable.get(r.key, default=sp.mutez(0)) + r.value
 
         @sp.entrypoint
         def accept_offer(self, params):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(params, sp.record(offer_id=sp.nat, accept_qty=sp.nat))
-            o = self.data.offers[params.offer_id]
-            assert o.remaining_qty > 0, "NOT_ACTIVE"
+            o = self.data.offers.get(params.offer_id, error="NOT_ACTIVE")
             assert sp.now <= o.expiry, "OFFER_EXPIRED"
             assert params.accept_qty > 0, "BAD_ACCEPT_QTY"
             assert params.accept_qty <= o.remaining_qty, "OVER_QTY"
@@ -318,8 +598,22 @@ def main():
             rr = cfg.royalty_recipient
             ry = sp.split_tokens(pt, cfg.royalty_bps, 10_000)
             po = pt - ry
-            self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
-            self.data.claimable[sp.sender] = self.data.claimable.get(sp.sender, default=sp.mutez(0)) + po
+            if self.data.direct_payout:
+                # Paid from the offer's escrow in the same operation; contract payees are credited
+                # as before.
+                payouts = sp.cast({}, sp.map[sp.address, sp.mutez])
+                if ry > sp.mutez(0):
+                    payouts[rr] = ry
+                payouts[sp.sender] = payouts.get(sp.sender, default=sp.mutez(0)) + po
+                for payout in payouts.items():
+                    if payout.value > sp.mutez(0):
+                        if sp.is_implicit_account(payout.key).is_some():
+                            sp.send(payout.key, payout.value)
+                        else:
+                            self.data.claimable[payout.key] = self.data.claimable.get(payout.key, default=sp.mutez(0)) + payout.value
+            else:
+                self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
+                self.data.claimable[sp.sender] = self.data.claimable.get(sp.sender, default=sp.mutez(0)) + po
             nfb = sp.as_nat(fb - params.accept_qty)
             if nfb == 0:
                 if fk in self.data.ledger:
@@ -331,9 +625,95 @@ def main():
             tk = sp.record(owner=o.buyer, token_id=tid)
             tb = self.data.ledger.get(tk, default=sp.nat(0))
             self.data.ledger[tk] = tb + params.accept_qty
+            if (nfb == 0) != (tb == 0):
+                sup = self.data.token_supply[tid]
+                if tb == 0:
+                    sup.holders += 1
+                else:
+                    sup.holders = sp.as_nat(sup.holders - 1)
+                self.data.token_supply[tid] = sup
             o.remaining_qty = sp.as_nat(o.remaining_qty - params.accept_qty)
-            self.data.offers[params.offer_id] = o
-            sp.emit(sp.record(id=params.offer_id, o=sp.sender, q=params.accept_qty), tag="accept")
+            if o.remaining_qty == 0:
+                del self.data.offers[params.offer_id]
+            else:
+                self.data.offers[params.offer_id] = o
+            sp.emit(sp.record(id=params.offer_id, o=sp.sender, q=params.accept_qty, b=o.buyer, i=tid, u=o.unit_price, p=pt, r=rr, y=ry), tag="accept")
+
+        @sp.entrypoint
+        def accept_offers(self, items):
+            # Batch bid fills: proceeds for the seller are summed into a single claimable credit,
+            # and the seller's balance is checked once per token against the summed quantity.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(items, sp.list[AcceptItemType])
+            assert sp.len(items) > 0, "NO_ITEMS"
+            royalties = sp.cast({}, sp.map[sp.nat, RoyaltyType])
+            credits = sp.cast({}, sp.map[sp.address, sp.mutez])
+            sold = sp.cast({}, sp.map[sp.nat, sp.nat])
+            deliveries = sp.cast({}, sp.map[LedgerKeyType, sp.nat])
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            proceeds = sp.mutez(0)
+            for item in items:
+                o = self.data.offers.get(item.offer_id, error="NOT_ACTIVE")
+                assert sp.now <= o.expiry, "OFFER_EXPIRED"
+                assert item.accept_qty > 0, "BAD_ACCEPT_QTY"
+                assert item.accept_qty <= o.remaining_qty, "OVER_QTY"
+                tid = o.token_id
+                assert not (o.buyer in self.data.contract_blocklist), "BLOCKED"
+                assert not (sp.record(owner=sp.sender, token_id=tid, blocked=o.buyer) in self.data.blacklist), "BLACKLISTED"
+                pt = sp.split_tokens(o.unit_price, item.accept_qty, 1)
+                assert pt > sp.mutez(0), "PAY_ZERO"
+                fk = sp.record(owner=sp.sender, token_id=tid)
+                if fk in self.data.listings:
+                    lst = self.data.listings[fk]
+                    if lst.min_bps > 0:
+                        lt = sp.split_tokens(lst.price, item.accept_qty, 1)
+                        ft = sp.split_tokens(lt, lst.min_bps, 10_000)
+                        assert pt >= ft, "LOW_BID"
+                if not (tid in royalties):
+                    rc = self.data.token_config[tid]
+                    royalties[tid] = sp.record(royalty_recipient=rc.royalty_recipient, royalty_bps=rc.royalty_bps)
+                roy = royalties[tid]
+                ry = sp.split_tokens(pt, roy.royalty_bps, 10_000)
+                credits[roy.royalty_recipient] = credits.get(roy.royalty_recipient, default=sp.mutez(0)) + ry
+                proceeds += pt - ry
+                sold[tid] = sold.get(tid, default=sp.nat(0)) + item.accept_qty
+                tk = sp.record(owner=o.buyer, token_id=tid)
+                deliveries[tk] = deliveries.get(tk, default=sp.nat(0)) + item.accept_qty
+                o.remaining_qty = sp.as_nat(o.remaining_qty - item.accept_qty)
+                if o.remaining_qty == 0:
+                    del self.data.offers[item.offer_id]
+                else:
+                    self.data.offers[item.offer_id] = o
+                sp.emit(sp.record(id=item.offer_id, o=sp.sender, q=item.accept_qty, b=o.buyer, i=tid, u=o.unit_price, p=pt, r=roy.royalty_recipient, y=ry), tag="accept")
+            credits[sp.sender] = credits.get(sp.sender, default=sp.mutez(0)) + proceeds
+            for s in sold.items():
+                fk = sp.record(owner=sp.sender, token_id=s.key)
+                fb = self.data.ledger.get(fk, default=sp.nat(0))
+                assert fb >= s.value, "LOW_BAL"
+                nfb = sp.as_nat(fb - s.value)
+                if nfb == 0:
+                    holders[s.key] = holders.get(s.key, default=0) - 1
+                    if fk in self.data.ledger:
+                        del self.data.ledger[fk]
+                    if fk in self.data.listings:
+                        del self.data.listings[fk]
+                else:
+                    self.data.ledger[fk] = nfb
+            for d in deliveries.items():
+                db = self.data.ledger.get(d.key, default=sp.nat(0))
+                if db == 0:
+                    holders[d.key.token_id] = holders.get(d.key.token_id, default=0) + 1
+                self.data.ledger[d.key] = db + d.value
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
+            for credit in credits.items():
+                if credit.value > sp.mutez(0):
+                    if self.data.direct_payout and sp.is_implicit_account(credit.key).is_some():
+                        sp.send(credit.key, credit.value)
+                    else:
+                        self.data.claimable[credit.key] = self.data.claimable.get(credit.key, default=sp.mutez(0)) + credit.value
 
         @sp.entrypoint
         def block_address(self, address):
@@ -341,6 +721,7 @@ def main():
             sp.cast(address, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.contract_blocklist[address] = ()
+            sp.emit(sp.record(address=address, blocked=True), tag="blocklist")
 
         @sp.entrypoint
         def unblock_address(self, address):
@@ -349,6 +730,7 @@ def main():
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             if address in self.data.contract_blocklist:
                 del self.data.contract_blocklist[address]
+            sp.emit(sp.record(address=address, blocked=False), tag="blocklist")
 
         @sp.entrypoint
         def blacklist_address(self, params):
@@ -356,6 +738,7 @@ def main():
             sp.cast(params, sp.record(token_id=sp.nat, blocked=sp.address))
             assert self.data.ledger.get(sp.record(owner=sp.sender, token_id=params.token_id), default=sp.nat(0)) > 0, "NOT_OWNER"
             self.data.blacklist[sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked)] = ()
+            sp.emit(sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked, active=True), tag="blacklist")
 
         @sp.entrypoint
         def unblacklist_address(self, params):
@@ -365,20 +748,98 @@ def main():
             key = sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked)
             if key in self.data.blacklist:
                 del self.data.blacklist[key]
+            sp.emit(sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked, active=False), tag="blacklist")
 
         @sp.entrypoint
         def withdraw(self):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             amount = self.data.claimable.get(sp.sender, default=sp.mutez(0))
             assert amount > sp.mutez(0), "NO_FUNDS"
-            self.data.claimable[sp.sender] = sp.mutez(0)
+            del self.data.claimable[sp.sender]
             sp.send(sp.sender, amount)
 
+        @sp.entrypoint
+        def withdraw_for(self, recipients):
+            # Pays out claimable balances, curve mint proceeds included, for any list of wallets.
+            # Implicit accounts only: a recipient contract could reject the transfer and revert the
+            # batch, so contracts withdraw their own balance.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(recipients, sp.list[sp.address])
+            for recipient in recipients:
+                if sp.is_implicit_account(recipient).is_some():
+                    if recipient in self.data.claimable:
+                        amount = self.data.claimable[recipient]
+                        del self.data.claimable[recipient]
+                        if amount > sp.mutez(0):
+                            sp.send(recipient, amount)
+
+        @sp.entrypoint
+        def withdraw_token_proceeds(self, token_ids):
+            # The creator collects accrued curve revenue for several tokens in a single transfer.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(token_ids, sp.list[sp.nat])
+            amount = sp.mutez(0)
+            for token_id in token_ids:
+                assert token_id in self.data.token_state, "TOKEN_UNDEFINED"
+                assert self.data.token_config[token_id].creator == sp.sender, "NOT_CREATOR"
+                st = self.data.token_state[token_id]
+                amount += st.proceeds
+                st.proceeds = sp.mutez(0)
+                self.data.token_state[token_id] = st
+            assert amount > sp.mutez(0), "NO_FUNDS"
+            sp.send(sp.sender, amount)
+
+        @sp.offchain_view
+        def token_metadata(self, token_id):
+            """TZIP-12 token metadata: the stored token_info, else base_uri + suffix (default: the decimal token id)."""
+            sp.cast(token_id, sp.nat)
+            if token_id in self.data.token_metadata:
+                return self.data.token_metadata[token_id]
+            else:
+                assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+                suffix = self.data.token_uri_suffix.get(token_id, default=sp.bytes("0x"))
+                if suffix == sp.bytes("0x"):
+                    digits = sp.bytes("0x30313233343536373839")
+                    qr = sp.ediv(token_id, 10).unwrap_some()
+                    suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some()
+                    n = sp.fst(qr)
+                    while n > 0:
+                        qr = sp.ediv(n, 10).unwrap_some()
+                        suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some() + suffix
+                        n = sp.fst(qr)
+                return sp.record(
+                    token_id=token_id,
+                    token_info={"": self.data.base_uri + suffix, "decimals": sp.bytes("0x30")},
+                )
+
         @sp.onchain_view
         def get_balance(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat))
             return self.data.ledger.get(sp.record(owner=params.owner, token_id=params.token_id), default=sp.nat(0))
 
+        @sp.onchain_view
+        def get_balances(self, requests):
+            sp.cast(requests, sp.list[LedgerKeyType])
+            balances = []
+            for req in requests:
+                balances.push(self.data.ledger.get(req, default=sp.nat(0)))
+            return reversed(balances)
+
+        @sp.onchain_view
+        def total_supply(self, token_id):
+            sp.cast(token_id, sp.nat)
+            assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+            return self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))).total_supply
+
+        @sp.onchain_view
+        def get_token_supplies(self, token_ids):
+            # Supply tracks editions minted, so it also shows how far along its curve each token is.
+            sp.cast(token_ids, sp.list[sp.nat])
+            supplies = []
+            for token_id in token_ids:
+                supplies.push(self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))))
+            return reversed(supplies)
+
         @sp.onchain_view
         def get_offer(self, offer_id):
             sp.cast(offer_id, sp.nat)
@@ -387,18 +848,37 @@ def main():
         @sp.onchain_view
         def is_operator(self, params):
             sp.cast(params, sp.record(owner=sp.address, operator=sp.address, token_id=sp.nat))
-            return sp.record(owner=params.owner, operator=params.operator, token_id=params.token_id) in self.data.operators
+            return (sp.record(owner=params.owner, operator=params.operator) in self.data.all_operators) or (
+                sp.record(owner=params.owner, operator=params.operator, token_id=params.token_id) in self.data.operators
+            )
 
         @sp.onchain_view
         def get_listing(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat))
             return self.data.listings[sp.record(owner=params.owner, token_id=params.token_id)]
 
+        @sp.onchain_view
+        def get_listings(self, keys):
+            # Secondary listings for many (owner, token_id) pairs; None marks a key that is not listed.
+            sp.cast(keys, sp.list[LedgerKeyType])
+            listings = []
+            for key in keys:
+                listings.push(self.data.listings.get_opt(key))
+            return reversed(listings)
+
         @sp.onchain_view
         def get_claimable(self, addr):
             sp.cast(addr, sp.address)
             return self.data.claimable.get(addr, default=sp.mutez(0))
 
+        @sp.onchain_view
+        def get_claimables(self, addrs):
+            sp.cast(addrs, sp.list[sp.address])
+            amounts = []
+            for addr in addrs:
+                amounts.push(self.data.claimable.get(addr, default=sp.mutez(0)))
+            return reversed(amounts)
+
         @sp.onchain_view
         def is_blacklisted(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat, blocked=sp.address))
@@ -409,14 +889,41 @@ def main():
             sp.cast(token_id, sp.nat)
             return self.data.token_config[token_id]
 
+        @sp.onchain_view
+        def get_token_configs(self, token_ids):
+            sp.cast(token_ids, sp.list[sp.nat])
+            configs = []
+            for token_id in token_ids:
+                configs.push(self.data.token_config.get_opt(token_id))
+            return reversed(configs)
+
+        @sp.onchain_view
+        def get_token_state(self, token_id):
+            sp.cast(token_id, sp.nat)
+            return self.data.token_state[token_id]
+
         @sp.onchain_view
         def get_current_price(self, token_id):
             """Price for the next edition (at current minted count)."""
             sp.cast(token_id, sp.nat)
             cfg = self.data.token_config[token_id]
-            step_index = sp.fst(sp.ediv(cfg.minted, cfg.step_size).unwrap_some())
+            step_index = sp.fst(sp.ediv(self.data.token_state[token_id].minted, cfg.step_size).unwrap_some())
             return cfg.base_price + sp.split_tokens(cfg.price_increment, step_index, 1)
 
+        @sp.onchain_view
+        def get_mint_quote(self, params):
+            """What mint_editions would charge for qty editions now, failing where it would."""
+            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, buyer=sp.address))
+            return self._mint_check(sp.record(token_id=params.token_id, qty=params.qty)).quote
+
+
+def loop_curve_total(minted, qty, base_price, price_increment, step_size):
+    # Reference: the per-edition loop mint_editions used before the closed-form sum (mutez).
+    total = 0
+    for i in range(qty):
+        total += base_price + price_increment * ((minted + i) // step_size)
+    return total
+
 
 @sp.add_test()
 def test():
@@ -445,3 +952,490 @@ def test():
 
     c.mint_editions(token_id=0, qty=10, to_=alice.address, _sender=alice, _amount=sp.tez(10))
     c.mint_editions(token_id=0, qty=1, to_=alice.address, _sender=alice, _amount=sp.tez(1) + sp.mutez(100_000))
+
+    specs = [
+        sp.record(
+            metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmBatch%d" % i),
+            creator=alice.address,
+            base_price=sp.tez(1),
+            price_increment=sp.mutez(50_000),
+            step_size=5,
+            max_supply=50,
+            mint_end=None,
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            min_offer_per_unit_mutez=sp.mutez(1000),
+        )
+        for i in range(3)
+    ]
+    c.create_tokens(specs, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.create_tokens(specs + [sp.record(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmBad"),
+        creator=alice.address,
+        base_price=sp.tez(1),
+        price_increment=sp.mutez(50_000),
+        step_size=0,
+        max_supply=50,
+        mint_end=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(1000),
+    )], _sender=admin, _valid=False, _exception="STEP_ZERO")
+    c.create_tokens(specs, _sender=admin)
+    scenario.verify(c.data.next_token_id == 4)
+    scenario.verify(c.data.token_config[3].step_size == 5)
+    scenario.verify(c.data.token_metadata[3].token_id == 3)
+
+    bob = sp.test_account("bob")
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=3, min_bps=0, _sender=alice)
+    c.buy_many(
+        items=[sp.record(owner=alice.address, token_id=0, qty=4)],
+        expected_total=sp.tez(4),
+        _sender=bob,
+        _amount=sp.tez(4),
+        _valid=False,
+        _exception="MAX_QTY",
+    )
+    c.buy_many(
+        items=[sp.record(owner=alice.address, token_id=0, qty=3), sp.record(owner=alice.address, token_id=0, qty=1)],
+        expected_total=sp.tez(4),
+        _sender=bob,
+        _amount=sp.tez(4),
+    )
+    scenario.verify(c.data.ledger[sp.record(owner=bob.address, token_id=0)] == 4)
+    scenario.verify(c.data.claimable[admin.address] == sp.mutez(200_000))
+
+    c.make_offer(token_id=0, qty=2, expiry=sp.timestamp(1000), _sender=alice, _amount=sp.tez(2))
+    c.accept_offers(
+        [sp.record(offer_id=0, accept_qty=1), sp.record(offer_id=0, accept_qty=1)],
+        _sender=bob,
+    )
+    scenario.verify(c.data.ledger[sp.record(owner=bob.address, token_id=0)] == 2)
+    scenario.verify(~c.data.offers.contains(0))
+    scenario.verify(c.data.claimable[admin.address] == sp.mutez(300_000))
+
+
+@sp.add_test()
+def test_curve_pricing():
+    # Closed-form curve_total must charge exactly what the old per-edition loop charged,
+    # across step sizes and for mints that start and end mid-step.
+    scenario = sp.test_scenario("BowersBondingCurveFA2_curve_pricing", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    c = main.BowersBondingCurveFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    base_price = 1_234_567
+    price_increment = 98_765
+    token_id = 0
+    for step_size in [1, 2, 3, 7, 10, 64]:
+        c.create_token(
+            metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmCurve"),
+            creator=alice.address,
+            base_price=sp.mutez(base_price),
+            price_increment=sp.mutez(price_increment),
+            step_size=step_size,
+            max_supply=200,
+            mint_end=None,
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            min_offer_per_unit_mutez=sp.mutez(1000),
+            _sender=admin,
+        )
+        minted = 0
+        for qty in [1, 2, 5, 9, 13, 30, 64]:
+            total = loop_curve_total(minted, qty, base_price, price_increment, step_size)
+            c.mint_editions(
+                token_id=token_id, qty=qty, to_=alice.address,
+                _sender=alice, _amount=sp.mutez(total - 1), _valid=False, _exception="BAD_PAYMENT",
+            )
+            c.mint_editions(token_id=token_id, qty=qty, to_=alice.address, _sender=alice, _amount=sp.mutez(total))
+            minted += qty
+        scenario.verify(c.data.token_state[token_id].minted == minted)
+        token_id += 1
+
+
+@sp.add_test()
+def test_mint_quote():
+    # get_mint_quote charges what mint_editions charges and fails where it fails.
+    scenario = sp.test_scenario("BowersBondingCurveFA2_mint_quote", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersBondingCurveFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmCurve"),
+        creator=alice.address,
+        base_price=sp.mutez(1_000_000),
+        price_increment=sp.mutez(100_000),
+        step_size=3,
+        max_supply=10,
+        mint_end=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(1000),
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=4, to_=bob.address, _sender=bob, _amount=sp.mutez(loop_curve_total(0, 4, 1_000_000, 100_000, 3)))
+    total = loop_curve_total(4, 5, 1_000_000, 100_000, 3)
+    scenario.verify_equal(
+        c.get_mint_quote(sp.record(token_id=0, qty=5, buyer=bob.address)),
+        sp.record(total=sp.mutez(total), allowlist_remaining=None, supply_remaining=sp.Some(6)),
+    )
+    c.mint_editions(token_id=0, qty=5, to_=bob.address, _sender=bob, _amount=sp.mutez(total))
+    scenario.verify(c.data.token_state[0].minted == 9)
+
+
+@sp.add_test()
+def test_base_uri():
+    # With a base URI set, new tokens store only a suffix (or nothing) and their
+    # TZIP-12 metadata is rebuilt by the token_metadata off-chain view.
+    scenario = sp.test_scenario("BowersBondingCurveFA2_base_uri", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    c = main.BowersBondingCurveFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmFull"),
+        creator=alice.address,
+        base_price=sp.tez(1),
+        price_increment=sp.mutez(100_000),
+        step_size=10,
+        max_supply=100,
+        mint_end=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(1000),
+        _sender=admin,
+    )
+
+    base = sp.scenario_utils.bytes_of_string("ipfs://QmBase/")
+    c.set_base_uri(base, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_base_uri(base, _sender=admin)
+    for _ in range(11):
+        c.create_token(
+            metadata_uri=sp.bytes("0x"),
+            creator=alice.address,
+            base_price=sp.tez(1),
+            price_increment=sp.mutez(100_000),
+            step_size=10,
+            max_supply=100,
+            mint_end=None,
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            min_offer_per_unit_mutez=sp.mutez(1000),
+            _sender=admin,
+        )
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("custom.json"),
+        creator=alice.address,
+        base_price=sp.tez(1),
+        price_increment=sp.mutez(100_000),
+        step_size=10,
+        max_supply=100,
+        mint_end=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(1000),
+        _sender=admin,
+    )
+
+    scenario.verify(c.token_metadata(0).token_info[""] == sp.scenario_utils.bytes_of_string("ipfs://QmFull"))
+    scenario.verify(~c.data.token_metadata.contains(1))
+    scenario.verify(~c.data.token_uri_suffix.contains(1))
+    scenario.verify(c.token_metadata(1).token_info[""] == base + sp.scenario_utils.bytes_of_string("1"))
+    scenario.verify(c.token_metadata(11).token_info[""] == base + sp.scenario_utils.bytes_of_string("11"))
+    scenario.verify(c.token_metadata(11).token_info["decimals"] == sp.bytes("0x30"))
+    scenario.verify(c.token_metadata(12).token_info[""] == base + sp.scenario_utils.bytes_of_string("custom.json"))
+
+
+@sp.add_test()
+def test_withdraw_for():
+    # Curve mint and sale proceeds are paid out by anyone; a contract royalty recipient
+    # is skipped and keeps its balance for withdraw.
+    scenario = sp.test_scenario("BowersBondingCurveFA2_withdraw_for", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersBondingCurveFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmCurve"),
+        creator=alice.address,
+        base_price=sp.tez(1),
+        price_increment=sp.mutez(100_000),
+        step_size=10,
+        max_supply=100,
+        mint_end=None,
+        royalty_recipient=c.address,
+        royalty_bps=1000,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, _sender=bob, _amount=sp.tez(1))
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy(owner=bob.address, token_id=0, qty=1, _sender=alice, _amount=sp.tez(1))
+
+    c.withdraw_for([bob.address], _sender=alice, _amount=sp.tez(1), _valid=False, _exception="NO_TEZ")
+    # Both wallets are drained, the duplicate entry is a no-op, and c.address is skipped.
+    c.withdraw_for([bob.address, alice.address, c.address, bob.address], _sender=alice)
+    scenario.verify(~c.data.claimable.contains(bob.address))
+    scenario.verify(~c.data.claimable.contains(alice.address))
+    scenario.verify(c.data.claimable[c.address] == sp.mutez(100000))
+    scenario.verify(c.balance == sp.mutez(100000))
+
+
+@sp.add_test()
+def test_prune_offers():
+    # Anyone deletes bids past their expiry; each bidder's escrow comes back in one claimable credit.
+    scenario = sp.test_scenario("BowersBondingCurveFA2_prune_offers", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersBondingCurveFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmCurve"),
+        creator=alice.address,
+        base_price=sp.tez(1),
+        price_increment=sp.mutez(100_000),
+        step_size=10,
+        max_supply=100,
+        mint_end=None,
+        royalty_recipient=alice.address,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(100), _sender=bob, _amount=sp.tez(1))
+    c.make_offer(token_id=0, qty=2, expiry=sp.timestamp(200), _sender=bob, _amount=sp.tez(2))
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(300), _sender=carol, _amount=sp.tez(1))
+
+    c.prune_offers([0, 1, 2], _sender=alice, _now=sp.timestamp(250))
+    scenario.verify(c.data.claimable[bob.address] == sp.tez(3))
+    scenario.verify(~c.data.claimable.contains(carol.address))
+    scenario.verify(c.data.offers.contains(2))
+    c.prune_offers([2], _sender=alice, _now=sp.timestamp(301))
+    scenario.verify(c.data.claimable[carol.address] == sp.tez(1))
+
+
+@sp.add_test()
+def test_token_proceeds():
+    # Accrued curve revenue follows the step price exactly and is swept per token by its creator.
+    scenario = sp.test_scenario("BowersBondingCurveFA2_token_proceeds", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersBondingCurveFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    for _ in range(2):
+        c.create_token(
+            metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmCurve"),
+            creator=alice.address,
+            base_price=sp.tez(1),
+            price_increment=sp.mutez(100_000),
+            step_size=2,
+            max_supply=100,
+            mint_end=None,
+            royalty_recipient=alice.address,
+            royalty_bps=500,
+            min_offer_per_unit_mutez=sp.mutez(500),
+            _sender=admin,
+        )
+    c.set_accrue_proceeds(True, _sender=bob, _valid=False, _exception="NOT_ADMIN")
+    c.set_accrue_proceeds(True, _sender=admin)
+    # Editions 0-2 of token 0 cost 1 + 1 + 1.1 tez.
+    c.mint_editions(token_id=0, qty=3, to_=bob.address, _sender=bob, _amount=sp.mutez(3_100_000))
+    c.mint_editions(token_id=1, qty=1, to_=bob.address, _sender=bob, _amount=sp.tez(1))
+    scenario.verify(c.data.token_state[0].proceeds == sp.mutez(3_100_000))
+    scenario.verify(~c.data.claimable.contains(alice.address))
+
+    c.withdraw_token_proceeds([0, 1], _sender=alice, _amount=sp.mutez(1), _valid=False, _exception="NO_TEZ")
+    c.withdraw_token_proceeds([0, 1], _sender=alice)
+    scenario.verify(c.data.token_state[1].proceeds == sp.mutez(0))
+    scenario.verify(c.balance == sp.mutez(0))
+
+
+@sp.add_test()
+def test_direct_payout():
+    # Sweeps and batched bid fills pay implicit payees directly once direct payout is on, with
+    # each payee paid once per call; a contract royalty recipient is credited.
+    scenario = sp.test_scenario("BowersBondingCurveFA2_direct_payout", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersBondingCurveFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    for token_id, royalty_recipient in enumerate([alice.address, c.address]):
+        c.create_token(
+            metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmCurve"),
+            creator=alice.address,
+            base_price=sp.tez(1),
+            price_increment=sp.mutez(100_000),
+            step_size=10,
+            max_supply=100,
+            mint_end=None,
+            royalty_recipient=royalty_recipient,
+            royalty_bps=1000,
+            min_offer_per_unit_mutez=sp.mutez(500),
+            _sender=admin,
+        )
+        c.mint_editions(token_id=token_id, qty=2, to_=bob.address, _sender=bob, _amount=sp.tez(2))
+    c.set_direct_payout(True, _sender=admin)
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.set_listing(token_id=1, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+
+    c.buy_many(
+        items=[sp.record(owner=bob.address, token_id=0, qty=1), sp.record(owner=bob.address, token_id=1, qty=1)],
+        expected_total=sp.tez(2),
+        _sender=carol,
+        _amount=sp.tez(2),
+    )
+    scenario.verify(~c.data.claimable.contains(bob.address))
+    scenario.verify(c.data.claimable[alice.address] == sp.tez(4))
+    scenario.verify(c.data.claimable[c.address] == sp.mutez(100000))
+
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(1000), _sender=carol, _amount=sp.tez(1))
+    c.make_offer(token_id=1, qty=1, expiry=sp.timestamp(1000), _sender=carol, _amount=sp.tez(1))
+    c.accept_offers([sp.record(offer_id=0, accept_qty=1), sp.record(offer_id=1, accept_qty=1)], _sender=bob)
+    scenario.verify(~c.data.claimable.contains(bob.address))
+    scenario.verify(c.data.claimable[c.address] == sp.mutez(200000))
+    scenario.verify(c.balance == sp.tez(4) + sp.mutez(200000))
+
+    # A zero royalty gives a contract recipient no claimable entry.
+    vault = sp.address("KT1Tezooo1zzSmartPyzzSTATiCzzzyfC8eF")
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmCurve"),
+        creator=alice.address,
+        base_price=sp.tez(1),
+        price_increment=sp.mutez(100_000),
+        step_size=10,
+        max_supply=100,
+        mint_end=None,
+        royalty_recipient=vault,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.mint_editions(token_id=2, qty=3, to_=bob.address, _sender=bob, _amount=sp.tez(3))
+    c.set_listing(token_id=2, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy(owner=bob.address, token_id=2, qty=1, _sender=carol, _amount=sp.tez(1))
+    c.buy_many(
+        items=[sp.record(owner=bob.address, token_id=2, qty=1)],
+        expected_total=sp.tez(1),
+        _sender=carol,
+        _amount=sp.tez(1),
+    )
+    c.make_offer(token_id=2, qty=1, expiry=sp.timestamp(1000), _sender=carol, _amount=sp.tez(1))
+    c.accept_offer(offer_id=2, accept_qty=1, _sender=bob)
+    scenario.verify(~c.data.claimable.contains(vault))
+    c.make_offer(token_id=2, qty=1, expiry=sp.timestamp(1000), _sender=bob, _amount=sp.tez(1))
+    c.accept_offers([], _sender=carol, _valid=False, _exception="NO_ITEMS")
+    c.accept_offers([sp.record(offer_id=3, accept_qty=1)], _sender=carol)
+    scenario.verify(~c.data.claimable.contains(vault))
+
+
+@sp.add_test()
+def test_batch_views():
+    # Curve token configs, listings, balances and claimables in one call per view; missing
+    # entries are None or zero.
+    scenario = sp.test_scenario("BowersBondingCurveFA2_batch_views", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersBondingCurveFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmCurve"),
+        creator=alice.address,
+        base_price=sp.tez(1),
+        price_increment=sp.mutez(100_000),
+        step_size=10,
+        max_supply=100,
+        mint_end=None,
+        royalty_recipient=alice.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, _sender=bob, _amount=sp.tez(2))
+    c.set_listing(token_id=0, price=sp.mutez(1_500_000), max_qty=0, min_bps=0, _sender=bob)
+
+    bob_0 = sp.record(owner=bob.address, token_id=0)
+    scenario.verify_equal(c.get_balances([bob_0, sp.record(owner=bob.address, token_id=3)]), [2, 0])
+    scenario.verify_equal(c.get_claimables([alice.address]), [sp.tez(2)])
+    scenario.verify_equal(c.get_listings([bob_0, sp.record(owner=alice.address, token_id=0)]), [sp.Some(sp.record(price=sp.mutez(1_500_000), max_qty=0, min_bps=0)), None])
+    scenario.verify_equal(c.get_token_configs([0, 1]), [sp.Some(c.get_token_config(0)), None])
+
+
+@sp.add_test()
+def test_supply_counters():
+    # Supply follows the editions minted on the curve; holders change as editions are resold.
+    scenario = sp.test_scenario("BowersBondingCurveFA2_supply_counters", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersBondingCurveFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmCurve"),
+        creator=alice.address,
+        base_price=sp.tez(1),
+        price_increment=sp.mutez(100_000),
+        step_size=10,
+        max_supply=100,
+        mint_end=None,
+        royalty_recipient=alice.address,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, _sender=bob, _amount=sp.tez(2))
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, _sender=alice, _amount=sp.tez(1))
+    scenario.verify_equal(c.get_token_supplies([0]), [sp.record(total_supply=3, holders=1)])
+    scenario.verify(c.data.token_state[0].minted == c.total_supply(0))
+
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(1000), _sender=alice, _amount=sp.tez(1))
+    c.accept_offer(offer_id=0, accept_qty=1, _sender=bob)
+    scenario.verify(c.data.token_supply[0].holders == 2)
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy(owner=bob.address, token_id=0, qty=2, _sender=alice, _amount=sp.tez(2))
+    scenario.verify_equal(c.get_token_supplies([0]), [sp.record(total_supply=3, holders=1)])
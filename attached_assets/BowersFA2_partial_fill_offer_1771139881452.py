@@ -14,11 +14,17 @@ def main():
     BalanceOfRequestType: type = sp.record(owner=sp.address, token_id=sp.nat)
     BalanceOfResponseType: type = sp.record(request=BalanceOfRequestType, balance=sp.nat)
     LedgerKeyType: type = sp.record(owner=sp.address, token_id=sp.nat)
+    SupplyType: type = sp.record(total_supply=sp.nat, holders=sp.nat)
     OperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address, token_id=sp.nat)
     BlacklistKeyType: type = sp.record(owner=sp.address, token_id=sp.nat, blocked=sp.address)
     OperatorParamType: type = sp.variant(add_operator=OperatorKeyType, remove_operator=OperatorKeyType)
+    AllOperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address)
+    AllOperatorParamType: type = sp.variant(add_operator=AllOperatorKeyType, remove_operator=AllOperatorKeyType)
     TransferTxType: type = sp.record(to_=sp.address, token_id=sp.nat, amount=sp.nat)
     TransferBatchItemType: type = sp.record(from_=sp.address, txs=sp.list[TransferTxType])
+    BuyItemType: type = sp.record(owner=sp.address, token_id=sp.nat, qty=sp.nat)
+    RoyaltyType: type = sp.record(royalty_recipient=sp.address, royalty_bps=sp.nat)
+    AcceptItemType: type = sp.record(offer_id=sp.nat, accept_qty=sp.nat)
 
     TokenMarketType: type = sp.record(
         royalty_recipient=sp.address,
@@ -33,13 +39,22 @@ def main():
         def __init__(self, admin, metadata):
             self.data.admin = admin
             self.data.ledger = sp.cast(sp.big_map(), sp.big_map[LedgerKeyType, sp.nat])
+            self.data.token_supply = sp.cast(sp.big_map(), sp.big_map[sp.nat, SupplyType])
             self.data.token_metadata = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes])])
+            # Optional shared base URI: when set, tokens store only a URI suffix (or nothing) and
+            # TZIP-12 metadata is served by the token_metadata off-chain view.
+            self.data.base_uri = sp.bytes("0x")
+            self.data.token_uri_suffix = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.bytes])
             self.data.operators = sp.cast(sp.big_map(), sp.big_map[OperatorKeyType, sp.unit])
+            self.data.all_operators = sp.cast(sp.big_map(), sp.big_map[AllOperatorKeyType, sp.unit])
             self.data.next_token_id = sp.nat(0)
             self.data.listings = sp.cast(sp.big_map(), sp.big_map[LedgerKeyType, ListingType])
             self.data.offers = sp.cast(sp.big_map(), sp.big_map[sp.nat, OfferType])
             self.data.next_offer_id = sp.nat(0)
             self.data.claimable = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.mutez])
+            # Off by default. With it on, buy and accept_offer send sale proceeds and royalties
+            # straight to implicit accounts; contract payees are still credited to claimable.
+            self.data.direct_payout = False
             self.data.blacklist = sp.cast(sp.big_map(), sp.big_map[BlacklistKeyType, sp.unit])
             self.data.contract_blocklist = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.unit])
             self.data.token_market = sp.cast(sp.big_map(), sp.big_map[sp.nat, TokenMarketType])
@@ -71,36 +86,106 @@ def main():
                         assert op in self.data.operators, "NO_OP"
                         del self.data.operators[op]
 
+        @sp.entrypoint
+        def update_all_operators(self, actions):
+            # Owner-level operators: one entry approves the operator for all of the owner's tokens.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(actions, sp.list[AllOperatorParamType])
+            for action in actions:
+                match action:
+                    case add_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        self.data.all_operators[op] = ()
+                    case remove_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        assert op in self.data.all_operators, "NO_OP"
+                        del self.data.all_operators[op]
+
         @sp.entrypoint
         def transfer(self, batch):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(batch, sp.list[TransferBatchItemType])
+            # Balances touched by the batch are read from the ledger once and written back once at
+            # the end; addresses cleared against contract_blocklist are not looked up again.
+            balances = sp.cast({}, sp.map[LedgerKeyType, sp.nat])
+            # Recipient keys with no ledger entry when the batch first reads them. They become new
+            # holders only if still non-zero at write-back; an emptied key that was not fresh drops one.
+            fresh = sp.cast(set(), sp.set[LedgerKeyType])
+            cleared = sp.cast(set(), sp.set[sp.address])
             for item in batch:
                 from_ = item.from_
-                for tx in item.txs:
+                if not (from_ in cleared):
                     assert not (from_ in self.data.contract_blocklist), "BLOCKED"
-                    assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
-                    if from_ != sp.sender:
-                        assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                    cleared.add(from_)
+                # Checked once per batch item; per-token entries are only read without an owner-level
+                # operator, once per token.
+                all_tokens = from_ == sp.sender
+                if not all_tokens:
+                    all_tokens = sp.record(owner=from_, operator=sp.sender) in self.data.all_operators
+                approved = sp.cast(set(), sp.set[sp.nat])
+                for tx in item.txs:
+                    if not (tx.to_ in cleared):
+                        assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
+                        cleared.add(tx.to_)
+                    if not all_tokens:
+                        if not (tx.token_id in approved):
+                            assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                            approved.add(tx.token_id)
                     assert tx.amount > 0, "BAD_AMOUNT"
                     fk = sp.record(owner=from_, token_id=tx.token_id)
-                    fb = self.data.ledger.get(fk, default=sp.nat(0))
+                    fb = balances.get(fk, default=sp.nat(0))
+                    if not (fk in balances):
+                        fb = self.data.ledger.get(fk, default=sp.nat(0))
                     assert fb >= tx.amount, "LOW_BAL"
                     nfb = sp.as_nat(fb - tx.amount)
+                    balances[fk] = nfb
                     if nfb == 0:
-                        if fk in self.data.ledger:
-                            del self.data.ledger[fk]
                         if fk in self.data.listings:
                             del self.data.listings[fk]
-                    else:
-                        self.data.ledger[fk] = nfb
                     tk = sp.record(owner=tx.to_, token_id=tx.token_id)
-                    tb = self.data.ledger.get(tk, default=sp.nat(0))
-                    self.data.ledger[tk] = tb + tx.amount
-                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, a=tx.amount), tag="xfer")
+                    tb = balances.get(tk, default=sp.nat(0))
+                    if not (tk in balances):
+                        tb = self.data.ledger.get(tk, default=sp.nat(0))
+                        if tb == 0:
+                            fresh.add(tk)
+                    balances[tk] = tb + tx.amount
+                    # Activity events (xfer, mint, buy, accept, list, offer, close) share one set of short keys;
+                    # event-schemas.json maps each to its field name.
+                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, q=tx.amount), tag="xfer")
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            for entry in balances.items():
+                tid = entry.key.token_id
+                if entry.value == 0:
+                    del self.data.ledger[entry.key]
+                    if not (entry.key in fresh):
+                        holders[tid] = holders.get(tid, default=0) - 1
+                else:
+                    self.data.ledger[entry.key] = entry.value
+                    if entry.key in fresh:
+                        holders[tid] = holders.get(tid, default=0) + 1
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
 
         # ---- Minting ----
 
+        @sp.entrypoint
+        def set_base_uri(self, base_uri):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(base_uri, sp.bytes)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.base_uri = base_uri
+            sp.emit(base_uri, tag="base_uri")
+
+        @sp.entrypoint
+        def set_direct_payout(self, direct):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(direct, sp.bool)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.direct_payout = direct
+            sp.emit(direct, tag="direct_payout")
+
         @sp.entrypoint
         def mint(self, params):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
@@ -121,19 +206,27 @@ def main():
             tid = self.data.next_token_id
             self.data.next_token_id += 1
 
-            token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
-            self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            if self.data.base_uri == sp.bytes("0x"):
+                token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
+                self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            else:
+                if params.metadata_uri != sp.bytes("0x"):
+                    self.data.token_uri_suffix[tid] = params.metadata_uri
 
-            self.data.token_market[tid] = sp.record(
+            cfg = sp.record(
                 royalty_recipient=params.royalty_recipient,
                 royalty_bps=params.royalty_bps,
                 min_offer_per_unit_mutez=params.min_offer_per_unit_mutez,
             )
+            self.data.token_market[tid] = cfg
+            # The family's token config event; admin-minted tokens have no mint window.
+            sp.emit(sp.record(token_id=tid, config=cfg, mint_end=sp.cast(None, sp.option[sp.timestamp])), tag="token_created")
 
             lk = sp.record(owner=self.data.admin, token_id=tid)
             cb = self.data.ledger.get(lk, default=sp.nat(0))
             self.data.ledger[lk] = cb + params.supply
-            sp.emit(sp.record(i=tid, t=self.data.admin, s=params.supply), tag="mint")
+            self.data.token_supply[tid] = sp.record(total_supply=params.supply, holders=sp.nat(1))
+            sp.emit(sp.record(i=tid, t=self.data.admin, q=params.supply, p=sp.mutez(0), a=sp.mutez(0), c=self.data.admin), tag="mint")
 
         # ---- Listings (set price=0 to clear) ----
 
@@ -149,6 +242,8 @@ def main():
             else:
                 assert params.min_bps <= 10_000, "BPS_TOO_HIGH"
                 self.data.listings[pk] = sp.record(price=params.price, max_qty=params.max_qty, min_bps=params.min_bps)
+            # A zero price is a delisting.
+            sp.emit(sp.record(o=sp.sender, i=params.token_id, u=params.price, m=params.max_qty, n=params.min_bps), tag="list")
 
         # ---- Instant buy ----
 
@@ -171,8 +266,21 @@ def main():
             rr = tm.royalty_recipient
             ry = sp.split_tokens(tp, tm.royalty_bps, 10_000)
             po = tp - ry
-            self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
-            self.data.claimable[params.owner] = self.data.claimable.get(params.owner, default=sp.mutez(0)) + po
+            if self.data.direct_payout:
+                # Pay implicit accounts now; a contract payee may reject tez, so it is credited.
+                payouts = sp.cast({}, sp.map[sp.address, sp.mutez])
+                if ry > sp.mutez(0):
+                    payouts[rr] = ry
+                payouts[params.owner] = payouts.get(params.owner, default=sp.mutez(0)) + po
+                for payout in payouts.items():
+                    if payout.value > sp.mutez(0):
+                        if sp.is_implicit_account(payout.key).is_some():
+                            sp.send(payout.key, payout.value)
+                        else:
+                            self.data.claimable[payout.key] = self.data.claimable.get(payout.key, default=sp.mutez(0)) + payout.value
+            else:
+                self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
+                self.data.claimable[params.owner] = self.data.claimable.get(params.owner, default=sp.mutez(0)) + po
             nfb = sp.as_nat(fb - params.qty)
             if nfb == 0:
                 if pk in self.data.ledger:
@@ -184,7 +292,75 @@ def main():
             tk = sp.record(owner=sp.sender, token_id=params.token_id)
             tb = self.data.ledger.get(tk, default=sp.nat(0))
             self.data.ledger[tk] = tb + params.qty
-            sp.emit(sp.record(b=sp.sender, o=params.owner, i=params.token_id, q=params.qty), tag="buy")
+            if (nfb == 0) != (tb == 0):
+                sup = self.data.token_supply[params.token_id]
+                if tb == 0:
+                    sup.holders += 1
+                else:
+                    sup.holders = sp.as_nat(sup.holders - 1)
+                self.data.token_supply[params.token_id] = sup
+            # u: unit price, p: total paid, r / y: royalty recipient / amount (also on "accept").
+            sp.emit(sp.record(b=sp.sender, o=params.owner, i=params.token_id, q=params.qty, u=lst.price, p=tp, r=rr, y=ry), tag="buy")
+
+        @sp.entrypoint
+        def buy_many(self, params):
+            # Floor sweep across admin-minted tokens: every (owner, token_id, qty) fills or the call
+            # fails. token_market is read once per token, claimable once per payee.
+            sp.cast(params, sp.record(items=sp.list[BuyItemType], expected_total=sp.mutez))
+            assert not (sp.sender in self.data.contract_blocklist), "BLOCKED"
+            assert sp.amount == params.expected_total, "WRONG_PRICE"
+            royalties = sp.cast({}, sp.map[sp.nat, RoyaltyType])
+            credits = sp.cast({}, sp.map[sp.address, sp.mutez])
+            bought = sp.cast({}, sp.map[sp.nat, sp.nat])
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            total = sp.mutez(0)
+            for item in params.items:
+                assert item.qty > 0, "BAD_QTY"
+                assert not (sp.record(owner=item.owner, token_id=item.token_id, blocked=sp.sender) in self.data.blacklist), "BLACKLISTED"
+                pk = sp.record(owner=item.owner, token_id=item.token_id)
+                assert pk in self.data.listings, "NOT_FOR_SALE"
+                lst = self.data.listings[pk]
+                if lst.max_qty > 0:
+                    assert item.qty <= lst.max_qty, "MAX_QTY"
+                fb = self.data.ledger.get(pk, default=sp.nat(0))
+                assert fb >= item.qty, "NO_BAL"
+                tp = sp.split_tokens(lst.price, item.qty, 1)
+                if not (item.token_id in royalties):
+                    rc = self.data.token_market[item.token_id]
+                    royalties[item.token_id] = sp.record(royalty_recipient=rc.royalty_recipient, royalty_bps=rc.royalty_bps)
+                roy = royalties[item.token_id]
+                ry = sp.split_tokens(tp, roy.royalty_bps, 10_000)
+                credits[roy.royalty_recipient] = credits.get(roy.royalty_recipient, default=sp.mutez(0)) + ry
+                credits[item.owner] = credits.get(item.owner, default=sp.mutez(0)) + (tp - ry)
+                total += tp
+                nfb = sp.as_nat(fb - item.qty)
+                if nfb == 0:
+                    holders[item.token_id] = holders.get(item.token_id, default=0) - 1
+                    if pk in self.data.ledger:
+                        del self.data.ledger[pk]
+                    if pk in self.data.listings:
+                        del self.data.listings[pk]
+                else:
+                    self.data.ledger[pk] = nfb
+                bought[item.token_id] = bought.get(item.token_id, default=sp.nat(0)) + item.qty
+                sp.emit(sp.record(b=sp.sender, o=item.owner, i=item.token_id, q=item.qty, u=lst.price, p=tp, r=roy.royalty_recipient, y=ry), tag="buy")
+            assert total == params.expected_total, "WRONG_PRICE"
+            for credit in credits.items():
+                if credit.value > sp.mutez(0):
+                    if self.data.direct_payout and sp.is_implicit_account(credit.key).is_some():
+                        sp.send(credit.key, credit.value)
+                    else:
+                        self.data.claimable[credit.key] = self.data.claimable.get(credit.key, default=sp.mutez(0)) + credit.value
+            for b in bought.items():
+                tk = sp.record(owner=sp.sender, token_id=b.key)
+                tb = self.data.ledger.get(tk, default=sp.nat(0))
+                if tb == 0:
+                    holders[b.key] = holders.get(b.key, default=0) + 1
+                self.data.ledger[tk] = tb + b.value
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
 
         # ---- Offers (partial fill) ----
 
@@ -204,26 +380,45 @@ def main():
             self.data.offers[oid] = sp.record(
                 token_id=params.token_id, buyer=sp.sender, unit_price=up,
                 remaining_qty=params.qty, expiry=params.expiry)
+            sp.emit(sp.record(id=oid, b=sp.sender, i=params.token_id, u=up, q=params.qty, e=params.expiry), tag="offer")
 
         @sp.entrypoint
         def close_offer(self, offer_id):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(offer_id, sp.nat)
-            o = self.data.offers[offer_id]
-            assert o.remaining_qty > 0, "NOT_ACTIVE"
+            o = self.data.offers.get(offer_id, error="NOT_ACTIVE")
             if o.buyer != sp.sender:
                 assert sp.now > o.expiry, "NO_AUTH"
             refund = sp.split_tokens(o.unit_price, o.remaining_qty, 1)
             self.data.claimable[o.buyer] = self.data.claimable.get(o.buyer, default=sp.mutez(0)) + refund
-            o.remaining_qty = sp.nat(0)
-            self.data.offers[offer_id] = o
+            del self.data.offers[offer_id]
+            sp.emit(sp.record(id=offer_id, b=o.buyer, p=refund), tag="close")
+
+        @sp.entrypoint
+        def prune_offers(self, offer_ids):
+            # Anyone can clear bids that expired unfilled: the offer is deleted and its escrow is
+            # credited back to the bidder. Ids already gone or still live are skipped, so a list
+            # built from a stale index does not fail the call.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(offer_ids, sp.list[sp.nat])
+            refunds = sp.cast({}, sp.map[sp.address, sp.mutez])
+            for oid in offer_ids:
+                if oid in self.data.offers:
+                    o = self.data.offers[oid]
+                    if o.remaining_qty == 0 or sp.now > o.expiry:
+                        refund = sp.split_tokens(o.unit_price, o.remaining_qty, 1)
+                        refunds[o.buyer] = refunds.get(o.buyer, default=sp.mutez(0)) + refund
+                        del self.data.offers[oid]
+                        sp.emit(sp.record(id=oid, b=o.buyer, p=refund), tag="close")
+            for r in refunds.items():
+                if r.value > sp.mutez(0):
+                    self.data.claimable[r.key] = self.data.claimable.get(r.key, default=sp.mutez(0)) + r.value
 
         @sp.entrypoint
         def accept_offer(self, params):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(params, sp.record(offer_id=sp.nat, accept_qty=sp.nat))
-            o = self.data.offers[params.offer_id]
-            assert o.remaining_qty > 0, "NOT_ACTIVE"
+            o = self.data.offers.get(params.offer_id, error="NOT_ACTIVE")
             assert sp.now <= o.expiry, "OFFER_EXPIRED"
             assert params.accept_qty > 0, "BAD_ACCEPT_QTY"
             assert params.accept_qty <= o.remaining_qty, "OVER_QTY"
@@ -245,8 +440,22 @@ def main():
             rr = tm.royalty_recipient
             ry = sp.split_tokens(pt, tm.royalty_bps, 10_000)
             po = pt - ry
-            self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
-            self.data.claimable[sp.sender] = self.data.claimable.get(sp.sender, default=sp.mutez(0)) + po
+            if self.data.direct_payout:
+                # The bidder's escrow goes straight to an implicit seller and royalty recipient;
+                # contracts are credited.
+                payouts = sp.cast({}, sp.map[sp.address, sp.mutez])
+                if ry > sp.mutez(0):
+                    payouts[rr] = ry
+                payouts[sp.sender] = payouts.get(sp.sender, default=sp.mutez(0)) + po
+                for payout in payouts.items():
+                    if payout.value > sp.mutez(0):
+                        if sp.is_implicit_account(payout.key).is_some():
+                            sp.send(payout.key, payout.value)
+                        else:
+                            self.data.claimable[payout.key] = self.data.claimable.get(payout.key, default=sp.mutez(0)) + payout.value
+            else:
+                self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
+                self.data.claimable[sp.sender] = self.data.claimable.get(sp.sender, default=sp.mutez(0)) + po
             nfb = sp.as_nat(fb - params.accept_qty)
             if nfb == 0:
                 if fk in self.data.ledger:
@@ -258,9 +467,95 @@ def main():
             tk = sp.record(owner=o.buyer, token_id=tid)
             tb = self.data.ledger.get(tk, default=sp.nat(0))
             self.data.ledger[tk] = tb + params.accept_qty
+            if (nfb == 0) != (tb == 0):
+                sup = self.data.token_supply[tid]
+                if tb == 0:
+                    sup.holders += 1
+                else:
+                    sup.holders = sp.as_nat(sup.holders - 1)
+                self.data.token_supply[tid] = sup
             o.remaining_qty = sp.as_nat(o.remaining_qty - params.accept_qty)
-            self.data.offers[params.offer_id] = o
-            sp.emit(sp.record(id=params.offer_id, o=sp.sender, q=params.accept_qty), tag="accept")
+            if o.remaining_qty == 0:
+                del self.data.offers[params.offer_id]
+            else:
+                self.data.offers[params.offer_id] = o
+            sp.emit(sp.record(id=params.offer_id, o=sp.sender, q=params.accept_qty, b=o.buyer, i=tid, u=o.unit_price, p=pt, r=rr, y=ry), tag="accept")
+
+        @sp.entrypoint
+        def accept_offers(self, items):
+            # A holder fills several bids, partially or fully, in one call. Quantities are summed per
+            # token before the balance check, so bids for one token can share a balance.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(items, sp.list[AcceptItemType])
+            assert sp.len(items) > 0, "NO_ITEMS"
+            royalties = sp.cast({}, sp.map[sp.nat, RoyaltyType])
+            credits = sp.cast({}, sp.map[sp.address, sp.mutez])
+            sold = sp.cast({}, sp.map[sp.nat, sp.nat])
+            deliveries = sp.cast({}, sp.map[LedgerKeyType, sp.nat])
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            proceeds = sp.mutez(0)
+            for item in items:
+                o = self.data.offers.get(item.offer_id, error="NOT_ACTIVE")
+                assert sp.now <= o.expiry, "OFFER_EXPIRED"
+                assert item.accept_qty > 0, "BAD_ACCEPT_QTY"
+                assert item.accept_qty <= o.remaining_qty, "OVER_QTY"
+                tid = o.token_id
+                assert not (o.buyer in self.data.contract_blocklist), "BLOCKED"
+                assert not (sp.record(owner=sp.sender, token_id=tid, blocked=o.buyer) in self.data.blacklist), "BLACKLISTED"
+                pt = sp.split_tokens(o.unit_price, item.accept_qty, 1)
+                assert pt > sp.mutez(0), "PAY_ZERO"
+                fk = sp.record(owner=sp.sender, token_id=tid)
+                if fk in self.data.listings:
+                    lst = self.data.listings[fk]
+                    if lst.min_bps > 0:
+                        lt = sp.split_tokens(lst.price, item.accept_qty, 1)
+                        ft = sp.split_tokens(lt, lst.min_bps, 10_000)
+                        assert pt >= ft, "LOW_BID"
+                if not (tid in royalties):
+                    rc = self.data.token_market[tid]
+                    royalties[tid] = sp.record(royalty_recipient=rc.royalty_recipient, royalty_bps=rc.royalty_bps)
+                roy = royalties[tid]
+                ry = sp.split_tokens(pt, roy.royalty_bps, 10_000)
+                credits[roy.royalty_recipient] = credits.get(roy.royalty_recipient, default=sp.mutez(0)) + ry
+                proceeds += pt - ry
+                sold[tid] = sold.get(tid, default=sp.nat(0)) + item.accept_qty
+                tk = sp.record(owner=o.buyer, token_id=tid)
+                deliveries[tk] = deliveries.get(tk, default=sp.nat(0)) + item.accept_qty
+                o.remaining_qty = sp.as_nat(o.remaining_qty - item.accept_qty)
+                if o.remaining_qty == 0:
+                    del self.data.offers[item.offer_id]
+                else:
+                    self.data.offers[item.offer_id] = o
+                sp.emit(sp.record(id=item.offer_id, o=sp.sender, q=item.accept_qty, b=o.buyer, i=tid, u=o.unit_price, p=pt, r=roy.royalty_recipient, y=ry), tag="accept")
+            credits[sp.sender] = credits.get(sp.sender, default=sp.mutez(0)) + proceeds
+            for s in sold.items():
+                fk = sp.record(owner=sp.sender, token_id=s.key)
+                fb = self.data.ledger.get(fk, default=sp.nat(0))
+                assert fb >= s.value, "LOW_BAL"
+                nfb = sp.as_nat(fb - s.value)
+                if nfb == 0:
+                    holders[s.key] = holders.get(s.key, default=0) - 1
+                    if fk in self.data.ledger:
+                        del self.data.ledger[fk]
+                    if fk in self.data.listings:
+                        del self.data.listings[fk]
+                else:
+                    self.data.ledger[fk] = nfb
+            for d in deliveries.items():
+                db = self.data.ledger.get(d.key, default=sp.nat(0))
+                if db == 0:
+                    holders[d.key.token_id] = holders.get(d.key.token_id, default=0) + 1
+                self.data.ledger[d.key] = db + d.value
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
+            for credit in credits.items():
+                if credit.value > sp.mutez(0):
+                    if self.data.direct_payout and sp.is_implicit_account(credit.key).is_some():
+                        sp.send(credit.key, credit.value)
+                    else:
+                        self.data.claimable[credit.key] = self.data.claimable.get(credit.key, default=sp.mutez(0)) + credit.value
 
         # ---- Contract blocklist (admin) ----
 
@@ -270,6 +565,7 @@ def main():
             sp.cast(address, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.contract_blocklist[address] = ()
+            sp.emit(sp.record(address=address, blocked=True), tag="blocklist")
 
         @sp.entrypoint
         def unblock_address(self, address):
@@ -278,6 +574,7 @@ def main():
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             if address in self.data.contract_blocklist:
                 del self.data.contract_blocklist[address]
+            sp.emit(sp.record(address=address, blocked=False), tag="blocklist")
 
         # ---- Blacklist (per-token, owner) ----
 
@@ -287,6 +584,7 @@ def main():
             sp.cast(params, sp.record(token_id=sp.nat, blocked=sp.address))
             assert self.data.ledger.get(sp.record(owner=sp.sender, token_id=params.token_id), default=sp.nat(0)) > 0, "NOT_OWNER"
             self.data.blacklist[sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked)] = ()
+            sp.emit(sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked, active=True), tag="blacklist")
 
         @sp.entrypoint
         def unblacklist_address(self, params):
@@ -296,6 +594,7 @@ def main():
             key = sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked)
             if key in self.data.blacklist:
                 del self.data.blacklist[key]
+            sp.emit(sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked, active=False), tag="blacklist")
 
         # ---- Withdraw ----
 
@@ -304,16 +603,77 @@ def main():
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             amount = self.data.claimable.get(sp.sender, default=sp.mutez(0))
             assert amount > sp.mutez(0), "NO_FUNDS"
-            self.data.claimable[sp.sender] = sp.mutez(0)
+            del self.data.claimable[sp.sender]
             sp.send(sp.sender, amount)
 
+        @sp.entrypoint
+        def withdraw_for(self, recipients):
+            # Lets anyone pay out sale proceeds, royalties and offer refunds owed to a list of
+            # wallets. Only implicit accounts are paid: a contract could fail on receipt and revert
+            # the whole batch, so contracts are skipped and collect with withdraw themselves.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(recipients, sp.list[sp.address])
+            for recipient in recipients:
+                if sp.is_implicit_account(recipient).is_some():
+                    if recipient in self.data.claimable:
+                        amount = self.data.claimable[recipient]
+                        del self.data.claimable[recipient]
+                        if amount > sp.mutez(0):
+                            sp.send(recipient, amount)
+
         # ---- On-chain views ----
 
+        @sp.offchain_view
+        def token_metadata(self, token_id):
+            """TZIP-12 token metadata: the stored token_info, else base_uri + suffix (default: the decimal token id)."""
+            sp.cast(token_id, sp.nat)
+            if token_id in self.data.token_metadata:
+                return self.data.token_metadata[token_id]
+            else:
+                assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+                suffix = self.data.token_uri_suffix.get(token_id, default=sp.bytes("0x"))
+                if suffix == sp.bytes("0x"):
+                    digits = sp.bytes("0x30313233343536373839")
+                    qr = sp.ediv(token_id, 10).unwrap_some()
+                    suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some()
+                    n = sp.fst(qr)
+                    while n > 0:
+                        qr = sp.ediv(n, 10).unwrap_some()
+                        suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some() + suffix
+                        n = sp.fst(qr)
+                return sp.record(
+                    token_id=token_id,
+                    token_info={"": self.data.base_uri + suffix, "decimals": sp.bytes("0x30")},
+                )
+
         @sp.onchain_view
         def get_balance(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat))
             return self.data.ledger.get(sp.record(owner=params.owner, token_id=params.token_id), default=sp.nat(0))
 
+        @sp.onchain_view
+        def get_balances(self, requests):
+            sp.cast(requests, sp.list[LedgerKeyType])
+            balances = []
+            for req in requests:
+                balances.push(self.data.ledger.get(req, default=sp.nat(0)))
+            return reversed(balances)
+
+        @sp.onchain_view
+        def total_supply(self, token_id):
+            sp.cast(token_id, sp.nat)
+            assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+            return self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))).total_supply
+
+        @sp.onchain_view
+        def get_token_supplies(self, token_ids):
+            # Supply and holder count for each requested token, kept current by mint, transfer and sales.
+            sp.cast(token_ids, sp.list[sp.nat])
+            supplies = []
+            for token_id in token_ids:
+                supplies.push(self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))))
+            return reversed(supplies)
+
         @sp.onchain_view
         def get_offer(self, offer_id):
             sp.cast(offer_id, sp.nat)
@@ -322,18 +682,37 @@ def main():
         @sp.onchain_view
         def is_operator(self, params):
             sp.cast(params, sp.record(owner=sp.address, operator=sp.address, token_id=sp.nat))
-            return sp.record(owner=params.owner, operator=params.operator, token_id=params.token_id) in self.data.operators
+            return (sp.record(owner=params.owner, operator=params.operator) in self.data.all_operators) or (
+                sp.record(owner=params.owner, operator=params.operator, token_id=params.token_id) in self.data.operators
+            )
 
         @sp.onchain_view
         def get_listing(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat))
             return self.data.listings[sp.record(owner=params.owner, token_id=params.token_id)]
 
+        @sp.onchain_view
+        def get_listings(self, keys):
+            # One entry per key, in request order; a key with no listing is None where get_listing fails.
+            sp.cast(keys, sp.list[LedgerKeyType])
+            listings = []
+            for key in keys:
+                listings.push(self.data.listings.get_opt(key))
+            return reversed(listings)
+
         @sp.onchain_view
         def get_claimable(self, addr):
             sp.cast(addr, sp.address)
             return self.data.claimable.get(addr, default=sp.mutez(0))
 
+        @sp.onchain_view
+        def get_claimables(self, addrs):
+            sp.cast(addrs, sp.list[sp.address])
+            amounts = []
+            for addr in addrs:
+                amounts.push(self.data.claimable.get(addr, default=sp.mutez(0)))
+            return reversed(amounts)
+
         @sp.onchain_view
         def is_blacklisted(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat, blocked=sp.address))
@@ -344,6 +723,14 @@ def main():
             sp.cast(token_id, sp.nat)
             return self.data.token_market[token_id]
 
+        @sp.onchain_view
+        def get_token_markets(self, token_ids):
+            sp.cast(token_ids, sp.list[sp.nat])
+            markets = []
+            for token_id in token_ids:
+                markets.push(self.data.token_market.get_opt(token_id))
+            return reversed(markets)
+
 
 @sp.add_test()
 def test():
@@ -354,3 +741,348 @@ def test():
         metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
     )
     scenario += c
+
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    for supply in [10, 5]:
+        c.mint(
+            metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmToken"),
+            supply=supply,
+            royalty_recipient=carol.address,
+            royalty_bps=1000,
+            min_offer_per_unit_mutez=sp.mutez(1000),
+            _sender=admin,
+        )
+    c.transfer(
+        [sp.record(from_=admin.address, txs=[sp.record(to_=bob.address, token_id=0, amount=4)])],
+        _sender=admin,
+    )
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=admin)
+    c.set_listing(token_id=1, price=sp.tez(3), max_qty=2, min_bps=0, _sender=admin)
+    c.set_listing(token_id=0, price=sp.mutez(1_500_000), max_qty=0, min_bps=0, _sender=bob)
+
+    # Floor sweep: three listings, one payment, atomic.
+    sweep = [
+        sp.record(owner=admin.address, token_id=0, qty=3),
+        sp.record(owner=bob.address, token_id=0, qty=2),
+        sp.record(owner=admin.address, token_id=1, qty=2),
+    ]
+    c.buy_many(items=sweep, expected_total=sp.tez(11), _sender=alice, _amount=sp.tez(11), _valid=False, _exception="WRONG_PRICE")
+    c.buy_many(
+        items=sweep + [sp.record(owner=bob.address, token_id=1, qty=1)],
+        expected_total=sp.tez(15),
+        _sender=alice,
+        _amount=sp.tez(15),
+        _valid=False,
+        _exception="NOT_FOR_SALE",
+    )
+    c.buy_many(items=sweep, expected_total=sp.tez(12), _sender=alice, _amount=sp.tez(12))
+    scenario.verify(c.data.ledger[sp.record(owner=alice.address, token_id=0)] == 5)
+    scenario.verify(c.data.ledger[sp.record(owner=alice.address, token_id=1)] == 2)
+    scenario.verify(c.data.ledger[sp.record(owner=bob.address, token_id=0)] == 2)
+    scenario.verify(c.data.claimable[carol.address] == sp.mutez(1_200_000))
+    scenario.verify(c.data.claimable[admin.address] == sp.mutez(8_100_000))
+    scenario.verify(c.data.claimable[bob.address] == sp.mutez(2_700_000))
+
+    # Alice (5x token 0, 2x token 1) fills bids across both tokens at once.
+    c.make_offer(token_id=0, qty=3, expiry=sp.timestamp(1000), _sender=bob, _amount=sp.tez(3))
+    c.make_offer(token_id=1, qty=1, expiry=sp.timestamp(1000), _sender=carol, _amount=sp.tez(2))
+    c.make_offer(token_id=0, qty=3, expiry=sp.timestamp(1000), _sender=admin, _amount=sp.tez(3))
+    c.accept_offers(
+        [sp.record(offer_id=0, accept_qty=3), sp.record(offer_id=2, accept_qty=3)],
+        _sender=alice,
+        _valid=False,
+        _exception="LOW_BAL",
+    )
+    c.accept_offers(
+        [sp.record(offer_id=0, accept_qty=3), sp.record(offer_id=1, accept_qty=1)],
+        _sender=alice,
+    )
+    scenario.verify(c.data.ledger[sp.record(owner=alice.address, token_id=0)] == 2)
+    scenario.verify(c.data.ledger[sp.record(owner=alice.address, token_id=1)] == 1)
+    scenario.verify(c.data.ledger[sp.record(owner=bob.address, token_id=0)] == 5)
+    scenario.verify(c.data.ledger[sp.record(owner=carol.address, token_id=1)] == 1)
+    scenario.verify(c.data.claimable[alice.address] == sp.mutez(4_500_000))
+    scenario.verify(c.data.claimable[carol.address] == sp.mutez(1_700_000))
+    scenario.verify(~c.data.offers.contains(0))
+
+    c.close_offer(2, _sender=admin)
+    scenario.verify(~c.data.offers.contains(2))
+    scenario.verify(c.data.claimable[admin.address] == sp.mutez(11_100_000))
+    c.close_offer(2, _sender=admin, _valid=False, _exception="NOT_ACTIVE")
+
+
+@sp.add_test()
+def test_base_uri():
+    # With a base URI set, new tokens store only a suffix (or nothing) and their
+    # TZIP-12 metadata is rebuilt by the token_metadata off-chain view.
+    scenario = sp.test_scenario("BowersFA2_base_uri", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    carol = sp.test_account("carol")
+    c = main.BowersFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.mint(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmFull"),
+        supply=1,
+        royalty_recipient=carol.address,
+        royalty_bps=1000,
+        min_offer_per_unit_mutez=sp.mutez(1000),
+        _sender=admin,
+    )
+
+    base = sp.scenario_utils.bytes_of_string("ipfs://QmBase/")
+    c.set_base_uri(base, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_base_uri(base, _sender=admin)
+    for _ in range(11):
+        c.mint(
+            metadata_uri=sp.bytes("0x"),
+            supply=1,
+            royalty_recipient=carol.address,
+            royalty_bps=1000,
+            min_offer_per_unit_mutez=sp.mutez(1000),
+            _sender=admin,
+        )
+    c.mint(
+        metadata_uri=sp.scenario_utils.bytes_of_string("custom.json"),
+        supply=1,
+        royalty_recipient=carol.address,
+        royalty_bps=1000,
+        min_offer_per_unit_mutez=sp.mutez(1000),
+        _sender=admin,
+    )
+
+    scenario.verify(c.token_metadata(0).token_info[""] == sp.scenario_utils.bytes_of_string("ipfs://QmFull"))
+    scenario.verify(~c.data.token_metadata.contains(1))
+    scenario.verify(~c.data.token_uri_suffix.contains(1))
+    scenario.verify(c.token_metadata(1).token_info[""] == base + sp.scenario_utils.bytes_of_string("1"))
+    scenario.verify(c.token_metadata(11).token_info[""] == base + sp.scenario_utils.bytes_of_string("11"))
+    scenario.verify(c.token_metadata(11).token_info["decimals"] == sp.bytes("0x30"))
+    scenario.verify(c.token_metadata(12).token_info[""] == base + sp.scenario_utils.bytes_of_string("custom.json"))
+
+
+@sp.add_test()
+def test_withdraw_for():
+    # Anyone can pay sellers their sale proceeds in one call; a contract royalty recipient
+    # is skipped and keeps its balance for withdraw.
+    scenario = sp.test_scenario("BowersFA2_withdraw_for", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.mint(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmToken"),
+        supply=2,
+        royalty_recipient=c.address,
+        royalty_bps=1000,
+        min_offer_per_unit_mutez=sp.mutez(1000),
+        _sender=admin,
+    )
+    c.transfer([sp.record(from_=admin.address, txs=[sp.record(to_=bob.address, token_id=0, amount=2)])], _sender=admin)
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy(owner=bob.address, token_id=0, qty=1, _sender=alice, _amount=sp.tez(1))
+
+    c.withdraw_for([bob.address], _sender=alice, _amount=sp.tez(1), _valid=False, _exception="NO_TEZ")
+    # The seller is paid; the contract royalty recipient keeps its share.
+    c.withdraw_for([bob.address, alice.address, c.address, bob.address], _sender=alice)
+    scenario.verify(~c.data.claimable.contains(bob.address))
+    scenario.verify(~c.data.claimable.contains(alice.address))
+    scenario.verify(c.data.claimable[c.address] == sp.mutez(100000))
+    scenario.verify(c.balance == sp.mutez(100000))
+
+
+@sp.add_test()
+def test_prune_offers():
+    # Expired bids are cleared by anyone and refunded to the bidder; live and unknown ids stay put.
+    scenario = sp.test_scenario("BowersFA2_prune_offers", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.mint(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmToken"),
+        supply=5,
+        royalty_recipient=admin.address,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(1000),
+        _sender=admin,
+    )
+    c.make_offer(token_id=0, qty=2, expiry=sp.timestamp(100), _sender=alice, _amount=sp.tez(2))
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(500), _sender=bob, _amount=sp.tez(1))
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(100), _sender=alice, _amount=sp.tez(1))
+
+    c.prune_offers([0], _sender=bob, _amount=sp.tez(1), _valid=False, _exception="NO_TEZ")
+    c.prune_offers([0, 1, 2], _sender=bob, _now=sp.timestamp(100))
+    scenario.verify(c.data.offers.contains(0))
+    c.prune_offers([0, 1, 2, 7], _sender=bob, _now=sp.timestamp(200))
+    scenario.verify(~c.data.offers.contains(0))
+    scenario.verify(~c.data.offers.contains(2))
+    scenario.verify(c.data.offers.contains(1))
+    scenario.verify(c.data.claimable[alice.address] == sp.tez(3))
+    scenario.verify(~c.data.claimable.contains(bob.address))
+
+
+@sp.add_test()
+def test_direct_payout():
+    # In direct mode single sales, sweeps and filled bids pay implicit sellers and royalty
+    # recipients at once; a contract royalty recipient is credited instead.
+    scenario = sp.test_scenario("BowersFA2_direct_payout", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    for royalty_recipient in [carol.address, c.address]:
+        c.mint(
+            metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmToken"),
+            supply=10,
+            royalty_recipient=royalty_recipient,
+            royalty_bps=1000,
+            min_offer_per_unit_mutez=sp.mutez(1000),
+            _sender=admin,
+        )
+    c.set_direct_payout(True, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_direct_payout(True, _sender=admin)
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=admin)
+    c.set_listing(token_id=1, price=sp.tez(1), max_qty=0, min_bps=0, _sender=admin)
+
+    c.buy(owner=admin.address, token_id=0, qty=2, _sender=alice, _amount=sp.tez(2))
+    scenario.verify(~c.data.claimable.contains(admin.address))
+    scenario.verify(~c.data.claimable.contains(carol.address))
+    scenario.verify(c.balance == sp.mutez(0))
+    c.buy_many(
+        items=[sp.record(owner=admin.address, token_id=0, qty=1), sp.record(owner=admin.address, token_id=1, qty=2)],
+        expected_total=sp.tez(3),
+        _sender=bob,
+        _amount=sp.tez(3),
+    )
+    scenario.verify(c.data.claimable[c.address] == sp.mutez(200000))
+    scenario.verify(c.balance == sp.mutez(200000))
+
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(1000), _sender=carol, _amount=sp.tez(1))
+    c.make_offer(token_id=1, qty=1, expiry=sp.timestamp(1000), _sender=carol, _amount=sp.tez(1))
+    c.accept_offer(offer_id=0, accept_qty=1, _sender=alice)
+    c.accept_offers([sp.record(offer_id=1, accept_qty=1)], _sender=bob)
+    scenario.verify(~c.data.claimable.contains(alice.address))
+    scenario.verify(~c.data.claimable.contains(bob.address))
+    scenario.verify(c.data.claimable[c.address] == sp.mutez(300000))
+    scenario.verify(c.balance == sp.mutez(300000))
+
+    # A zero royalty gives a contract recipient no claimable entry.
+    vault = sp.address("KT1Tezooo1zzSmartPyzzSTATiCzzzyfC8eF")
+    c.mint(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmToken"),
+        supply=10,
+        royalty_recipient=vault,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(1000),
+        _sender=admin,
+    )
+    c.set_listing(token_id=2, price=sp.tez(1), max_qty=0, min_bps=0, _sender=admin)
+    c.buy(owner=admin.address, token_id=2, qty=2, _sender=alice, _amount=sp.tez(2))
+    c.buy_many(
+        items=[sp.record(owner=admin.address, token_id=2, qty=1)],
+        expected_total=sp.tez(1),
+        _sender=bob,
+        _amount=sp.tez(1),
+    )
+    c.make_offer(token_id=2, qty=1, expiry=sp.timestamp(1000), _sender=carol, _amount=sp.tez(1))
+    c.accept_offer(offer_id=2, accept_qty=1, _sender=alice)
+    scenario.verify(~c.data.claimable.contains(vault))
+    c.make_offer(token_id=2, qty=1, expiry=sp.timestamp(1000), _sender=carol, _amount=sp.tez(1))
+    c.accept_offers([], _sender=bob, _valid=False, _exception="NO_ITEMS")
+    c.accept_offers([sp.record(offer_id=3, accept_qty=1)], _sender=bob)
+    scenario.verify(~c.data.claimable.contains(vault))
+    scenario.verify(c.balance == sp.mutez(300000))
+
+
+@sp.add_test()
+def test_batch_views():
+    # Batch views answer in request order, repeats included; unknown keys are zero or None.
+    scenario = sp.test_scenario("BowersFA2_batch_views", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.mint(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmToken"),
+        supply=5,
+        royalty_recipient=alice.address,
+        royalty_bps=1000,
+        min_offer_per_unit_mutez=sp.mutez(1000),
+        _sender=admin,
+    )
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=2, min_bps=0, _sender=admin)
+    c.buy(owner=admin.address, token_id=0, qty=2, _sender=bob, _amount=sp.tez(2))
+
+    admin_0 = sp.record(owner=admin.address, token_id=0)
+    bob_0 = sp.record(owner=bob.address, token_id=0)
+    scenario.verify_equal(c.get_balances([admin_0, bob_0, sp.record(owner=bob.address, token_id=1), admin_0]), [3, 2, 0, 3])
+    scenario.verify_equal(c.get_claimables([alice.address, admin.address, bob.address]), [sp.mutez(200000), sp.mutez(1_800_000), sp.mutez(0)])
+    scenario.verify_equal(c.get_listings([bob_0, admin_0]), [None, sp.Some(sp.record(price=sp.tez(1), max_qty=2, min_bps=0))])
+    scenario.verify_equal(c.get_token_markets([1, 0]), [None, sp.Some(c.get_token_market(0))])
+
+
+@sp.add_test()
+def test_supply_counters():
+    # The admin mint sets supply and one holder; transfers, sales and filled bids add buyers
+    # new to the token and drop sellers who sell out.
+    scenario = sp.test_scenario("BowersFA2_supply_counters", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.mint(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmToken"),
+        supply=10,
+        royalty_recipient=admin.address,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(1000),
+        _sender=admin,
+    )
+    scenario.verify_equal(c.get_token_supplies([0, 1]), [sp.record(total_supply=10, holders=1), sp.record(total_supply=0, holders=0)])
+    c.transfer([sp.record(from_=admin.address, txs=[sp.record(to_=alice.address, token_id=0, amount=3)])], _sender=admin)
+    c.transfer([sp.record(from_=alice.address, txs=[sp.record(to_=bob.address, token_id=0, amount=3)])], _sender=alice)
+    scenario.verify(c.data.token_supply[0].holders == 2)
+
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy(owner=bob.address, token_id=0, qty=3, _sender=alice, _amount=sp.tez(3))
+    scenario.verify(c.data.token_supply[0].holders == 2)
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(1000), _sender=carol, _amount=sp.tez(1))
+    c.accept_offer(offer_id=0, accept_qty=1, _sender=admin)
+    scenario.verify(c.data.token_supply[0].holders == 3)
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=carol)
+    c.buy_many(items=[sp.record(owner=carol.address, token_id=0, qty=1)], expected_total=sp.tez(1), _sender=admin, _amount=sp.tez(1))
+    scenario.verify_equal(c.get_token_supplies([0]), [sp.record(total_supply=10, holders=2)])
+    scenario.verify(c.total_supply(0) == 10)
@@ -0,0 +1,270 @@
+# BowersFactory - SmartPy v2
+# On-chain collection factories: each embeds one style template and originates a fresh
+# collection with CREATE_CONTRACT, so the user operation carries only admin, contract
+# metadata and base URI instead of the full script.
+# One factory per style: inline modules are imported by name and every template module is
+# called `main`, and a single template keeps each factory well under the operation size limit.
+# The Unified factory is the exception: compiled, it is over that limit. Register the shared
+# global constants first (npx tsx scripts/register-global-constants.ts [network] --shared),
+# then originate bowers-factory-unified.shared.json, whose embedded template references them.
+# Origination of the .shared script fails until every constant it uses is registered.
+
+import os
+import importlib.util
+
+import smartpy as sp
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_template(filename):
+    spec = importlib.util.spec_from_file_location(filename[:-3], os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.main
+
+
+# Each factory module below imports the template loaded just before it.
+
+unified = load_template("BowersUnifiedFA2.py")
+
+
+@sp.module
+def unified_factory():
+    import main
+
+    # The payout flags are fixed at origination, so the factory takes them like direct origination does.
+    CreateCollectionType: type = sp.record(
+        admin=sp.address,
+        metadata=sp.map[sp.string, sp.bytes],
+        base_uri=sp.bytes,
+        direct_payout=sp.bool,
+        accrue_proceeds=sp.bool,
+    )
+
+    class BowersUnifiedFactory(sp.Contract):
+        @sp.entrypoint
+        def create_collection(self, params):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(params, CreateCollectionType)
+            metadata = sp.cast(sp.big_map(), sp.big_map[sp.string, sp.bytes])
+            for item in params.metadata.items():
+                metadata[item.key] = item.value
+            collection = sp.create_contract(
+                main.BowersUnifiedFA2,
+                None,
+                sp.mutez(0),
+                sp.record(
+                    admin=params.admin,
+                    metadata=metadata,
+                    ledger=sp.big_map(),
+                    token_supply=sp.big_map(),
+                    token_metadata=sp.big_map(),
+                    base_uri=params.base_uri,
+                    token_uri_suffix=sp.big_map(),
+                    token_config=sp.big_map(),
+                    token_state=sp.big_map(),
+                    token_allowlist=sp.big_map(),
+                    allowlist_root=sp.big_map(),
+                    allowlist_minted=sp.big_map(),
+                    operators=sp.big_map(),
+                    all_operators=sp.big_map(),
+                    next_token_id=sp.nat(0),
+                    listings=sp.big_map(),
+                    offers=sp.big_map(),
+                    next_offer_id=sp.nat(0),
+                    claimable=sp.big_map(),
+                    direct_payout=params.direct_payout,
+                    accrue_proceeds=params.accrue_proceeds,
+                    blacklist=sp.big_map(),
+                    contract_blocklist=sp.big_map(),
+                ),
+                # The regular build: per-token indexes are off.
+                private_=sp.record(indexed=False),
+            )
+            sp.emit(sp.record(collection=collection, admin=params.admin), tag="collection")
+
+
+mint_oe = load_template("BowersMintOpenEdition.py")
+
+
+@sp.module
+def mint_oe_factory():
+    import main
+
+    CreateCollectionType: type = sp.record(
+        admin=sp.address,
+        metadata=sp.map[sp.string, sp.bytes],
+        base_uri=sp.bytes,
+    )
+
+    class BowersMintOpenEditionFactory(sp.Contract):
+        @sp.entrypoint
+        def create_collection(self, params):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(params, CreateCollectionType)
+            metadata = sp.cast(sp.big_map(), sp.big_map[sp.string, sp.bytes])
+            for item in params.metadata.items():
+                metadata[item.key] = item.value
+            collection = sp.create_contract(
+                main.BowersMintOpenEdition,
+                None,
+                sp.mutez(0),
+                sp.record(
+                    admin=params.admin,
+                    metadata=metadata,
+                    ledger=sp.big_map(),
+                    token_supply=sp.big_map(),
+                    token_metadata=sp.big_map(),
+                    base_uri=params.base_uri,
+                    token_uri_suffix=sp.big_map(),
+                    token_config=sp.big_map(),
+                    operators=sp.big_map(),
+                    all_operators=sp.big_map(),
+                    next_token_id=sp.nat(0),
+                    claimable=sp.big_map(),
+                    contract_blocklist=sp.big_map(),
+                ),
+            )
+            sp.emit(sp.record(collection=collection, admin=params.admin), tag="collection")
+
+
+mint_allowlist = load_template("BowersMintAllowlist.py")
+
+
+@sp.module
+def mint_allowlist_factory():
+    import main
+
+    CreateCollectionType: type = sp.record(
+        admin=sp.address,
+        metadata=sp.map[sp.string, sp.bytes],
+        base_uri=sp.bytes,
+    )
+
+    class BowersMintAllowlistFactory(sp.Contract):
+        @sp.entrypoint
+        def create_collection(self, params):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(params, CreateCollectionType)
+            metadata = sp.cast(sp.big_map(), sp.big_map[sp.string, sp.bytes])
+            for item in params.metadata.items():
+                metadata[item.key] = item.value
+            collection = sp.create_contract(
+                main.BowersMintAllowlist,
+                None,
+                sp.mutez(0),
+                sp.record(
+                    admin=params.admin,
+                    metadata=metadata,
+                    ledger=sp.big_map(),
+                    token_supply=sp.big_map(),
+                    token_metadata=sp.big_map(),
+                    base_uri=params.base_uri,
+                    token_uri_suffix=sp.big_map(),
+                    token_config=sp.big_map(),
+                    token_allowlist=sp.big_map(),
+                    allowlist_root=sp.big_map(),
+                    allowlist_minted=sp.big_map(),
+                    operators=sp.big_map(),
+                    all_operators=sp.big_map(),
+                    next_token_id=sp.nat(0),
+                    claimable=sp.big_map(),
+                    contract_blocklist=sp.big_map(),
+                ),
+            )
+            sp.emit(sp.record(collection=collection, admin=params.admin), tag="collection")
+
+
+mint_bonding_curve = load_template("BowersMintBondingCurve.py")
+
+
+@sp.module
+def mint_bonding_curve_factory():
+    import main
+
+    CreateCollectionType: type = sp.record(
+        admin=sp.address,
+        metadata=sp.map[sp.string, sp.bytes],
+        base_uri=sp.bytes,
+    )
+
+    class BowersMintBondingCurveFactory(sp.Contract):
+        @sp.entrypoint
+        def create_collection(self, params):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(params, CreateCollectionType)
+            metadata = sp.cast(sp.big_map(), sp.big_map[sp.string, sp.bytes])
+            for item in params.metadata.items():
+                metadata[item.key] = item.value
+            collection = sp.create_contract(
+                main.BowersMintBondingCurve,
+                None,
+                sp.mutez(0),
+                sp.record(
+                    admin=params.admin,
+                    metadata=metadata,
+                    ledger=sp.big_map(),
+                    token_supply=sp.big_map(),
+                    token_metadata=sp.big_map(),
+                    base_uri=params.base_uri,
+                    token_uri_suffix=sp.big_map(),
+                    token_config=sp.big_map(),
+                    operators=sp.big_map(),
+                    all_operators=sp.big_map(),
+                    next_token_id=sp.nat(0),
+                    claimable=sp.big_map(),
+                    contract_blocklist=sp.big_map(),
+                ),
+            )
+            sp.emit(sp.record(collection=collection, admin=params.admin), tag="collection")
+
+
+# ==============================================================================
+# Tests
+# ==============================================================================
+
+FACTORIES = [
+    ("BowersUnifiedFactory", unified, unified_factory, "BowersUnifiedFactory", "BowersUnifiedFA2"),
+    ("BowersMintOpenEditionFactory", mint_oe, mint_oe_factory, "BowersMintOpenEditionFactory", "BowersMintOpenEdition"),
+    ("BowersMintAllowlistFactory", mint_allowlist, mint_allowlist_factory, "BowersMintAllowlistFactory", "BowersMintAllowlist"),
+    ("BowersMintBondingCurveFactory", mint_bonding_curve, mint_bonding_curve_factory, "BowersMintBondingCurveFactory", "BowersMintBondingCurve"),
+]
+
+
+# create_collection arguments beyond admin, metadata and base URI, per factory.
+EXTRA_ARGS = {
+    "BowersUnifiedFactory": {"direct_payout": True, "accrue_proceeds": True},
+}
+
+
+@sp.add_test()
+def test():
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    metadata = {"": sp.bytes("0x" + b"tezos-storage:content".hex())}
+
+    for name, template, factory, factory_class, template_class in FACTORIES:
+        scenario = sp.test_scenario(name, [template, factory])
+        f = getattr(factory, factory_class)()
+        scenario += f
+
+        extra = EXTRA_ARGS.get(name, {})
+        f.create_collection(admin=alice.address, metadata=metadata, base_uri=sp.bytes("0x"), _sender=admin, **extra)
+        collection = scenario.dynamic_contract(getattr(template, template_class))
+        scenario.verify(collection.data.admin == alice.address)
+        scenario.verify(collection.data.next_token_id == 0)
+        scenario.verify(collection.data.metadata[""] == metadata[""])
+        for field, value in extra.items():
+            scenario.verify(getattr(collection.data, field) == value)
+
+        f.create_collection(
+            admin=alice.address,
+            metadata=metadata,
+            base_uri=sp.bytes("0x"),
+            _sender=admin,
+            **extra,
+            _amount=sp.tez(1),
+            _valid=False,
+            _exception="NO_TEZ",
+        )
@@ -10,10 +10,18 @@ def main():
     BalanceOfRequestType: type = sp.record(owner=sp.address, token_id=sp.nat)
     BalanceOfResponseType: type = sp.record(request=BalanceOfRequestType, balance=sp.nat)
     LedgerKeyType: type = sp.record(owner=sp.address, token_id=sp.nat)
+    SupplyType: type = sp.record(total_supply=sp.nat, holders=sp.nat)
     OperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address, token_id=sp.nat)
-    AllowlistKeyType: type = sp.record(token_id=sp.nat, address=sp.address)
+    # epoch is the token's allowlist_epoch when the entry was written; older epochs are stale.
+    AllowlistKeyType: type = sp.record(token_id=sp.nat, epoch=sp.nat, address=sp.address)
     AllowlistEntryType: type = sp.record(max_qty=sp.nat, minted=sp.nat, price_override=sp.option[sp.mutez])
+    # Merkle allowlist proof. The leaf is blake2b(pack((address, (max_qty, price_override))));
+    # path holds the sibling hashes from leaf to root, tagged with the side they sit on.
+    MerkleStepType: type = sp.variant(left=sp.bytes, right=sp.bytes)
+    AllowlistProofType: type = sp.record(max_qty=sp.nat, price_override=sp.option[sp.mutez], path=sp.list[MerkleStepType])
     OperatorParamType: type = sp.variant(add_operator=OperatorKeyType, remove_operator=OperatorKeyType)
+    AllOperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address)
+    AllOperatorParamType: type = sp.variant(add_operator=AllOperatorKeyType, remove_operator=AllOperatorKeyType)
     TransferTxType: type = sp.record(to_=sp.address, token_id=sp.nat, amount=sp.nat)
     TransferBatchItemType: type = sp.record(from_=sp.address, txs=sp.list[TransferTxType])
 
@@ -25,10 +33,17 @@ def main():
         max_supply=sp.option[sp.nat],
         minted=sp.nat,
         allowlist_end=sp.option[sp.timestamp],
+        allowlist_epoch=sp.nat,
         royalty_recipient=sp.address,
         royalty_bps=sp.nat,
     )
 
+    # get_mint_quote result: remaining counts are before the quoted mint, None when uncapped.
+    MintQuoteType: type = sp.record(total=sp.mutez, allowlist_remaining=sp.option[sp.nat], supply_remaining=sp.option[sp.nat])
+    # _mint_check result: the quote, the allowlist entry a mint bumps (None outside the allowlist
+    # phase), and the token's config, which holds its mint state.
+    MintCheckType: type = sp.record(quote=MintQuoteType, allowlist_key=sp.option[AllowlistKeyType], config=TokenConfigType)
+
     AllowlistEntryParam: type = sp.record(
         address=sp.address,
         max_qty=sp.nat,
@@ -40,10 +55,19 @@ def main():
             self.data.admin = admin
             self.data.metadata = metadata
             self.data.ledger = sp.cast(sp.big_map(), sp.big_map[LedgerKeyType, sp.nat])
+            self.data.token_supply = sp.cast(sp.big_map(), sp.big_map[sp.nat, SupplyType])
             self.data.token_metadata = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes])])
+            # Optional shared base URI: when set, tokens store only a URI suffix (or nothing) and
+            # TZIP-12 metadata is served by the token_metadata off-chain view.
+            self.data.base_uri = sp.bytes("0x")
+            self.data.token_uri_suffix = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.bytes])
             self.data.token_config = sp.cast(sp.big_map(), sp.big_map[sp.nat, TokenConfigType])
             self.data.token_allowlist = sp.cast(sp.big_map(), sp.big_map[AllowlistKeyType, AllowlistEntryType])
+            # Merkle allowlists: one root per token; per-address minted counts are written on first mint.
+            self.data.allowlist_root = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.bytes])
+            self.data.allowlist_minted = sp.cast(sp.big_map(), sp.big_map[AllowlistKeyType, sp.nat])
             self.data.operators = sp.cast(sp.big_map(), sp.big_map[OperatorKeyType, sp.unit])
+            self.data.all_operators = sp.cast(sp.big_map(), sp.big_map[AllOperatorKeyType, sp.unit])
             self.data.next_token_id = sp.nat(0)
             self.data.claimable = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.mutez])
             self.data.contract_blocklist = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.unit])
@@ -72,31 +96,84 @@ def main():
                         assert op in self.data.operators, "NO_OP"
                         del self.data.operators[op]
 
+        @sp.entrypoint
+        def update_all_operators(self, actions):
+            # Owner-level operators: one entry approves the operator for all of the owner's tokens.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(actions, sp.list[AllOperatorParamType])
+            for action in actions:
+                match action:
+                    case add_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        self.data.all_operators[op] = ()
+                    case remove_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        assert op in self.data.all_operators, "NO_OP"
+                        del self.data.all_operators[op]
+
         @sp.entrypoint
         def transfer(self, batch):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(batch, sp.list[TransferBatchItemType])
+            # Balances touched by the batch are read from the ledger once and written back once at
+            # the end; addresses cleared against contract_blocklist are not looked up again.
+            balances = sp.cast({}, sp.map[LedgerKeyType, sp.nat])
+            # Recipients new to a token in this batch. Holder counts change once per key at
+            # write-back, never per transfer.
+            fresh = sp.cast(set(), sp.set[LedgerKeyType])
+            cleared = sp.cast(set(), sp.set[sp.address])
             for item in batch:
                 from_ = item.from_
-                for tx in item.txs:
+                if not (from_ in cleared):
                     assert not (from_ in self.data.contract_blocklist), "BLOCKED"
-                    assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
-                    if from_ != sp.sender:
-                        assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                    cleared.add(from_)
+                # Checked once per batch item; per-token entries are only read without an owner-level
+                # operator, once per token.
+                all_tokens = from_ == sp.sender
+                if not all_tokens:
+                    all_tokens = sp.record(owner=from_, operator=sp.sender) in self.data.all_operators
+                approved = sp.cast(set(), sp.set[sp.nat])
+                for tx in item.txs:
+                    if not (tx.to_ in cleared):
+                        assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
+                        cleared.add(tx.to_)
+                    if not all_tokens:
+                        if not (tx.token_id in approved):
+                            assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                            approved.add(tx.token_id)
                     assert tx.amount > 0, "BAD_AMOUNT"
                     fk = sp.record(owner=from_, token_id=tx.token_id)
-                    fb = self.data.ledger.get(fk, default=sp.nat(0))
+                    fb = balances.get(fk, default=sp.nat(0))
+                    if not (fk in balances):
+                        fb = self.data.ledger.get(fk, default=sp.nat(0))
                     assert fb >= tx.amount, "LOW_BAL"
                     nfb = sp.as_nat(fb - tx.amount)
-                    if nfb == 0:
-                        if fk in self.data.ledger:
-                            del self.data.ledger[fk]
-                    else:
-                        self.data.ledger[fk] = nfb
+                    balances[fk] = nfb
                     tk = sp.record(owner=tx.to_, token_id=tx.token_id)
-                    tb = self.data.ledger.get(tk, default=sp.nat(0))
-                    self.data.ledger[tk] = tb + tx.amount
-                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, a=tx.amount), tag="xfer")
+                    tb = balances.get(tk, default=sp.nat(0))
+                    if not (tk in balances):
+                        tb = self.data.ledger.get(tk, default=sp.nat(0))
+                        if tb == 0:
+                            fresh.add(tk)
+                    balances[tk] = tb + tx.amount
+                    # Activity events (xfer, mint, buy, accept, list, offer, close) share one set of short keys;
+                    # event-schemas.json maps each to its field name.
+                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, q=tx.amount), tag="xfer")
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            for entry in balances.items():
+                tid = entry.key.token_id
+                if entry.value == 0:
+                    del self.data.ledger[entry.key]
+                    if not (entry.key in fresh):
+                        holders[tid] = holders.get(tid, default=0) - 1
+                else:
+                    self.data.ledger[entry.key] = entry.value
+                    if entry.key in fresh:
+                        holders[tid] = holders.get(tid, default=0) + 1
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
 
         @sp.entrypoint
         def set_admin(self, new_admin):
@@ -104,6 +181,15 @@ def main():
             sp.cast(new_admin, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.admin = new_admin
+            sp.emit(new_admin, tag="admin")
+
+        @sp.entrypoint
+        def set_base_uri(self, base_uri):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(base_uri, sp.bytes)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.base_uri = base_uri
+            sp.emit(base_uri, tag="base_uri")
 
         @sp.entrypoint
         def create_token(self, params):
@@ -127,10 +213,14 @@ def main():
             tid = self.data.next_token_id
             self.data.next_token_id += 1
 
-            token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
-            self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            if self.data.base_uri == sp.bytes("0x"):
+                token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
+                self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            else:
+                if params.metadata_uri != sp.bytes("0x"):
+                    self.data.token_uri_suffix[tid] = params.metadata_uri
 
-            self.data.token_config[tid] = sp.record(
+            cfg = sp.record(
                 creator=params.creator,
                 mint_price=params.mint_price,
                 mint_end=params.mint_end,
@@ -138,9 +228,13 @@ def main():
                 max_supply=params.max_supply,
                 minted=sp.nat(0),
                 allowlist_end=params.allowlist_end,
+                allowlist_epoch=sp.nat(0),
                 royalty_recipient=params.royalty_recipient,
                 royalty_bps=params.royalty_bps,
             )
+            self.data.token_config[tid] = cfg
+            # mint_end repeats the config's so token_created has the same fields in every contract.
+            sp.emit(sp.record(token_id=tid, config=cfg, mint_end=params.mint_end), tag="token_created")
 
         @sp.entrypoint
         def set_mint_price(self, params):
@@ -151,6 +245,7 @@ def main():
             cfg = self.data.token_config[params.token_id]
             cfg.mint_price = params.mint_price
             self.data.token_config[params.token_id] = cfg
+            sp.emit(sp.record(token_id=params.token_id, mint_price=params.mint_price), tag="mint_price")
 
         @sp.entrypoint
         def set_mint_end(self, params):
@@ -161,6 +256,7 @@ def main():
             cfg = self.data.token_config[params.token_id]
             cfg.mint_end = params.mint_end
             self.data.token_config[params.token_id] = cfg
+            sp.emit(sp.record(token_id=params.token_id, mint_end=params.mint_end), tag="mint_end")
 
         @sp.entrypoint
         def set_mint_paused(self, params):
@@ -171,6 +267,7 @@ def main():
             cfg = self.data.token_config[params.token_id]
             cfg.mint_paused = params.paused
             self.data.token_config[params.token_id] = cfg
+            sp.emit(sp.record(token_id=params.token_id, paused=params.paused), tag="mint_paused")
 
         @sp.entrypoint
         def set_allowlist(self, params):
@@ -178,20 +275,41 @@ def main():
             sp.cast(params, sp.record(token_id=sp.nat, entries=sp.list[AllowlistEntryParam]))
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
+            epoch = self.data.token_config[params.token_id].allowlist_epoch
             for e in params.entries:
-                key = sp.record(token_id=params.token_id, address=e.address)
+                key = sp.record(token_id=params.token_id, epoch=epoch, address=e.address)
                 self.data.token_allowlist[key] = sp.record(
                     max_qty=e.max_qty, minted=sp.nat(0), price_override=e.price_override)
+            sp.emit(sp.record(token_id=params.token_id, epoch=epoch, entries=params.entries), tag="allowlist")
 
         @sp.entrypoint
         def clear_allowlist(self, token_id):
+            # Ends the allowlist phase. The epoch bump orphans every entry and minted count at once
+            # (stale keys can be pruned); a Merkle root is dropped.
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(token_id, sp.nat)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             assert token_id in self.data.token_config, "TOKEN_UNDEFINED"
             cfg = self.data.token_config[token_id]
             cfg.allowlist_end = None
+            cfg.allowlist_epoch += 1
+            self.data.token_config[token_id] = cfg
+            if token_id in self.data.allowlist_root:
+                del self.data.allowlist_root[token_id]
+            sp.emit(sp.record(token_id=token_id, epoch=cfg.allowlist_epoch), tag="allowlist_cleared")
+
+        @sp.entrypoint
+        def reset_allowlist(self, token_id):
+            # Restarts the allowlist phase: a new epoch resets every minted count and per-address
+            # entry in one write. A Merkle root is kept, so the same list can run again.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(token_id, sp.nat)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            assert token_id in self.data.token_config, "TOKEN_UNDEFINED"
+            cfg = self.data.token_config[token_id]
+            cfg.allowlist_epoch += 1
             self.data.token_config[token_id] = cfg
+            sp.emit(sp.record(token_id=token_id, epoch=cfg.allowlist_epoch), tag="allowlist_reset")
 
         @sp.entrypoint
         def set_allowlist_end(self, params):
@@ -202,19 +320,48 @@ def main():
             cfg = self.data.token_config[params.token_id]
             cfg.allowlist_end = params.allowlist_end
             self.data.token_config[params.token_id] = cfg
+            sp.emit(sp.record(token_id=params.token_id, allowlist_end=params.allowlist_end), tag="allowlist_end")
 
         @sp.entrypoint
-        def mint_editions(self, params):
-            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, to_=sp.address))
+        def set_allowlist_root(self, params):
+            # Merkle mode: one root replaces per-address entries; None removes it.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(params, sp.record(token_id=sp.nat, root=sp.option[sp.bytes]))
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
+            if params.root.is_some():
+                self.data.allowlist_root[params.token_id] = params.root.unwrap_some()
+            else:
+                del self.data.allowlist_root[params.token_id]
+            sp.emit(sp.record(token_id=params.token_id, root=params.root), tag="allowlist_root")
+
+        @sp.entrypoint
+        def prune_allowlist(self, keys):
+            # Permissionless cleanup of entries and minted counts left behind by a past epoch.
+            # Keys from the current epoch or for unknown tokens are skipped.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(keys, sp.list[AllowlistKeyType])
+            for key in keys:
+                if key.token_id in self.data.token_config:
+                    if key.epoch < self.data.token_config[key.token_id].allowlist_epoch:
+                        del self.data.token_allowlist[key]
+                        del self.data.allowlist_minted[key]
+
+        @sp.private(with_storage="read-only")
+        def _mint_check(self, params):
+            # Checks shared by mint_editions and get_mint_quote: supply cap, mint window, allowlist
+            # entry or Merkle proof for buyer, and the price. allowlist_key is the entry a mint bumps.
+            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, buyer=sp.address, proof=sp.option[AllowlistProofType]))
             assert params.qty > 0, "BAD_QTY"
-            assert not (params.to_ in self.data.contract_blocklist), "BLOCKED"
             assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
             cfg = self.data.token_config[params.token_id]
 
+            supply_remaining = sp.cast(None, sp.option[sp.nat])
             ms = cfg.max_supply
             if ms.is_some():
                 cap = ms.unwrap_some()
                 assert cfg.minted + params.qty <= cap, "MAX_SUPPLY"
+                supply_remaining = sp.Some(sp.as_nat(cap - cfg.minted))
 
             me = cfg.mint_end
             if me.is_some():
@@ -222,29 +369,80 @@ def main():
             assert not cfg.mint_paused, "MINT_CLOSED"
 
             price_per = cfg.mint_price
+            allowlist_remaining = sp.cast(None, sp.option[sp.nat])
+            allowlist_key = sp.cast(None, sp.option[AllowlistKeyType])
             al_end = cfg.allowlist_end
             if al_end.is_some():
                 if sp.now < al_end.unwrap_some():
-                    key = sp.record(token_id=params.token_id, address=sp.sender)
-                    assert key in self.data.token_allowlist, "NOT_ALLOWLISTED"
-                    entry = self.data.token_allowlist[key]
-                    assert entry.minted + params.qty <= entry.max_qty, "ALLOWLIST_CAP"
-                    po = entry.price_override
+                    key = sp.record(token_id=params.token_id, epoch=cfg.allowlist_epoch, address=params.buyer)
+                    max_qty = sp.nat(0)
+                    al_minted = sp.nat(0)
+                    po = sp.cast(None, sp.option[sp.mutez])
+                    if params.proof.is_some():
+                        proof = params.proof.unwrap_some()
+                        node = sp.blake2b(sp.pack((params.buyer, (proof.max_qty, proof.price_override))))
+                        for step in proof.path:
+                            match step:
+                                case left(h):
+                                    node = sp.blake2b(h + node)
+                                case right(h):
+                                    node = sp.blake2b(node + h)
+                        assert self.data.allowlist_root.get(params.token_id, error="NOT_ALLOWLISTED") == node, "BAD_PROOF"
+                        max_qty = proof.max_qty
+                        al_minted = self.data.allowlist_minted.get(key, default=sp.nat(0))
+                        po = proof.price_override
+                    else:
+                        assert key in self.data.token_allowlist, "NOT_ALLOWLISTED"
+                        entry = self.data.token_allowlist[key]
+                        max_qty = entry.max_qty
+                        al_minted = entry.minted
+                        po = entry.price_override
+                    assert al_minted + params.qty <= max_qty, "ALLOWLIST_CAP"
+                    allowlist_remaining = sp.Some(sp.as_nat(max_qty - al_minted))
+                    allowlist_key = sp.Some(key)
                     if po.is_some():
                         price_per = po.unwrap_some()
-                    entry.minted = entry.minted + params.qty
-                    self.data.token_allowlist[key] = entry
+            total = sp.split_tokens(price_per, params.qty, 1)
+            return sp.cast(
+                sp.record(
+                    quote=sp.record(total=total, allowlist_remaining=allowlist_remaining, supply_remaining=supply_remaining),
+                    allowlist_key=allowlist_key,
+                    config=cfg,
+                ),
+                MintCheckType,
+            )
 
-            total_price = sp.split_tokens(price_per, params.qty, 1)
+        @sp.entrypoint
+        def mint_editions(self, params):
+            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, to_=sp.address, proof=sp.option[AllowlistProofType]))
+            assert not (params.to_ in self.data.contract_blocklist), "BLOCKED"
+            chk = self._mint_check(sp.record(token_id=params.token_id, qty=params.qty, buyer=sp.sender, proof=params.proof))
+            total_price = chk.quote.total
             assert sp.amount == total_price, "BAD_PAYMENT"
 
+            if chk.allowlist_key.is_some():
+                key = chk.allowlist_key.unwrap_some()
+                if params.proof.is_some():
+                    self.data.allowlist_minted[key] = self.data.allowlist_minted.get(key, default=sp.nat(0)) + params.qty
+                else:
+                    entry = self.data.token_allowlist[key]
+                    entry.minted += params.qty
+                    self.data.token_allowlist[key] = entry
+
+            cfg = chk.config
             lk = sp.record(owner=params.to_, token_id=params.token_id)
-            self.data.ledger[lk] = self.data.ledger.get(lk, default=sp.nat(0)) + params.qty
+            lb = self.data.ledger.get(lk, default=sp.nat(0))
+            self.data.ledger[lk] = lb + params.qty
+            sup = self.data.token_supply.get(params.token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0)))
+            sup.total_supply += params.qty
+            if lb == 0:
+                sup.holders += 1
+            self.data.token_supply[params.token_id] = sup
             self.data.claimable[cfg.creator] = self.data.claimable.get(cfg.creator, default=sp.mutez(0)) + total_price
 
             cfg.minted = cfg.minted + params.qty
             self.data.token_config[params.token_id] = cfg
-            sp.emit(sp.record(token_id=params.token_id, to_=params.to_, qty=params.qty, paid=total_price), tag="mint")
+            sp.emit(sp.record(i=params.token_id, t=params.to_, q=params.qty, p=total_price, a=sp.fst(sp.ediv(total_price, params.qty).unwrap_some()), c=cfg.creator), tag="mint")
 
         @sp.entrypoint
         def block_address(self, address):
@@ -252,6 +450,7 @@ def main():
             sp.cast(address, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.contract_blocklist[address] = ()
+            sp.emit(sp.record(address=address, blocked=True), tag="blocklist")
 
         @sp.entrypoint
         def unblock_address(self, address):
@@ -260,34 +459,129 @@ def main():
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             if address in self.data.contract_blocklist:
                 del self.data.contract_blocklist[address]
+            sp.emit(sp.record(address=address, blocked=False), tag="blocklist")
 
         @sp.entrypoint
         def withdraw(self):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             amount = self.data.claimable.get(sp.sender, default=sp.mutez(0))
             assert amount > sp.mutez(0), "NO_FUNDS"
-            self.data.claimable[sp.sender] = sp.mutez(0)
+            del self.data.claimable[sp.sender]
             sp.send(sp.sender, amount)
 
+        @sp.entrypoint
+        def withdraw_for(self, recipients):
+            # Settles creators' mint proceeds in one call, e.g. after an allowlist phase closes.
+            # Contracts are skipped (one rejecting the tez would revert the batch) and keep their
+            # balance for withdraw.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(recipients, sp.list[sp.address])
+            for recipient in recipients:
+                if sp.is_implicit_account(recipient).is_some():
+                    if recipient in self.data.claimable:
+                        amount = self.data.claimable[recipient]
+                        del self.data.claimable[recipient]
+                        if amount > sp.mutez(0):
+                            sp.send(recipient, amount)
+
+        @sp.offchain_view
+        def token_metadata(self, token_id):
+            """TZIP-12 token metadata: the stored token_info, else base_uri + suffix (default: the decimal token id)."""
+            sp.cast(token_id, sp.nat)
+            if token_id in self.data.token_metadata:
+                return self.data.token_metadata[token_id]
+            else:
+                assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+                suffix = self.data.token_uri_suffix.get(token_id, default=sp.bytes("0x"))
+                if suffix == sp.bytes("0x"):
+                    digits = sp.bytes("0x30313233343536373839")
+                    qr = sp.ediv(token_id, 10).unwrap_some()
+                    suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some()
+                    n = sp.fst(qr)
+                    while n > 0:
+                        qr = sp.ediv(n, 10).unwrap_some()
+                        suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some() + suffix
+                        n = sp.fst(qr)
+                return sp.record(
+                    token_id=token_id,
+                    token_info={"": self.data.base_uri + suffix, "decimals": sp.bytes("0x30")},
+                )
+
         @sp.onchain_view
         def get_balance(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat))
             return self.data.ledger.get(sp.record(owner=params.owner, token_id=params.token_id), default=sp.nat(0))
 
+        @sp.onchain_view
+        def get_balances(self, requests):
+            sp.cast(requests, sp.list[LedgerKeyType])
+            balances = []
+            for req in requests:
+                balances.push(self.data.ledger.get(req, default=sp.nat(0)))
+            return reversed(balances)
+
+        @sp.onchain_view
+        def total_supply(self, token_id):
+            sp.cast(token_id, sp.nat)
+            assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+            return self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))).total_supply
+
+        @sp.onchain_view
+        def get_token_supplies(self, token_ids):
+            # Counters kept by mint and transfer: total supply and current holders for each token.
+            sp.cast(token_ids, sp.list[sp.nat])
+            supplies = []
+            for token_id in token_ids:
+                supplies.push(self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))))
+            return reversed(supplies)
+
         @sp.onchain_view
         def get_claimable(self, addr):
             sp.cast(addr, sp.address)
             return self.data.claimable.get(addr, default=sp.mutez(0))
 
+        @sp.onchain_view
+        def get_claimables(self, addrs):
+            sp.cast(addrs, sp.list[sp.address])
+            amounts = []
+            for addr in addrs:
+                amounts.push(self.data.claimable.get(addr, default=sp.mutez(0)))
+            return reversed(amounts)
+
         @sp.onchain_view
         def get_token_config(self, token_id):
             sp.cast(token_id, sp.nat)
             return self.data.token_config[token_id]
 
+        @sp.onchain_view
+        def get_token_configs(self, token_ids):
+            sp.cast(token_ids, sp.list[sp.nat])
+            configs = []
+            for token_id in token_ids:
+                configs.push(self.data.token_config.get_opt(token_id))
+            return reversed(configs)
+
         @sp.onchain_view
         def is_allowlisted(self, params):
             sp.cast(params, sp.record(token_id=sp.nat, address=sp.address))
-            return sp.record(token_id=params.token_id, address=params.address) in self.data.token_allowlist
+            key = sp.record(token_id=params.token_id, epoch=self.data.token_config[params.token_id].allowlist_epoch, address=params.address)
+            return key in self.data.token_allowlist
+
+        @sp.onchain_view
+        def get_allowlist_minted(self, params):
+            sp.cast(params, sp.record(token_id=sp.nat, address=sp.address))
+            key = sp.record(
+                token_id=params.token_id,
+                epoch=self.data.token_config[params.token_id].allowlist_epoch,
+                address=params.address,
+            )
+            return self.data.allowlist_minted.get(key, default=sp.nat(0))
+
+        @sp.onchain_view
+        def get_mint_quote(self, params):
+            """What mint_editions would charge buyer for qty editions now, failing where it would."""
+            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, buyer=sp.address, proof=sp.option[AllowlistProofType]))
+            return self._mint_check(params).quote
 
 
 @sp.add_test()
@@ -321,4 +615,381 @@ def test():
         _sender=admin,
     )
 
-    c.mint_editions(token_id=0, qty=2, to_=bob.address, _sender=bob, _amount=sp.mutez(0))
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.mutez(0))
+
+
+@sp.add_test()
+def test_base_uri():
+    # With a base URI set, new tokens store only a suffix (or nothing) and their
+    # TZIP-12 metadata is rebuilt by the token_metadata off-chain view.
+    scenario = sp.test_scenario("BowersMintAllowlist_base_uri", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    c = main.BowersMintAllowlist(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmFull"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=sp.Some(10),
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        _sender=admin,
+    )
+
+    base = sp.scenario_utils.bytes_of_string("ipfs://QmBase/")
+    c.set_base_uri(base, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_base_uri(base, _sender=admin)
+    for _ in range(11):
+        c.create_token(
+            metadata_uri=sp.bytes("0x"),
+            creator=alice.address,
+            mint_price=sp.tez(1),
+            mint_end=None,
+            max_supply=sp.Some(10),
+            allowlist_end=sp.Some(sp.timestamp(100)),
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            _sender=admin,
+        )
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("custom.json"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=sp.Some(10),
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        _sender=admin,
+    )
+
+    scenario.verify(c.token_metadata(0).token_info[""] == sp.scenario_utils.bytes_of_string("ipfs://QmFull"))
+    scenario.verify(~c.data.token_metadata.contains(1))
+    scenario.verify(~c.data.token_uri_suffix.contains(1))
+    scenario.verify(c.token_metadata(1).token_info[""] == base + sp.scenario_utils.bytes_of_string("1"))
+    scenario.verify(c.token_metadata(11).token_info[""] == base + sp.scenario_utils.bytes_of_string("11"))
+    scenario.verify(c.token_metadata(11).token_info["decimals"] == sp.bytes("0x30"))
+    scenario.verify(c.token_metadata(12).token_info[""] == base + sp.scenario_utils.bytes_of_string("custom.json"))
+
+
+@sp.add_test()
+def test_merkle_allowlist():
+    # Merkle mode: one root per token, proofs supplied at mint, minted counts written lazily.
+    scenario = sp.test_scenario("BowersMintAllowlist_merkle_allowlist", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersMintAllowlist(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.bytes("0x" + "ipfs://QmExample".encode("utf-8").hex()),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=sp.Some(10),
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        _sender=admin,
+    )
+
+    def leaf(account, max_qty, price_override):
+        return scenario.compute(sp.blake2b(sp.pack((account.address, (sp.nat(max_qty), price_override)))))
+
+    free = sp.Some(sp.tez(0))
+    full = sp.cast(None, sp.option[sp.mutez])
+    l_bob, l_alice, l_carol = leaf(bob, 2, free), leaf(alice, 1, full), leaf(carol, 1, full)
+    # Three leaves: the odd one is promoted unchanged to the next level.
+    n_01 = scenario.compute(sp.blake2b(l_bob + l_alice))
+    root = scenario.compute(sp.blake2b(n_01 + l_carol))
+    bob_proof = sp.record(max_qty=2, price_override=free, path=[sp.variant.right(l_alice), sp.variant.right(l_carol)])
+    alice_proof = sp.record(max_qty=1, price_override=full, path=[sp.variant.left(l_bob), sp.variant.right(l_carol)])
+    carol_proof = sp.record(max_qty=1, price_override=full, path=[sp.variant.left(n_01)])
+
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=sp.Some(bob_proof), _sender=bob, _valid=False, _exception="NOT_ALLOWLISTED")
+    c.set_allowlist_root(token_id=0, root=sp.Some(root), _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_allowlist_root(token_id=0, root=sp.Some(root), _sender=admin)
+
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=sp.Some(bob_proof), _sender=bob, _amount=sp.mutez(0))
+    scenario.verify(c.data.allowlist_minted[sp.record(token_id=0, epoch=0, address=bob.address)] == 2)
+    scenario.verify(~c.data.token_allowlist.contains(sp.record(token_id=0, epoch=0, address=bob.address)))
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=sp.Some(bob_proof), _sender=bob, _valid=False, _exception="ALLOWLIST_CAP")
+
+    # A proof only verifies for the sender and the exact (max_qty, price_override) it was built for.
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=sp.Some(bob_proof), _sender=alice, _valid=False, _exception="BAD_PROOF")
+    c.mint_editions(
+        token_id=0, qty=1, to_=alice.address, proof=sp.Some(sp.record(max_qty=5, price_override=full, path=alice_proof.path)),
+        _sender=alice, _amount=sp.tez(1), _valid=False, _exception="BAD_PROOF",
+    )
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=sp.Some(alice_proof), _sender=alice, _amount=sp.mutez(0), _valid=False, _exception="BAD_PAYMENT")
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=sp.Some(alice_proof), _sender=alice, _amount=sp.tez(1))
+    c.mint_editions(token_id=0, qty=1, to_=carol.address, proof=sp.Some(carol_proof), _sender=carol, _amount=sp.tez(1))
+    scenario.verify(c.data.ledger[sp.record(owner=carol.address, token_id=0)] == 1)
+
+    # Without a proof the per-address big_map is consulted as before.
+    c.mint_editions(token_id=0, qty=1, to_=carol.address, proof=None, _sender=carol, _amount=sp.tez(1), _valid=False, _exception="NOT_ALLOWLISTED")
+    c.set_allowlist_root(token_id=0, root=None, _sender=admin)
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=sp.Some(bob_proof), _sender=bob, _valid=False, _exception="NOT_ALLOWLISTED")
+
+
+@sp.add_test()
+def test_mint_quote():
+    # The quote carries the list entry's or proof's price and the caps left before the mint; after
+    # the allowlist phase it is the public price.
+    scenario = sp.test_scenario("BowersMintAllowlist_mint_quote", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersMintAllowlist(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmExample"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=sp.Some(10),
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        _sender=admin,
+    )
+    c.set_allowlist(
+        token_id=0,
+        entries=[sp.record(address=bob.address, max_qty=3, price_override=sp.Some(sp.mutez(500_000)))],
+        _sender=admin,
+    )
+    full = sp.cast(None, sp.option[sp.mutez])
+    root = scenario.compute(sp.blake2b(sp.pack((carol.address, (sp.nat(2), full)))))
+    carol_proof = sp.Some(sp.record(max_qty=2, price_override=full, path=[]))
+    c.set_allowlist_root(token_id=0, root=sp.Some(root), _sender=admin)
+
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.mutez(500_000))
+    scenario.verify_equal(
+        c.get_mint_quote(sp.record(token_id=0, qty=2, buyer=bob.address, proof=None)),
+        sp.record(total=sp.tez(1), allowlist_remaining=sp.Some(2), supply_remaining=sp.Some(9)),
+    )
+    scenario.verify_equal(
+        c.get_mint_quote(sp.record(token_id=0, qty=2, buyer=carol.address, proof=carol_proof)),
+        sp.record(total=sp.tez(2), allowlist_remaining=sp.Some(2), supply_remaining=sp.Some(9)),
+    )
+    c.mint_editions(token_id=0, qty=2, to_=carol.address, proof=carol_proof, _sender=carol, _amount=sp.tez(2))
+    scenario.verify(c.data.allowlist_minted[sp.record(token_id=0, epoch=0, address=carol.address)] == 2)
+
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=None, _sender=alice, _amount=sp.tez(1), _now=sp.timestamp(100))
+    scenario.verify_equal(
+        c.get_mint_quote(sp.record(token_id=0, qty=3, buyer=bob.address, proof=None)),
+        sp.record(total=sp.tez(3), allowlist_remaining=None, supply_remaining=sp.Some(6)),
+    )
+
+
+@sp.add_test()
+def test_allowlist_epochs():
+    # Entries and minted counts are keyed by the token's allowlist epoch: reset and clear are O(1),
+    # stale keys are ignored and can be pruned by anyone.
+    scenario = sp.test_scenario("BowersMintAllowlist_allowlist_epochs", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersMintAllowlist(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.bytes("0x" + "ipfs://QmExample".encode("utf-8").hex()),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=sp.Some(10),
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        _sender=admin,
+    )
+
+    c.set_allowlist(
+        token_id=0,
+        entries=[sp.record(address=bob.address, max_qty=2, price_override=sp.Some(sp.tez(0)))],
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.mutez(0))
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _valid=False, _exception="ALLOWLIST_CAP")
+
+    c.reset_allowlist(0, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.reset_allowlist(0, _sender=admin)
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _valid=False, _exception="NOT_ALLOWLISTED")
+    c.set_allowlist(
+        token_id=0,
+        entries=[sp.record(address=bob.address, max_qty=1, price_override=sp.Some(sp.tez(0)))],
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.mutez(0))
+    scenario.verify(c.data.token_allowlist[sp.record(token_id=0, epoch=1, address=bob.address)].minted == 1)
+
+    # A Merkle root survives reset_allowlist, so the same list runs again with fresh counts.
+    full = sp.cast(None, sp.option[sp.mutez])
+    root = scenario.compute(sp.blake2b(sp.pack((alice.address, (sp.nat(1), full)))))
+    alice_proof = sp.Some(sp.record(max_qty=1, price_override=full, path=[]))
+    c.set_allowlist_root(token_id=0, root=sp.Some(root), _sender=admin)
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=alice_proof, _sender=alice, _amount=sp.tez(1))
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=alice_proof, _sender=alice, _amount=sp.tez(1), _valid=False, _exception="ALLOWLIST_CAP")
+    c.reset_allowlist(0, _sender=admin)
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=alice_proof, _sender=alice, _amount=sp.tez(1))
+    scenario.verify(c.data.allowlist_minted[sp.record(token_id=0, epoch=2, address=alice.address)] == 1)
+
+    # Stale keys are removed; current-epoch keys and unknown tokens are skipped.
+    c.prune_allowlist(
+        [
+            sp.record(token_id=0, epoch=0, address=bob.address),
+            sp.record(token_id=0, epoch=1, address=bob.address),
+            sp.record(token_id=0, epoch=1, address=alice.address),
+            sp.record(token_id=0, epoch=2, address=alice.address),
+            sp.record(token_id=7, epoch=0, address=bob.address),
+        ],
+        _sender=carol,
+    )
+    scenario.verify(~c.data.token_allowlist.contains(sp.record(token_id=0, epoch=0, address=bob.address)))
+    scenario.verify(~c.data.token_allowlist.contains(sp.record(token_id=0, epoch=1, address=bob.address)))
+    scenario.verify(~c.data.allowlist_minted.contains(sp.record(token_id=0, epoch=1, address=alice.address)))
+    scenario.verify(c.data.allowlist_minted[sp.record(token_id=0, epoch=2, address=alice.address)] == 1)
+
+    # clear_allowlist ends the phase and drops the root; minting falls back to the public price.
+    c.clear_allowlist(0, _sender=admin)
+    scenario.verify(~c.data.allowlist_root.contains(0))
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(1))
+
+
+@sp.add_test()
+def test_withdraw_for():
+    # Public-phase mint proceeds are paid out by anyone; a contract creator is skipped.
+    scenario = sp.test_scenario("BowersMintAllowlist_withdraw_for", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersMintAllowlist(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    for creator in [alice.address, c.address]:
+        c.create_token(
+            metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmExample"),
+            creator=creator,
+            mint_price=sp.tez(1),
+            mint_end=None,
+            max_supply=None,
+            allowlist_end=None,
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            _sender=admin,
+        )
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(2))
+    c.mint_editions(token_id=1, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(1))
+
+    c.withdraw_for([alice.address], _sender=bob, _amount=sp.tez(1), _valid=False, _exception="NO_TEZ")
+    # Only alice is paid: bob has nothing owed and the contract creator is not implicit.
+    c.withdraw_for([alice.address, bob.address, c.address, alice.address], _sender=bob)
+    scenario.verify(~c.data.claimable.contains(alice.address))
+    scenario.verify(c.data.claimable[c.address] == sp.tez(1))
+    scenario.verify(c.balance == sp.tez(1))
+
+
+@sp.add_test()
+def test_batch_views():
+    # Batch views over balances, claimables and configs, answered in request order.
+    scenario = sp.test_scenario("BowersMintAllowlist_batch_views", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersMintAllowlist(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    for creator in [alice.address, bob.address]:
+        c.create_token(
+            metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmExample"),
+            creator=creator,
+            mint_price=sp.tez(1),
+            mint_end=None,
+            max_supply=None,
+            allowlist_end=None,
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            _sender=admin,
+        )
+    c.mint_editions(token_id=1, qty=1, to_=alice.address, proof=None, _sender=alice, _amount=sp.tez(1))
+
+    scenario.verify_equal(
+        c.get_balances([sp.record(owner=alice.address, token_id=0), sp.record(owner=alice.address, token_id=1)]),
+        [0, 1],
+    )
+    scenario.verify_equal(c.get_claimables([alice.address, bob.address]), [sp.mutez(0), sp.tez(1)])
+    scenario.verify_equal(c.get_token_configs([1, 2, 0]), [sp.Some(c.get_token_config(1)), None, sp.Some(c.get_token_config(0))])
+
+
+@sp.add_test()
+def test_supply_counters():
+    # Several transfers in one batch change each token's holder count once, by the end result.
+    scenario = sp.test_scenario("BowersMintAllowlist_supply_counters", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersMintAllowlist(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    for _ in range(2):
+        c.create_token(
+            metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmExample"),
+            creator=alice.address,
+            mint_price=sp.tez(1),
+            mint_end=None,
+            max_supply=None,
+            allowlist_end=None,
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            _sender=admin,
+        )
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(2))
+    c.mint_editions(token_id=1, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(1))
+    c.transfer(
+        [
+            sp.record(
+                from_=bob.address,
+                txs=[
+                    sp.record(to_=alice.address, token_id=0, amount=1),
+                    sp.record(to_=alice.address, token_id=1, amount=1),
+                    sp.record(to_=admin.address, token_id=0, amount=1),
+                ],
+            )
+        ],
+        _sender=bob,
+    )
+    scenario.verify_equal(c.get_token_supplies([0, 1]), [
+        sp.record(total_supply=2, holders=2),
+        sp.record(total_supply=1, holders=1),
+    ])
@@ -10,8 +10,11 @@ def main():
     BalanceOfRequestType: type = sp.record(owner=sp.address, token_id=sp.nat)
     BalanceOfResponseType: type = sp.record(request=BalanceOfRequestType, balance=sp.nat)
     LedgerKeyType: type = sp.record(owner=sp.address, token_id=sp.nat)
+    SupplyType: type = sp.record(total_supply=sp.nat, holders=sp.nat)
     OperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address, token_id=sp.nat)
     OperatorParamType: type = sp.variant(add_operator=OperatorKeyType, remove_operator=OperatorKeyType)
+    AllOperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address)
+    AllOperatorParamType: type = sp.variant(add_operator=AllOperatorKeyType, remove_operator=AllOperatorKeyType)
     TransferTxType: type = sp.record(to_=sp.address, token_id=sp.nat, amount=sp.nat)
     TransferBatchItemType: type = sp.record(from_=sp.address, txs=sp.list[TransferTxType])
 
@@ -28,17 +31,54 @@ def main():
         royalty_bps=sp.nat,
     )
 
+    # get_mint_quote result: remaining counts are before the quoted mint, None when uncapped.
+    MintQuoteType: type = sp.record(total=sp.mutez, allowlist_remaining=sp.option[sp.nat], supply_remaining=sp.option[sp.nat])
+    # _mint_check result: the quote plus the token's config, which holds its mint state.
+    MintCheckType: type = sp.record(quote=MintQuoteType, config=TokenConfigType)
+
+    # Bonding-curve pricing: edition e costs base_price + price_increment * (e // step_size).
+    # step_index_sum(n) is the sum of (e // step_size) over e in [0, n): the k complete steps
+    # contribute step_size * (0 + 1 + ... + (k - 1)) and the partial step contributes r * k.
+    def step_index_sum(p):
+        sp.cast(p, sp.record(n=sp.nat, step_size=sp.nat))
+        qr = sp.ediv(p.n, p.step_size).unwrap_some()
+        k = sp.fst(qr)
+        r = sp.snd(qr)
+        return p.step_size * sp.fst(sp.ediv(sp.as_nat(k * k - k), 2).unwrap_some()) + r * k
+
+    # Exact total for editions [minted, minted + qty), in O(1) instead of one step per edition.
+    def curve_total(p):
+        sp.cast(
+            p,
+            sp.record(
+                minted=sp.nat,
+                qty=sp.nat,
+                base_price=sp.mutez,
+                price_increment=sp.mutez,
+                step_size=sp.nat,
+            ),
+        )
+        hi = step_index_sum(sp.record(n=p.minted + p.qty, step_size=p.step_size))
+        lo = step_index_sum(sp.record(n=p.minted, step_size=p.step_size))
+        return sp.split_tokens(p.base_price, p.qty, 1) + sp.split_tokens(p.price_increment, sp.as_nat(hi - lo), 1)
+
     class BowersMintBondingCurve(sp.Contract):
         def __init__(self, admin, metadata):
             self.data.admin = admin
             self.data.metadata = metadata
             self.data.ledger = sp.cast(sp.big_map(), sp.big_map[LedgerKeyType, sp.nat])
+            self.data.token_supply = sp.cast(sp.big_map(), sp.big_map[sp.nat, SupplyType])
             self.data.token_metadata = sp.cast(
                 sp.big_map(),
                 sp.big_map[sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes])],
             )
+            # Optional shared base URI: when set, tokens store only a URI suffix (or nothing) and
+            # TZIP-12 metadata is served by the token_metadata off-chain view.
+            self.data.base_uri = sp.bytes("0x")
+            self.data.token_uri_suffix = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.bytes])
             self.data.token_config = sp.cast(sp.big_map(), sp.big_map[sp.nat, TokenConfigType])
             self.data.operators = sp.cast(sp.big_map(), sp.big_map[OperatorKeyType, sp.unit])
+            self.data.all_operators = sp.cast(sp.big_map(), sp.big_map[AllOperatorKeyType, sp.unit])
             self.data.next_token_id = sp.nat(0)
             self.data.claimable = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.mutez])
             self.data.contract_blocklist = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.unit])
@@ -67,31 +107,84 @@ def main():
                         assert op in self.data.operators, "NO_OP"
                         del self.data.operators[op]
 
+        @sp.entrypoint
+        def update_all_operators(self, actions):
+            # Owner-level operators: one entry approves the operator for all of the owner's tokens.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(actions, sp.list[AllOperatorParamType])
+            for action in actions:
+                match action:
+                    case add_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        self.data.all_operators[op] = ()
+                    case remove_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        assert op in self.data.all_operators, "NO_OP"
+                        del self.data.all_operators[op]
+
         @sp.entrypoint
         def transfer(self, batch):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(batch, sp.list[TransferBatchItemType])
+            # Balances touched by the batch are read from the ledger once and written back once at
+            # the end; addresses cleared against contract_blocklist are not looked up again.
+            balances = sp.cast({}, sp.map[LedgerKeyType, sp.nat])
+            # Recipients whose balance was zero before the batch; comparing them with the final
+            # balances gives each token's holder change.
+            fresh = sp.cast(set(), sp.set[LedgerKeyType])
+            cleared = sp.cast(set(), sp.set[sp.address])
             for item in batch:
                 from_ = item.from_
-                for tx in item.txs:
+                if not (from_ in cleared):
                     assert not (from_ in self.data.contract_blocklist), "BLOCKED"
-                    assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
-                    if from_ != sp.sender:
-                        assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                    cleared.add(from_)
+                # Checked once per batch item; per-token entries are only read without an owner-level
+                # operator, once per token.
+                all_tokens = from_ == sp.sender
+                if not all_tokens:
+                    all_tokens = sp.record(owner=from_, operator=sp.sender) in self.data.all_operators
+                approved = sp.cast(set(), sp.set[sp.nat])
+                for tx in item.txs:
+                    if not (tx.to_ in cleared):
+                        assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
+                        cleared.add(tx.to_)
+                    if not all_tokens:
+                        if not (tx.token_id in approved):
+                            assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                            approved.add(tx.token_id)
                     assert tx.amount > 0, "BAD_AMOUNT"
                     fk = sp.record(owner=from_, token_id=tx.token_id)
-                    fb = self.data.ledger.get(fk, default=sp.nat(0))
+                    fb = balances.get(fk, default=sp.nat(0))
+                    if not (fk in balances):
+                        fb = self.data.ledger.get(fk, default=sp.nat(0))
                     assert fb >= tx.amount, "LOW_BAL"
                     nfb = sp.as_nat(fb - tx.amount)
-                    if nfb == 0:
-                        if fk in self.data.ledger:
-                            del self.data.ledger[fk]
-                    else:
-                        self.data.ledger[fk] = nfb
+                    balances[fk] = nfb
                     tk = sp.record(owner=tx.to_, token_id=tx.token_id)
-                    tb = self.data.ledger.get(tk, default=sp.nat(0))
-                    self.data.ledger[tk] = tb + tx.amount
-                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, a=tx.amount), tag="xfer")
+                    tb = balances.get(tk, default=sp.nat(0))
+                    if not (tk in balances):
+                        tb = self.data.ledger.get(tk, default=sp.nat(0))
+                        if tb == 0:
+                            fresh.add(tk)
+                    balances[tk] = tb + tx.amount
+                    # Activity events (xfer, mint, buy, accept, list, offer, close) share one set of short keys;
+                    # event-schemas.json maps each to its field name.
+                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, q=tx.amount), tag="xfer")
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            for entry in balances.items():
+                tid = entry.key.token_id
+                if entry.value == 0:
+                    del self.data.ledger[entry.key]
+                    if not (entry.key in fresh):
+                        holders[tid] = holders.get(tid, default=0) - 1
+                else:
+                    self.data.ledger[entry.key] = entry.value
+                    if entry.key in fresh:
+                        holders[tid] = holders.get(tid, default=0) + 1
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
 
         @sp.entrypoint
         def set_admin(self, new_admin):
@@ -99,6 +192,15 @@ def main():
             sp.cast(new_admin, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.admin = new_admin
+            sp.emit(new_admin, tag="admin")
+
+        @sp.entrypoint
+        def set_base_uri(self, base_uri):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(base_uri, sp.bytes)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.base_uri = base_uri
+            sp.emit(base_uri, tag="base_uri")
 
         @sp.entrypoint
         def create_token(self, params):
@@ -125,10 +227,14 @@ def main():
             tid = self.data.next_token_id
             self.data.next_token_id += 1
 
-            token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
-            self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            if self.data.base_uri == sp.bytes("0x"):
+                token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
+                self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            else:
+                if params.metadata_uri != sp.bytes("0x"):
+                    self.data.token_uri_suffix[tid] = params.metadata_uri
 
-            self.data.token_config[tid] = sp.record(
+            cfg = sp.record(
                 creator=params.creator,
                 base_price=params.base_price,
                 price_increment=params.price_increment,
@@ -140,6 +246,9 @@ def main():
                 royalty_recipient=params.royalty_recipient,
                 royalty_bps=params.royalty_bps,
             )
+            self.data.token_config[tid] = cfg
+            # mint_end repeats the config's so token_created has the same fields in every contract.
+            sp.emit(sp.record(token_id=tid, config=cfg, mint_end=params.mint_end), tag="token_created")
 
         @sp.entrypoint
         def set_mint_paused(self, params):
@@ -150,6 +259,7 @@ def main():
             cfg = self.data.token_config[params.token_id]
             cfg.mint_paused = params.paused
             self.data.token_config[params.token_id] = cfg
+            sp.emit(sp.record(token_id=params.token_id, paused=params.paused), tag="mint_paused")
 
         @sp.entrypoint
         def set_mint_end(self, params):
@@ -160,12 +270,14 @@ def main():
             cfg = self.data.token_config[params.token_id]
             cfg.mint_end = params.mint_end
             self.data.token_config[params.token_id] = cfg
+            sp.emit(sp.record(token_id=params.token_id, mint_end=params.mint_end), tag="mint_end")
 
-        @sp.entrypoint
-        def mint_editions(self, params):
-            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, to_=sp.address))
+        @sp.private(with_storage="read-only")
+        def _mint_check(self, params):
+            # Supply cap, mint window and curve price for qty editions; mint_editions charges the
+            # quote and get_mint_quote returns it.
+            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat))
             assert params.qty > 0, "BAD_QTY"
-            assert not (params.to_ in self.data.contract_blocklist), "BLOCKED"
             assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
             cfg = self.data.token_config[params.token_id]
 
@@ -175,26 +287,47 @@ def main():
                 assert sp.now <= me.unwrap_some(), "MINT_CLOSED"
             assert not cfg.mint_paused, "MINT_CLOSED"
 
-            total = sp.mutez(0)
-            i = sp.nat(0)
-            while i < params.qty:
-                edition_index = cfg.minted + i
-                step_index = sp.fst(sp.ediv(edition_index, cfg.step_size).unwrap_some())
-                total = total + cfg.base_price + sp.split_tokens(cfg.price_increment, step_index, 1)
-                i += 1
+            total = curve_total(
+                sp.record(
+                    minted=cfg.minted,
+                    qty=params.qty,
+                    base_price=cfg.base_price,
+                    price_increment=cfg.price_increment,
+                    step_size=cfg.step_size,
+                )
+            )
+            return sp.cast(
+                sp.record(
+                    quote=sp.record(total=total, allowlist_remaining=None, supply_remaining=sp.Some(sp.as_nat(cfg.max_supply - cfg.minted))),
+                    config=cfg,
+                ),
+                MintCheckType,
+            )
 
+        @sp.entrypoint
+        def mint_editions(self, params):
+            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, to_=sp.address))
+            assert not (params.to_ in self.data.contract_blocklist), "BLOCKED"
+            chk = self._mint_check(sp.record(token_id=params.token_id, qty=params.qty))
+            total = chk.quote.total
             assert sp.amount == total, "BAD_PAYMENT"
 
-            self.data.ledger[sp.record(owner=params.to_, token_id=params.token_id)] = (
-                self.data.ledger.get(sp.record(owner=params.to_, token_id=params.token_id), default=sp.nat(0))
-                + params.qty
-            )
+            cfg = chk.config
+
+            lk = sp.record(owner=params.to_, token_id=params.token_id)
+            lb = self.data.ledger.get(lk, default=sp.nat(0))
+            self.data.ledger[lk] = lb + params.qty
+            sup = self.data.token_supply.get(params.token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0)))
+            sup.total_supply += params.qty
+            if lb == 0:
+                sup.holders += 1
+            self.data.token_supply[params.token_id] = sup
             self.data.claimable[cfg.creator] = (
                 self.data.claimable.get(cfg.creator, default=sp.mutez(0)) + total
             )
             cfg.minted = cfg.minted + params.qty
             self.data.token_config[params.token_id] = cfg
-            sp.emit(sp.record(token_id=params.token_id, to_=params.to_, qty=params.qty, paid=total), tag="mint")
+            sp.emit(sp.record(i=params.token_id, t=params.to_, q=params.qty, p=total, a=sp.fst(sp.ediv(total, params.qty).unwrap_some()), c=cfg.creator), tag="mint")
 
         @sp.entrypoint
         def block_address(self, address):
@@ -202,6 +335,7 @@ def main():
             sp.cast(address, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.contract_blocklist[address] = ()
+            sp.emit(sp.record(address=address, blocked=True), tag="blocklist")
 
         @sp.entrypoint
         def unblock_address(self, address):
@@ -210,30 +344,107 @@ def main():
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             if address in self.data.contract_blocklist:
                 del self.data.contract_blocklist[address]
+            sp.emit(sp.record(address=address, blocked=False), tag="blocklist")
 
         @sp.entrypoint
         def withdraw(self):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             amount = self.data.claimable.get(sp.sender, default=sp.mutez(0))
             assert amount > sp.mutez(0), "NO_FUNDS"
-            self.data.claimable[sp.sender] = sp.mutez(0)
+            del self.data.claimable[sp.sender]
             sp.send(sp.sender, amount)
 
+        @sp.entrypoint
+        def withdraw_for(self, recipients):
+            # Batch payout of creators' curve mint proceeds. Only implicit accounts receive tez here,
+            # since a contract recipient could fail and revert the batch; contracts use withdraw.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(recipients, sp.list[sp.address])
+            for recipient in recipients:
+                if sp.is_implicit_account(recipient).is_some():
+                    if recipient in self.data.claimable:
+                        amount = self.data.claimable[recipient]
+                        del self.data.claimable[recipient]
+                        if amount > sp.mutez(0):
+                            sp.send(recipient, amount)
+
+        @sp.offchain_view
+        def token_metadata(self, token_id):
+            """TZIP-12 token metadata: the stored token_info, else base_uri + suffix (default: the decimal token id)."""
+            sp.cast(token_id, sp.nat)
+            if token_id in self.data.token_metadata:
+                return self.data.token_metadata[token_id]
+            else:
+                assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+                suffix = self.data.token_uri_suffix.get(token_id, default=sp.bytes("0x"))
+                if suffix == sp.bytes("0x"):
+                    digits = sp.bytes("0x30313233343536373839")
+                    qr = sp.ediv(token_id, 10).unwrap_some()
+                    suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some()
+                    n = sp.fst(qr)
+                    while n > 0:
+                        qr = sp.ediv(n, 10).unwrap_some()
+                        suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some() + suffix
+                        n = sp.fst(qr)
+                return sp.record(
+                    token_id=token_id,
+                    token_info={"": self.data.base_uri + suffix, "decimals": sp.bytes("0x30")},
+                )
+
         @sp.onchain_view
         def get_balance(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat))
             return self.data.ledger.get(sp.record(owner=params.owner, token_id=params.token_id), default=sp.nat(0))
 
+        @sp.onchain_view
+        def get_balances(self, requests):
+            sp.cast(requests, sp.list[LedgerKeyType])
+            balances = []
+            for req in requests:
+                balances.push(self.data.ledger.get(req, default=sp.nat(0)))
+            return reversed(balances)
+
+        @sp.onchain_view
+        def total_supply(self, token_id):
+            sp.cast(token_id, sp.nat)
+            assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+            return self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))).total_supply
+
+        @sp.onchain_view
+        def get_token_supplies(self, token_ids):
+            # Supply equals editions sold on the curve; holders counts addresses with a non-zero balance.
+            sp.cast(token_ids, sp.list[sp.nat])
+            supplies = []
+            for token_id in token_ids:
+                supplies.push(self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))))
+            return reversed(supplies)
+
         @sp.onchain_view
         def get_claimable(self, addr):
             sp.cast(addr, sp.address)
             return self.data.claimable.get(addr, default=sp.mutez(0))
 
+        @sp.onchain_view
+        def get_claimables(self, addrs):
+            sp.cast(addrs, sp.list[sp.address])
+            amounts = []
+            for addr in addrs:
+                amounts.push(self.data.claimable.get(addr, default=sp.mutez(0)))
+            return reversed(amounts)
+
         @sp.onchain_view
         def get_token_config(self, token_id):
             sp.cast(token_id, sp.nat)
             return self.data.token_config[token_id]
 
+        @sp.onchain_view
+        def get_token_configs(self, token_ids):
+            sp.cast(token_ids, sp.list[sp.nat])
+            configs = []
+            for token_id in token_ids:
+                configs.push(self.data.token_config.get_opt(token_id))
+            return reversed(configs)
+
         @sp.onchain_view
         def get_current_price(self, token_id):
             sp.cast(token_id, sp.nat)
@@ -241,6 +452,20 @@ def main():
             step_index = sp.fst(sp.ediv(cfg.minted, cfg.step_size).unwrap_some())
             return cfg.base_price + sp.split_tokens(cfg.price_increment, step_index, 1)
 
+        @sp.onchain_view
+        def get_mint_quote(self, params):
+            """What mint_editions would charge for qty editions now, failing where it would."""
+            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, buyer=sp.address))
+            return self._mint_check(sp.record(token_id=params.token_id, qty=params.qty)).quote
+
+
+def loop_curve_total(minted, qty, base_price, price_increment, step_size):
+    # Reference: the per-edition loop mint_editions used before the closed-form sum (mutez).
+    total = 0
+    for i in range(qty):
+        total += base_price + price_increment * ((minted + i) // step_size)
+    return total
+
 
 @sp.add_test()
 def test():
@@ -268,3 +493,247 @@ def test():
     )
 
     c.mint_editions(token_id=0, qty=10, to_=alice.address, _sender=alice, _amount=sp.tez(10))
+
+
+@sp.add_test()
+def test_curve_pricing():
+    # Closed-form curve_total must charge exactly what the old per-edition loop charged,
+    # across step sizes and for mints that start and end mid-step.
+    scenario = sp.test_scenario("BowersMintBondingCurve_curve_pricing", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    c = main.BowersMintBondingCurve(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    base_price = 1_234_567
+    price_increment = 98_765
+    token_id = 0
+    for step_size in [1, 2, 3, 7, 10, 64]:
+        c.create_token(
+            metadata_uri=sp.bytes("0x" + "ipfs://QmCurve".encode("utf-8").hex()),
+            creator=alice.address,
+            base_price=sp.mutez(base_price),
+            price_increment=sp.mutez(price_increment),
+            step_size=step_size,
+            max_supply=200,
+            mint_end=None,
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            _sender=admin,
+        )
+        minted = 0
+        for qty in [1, 2, 5, 9, 13, 30, 64]:
+            total = loop_curve_total(minted, qty, base_price, price_increment, step_size)
+            c.mint_editions(
+                token_id=token_id, qty=qty, to_=alice.address,
+                _sender=alice, _amount=sp.mutez(total - 1), _valid=False, _exception="BAD_PAYMENT",
+            )
+            c.mint_editions(token_id=token_id, qty=qty, to_=alice.address, _sender=alice, _amount=sp.mutez(total))
+            minted += qty
+        scenario.verify(c.data.token_config[token_id].minted == minted)
+        token_id += 1
+
+
+@sp.add_test()
+def test_mint_quote():
+    # The quote is the curve total and supply headroom; mint_editions accepts exactly that total.
+    scenario = sp.test_scenario("BowersMintBondingCurve_mint_quote", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersMintBondingCurve(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmCurve"),
+        creator=alice.address,
+        base_price=sp.mutez(1_000_000),
+        price_increment=sp.mutez(100_000),
+        step_size=3,
+        max_supply=10,
+        mint_end=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=4, to_=bob.address, _sender=bob, _amount=sp.mutez(loop_curve_total(0, 4, 1_000_000, 100_000, 3)))
+    total = loop_curve_total(4, 5, 1_000_000, 100_000, 3)
+    scenario.verify_equal(
+        c.get_mint_quote(sp.record(token_id=0, qty=5, buyer=bob.address)),
+        sp.record(total=sp.mutez(total), allowlist_remaining=None, supply_remaining=sp.Some(6)),
+    )
+    c.mint_editions(token_id=0, qty=5, to_=bob.address, _sender=bob, _amount=sp.mutez(total))
+    scenario.verify(c.data.token_config[0].minted == 9)
+
+
+@sp.add_test()
+def test_base_uri():
+    # With a base URI set, new tokens store only a suffix (or nothing) and their
+    # TZIP-12 metadata is rebuilt by the token_metadata off-chain view.
+    scenario = sp.test_scenario("BowersMintBondingCurve_base_uri", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    c = main.BowersMintBondingCurve(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmFull"),
+        creator=alice.address,
+        base_price=sp.tez(1),
+        price_increment=sp.mutez(100_000),
+        step_size=10,
+        max_supply=100,
+        mint_end=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        _sender=admin,
+    )
+
+    base = sp.scenario_utils.bytes_of_string("ipfs://QmBase/")
+    c.set_base_uri(base, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_base_uri(base, _sender=admin)
+    for _ in range(11):
+        c.create_token(
+            metadata_uri=sp.bytes("0x"),
+            creator=alice.address,
+            base_price=sp.tez(1),
+            price_increment=sp.mutez(100_000),
+            step_size=10,
+            max_supply=100,
+            mint_end=None,
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            _sender=admin,
+        )
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("custom.json"),
+        creator=alice.address,
+        base_price=sp.tez(1),
+        price_increment=sp.mutez(100_000),
+        step_size=10,
+        max_supply=100,
+        mint_end=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        _sender=admin,
+    )
+
+    scenario.verify(c.token_metadata(0).token_info[""] == sp.scenario_utils.bytes_of_string("ipfs://QmFull"))
+    scenario.verify(~c.data.token_metadata.contains(1))
+    scenario.verify(~c.data.token_uri_suffix.contains(1))
+    scenario.verify(c.token_metadata(1).token_info[""] == base + sp.scenario_utils.bytes_of_string("1"))
+    scenario.verify(c.token_metadata(11).token_info[""] == base + sp.scenario_utils.bytes_of_string("11"))
+    scenario.verify(c.token_metadata(11).token_info["decimals"] == sp.bytes("0x30"))
+    scenario.verify(c.token_metadata(12).token_info[""] == base + sp.scenario_utils.bytes_of_string("custom.json"))
+
+
+@sp.add_test()
+def test_withdraw_for():
+    # Curve mint proceeds are paid out by anyone; a contract creator is skipped.
+    scenario = sp.test_scenario("BowersMintBondingCurve_withdraw_for", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersMintBondingCurve(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    for creator in [alice.address, c.address]:
+        c.create_token(
+            metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmCurve"),
+            creator=creator,
+            base_price=sp.tez(1),
+            price_increment=sp.mutez(100_000),
+            step_size=10,
+            max_supply=100,
+            mint_end=None,
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            _sender=admin,
+        )
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, _sender=bob, _amount=sp.tez(2))
+    c.mint_editions(token_id=1, qty=1, to_=bob.address, _sender=bob, _amount=sp.tez(1))
+
+    c.withdraw_for([alice.address], _sender=bob, _amount=sp.tez(1), _valid=False, _exception="NO_TEZ")
+    # The contract creator's curve revenue stays in claimable; the implicit creator is paid.
+    c.withdraw_for([alice.address, bob.address, c.address, alice.address], _sender=bob)
+    scenario.verify(~c.data.claimable.contains(alice.address))
+    scenario.verify(c.data.claimable[c.address] == sp.tez(1))
+    scenario.verify(c.balance == sp.tez(1))
+
+
+@sp.add_test()
+def test_batch_views():
+    # Balances, claimables and curve configs for many keys, with None for unknown tokens.
+    scenario = sp.test_scenario("BowersMintBondingCurve_batch_views", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersMintBondingCurve(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmCurve"),
+        creator=alice.address,
+        base_price=sp.tez(1),
+        price_increment=sp.mutez(100_000),
+        step_size=1,
+        max_supply=100,
+        mint_end=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        _sender=admin,
+    )
+    # Editions 0 and 1 cost 1 and 1.1 tez.
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, _sender=bob, _amount=sp.mutez(2_100_000))
+
+    scenario.verify_equal(c.get_balances([sp.record(owner=bob.address, token_id=0)]), [2])
+    scenario.verify_equal(c.get_claimables([bob.address, alice.address]), [sp.mutez(0), sp.mutez(2_100_000)])
+    scenario.verify_equal(c.get_token_configs([5, 0]), [None, sp.Some(c.get_token_config(0))])
+
+
+@sp.add_test()
+def test_supply_counters():
+    # Total supply tracks editions sold on the curve; holders count non-zero balances.
+    scenario = sp.test_scenario("BowersMintBondingCurve_supply_counters", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersMintBondingCurve(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmCurve"),
+        creator=alice.address,
+        base_price=sp.tez(1),
+        price_increment=sp.mutez(100_000),
+        step_size=10,
+        max_supply=100,
+        mint_end=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, _sender=bob, _amount=sp.tez(2))
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, _sender=alice, _amount=sp.tez(1))
+    scenario.verify_equal(c.get_token_supplies([0]), [sp.record(total_supply=3, holders=2)])
+    c.transfer([sp.record(from_=alice.address, txs=[sp.record(to_=bob.address, token_id=0, amount=1)])], _sender=alice)
+    scenario.verify_equal(c.get_token_supplies([0]), [sp.record(total_supply=3, holders=1)])
+    scenario.verify(c.total_supply(0) == 3)
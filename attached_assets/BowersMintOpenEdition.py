@@ -10,8 +10,11 @@ def main():
     BalanceOfRequestType: type = sp.record(owner=sp.address, token_id=sp.nat)
     BalanceOfResponseType: type = sp.record(request=BalanceOfRequestType, balance=sp.nat)
     LedgerKeyType: type = sp.record(owner=sp.address, token_id=sp.nat)
+    SupplyType: type = sp.record(total_supply=sp.nat, holders=sp.nat)
     OperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address, token_id=sp.nat)
     OperatorParamType: type = sp.variant(add_operator=OperatorKeyType, remove_operator=OperatorKeyType)
+    AllOperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address)
+    AllOperatorParamType: type = sp.variant(add_operator=AllOperatorKeyType, remove_operator=AllOperatorKeyType)
     TransferTxType: type = sp.record(to_=sp.address, token_id=sp.nat, amount=sp.nat)
     TransferBatchItemType: type = sp.record(from_=sp.address, txs=sp.list[TransferTxType])
 
@@ -31,9 +34,15 @@ def main():
             self.data.admin = admin
             self.data.metadata = metadata
             self.data.ledger = sp.cast(sp.big_map(), sp.big_map[LedgerKeyType, sp.nat])
+            self.data.token_supply = sp.cast(sp.big_map(), sp.big_map[sp.nat, SupplyType])
             self.data.token_metadata = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes])])
+            # Optional shared base URI: when set, tokens store only a URI suffix (or nothing) and
+            # TZIP-12 metadata is served by the token_metadata off-chain view.
+            self.data.base_uri = sp.bytes("0x")
+            self.data.token_uri_suffix = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.bytes])
             self.data.token_config = sp.cast(sp.big_map(), sp.big_map[sp.nat, TokenConfigType])
             self.data.operators = sp.cast(sp.big_map(), sp.big_map[OperatorKeyType, sp.unit])
+            self.data.all_operators = sp.cast(sp.big_map(), sp.big_map[AllOperatorKeyType, sp.unit])
             self.data.next_token_id = sp.nat(0)
             self.data.claimable = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.mutez])
             self.data.contract_blocklist = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.unit])
@@ -62,31 +71,84 @@ def main():
                         assert op in self.data.operators, "NO_OP"
                         del self.data.operators[op]
 
+        @sp.entrypoint
+        def update_all_operators(self, actions):
+            # Owner-level operators: one entry approves the operator for all of the owner's tokens.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(actions, sp.list[AllOperatorParamType])
+            for action in actions:
+                match action:
+                    case add_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        self.data.all_operators[op] = ()
+                    case remove_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        assert op in self.data.all_operators, "NO_OP"
+                        del self.data.all_operators[op]
+
         @sp.entrypoint
         def transfer(self, batch):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(batch, sp.list[TransferBatchItemType])
+            # Balances touched by the batch are read from the ledger once and written back once at
+            # the end; addresses cleared against contract_blocklist are not looked up again.
+            balances = sp.cast({}, sp.map[LedgerKeyType, sp.nat])
+            # Keys first seen empty in this batch; whether they end up holding decides the holder
+            # change for their token, counted once when balances are written back.
+            fresh = sp.cast(set(), sp.set[LedgerKeyType])
+            cleared = sp.cast(set(), sp.set[sp.address])
             for item in batch:
                 from_ = item.from_
-                for tx in item.txs:
+                if not (from_ in cleared):
                     assert not (from_ in self.data.contract_blocklist), "BLOCKED"
-                    assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
-                    if from_ != sp.sender:
-                        assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                    cleared.add(from_)
+                # Checked once per batch item; per-token entries are only read without an owner-level
+                # operator, once per token.
+                all_tokens = from_ == sp.sender
+                if not all_tokens:
+                    all_tokens = sp.record(owner=from_, operator=sp.sender) in self.data.all_operators
+                approved = sp.cast(set(), sp.set[sp.nat])
+                for tx in item.txs:
+                    if not (tx.to_ in cleared):
+                        assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
+                        cleared.add(tx.to_)
+                    if not all_tokens:
+                        if not (tx.token_id in approved):
+                            assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                            approved.add(tx.token_id)
                     assert tx.amount > 0, "BAD_AMOUNT"
                     fk = sp.record(owner=from_, token_id=tx.token_id)
-                    fb = self.data.ledger.get(fk, default=sp.nat(0))
+                    fb = balances.get(fk, default=sp.nat(0))
+                    if not (fk in balances):
+                        fb = self.data.ledger.get(fk, default=sp.nat(0))
                     assert fb >= tx.amount, "LOW_BAL"
                     nfb = sp.as_nat(fb - tx.amount)
-                    if nfb == 0:
-                        if fk in self.data.ledger:
-                            del self.data.ledger[fk]
-                    else:
-                        self.data.ledger[fk] = nfb
+                    balances[fk] = nfb
                     tk = sp.record(owner=tx.to_, token_id=tx.token_id)
-                    tb = self.data.ledger.get(tk, default=sp.nat(0))
-                    self.data.ledger[tk] = tb + tx.amount
-                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, a=tx.amount), tag="xfer")
+                    tb = balances.get(tk, default=sp.nat(0))
+                    if not (tk in balances):
+                        tb = self.data.ledger.get(tk, default=sp.nat(0))
+                        if tb == 0:
+                            fresh.add(tk)
+                    balances[tk] = tb + tx.amount
+                    # Activity events (xfer, mint, buy, accept, list, offer, close) share one set of short keys;
+                    # event-schemas.json maps each to its field name.
+                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, q=tx.amount), tag="xfer")
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            for entry in balances.items():
+                tid = entry.key.token_id
+                if entry.value == 0:
+                    del self.data.ledger[entry.key]
+                    if not (entry.key in fresh):
+                        holders[tid] = holders.get(tid, default=0) - 1
+                else:
+                    self.data.ledger[entry.key] = entry.value
+                    if entry.key in fresh:
+                        holders[tid] = holders.get(tid, default=0) + 1
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
 
         @sp.entrypoint
         def set_admin(self, new_admin):
@@ -94,6 +156,15 @@ def main():
             sp.cast(new_admin, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.admin = new_admin
+            sp.emit(new_admin, tag="admin")
+
+        @sp.entrypoint
+        def set_base_uri(self, base_uri):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(base_uri, sp.bytes)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.base_uri = base_uri
+            sp.emit(base_uri, tag="base_uri")
 
         @sp.entrypoint
         def create_token(self, params):
@@ -116,10 +187,14 @@ def main():
             tid = self.data.next_token_id
             self.data.next_token_id += 1
 
-            token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
-            self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            if self.data.base_uri == sp.bytes("0x"):
+                token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
+                self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            else:
+                if params.metadata_uri != sp.bytes("0x"):
+                    self.data.token_uri_suffix[tid] = params.metadata_uri
 
-            self.data.token_config[tid] = sp.record(
+            cfg = sp.record(
                 creator=params.creator,
                 mint_price=params.mint_price,
                 mint_end=params.mint_end,
@@ -129,6 +204,9 @@ def main():
                 royalty_recipient=params.royalty_recipient,
                 royalty_bps=params.royalty_bps,
             )
+            self.data.token_config[tid] = cfg
+            # mint_end repeats the config's so token_created has the same fields in every contract.
+            sp.emit(sp.record(token_id=tid, config=cfg, mint_end=params.mint_end), tag="token_created")
 
         @sp.entrypoint
         def set_mint_price(self, params):
@@ -139,6 +217,7 @@ def main():
             cfg = self.data.token_config[params.token_id]
             cfg.mint_price = params.mint_price
             self.data.token_config[params.token_id] = cfg
+            sp.emit(sp.record(token_id=params.token_id, mint_price=params.mint_price), tag="mint_price")
 
         @sp.entrypoint
         def set_mint_end(self, params):
@@ -149,6 +228,7 @@ def main():
             cfg = self.data.token_config[params.token_id]
             cfg.mint_end = params.mint_end
             self.data.token_config[params.token_id] = cfg
+            sp.emit(sp.record(token_id=params.token_id, mint_end=params.mint_end), tag="mint_end")
 
         @sp.entrypoint
         def set_mint_paused(self, params):
@@ -159,6 +239,7 @@ def main():
             cfg = self.data.token_config[params.token_id]
             cfg.mint_paused = params.paused
             self.data.token_config[params.token_id] = cfg
+            sp.emit(sp.record(token_id=params.token_id, paused=params.paused), tag="mint_paused")
 
         @sp.entrypoint
         def mint_editions(self, params):
@@ -182,12 +263,18 @@ def main():
             assert sp.amount == total_price, "BAD_PAYMENT"
 
             lk = sp.record(owner=params.to_, token_id=params.token_id)
-            self.data.ledger[lk] = self.data.ledger.get(lk, default=sp.nat(0)) + params.qty
+            lb = self.data.ledger.get(lk, default=sp.nat(0))
+            self.data.ledger[lk] = lb + params.qty
+            sup = self.data.token_supply.get(params.token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0)))
+            sup.total_supply += params.qty
+            if lb == 0:
+                sup.holders += 1
+            self.data.token_supply[params.token_id] = sup
             self.data.claimable[cfg.creator] = self.data.claimable.get(cfg.creator, default=sp.mutez(0)) + total_price
 
             cfg.minted = cfg.minted + params.qty
             self.data.token_config[params.token_id] = cfg
-            sp.emit(sp.record(token_id=params.token_id, to_=params.to_, qty=params.qty, paid=total_price), tag="mint")
+            sp.emit(sp.record(i=params.token_id, t=params.to_, q=params.qty, p=total_price, a=sp.fst(sp.ediv(total_price, params.qty).unwrap_some()), c=cfg.creator), tag="mint")
 
         @sp.entrypoint
         def block_address(self, address):
@@ -195,6 +282,7 @@ def main():
             sp.cast(address, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.contract_blocklist[address] = ()
+            sp.emit(sp.record(address=address, blocked=True), tag="blocklist")
 
         @sp.entrypoint
         def unblock_address(self, address):
@@ -203,30 +291,108 @@ def main():
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             if address in self.data.contract_blocklist:
                 del self.data.contract_blocklist[address]
+            sp.emit(sp.record(address=address, blocked=False), tag="blocklist")
 
         @sp.entrypoint
         def withdraw(self):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             amount = self.data.claimable.get(sp.sender, default=sp.mutez(0))
             assert amount > sp.mutez(0), "NO_FUNDS"
-            self.data.claimable[sp.sender] = sp.mutez(0)
+            del self.data.claimable[sp.sender]
             sp.send(sp.sender, amount)
 
+        @sp.entrypoint
+        def withdraw_for(self, recipients):
+            # Sends creators their mint proceeds without each of them calling withdraw. Only
+            # implicit accounts are paid; a contract creator could make the whole batch fail, so it
+            # withdraws on its own.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(recipients, sp.list[sp.address])
+            for recipient in recipients:
+                if sp.is_implicit_account(recipient).is_some():
+                    if recipient in self.data.claimable:
+                        amount = self.data.claimable[recipient]
+                        del self.data.claimable[recipient]
+                        if amount > sp.mutez(0):
+                            sp.send(recipient, amount)
+
+        @sp.offchain_view
+        def token_metadata(self, token_id):
+            """TZIP-12 token metadata: the stored token_info, else base_uri + suffix (default: the decimal token id)."""
+            sp.cast(token_id, sp.nat)
+            if token_id in self.data.token_metadata:
+                return self.data.token_metadata[token_id]
+            else:
+                assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+                suffix = self.data.token_uri_suffix.get(token_id, default=sp.bytes("0x"))
+                if suffix == sp.bytes("0x"):
+                    digits = sp.bytes("0x30313233343536373839")
+                    qr = sp.ediv(token_id, 10).unwrap_some()
+                    suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some()
+                    n = sp.fst(qr)
+                    while n > 0:
+                        qr = sp.ediv(n, 10).unwrap_some()
+                        suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some() + suffix
+                        n = sp.fst(qr)
+                return sp.record(
+                    token_id=token_id,
+                    token_info={"": self.data.base_uri + suffix, "decimals": sp.bytes("0x30")},
+                )
+
         @sp.onchain_view
         def get_balance(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat))
             return self.data.ledger.get(sp.record(owner=params.owner, token_id=params.token_id), default=sp.nat(0))
 
+        @sp.onchain_view
+        def get_balances(self, requests):
+            sp.cast(requests, sp.list[LedgerKeyType])
+            balances = []
+            for req in requests:
+                balances.push(self.data.ledger.get(req, default=sp.nat(0)))
+            return reversed(balances)
+
+        @sp.onchain_view
+        def total_supply(self, token_id):
+            sp.cast(token_id, sp.nat)
+            assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+            return self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))).total_supply
+
+        @sp.onchain_view
+        def get_token_supplies(self, token_ids):
+            # Minted supply and distinct holders per token; ids never created read as zero.
+            sp.cast(token_ids, sp.list[sp.nat])
+            supplies = []
+            for token_id in token_ids:
+                supplies.push(self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))))
+            return reversed(supplies)
+
         @sp.onchain_view
         def get_claimable(self, addr):
             sp.cast(addr, sp.address)
             return self.data.claimable.get(addr, default=sp.mutez(0))
 
+        @sp.onchain_view
+        def get_claimables(self, addrs):
+            sp.cast(addrs, sp.list[sp.address])
+            amounts = []
+            for addr in addrs:
+                amounts.push(self.data.claimable.get(addr, default=sp.mutez(0)))
+            return reversed(amounts)
+
         @sp.onchain_view
         def get_token_config(self, token_id):
             sp.cast(token_id, sp.nat)
             return self.data.token_config[token_id]
 
+        @sp.onchain_view
+        def get_token_configs(self, token_ids):
+            sp.cast(token_ids, sp.list[sp.nat])
+            configs = []
+            for token_id in token_ids:
+                configs.push(self.data.token_config.get_opt(token_id))
+            return reversed(configs)
+
 
 @sp.add_test()
 def test():
@@ -253,3 +419,163 @@ def test():
     )
 
     c.mint_editions(token_id=0, qty=2, to_=bob.address, _sender=bob, _amount=sp.tez(2))
+
+
+@sp.add_test()
+def test_base_uri():
+    # With a base URI set, new tokens store only a suffix (or nothing) and their
+    # TZIP-12 metadata is rebuilt by the token_metadata off-chain view.
+    scenario = sp.test_scenario("BowersMintOpenEdition_base_uri", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    c = main.BowersMintOpenEdition(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmFull"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        _sender=admin,
+    )
+
+    base = sp.scenario_utils.bytes_of_string("ipfs://QmBase/")
+    c.set_base_uri(base, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_base_uri(base, _sender=admin)
+    for _ in range(11):
+        c.create_token(
+            metadata_uri=sp.bytes("0x"),
+            creator=alice.address,
+            mint_price=sp.tez(1),
+            mint_end=None,
+            max_supply=None,
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            _sender=admin,
+        )
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("custom.json"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        _sender=admin,
+    )
+
+    scenario.verify(c.token_metadata(0).token_info[""] == sp.scenario_utils.bytes_of_string("ipfs://QmFull"))
+    scenario.verify(~c.data.token_metadata.contains(1))
+    scenario.verify(~c.data.token_uri_suffix.contains(1))
+    scenario.verify(c.token_metadata(1).token_info[""] == base + sp.scenario_utils.bytes_of_string("1"))
+    scenario.verify(c.token_metadata(11).token_info[""] == base + sp.scenario_utils.bytes_of_string("11"))
+    scenario.verify(c.token_metadata(11).token_info["decimals"] == sp.bytes("0x30"))
+    scenario.verify(c.token_metadata(12).token_info[""] == base + sp.scenario_utils.bytes_of_string("custom.json"))
+
+
+@sp.add_test()
+def test_withdraw_for():
+    # Creators' mint proceeds are paid out by anyone; a contract creator is skipped.
+    scenario = sp.test_scenario("BowersMintOpenEdition_withdraw_for", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersMintOpenEdition(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    for creator in [alice.address, c.address]:
+        c.create_token(
+            metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmExample"),
+            creator=creator,
+            mint_price=sp.tez(1),
+            mint_end=None,
+            max_supply=None,
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            _sender=admin,
+        )
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, _sender=bob, _amount=sp.tez(2))
+    c.mint_editions(token_id=1, qty=1, to_=bob.address, _sender=bob, _amount=sp.tez(1))
+
+    c.withdraw_for([alice.address], _sender=bob, _amount=sp.tez(1), _valid=False, _exception="NO_TEZ")
+    # Alice is paid once despite appearing twice; bob owes nothing and c.address is a contract.
+    c.withdraw_for([alice.address, bob.address, c.address, alice.address], _sender=bob)
+    scenario.verify(~c.data.claimable.contains(alice.address))
+    scenario.verify(c.data.claimable[c.address] == sp.tez(1))
+    scenario.verify(c.balance == sp.tez(1))
+
+
+@sp.add_test()
+def test_batch_views():
+    # A mint page reads balances, claimables and token configs in one call each; unknown
+    # tokens are None.
+    scenario = sp.test_scenario("BowersMintOpenEdition_batch_views", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersMintOpenEdition(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmExample"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, _sender=bob, _amount=sp.tez(2))
+
+    scenario.verify_equal(
+        c.get_balances([sp.record(owner=bob.address, token_id=0), sp.record(owner=alice.address, token_id=0)]),
+        [2, 0],
+    )
+    scenario.verify_equal(c.get_claimables([alice.address, bob.address]), [sp.tez(2), sp.mutez(0)])
+    scenario.verify_equal(c.get_token_configs([0, 1]), [sp.Some(c.get_token_config(0)), None])
+
+
+@sp.add_test()
+def test_supply_counters():
+    # Mints add supply and first-time holders; a transfer that empties the sender drops it.
+    scenario = sp.test_scenario("BowersMintOpenEdition_supply_counters", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersMintOpenEdition(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=sp.scenario_utils.bytes_of_string("ipfs://QmExample"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, _sender=bob, _amount=sp.tez(2))
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, _sender=bob, _amount=sp.tez(1))
+    scenario.verify_equal(c.get_token_supplies([0, 1]), [sp.record(total_supply=3, holders=1), sp.record(total_supply=0, holders=0)])
+    c.transfer([sp.record(from_=bob.address, txs=[sp.record(to_=alice.address, token_id=0, amount=1)])], _sender=bob)
+    scenario.verify(c.data.token_supply[0].holders == 2)
+    c.transfer([sp.record(from_=bob.address, txs=[sp.record(to_=alice.address, token_id=0, amount=2)])], _sender=bob)
+    scenario.verify_equal(c.get_token_supplies([0]), [sp.record(total_supply=3, holders=1)])
+    scenario.verify(c.total_supply(0) == 3)
@@ -16,19 +16,39 @@ def main():
     BalanceOfRequestType: type = sp.record(owner=sp.address, token_id=sp.nat)
     BalanceOfResponseType: type = sp.record(request=BalanceOfRequestType, balance=sp.nat)
     LedgerKeyType: type = sp.record(owner=sp.address, token_id=sp.nat)
+    SupplyType: type = sp.record(total_supply=sp.nat, holders=sp.nat)
     OperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address, token_id=sp.nat)
     BlacklistKeyType: type = sp.record(owner=sp.address, token_id=sp.nat, blocked=sp.address)
     OperatorParamType: type = sp.variant(add_operator=OperatorKeyType, remove_operator=OperatorKeyType)
+    AllOperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address)
+    AllOperatorParamType: type = sp.variant(add_operator=AllOperatorKeyType, remove_operator=AllOperatorKeyType)
     TransferTxType: type = sp.record(to_=sp.address, token_id=sp.nat, amount=sp.nat)
     TransferBatchItemType: type = sp.record(from_=sp.address, txs=sp.list[TransferTxType])
+    BuyItemType: type = sp.record(owner=sp.address, token_id=sp.nat, qty=sp.nat)
+    RoyaltyType: type = sp.record(royalty_recipient=sp.address, royalty_bps=sp.nat)
+    AcceptItemType: type = sp.record(offer_id=sp.nat, accept_qty=sp.nat)
+    MintBatchItemType: type = sp.record(token_id=sp.nat, qty=sp.nat, to_=sp.address)
+    # _mint_item result: the price of the editions and the creator it is owed to.
+    MintedType: type = sp.record(total=sp.mutez, creator=sp.address)
 
     TokenConfigType: type = sp.record(
+        creator=sp.address,
+        mint_price=sp.mutez,
+        max_supply=sp.option[sp.nat],
+        royalty_recipient=sp.address,
+        royalty_bps=sp.nat,
+        min_offer_per_unit_mutez=sp.mutez,
+    )
+
+    # Hot per-token mint state, split from token_config so a mint only rewrites this record.
+    TokenStateType: type = sp.record(minted=sp.nat, mint_paused=sp.bool, mint_end=sp.option[sp.timestamp], proceeds=sp.mutez)
+
+    CreateTokenParamType: type = sp.record(
+        metadata_uri=sp.bytes,
         creator=sp.address,
         mint_price=sp.mutez,
         mint_end=sp.option[sp.timestamp],
-        mint_paused=sp.bool,
         max_supply=sp.option[sp.nat],
-        minted=sp.nat,
         royalty_recipient=sp.address,
         royalty_bps=sp.nat,
         min_offer_per_unit_mutez=sp.mutez,
@@ -39,14 +59,28 @@ def main():
             self.data.admin = admin
             self.data.metadata = metadata
             self.data.ledger = sp.cast(sp.big_map(), sp.big_map[LedgerKeyType, sp.nat])
+            self.data.token_supply = sp.cast(sp.big_map(), sp.big_map[sp.nat, SupplyType])
             self.data.token_metadata = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes])])
+            # Optional shared base URI: when set, tokens store only a URI suffix (or nothing) and
+            # TZIP-12 metadata is served by the token_metadata off-chain view.
+            self.data.base_uri = sp.bytes("0x")
+            self.data.token_uri_suffix = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.bytes])
             self.data.token_config = sp.cast(sp.big_map(), sp.big_map[sp.nat, TokenConfigType])
+            self.data.token_state = sp.cast(sp.big_map(), sp.big_map[sp.nat, TokenStateType])
             self.data.operators = sp.cast(sp.big_map(), sp.big_map[OperatorKeyType, sp.unit])
+            self.data.all_operators = sp.cast(sp.big_map(), sp.big_map[AllOperatorKeyType, sp.unit])
             self.data.next_token_id = sp.nat(0)
             self.data.listings = sp.cast(sp.big_map(), sp.big_map[LedgerKeyType, ListingType])
             self.data.offers = sp.cast(sp.big_map(), sp.big_map[sp.nat, OfferType])
             self.data.next_offer_id = sp.nat(0)
             self.data.claimable = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.mutez])
+            # Affects sales, not mints: buy / accept_offer pay implicit sellers and royalty
+            # recipients in the sale operation, and whatever is owed to a contract still goes to
+            # claimable.
+            self.data.direct_payout = False
+            # Off by default. When on, each edition mint adds its price to token_state.proceeds,
+            # which the mint rewrites anyway, and creators collect with withdraw_token_proceeds.
+            self.data.accrue_proceeds = False
             self.data.blacklist = sp.cast(sp.big_map(), sp.big_map[BlacklistKeyType, sp.unit])
             self.data.contract_blocklist = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.unit])
 
@@ -76,33 +110,87 @@ def main():
                         assert op in self.data.operators, "NO_OP"
                         del self.data.operators[op]
 
+        @sp.entrypoint
+        def update_all_operators(self, actions):
+            # Owner-level operators: one entry approves the operator for all of the owner's tokens.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(actions, sp.list[AllOperatorParamType])
+            for action in actions:
+                match action:
+                    case add_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        self.data.all_operators[op] = ()
+                    case remove_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        assert op in self.data.all_operators, "NO_OP"
+                        del self.data.all_operators[op]
+
         @sp.entrypoint
         def transfer(self, batch):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(batch, sp.list[TransferBatchItemType])
+            # Balances touched by the batch are read from the ledger once and written back once at
+            # the end; addresses cleared against contract_blocklist are not looked up again.
+            balances = sp.cast({}, sp.map[LedgerKeyType, sp.nat])
+            # Keys that start the batch empty. Holder counts are settled per token at write-back,
+            # so an edition passed along a chain of new owners adds only its final owner.
+            fresh = sp.cast(set(), sp.set[LedgerKeyType])
+            cleared = sp.cast(set(), sp.set[sp.address])
             for item in batch:
                 from_ = item.from_
-                for tx in item.txs:
+                if not (from_ in cleared):
                     assert not (from_ in self.data.contract_blocklist), "BLOCKED"
-                    assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
-                    if from_ != sp.sender:
-                        assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                    cleared.add(from_)
+                # Checked once per batch item; per-token entries are only read without an owner-level
+                # operator, once per token.
+                all_tokens = from_ == sp.sender
+                if not all_tokens:
+                    all_tokens = sp.record(owner=from_, operator=sp.sender) in self.data.all_operators
+                approved = sp.cast(set(), sp.set[sp.nat])
+                for tx in item.txs:
+                    if not (tx.to_ in cleared):
+                        assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
+                        cleared.add(tx.to_)
+                    if not all_tokens:
+                        if not (tx.token_id in approved):
+                            assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                            approved.add(tx.token_id)
                     assert tx.amount > 0, "BAD_AMOUNT"
                     fk = sp.record(owner=from_, token_id=tx.token_id)
-                    fb = self.data.ledger.get(fk, default=sp.nat(0))
+                    fb = balances.get(fk, default=sp.nat(0))
+                    if not (fk in balances):
+                        fb = self.data.ledger.get(fk, default=sp.nat(0))
                     assert fb >= tx.amount, "LOW_BAL"
                     nfb = sp.as_nat(fb - tx.amount)
+                    balances[fk] = nfb
                     if nfb == 0:
-                        if fk in self.data.ledger:
-                            del self.data.ledger[fk]
                         if fk in self.data.listings:
                             del self.data.listings[fk]
-                    else:
-                        self.data.ledger[fk] = nfb
                     tk = sp.record(owner=tx.to_, token_id=tx.token_id)
-                    tb = self.data.ledger.get(tk, default=sp.nat(0))
-                    self.data.ledger[tk] = tb + tx.amount
-                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, a=tx.amount), tag="xfer")
+                    tb = balances.get(tk, default=sp.nat(0))
+                    if not (tk in balances):
+                        tb = self.data.ledger.get(tk, default=sp.nat(0))
+                        if tb == 0:
+                            fresh.add(tk)
+                    balances[tk] = tb + tx.amount
+                    # Activity events (xfer, mint, buy, accept, list, offer, close) share one set of short keys;
+                    # event-schemas.json maps each to its field name.
+                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, q=tx.amount), tag="xfer")
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            for entry in balances.items():
+                tid = entry.key.token_id
+                if entry.value == 0:
+                    del self.data.ledger[entry.key]
+                    if not (entry.key in fresh):
+                        holders[tid] = holders.get(tid, default=0) - 1
+                else:
+                    self.data.ledger[entry.key] = entry.value
+                    if entry.key in fresh:
+                        holders[tid] = holders.get(tid, default=0) + 1
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
 
         # ---- Admin ----
 
@@ -112,46 +200,78 @@ def main():
             sp.cast(new_admin, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.admin = new_admin
+            sp.emit(new_admin, tag="admin")
 
-        # ---- Open edition: create_token, mint_editions ----
+        @sp.entrypoint
+        def set_direct_payout(self, direct):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(direct, sp.bool)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.direct_payout = direct
+            sp.emit(direct, tag="direct_payout")
 
         @sp.entrypoint
-        def create_token(self, params):
+        def set_accrue_proceeds(self, accrue):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
-            sp.cast(
-                params,
-                sp.record(
-                    metadata_uri=sp.bytes,
-                    creator=sp.address,
-                    mint_price=sp.mutez,
-                    mint_end=sp.option[sp.timestamp],
-                    max_supply=sp.option[sp.nat],
-                    royalty_recipient=sp.address,
-                    royalty_bps=sp.nat,
-                    min_offer_per_unit_mutez=sp.mutez,
-                ),
-            )
+            sp.cast(accrue, sp.bool)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.accrue_proceeds = accrue
+            sp.emit(accrue, tag="accrue_proceeds")
+
+        @sp.entrypoint
+        def set_base_uri(self, base_uri):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(base_uri, sp.bytes)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.base_uri = base_uri
+            sp.emit(base_uri, tag="base_uri")
+
+        # ---- Open edition: create_token, mint_editions ----
+
+        @sp.private(with_storage="read-write", with_operations=True)
+        def _create_token(self, params):
+            # One spec, validated and stored under next_token_id; create_token and create_tokens
+            # both go through here.
+            sp.cast(params, CreateTokenParamType)
             assert params.royalty_bps <= 10_000, "BPS_TOO_HIGH"
 
             tid = self.data.next_token_id
             self.data.next_token_id += 1
 
-            token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
-            self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            if self.data.base_uri == sp.bytes("0x"):
+                token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
+                self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            else:
+                if params.metadata_uri != sp.bytes("0x"):
+                    self.data.token_uri_suffix[tid] = params.metadata_uri
 
-            self.data.token_config[tid] = sp.record(
+            cfg = sp.record(
                 creator=params.creator,
                 mint_price=params.mint_price,
-                mint_end=params.mint_end,
-                mint_paused=False,
                 max_supply=params.max_supply,
-                minted=sp.nat(0),
                 royalty_recipient=params.royalty_recipient,
                 royalty_bps=params.royalty_bps,
                 min_offer_per_unit_mutez=params.min_offer_per_unit_mutez,
             )
-            sp.emit(sp.record(token_id=tid, creator=params.creator, price=params.mint_price), tag="token_created")
+            self.data.token_config[tid] = cfg
+            self.data.token_state[tid] = sp.record(minted=sp.nat(0), mint_paused=False, mint_end=params.mint_end, proceeds=sp.mutez(0))
+            sp.emit(sp.record(token_id=tid, config=cfg, mint_end=params.mint_end), tag="token_created")
+
+        @sp.entrypoint
+        def create_token(self, params):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(params, CreateTokenParamType)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self._create_token(params)
+
+        @sp.entrypoint
+        def create_tokens(self, specs):
+            # Batch create_token: consecutive ids from next_token_id.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(specs, sp.list[CreateTokenParamType])
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            for params in specs:
+                self._create_token(params)
 
         @sp.entrypoint
         def set_mint_price(self, params):
@@ -162,55 +282,98 @@ def main():
             cfg = self.data.token_config[params.token_id]
             cfg.mint_price = params.mint_price
             self.data.token_config[params.token_id] = cfg
+            sp.emit(sp.record(token_id=params.token_id, mint_price=params.mint_price), tag="mint_price")
 
         @sp.entrypoint
         def set_mint_end(self, params):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(params, sp.record(token_id=sp.nat, mint_end=sp.option[sp.timestamp]))
             assert sp.sender == self.data.admin, "NOT_ADMIN"
-            assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
-            cfg = self.data.token_config[params.token_id]
-            cfg.mint_end = params.mint_end
-            self.data.token_config[params.token_id] = cfg
+            assert params.token_id in self.data.token_state, "TOKEN_UNDEFINED"
+            st = self.data.token_state[params.token_id]
+            st.mint_end = params.mint_end
+            self.data.token_state[params.token_id] = st
+            sp.emit(sp.record(token_id=params.token_id, mint_end=params.mint_end), tag="mint_end")
 
         @sp.entrypoint
         def set_mint_paused(self, params):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(params, sp.record(token_id=sp.nat, paused=sp.bool))
             assert sp.sender == self.data.admin, "NOT_ADMIN"
-            assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
-            cfg = self.data.token_config[params.token_id]
-            cfg.mint_paused = params.paused
-            self.data.token_config[params.token_id] = cfg
+            assert params.token_id in self.data.token_state, "TOKEN_UNDEFINED"
+            st = self.data.token_state[params.token_id]
+            st.mint_paused = params.paused
+            self.data.token_state[params.token_id] = st
+            sp.emit(sp.record(token_id=params.token_id, paused=params.paused), tag="mint_paused")
 
-        @sp.entrypoint
-        def mint_editions(self, params):
-            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, to_=sp.address))
-            assert params.qty > 0, "BAD_QTY"
-            assert not (params.to_ in self.data.contract_blocklist), "BLOCKED"
-            assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
-            cfg = self.data.token_config[params.token_id]
+        @sp.private(with_storage="read-write", with_operations=True)
+        def _mint_item(self, item):
+            # Mints one (token_id, qty, to_) for mint_editions and mint_editions_batch: checks,
+            # ledger, supply counters, mint state and event. Returns the price and the creator
+            # it is owed to, so the caller can check payment and credit claimable its own way.
+            sp.cast(item, MintBatchItemType)
+            assert item.qty > 0, "BAD_QTY"
+            assert item.token_id in self.data.token_state, "TOKEN_UNDEFINED"
+            st = self.data.token_state[item.token_id]
+            cfg = self.data.token_config[item.token_id]
 
             ms = cfg.max_supply
             if ms.is_some():
                 cap = ms.unwrap_some()
-                assert cfg.minted + params.qty <= cap, "MAX_SUPPLY"
+                assert st.minted + item.qty <= cap, "MAX_SUPPLY"
 
-            me = cfg.mint_end
+            me = st.mint_end
             if me.is_some():
                 assert sp.now <= me.unwrap_some(), "MINT_CLOSED"
-            assert not cfg.mint_paused, "MINT_CLOSED"
+            assert not st.mint_paused, "MINT_CLOSED"
 
-            total_price = sp.split_tokens(cfg.mint_price, params.qty, 1)
-            assert sp.amount == total_price, "BAD_PAYMENT"
+            total_price = sp.split_tokens(cfg.mint_price, item.qty, 1)
 
-            lk = sp.record(owner=params.to_, token_id=params.token_id)
-            self.data.ledger[lk] = self.data.ledger.get(lk, default=sp.nat(0)) + params.qty
-            self.data.claimable[cfg.creator] = self.data.claimable.get(cfg.creator, default=sp.mutez(0)) + total_price
+            lk = sp.record(owner=item.to_, token_id=item.token_id)
+            lb = self.data.ledger.get(lk, default=sp.nat(0))
+            self.data.ledger[lk] = lb + item.qty
+            sup = self.data.token_supply.get(item.token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0)))
+            sup.total_supply += item.qty
+            if lb == 0:
+                sup.holders += 1
+            self.data.token_supply[item.token_id] = sup
+            if self.data.accrue_proceeds:
+                st.proceeds += total_price
 
-            cfg.minted = cfg.minted + params.qty
-            self.data.token_config[params.token_id] = cfg
-            sp.emit(sp.record(token_id=params.token_id, to_=params.to_, qty=params.qty, paid=total_price), tag="mint")
+            st.minted = st.minted + item.qty
+            self.data.token_state[item.token_id] = st
+            sp.emit(sp.record(i=item.token_id, t=item.to_, q=item.qty, p=total_price, a=sp.fst(sp.ediv(total_price, item.qty).unwrap_some()), c=cfg.creator), tag="mint")
+            return sp.cast(sp.record(total=total_price, creator=cfg.creator), MintedType)
+
+        @sp.entrypoint
+        def mint_editions(self, params):
+            sp.cast(params, MintBatchItemType)
+            assert not (params.to_ in self.data.contract_blocklist), "BLOCKED"
+            minted = self._mint_item(params)
+            assert sp.amount == minted.total, "BAD_PAYMENT"
+            if not self.data.accrue_proceeds:
+                self.data.claimable[minted.creator] = self.data.claimable.get(minted.creator, default=sp.mutez(0)) + minted.total
+
+        @sp.entrypoint
+        def mint_editions_batch(self, items):
+            # Cart checkout: one payment for the summed price, one claimable write per distinct
+            # creator, and each recipient checked against the blocklist once.
+            sp.cast(items, sp.list[MintBatchItemType])
+            cleared = sp.cast(set(), sp.set[sp.address])
+            credits = sp.cast({}, sp.map[sp.address, sp.mutez])
+            grand_total = sp.mutez(0)
+            for item in items:
+                if not (item.to_ in cleared):
+                    assert not (item.to_ in self.data.contract_blocklist), "BLOCKED"
+                    cleared.add(item.to_)
+                minted = self._mint_item(item)
+                if not self.data.accrue_proceeds:
+                    credits[minted.creator] = credits.get(minted.creator, default=sp.mutez(0)) + minted.total
+                grand_total += minted.total
+
+            assert sp.amount == grand_total, "BAD_PAYMENT"
+            for credit in credits.items():
+                self.data.claimable[credit.key] = self.data.claimable.get(credit.key, default=sp.mutez(0)) + credit.value
 
         # ---- Listings ----
 
@@ -226,6 +389,8 @@ def main():
             else:
                 assert params.min_bps <= 10_000, "BPS_TOO_HIGH"
                 self.data.listings[pk] = sp.record(price=params.price, max_qty=params.max_qty, min_bps=params.min_bps)
+            # A zero price is a delisting.
+            sp.emit(sp.record(o=sp.sender, i=params.token_id, u=params.price, m=params.max_qty, n=params.min_bps), tag="list")
 
         @sp.entrypoint
         def buy(self, params):
@@ -246,8 +411,22 @@ def main():
             rr = cfg.royalty_recipient
             ry = sp.split_tokens(tp, cfg.royalty_bps, 10_000)
             po = tp - ry
-            self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
-            self.data.claimable[params.owner] = self.data.claimable.get(params.owner, default=sp.mutez(0)) + po
+            if self.data.direct_payout:
+                # Seller and royalty recipient are merged first, so a creator reselling its own
+                # edition is paid once; contracts fall back to claimable.
+                payouts = sp.cast({}, sp.map[sp.address, sp.mutez])
+                if ry > sp.mutez(0):
+                    payouts[rr] = ry
+                payouts[params.owner] = payouts.get(params.owner, default=sp.mutez(0)) + po
+                for payout in payouts.items():
+                    if payout.value > sp.mutez(0):
+                        if sp.is_implicit_account(payout.key).is_some():
+                            sp.send(payout.key, payout.value)
+                        else:
+                            self.data.claimable[payout.key] = self.data.claimable.get(payout.key, default=sp.mutez(0)) + payout.value
+            else:
+                self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
+                self.data.claimable[params.owner] = self.data.claimable.get(params.owner, default=sp.mutez(0)) + po
             nfb = sp.as_nat(fb - params.qty)
             if nfb == 0:
                 if pk in self.data.ledger:
@@ -259,7 +438,75 @@ def main():
             tk = sp.record(owner=sp.sender, token_id=params.token_id)
             tb = self.data.ledger.get(tk, default=sp.nat(0))
             self.data.ledger[tk] = tb + params.qty
-            sp.emit(sp.record(b=sp.sender, o=params.owner, i=params.token_id, q=params.qty), tag="buy")
+            if (nfb == 0) != (tb == 0):
+                sup = self.data.token_supply[params.token_id]
+                if tb == 0:
+                    sup.holders += 1
+                else:
+                    sup.holders = sp.as_nat(sup.holders - 1)
+                self.data.token_supply[params.token_id] = sup
+            # u: unit price, p: total paid, r / y: royalty recipient / amount (also on "accept").
+            sp.emit(sp.record(b=sp.sender, o=params.owner, i=params.token_id, q=params.qty, u=lst.price, p=tp, r=rr, y=ry), tag="buy")
+
+        @sp.entrypoint
+        def buy_many(self, params):
+            # Buys many edition listings for one payment, all or nothing. Each token's royalty terms
+            # are looked up once, and each seller or royalty recipient is credited once.
+            sp.cast(params, sp.record(items=sp.list[BuyItemType], expected_total=sp.mutez))
+            assert not (sp.sender in self.data.contract_blocklist), "BLOCKED"
+            assert sp.amount == params.expected_total, "WRONG_PRICE"
+            royalties = sp.cast({}, sp.map[sp.nat, RoyaltyType])
+            credits = sp.cast({}, sp.map[sp.address, sp.mutez])
+            bought = sp.cast({}, sp.map[sp.nat, sp.nat])
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            total = sp.mutez(0)
+            for item in params.items:
+                assert item.qty > 0, "BAD_QTY"
+                assert not (sp.record(owner=item.owner, token_id=item.token_id, blocked=sp.sender) in self.data.blacklist), "BLACKLISTED"
+                pk = sp.record(owner=item.owner, token_id=item.token_id)
+                assert pk in self.data.listings, "NOT_FOR_SALE"
+                lst = self.data.listings[pk]
+                if lst.max_qty > 0:
+                    assert item.qty <= lst.max_qty, "MAX_QTY"
+                fb = self.data.ledger.get(pk, default=sp.nat(0))
+                assert fb >= item.qty, "NO_BAL"
+                tp = sp.split_tokens(lst.price, item.qty, 1)
+                if not (item.token_id in royalties):
+                    rc = self.data.token_config[item.token_id]
+                    royalties[item.token_id] = sp.record(royalty_recipient=rc.royalty_recipient, royalty_bps=rc.royalty_bps)
+                roy = royalties[item.token_id]
+                ry = sp.split_tokens(tp, roy.royalty_bps, 10_000)
+                credits[roy.royalty_recipient] = credits.get(roy.royalty_recipient, default=sp.mutez(0)) + ry
+                credits[item.owner] = credits.get(item.owner, default=sp.mutez(0)) + (tp - ry)
+                total += tp
+                nfb = sp.as_nat(fb - item.qty)
+                if nfb == 0:
+                    holders[item.token_id] = holders.get(item.token_id, default=0) - 1
+                    if pk in self.data.ledger:
+                        del self.data.ledger[pk]
+                    if pk in self.data.listings:
+                        del self.data.listings[pk]
+                else:
+                    self.data.ledger[pk] = nfb
+                bought[item.token_id] = bought.get(item.token_id, default=sp.nat(0)) + item.qty
+                sp.emit(sp.record(b=sp.sender, o=item.owner, i=item.token_id, q=item.qty, u=lst.price, p=tp, r=roy.royalty_recipient, y=ry), tag="buy")
+            assert total == params.expected_total, "WRONG_PRICE"
+            for credit in credits.items():
+                if credit.value > sp.mutez(0):
+                    if self.data.direct_payout and sp.is_implicit_account(credit.key).is_some():
+                        sp.send(credit.key, credit.value)
+                    else:
+                        self.data.claimable[credit.key] = self.data.claimable.get(credit.key, default=sp.mutez(0)) + credit.value
+            for b in bought.items():
+                tk = sp.record(owner=sp.sender, token_id=b.key)
+                tb = self.data.ledger.get(tk, default=sp.nat(0))
+                if tb == 0:
+                    holders[b.key] = holders.get(b.key, default=0) + 1
+                self.data.ledger[tk] = tb + b.value
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
 
         # ---- Offers ----
 
@@ -279,26 +526,45 @@ def main():
             self.data.offers[oid] = sp.record(
                 token_id=params.token_id, buyer=sp.sender, unit_price=up,
                 remaining_qty=params.qty, expiry=params.expiry)
+            sp.emit(sp.record(id=oid, b=sp.sender, i=params.token_id, u=up, q=params.qty, e=params.expiry), tag="offer")
 
         @sp.entrypoint
         def close_offer(self, offer_id):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(offer_id, sp.nat)
-            o = self.data.offers[offer_id]
-            assert o.remaining_qty > 0, "NOT_ACTIVE"
+            o = self.data.offers.get(offer_id, error="NOT_ACTIVE")
             if o.buyer != sp.sender:
                 assert sp.now > o.expiry, "NO_AUTH"
             refund = sp.split_tokens(o.unit_price, o.remaining_qty, 1)
             self.data.claimable[o.buyer] = self.data.claimable.get(o.buyer, default=sp.mutez(0)) + refund
-            o.remaining_qty = sp.nat(0)
-            self.data.offers[offer_id] = o
+            del self.data.offers[offer_id]
+            sp.emit(sp.record(id=offer_id, b=o.buyer, p=refund), tag="close")
+
+        @sp.entrypoint
+        def prune_offers(self, offer_ids):
+            # Expired bids on editions keep their escrow and storage until someone calls this, and
+            # any caller may. Each bidder gets one claimable credit per call; ids that cannot be
+            # pruned yet are ignored.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(offer_ids, sp.list[sp.nat])
+            refunds = sp.cast({}, sp.map[sp.address, sp.mutez])
+            for oid in offer_ids:
+                if oid in self.data.offers:
+                    o = self.data.offers[oid]
+                    if o.remaining_qty == 0 or sp.now > o.expiry:
+                        refund = sp.split_tokens(o.unit_price, o.remaining_qty, 1)
+                        refunds[o.buyer] = refunds.get(o.buyer, default=sp.mutez(0)) + refund
+                        del self.data.offers[oid]
+                        sp.emit(sp.record(id=oid, b=o.buyer, p=refund), tag="close")
+            for r in refunds.items():
+                if r.value > sp.mutez(0):
+                    self.data.claimable[r.key] = self.data.claimable.get(r.key, default=sp.mutez(0)) + r.value
 
         @sp.entrypoint
         def accept_offer(self, params):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(params, sp.record(offer_id=sp.nat, accept_qty=sp.nat))
-            o = self.data.offers[params.offer_id]
-            assert o.remaining_qty > 0, "NOT_ACTIVE"
+            o = self.data.offers.get(params.offer_id, error="NOT_ACTIVE")
             assert sp.now <= o.expiry, "OFFER_EXPIRED"
             assert params.accept_qty > 0, "BAD_ACCEPT_QTY"
             assert params.accept_qty <= o.remaining_qty, "OVER_QTY"
@@ -320,8 +586,22 @@ def main():
             rr = cfg.royalty_recipient
             ry = sp.split_tokens(pt, cfg.royalty_bps, 10_000)
             po = pt - ry
-            self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
-            self.data.claimable[sp.sender] = self.data.claimable.get(sp.sender, default=sp.mutez(0)) + po
+            if self.data.direct_payout:
+                # Same split as buy: implicit accounts are paid from the escrow now, contracts
+                # are credited.
+                payouts = sp.cast({}, sp.map[sp.address, sp.mutez])
+                if ry > sp.mutez(0):
+                    payouts[rr] = ry
+                payouts[sp.sender] = payouts.get(sp.sender, default=sp.mutez(0)) + po
+                for payout in payouts.items():
+                    if payout.value > sp.mutez(0):
+                        if sp.is_implicit_account(payout.key).is_some():
+                            sp.send(payout.key, payout.value)
+                        else:
+                            self.data.claimable[payout.key] = self.data.claimable.get(payout.key, default=sp.mutez(0)) + payout.value
+            else:
+                self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
+                self.data.claimable[sp.sender] = self.data.claimable.get(sp.sender, default=sp.mutez(0)) + po
             nfb = sp.as_nat(fb - params.accept_qty)
             if nfb == 0:
                 if fk in self.data.ledger:
@@ -333,9 +613,95 @@ def main():
             tk = sp.record(owner=o.buyer, token_id=tid)
             tb = self.data.ledger.get(tk, default=sp.nat(0))
             self.data.ledger[tk] = tb + params.accept_qty
+            if (nfb == 0) != (tb == 0):
+                sup = self.data.token_supply[tid]
+                if tb == 0:
+                    sup.holders += 1
+                else:
+                    sup.holders = sp.as_nat(sup.holders - 1)
+                self.data.token_supply[tid] = sup
             o.remaining_qty = sp.as_nat(o.remaining_qty - params.accept_qty)
-            self.data.offers[params.offer_id] = o
-            sp.emit(sp.record(id=params.offer_id, o=sp.sender, q=params.accept_qty), tag="accept")
+            if o.remaining_qty == 0:
+                del self.data.offers[params.offer_id]
+            else:
+                self.data.offers[params.offer_id] = o
+            sp.emit(sp.record(id=params.offer_id, o=sp.sender, q=params.accept_qty, b=o.buyer, i=tid, u=o.unit_price, p=pt, r=rr, y=ry), tag="accept")
+
+        @sp.entrypoint
+        def accept_offers(self, items):
+            # Sells editions into several bids at once. The seller's balance is checked per token
+            # against the total accepted, and each buyer's ledger entry is written once.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(items, sp.list[AcceptItemType])
+            assert sp.len(items) > 0, "NO_ITEMS"
+            royalties = sp.cast({}, sp.map[sp.nat, RoyaltyType])
+            credits = sp.cast({}, sp.map[sp.address, sp.mutez])
+            sold = sp.cast({}, sp.map[sp.nat, sp.nat])
+            deliveries = sp.cast({}, sp.map[LedgerKeyType, sp.nat])
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            proceeds = sp.mutez(0)
+            for item in items:
+                o = self.data.offers.get(item.offer_id, error="NOT_ACTIVE")
+                assert sp.now <= o.expiry, "OFFER_EXPIRED"
+                assert item.accept_qty > 0, "BAD_ACCEPT_QTY"
+                assert item.accept_qty <= o.remaining_qty, "OVER_QTY"
+                tid = o.token_id
+                assert not (o.buyer in self.data.contract_blocklist), "BLOCKED"
+                assert not (sp.record(owner=sp.sender, token_id=tid, blocked=o.buyer) in self.data.blacklist), "BLACKLISTED"
+                pt = sp.split_tokens(o.unit_price, item.accept_qty, 1)
+                assert pt > sp.mutez(0), "PAY_ZERO"
+                fk = sp.record(owner=sp.sender, token_id=tid)
+                if fk in self.data.listings:
+                    lst = self.data.listings[fk]
+                    if lst.min_bps > 0:
+                        lt = sp.split_tokens(lst.price, item.accept_qty, 1)
+                        ft = sp.split_tokens(lt, lst.min_bps, 10_000)
+                        assert pt >= ft, "LOW_BID"
+                if not (tid in royalties):
+                    rc = self.data.token_config[tid]
+                    royalties[tid] = sp.record(royalty_recipient=rc.royalty_recipient, royalty_bps=rc.royalty_bps)
+                roy = royalties[tid]
+                ry = sp.split_tokens(pt, roy.royalty_bps, 10_000)
+                credits[roy.royalty_recipient] = credits.get(roy.royalty_recipient, default=sp.mutez(0)) + ry
+                proceeds += pt - ry
+                sold[tid] = sold.get(tid, default=sp.nat(0)) + item.accept_qty
+                tk = sp.record(owner=o.buyer, token_id=tid)
+                deliveries[tk] = deliveries.get(tk, default=sp.nat(0)) + item.accept_qty
+                o.remaining_qty = sp.as_nat(o.remaining_qty - item.accept_qty)
+                if o.remaining_qty == 0:
+                    del self.data.offers[item.offer_id]
+                else:
+                    self.data.offers[item.offer_id] = o
+                sp.emit(sp.record(id=item.offer_id, o=sp.sender, q=item.accept_qty, b=o.buyer, i=tid, u=o.unit_price, p=pt, r=roy.royalty_recipient, y=ry), tag="accept")
+            credits[sp.sender] = credits.get(sp.sender, default=sp.mutez(0)) + proceeds
+            for s in sold.items():
+                fk = sp.record(owner=sp.sender, token_id=s.key)
+                fb = self.data.ledger.get(fk, default=sp.nat(0))
+                assert fb >= s.value, "LOW_BAL"
+                nfb = sp.as_nat(fb - s.value)
+                if nfb == 0:
+                    holders[s.key] = holders.get(s.key, default=0) - 1
+                    if fk in self.data.ledger:
+                        del self.data.ledger[fk]
+                    if fk in self.data.listings:
+                        del self.data.listings[fk]
+                else:
+                    self.data.ledger[fk] = nfb
+            for d in deliveries.items():
+                db = self.data.ledger.get(d.key, default=sp.nat(0))
+                if db == 0:
+                    holders[d.key.token_id] = holders.get(d.key.token_id, default=0) + 1
+                self.data.ledger[d.key] = db + d.value
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
+            for credit in credits.items():
+                if credit.value > sp.mutez(0):
+                    if self.data.direct_payout and sp.is_implicit_account(credit.key).is_some():
+                        sp.send(credit.key, credit.value)
+                    else:
+                        self.data.claimable[credit.key] = self.data.claimable.get(credit.key, default=sp.mutez(0)) + credit.value
 
         # ---- Contract blocklist (admin) ----
 
@@ -345,6 +711,7 @@ def main():
             sp.cast(address, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.contract_blocklist[address] = ()
+            sp.emit(sp.record(address=address, blocked=True), tag="blocklist")
 
         @sp.entrypoint
         def unblock_address(self, address):
@@ -353,6 +720,7 @@ def main():
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             if address in self.data.contract_blocklist:
                 del self.data.contract_blocklist[address]
+            sp.emit(sp.record(address=address, blocked=False), tag="blocklist")
 
         # ---- Blacklist (per-token, owner) ----
 
@@ -362,6 +730,7 @@ def main():
             sp.cast(params, sp.record(token_id=sp.nat, blocked=sp.address))
             assert self.data.ledger.get(sp.record(owner=sp.sender, token_id=params.token_id), default=sp.nat(0)) > 0, "NOT_OWNER"
             self.data.blacklist[sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked)] = ()
+            sp.emit(sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked, active=True), tag="blacklist")
 
         @sp.entrypoint
         def unblacklist_address(self, params):
@@ -371,6 +740,7 @@ def main():
             key = sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked)
             if key in self.data.blacklist:
                 del self.data.blacklist[key]
+            sp.emit(sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked, active=False), tag="blacklist")
 
         # ---- Withdraw ----
 
@@ -379,16 +749,94 @@ def main():
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             amount = self.data.claimable.get(sp.sender, default=sp.mutez(0))
             assert amount > sp.mutez(0), "NO_FUNDS"
-            self.data.claimable[sp.sender] = sp.mutez(0)
+            del self.data.claimable[sp.sender]
+            sp.send(sp.sender, amount)
+
+        @sp.entrypoint
+        def withdraw_for(self, recipients):
+            # Lets anyone pay out what sellers, royalty recipients and (unless proceeds accrue per
+            # token) creators are owed. Contracts are skipped, as one that fails on receipt would
+            # revert every payout in the batch; they call withdraw instead.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(recipients, sp.list[sp.address])
+            for recipient in recipients:
+                if sp.is_implicit_account(recipient).is_some():
+                    if recipient in self.data.claimable:
+                        amount = self.data.claimable[recipient]
+                        del self.data.claimable[recipient]
+                        if amount > sp.mutez(0):
+                            sp.send(recipient, amount)
+
+        @sp.entrypoint
+        def withdraw_token_proceeds(self, token_ids):
+            # Pays the sender everything accrued on the given tokens, which must all be theirs,
+            # and zeroes each token's proceeds.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(token_ids, sp.list[sp.nat])
+            amount = sp.mutez(0)
+            for token_id in token_ids:
+                assert token_id in self.data.token_state, "TOKEN_UNDEFINED"
+                assert self.data.token_config[token_id].creator == sp.sender, "NOT_CREATOR"
+                st = self.data.token_state[token_id]
+                amount += st.proceeds
+                st.proceeds = sp.mutez(0)
+                self.data.token_state[token_id] = st
+            assert amount > sp.mutez(0), "NO_FUNDS"
             sp.send(sp.sender, amount)
 
         # ---- Views ----
 
+        @sp.offchain_view
+        def token_metadata(self, token_id):
+            """TZIP-12 token metadata: the stored token_info, else base_uri + suffix (default: the decimal token id)."""
+            sp.cast(token_id, sp.nat)
+            if token_id in self.data.token_metadata:
+                return self.data.token_metadata[token_id]
+            else:
+                assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+                suffix = self.data.token_uri_suffix.get(token_id, default=sp.bytes("0x"))
+                if suffix == sp.bytes("0x"):
+                    digits = sp.bytes("0x30313233343536373839")
+                    qr = sp.ediv(token_id, 10).unwrap_some()
+                    suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some()
+                    n = sp.fst(qr)
+                    while n > 0:
+                        qr = sp.ediv(n, 10).unwrap_some()
+                        suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some() + suffix
+                        n = sp.fst(qr)
+                return sp.record(
+                    token_id=token_id,
+                    token_info={"": self.data.base_uri + suffix, "decimals": sp.bytes("0x30")},
+                )
+
         @sp.onchain_view
         def get_balance(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat))
             return self.data.ledger.get(sp.record(owner=params.owner, token_id=params.token_id), default=sp.nat(0))
 
+        @sp.onchain_view
+        def get_balances(self, requests):
+            sp.cast(requests, sp.list[LedgerKeyType])
+            balances = []
+            for req in requests:
+                balances.push(self.data.ledger.get(req, default=sp.nat(0)))
+            return reversed(balances)
+
+        @sp.onchain_view
+        def total_supply(self, token_id):
+            sp.cast(token_id, sp.nat)
+            assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+            return self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))).total_supply
+
+        @sp.onchain_view
+        def get_token_supplies(self, token_ids):
+            # Editions minted so far and distinct holders, per token, from the token_supply counters.
+            sp.cast(token_ids, sp.list[sp.nat])
+            supplies = []
+            for token_id in token_ids:
+                supplies.push(self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))))
+            return reversed(supplies)
+
         @sp.onchain_view
         def get_offer(self, offer_id):
             sp.cast(offer_id, sp.nat)
@@ -397,18 +845,37 @@ def main():
         @sp.onchain_view
         def is_operator(self, params):
             sp.cast(params, sp.record(owner=sp.address, operator=sp.address, token_id=sp.nat))
-            return sp.record(owner=params.owner, operator=params.operator, token_id=params.token_id) in self.data.operators
+            return (sp.record(owner=params.owner, operator=params.operator) in self.data.all_operators) or (
+                sp.record(owner=params.owner, operator=params.operator, token_id=params.token_id) in self.data.operators
+            )
 
         @sp.onchain_view
         def get_listing(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat))
             return self.data.listings[sp.record(owner=params.owner, token_id=params.token_id)]
 
+        @sp.onchain_view
+        def get_listings(self, keys):
+            # Lets a storefront price a page of editions in one call; unlisted keys come back as None.
+            sp.cast(keys, sp.list[LedgerKeyType])
+            listings = []
+            for key in keys:
+                listings.push(self.data.listings.get_opt(key))
+            return reversed(listings)
+
         @sp.onchain_view
         def get_claimable(self, addr):
             sp.cast(addr, sp.address)
             return self.data.claimable.get(addr, default=sp.mutez(0))
 
+        @sp.onchain_view
+        def get_claimables(self, addrs):
+            sp.cast(addrs, sp.list[sp.address])
+            amounts = []
+            for addr in addrs:
+                amounts.push(self.data.claimable.get(addr, default=sp.mutez(0)))
+            return reversed(amounts)
+
         @sp.onchain_view
         def is_blacklisted(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat, blocked=sp.address))
@@ -419,6 +886,19 @@ def main():
             sp.cast(token_id, sp.nat)
             return self.data.token_config[token_id]
 
+        @sp.onchain_view
+        def get_token_configs(self, token_ids):
+            sp.cast(token_ids, sp.list[sp.nat])
+            configs = []
+            for token_id in token_ids:
+                configs.push(self.data.token_config.get_opt(token_id))
+            return reversed(configs)
+
+        @sp.onchain_view
+        def get_token_state(self, token_id):
+            sp.cast(token_id, sp.nat)
+            return self.data.token_state[token_id]
+
 
 def bytes_of_string(s):
     return sp.bytes("0x" + s.encode("utf-8").hex())
@@ -453,3 +933,463 @@ def test():
     c.set_mint_paused(token_id=0, paused=True, _sender=admin)
     c.set_mint_paused(token_id=0, paused=False, _sender=admin)
     c.mint_editions(token_id=0, qty=1, to_=bob.address, _sender=bob, _amount=sp.tez(1))
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmSecondCID"),
+        creator=alice.address,
+        mint_price=sp.mutez(250_000),
+        mint_end=None,
+        max_supply=sp.Some(4),
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(100000),
+        _sender=admin,
+    )
+    cart = [
+        sp.record(token_id=0, qty=2, to_=bob.address),
+        sp.record(token_id=1, qty=4, to_=bob.address),
+        sp.record(token_id=0, qty=1, to_=alice.address),
+    ]
+    c.mint_editions_batch(cart, _sender=bob, _amount=sp.tez(3), _valid=False, _exception="BAD_PAYMENT")
+    c.mint_editions_batch(cart, _sender=bob, _amount=sp.tez(4))
+    scenario.verify(c.data.claimable[alice.address] == sp.tez(7))
+    scenario.verify(c.data.token_state[0].minted == 6)
+    c.mint_editions_batch(
+        [sp.record(token_id=1, qty=1, to_=bob.address)],
+        _sender=bob,
+        _amount=sp.mutez(250_000),
+        _valid=False,
+        _exception="MAX_SUPPLY",
+    )
+
+    specs = [
+        sp.record(
+            metadata_uri=bytes_of_string("ipfs://QmBatch%d" % i),
+            creator=alice.address,
+            mint_price=sp.mutez(500_000 + i),
+            mint_end=None,
+            max_supply=None,
+            royalty_recipient=admin.address,
+            royalty_bps=250,
+            min_offer_per_unit_mutez=sp.mutez(100000),
+        )
+        for i in range(3)
+    ]
+    bad = sp.record(
+        metadata_uri=bytes_of_string("ipfs://QmBad"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        royalty_recipient=admin.address,
+        royalty_bps=10_001,
+        min_offer_per_unit_mutez=sp.mutez(100000),
+    )
+    c.create_tokens(specs + [bad], _sender=admin, _valid=False, _exception="BPS_TOO_HIGH")
+    c.create_tokens(specs, _sender=admin)
+    scenario.verify(c.data.next_token_id == 5)
+    scenario.verify(c.data.token_config[4].mint_price == sp.mutez(500_002))
+
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.set_listing(token_id=1, price=sp.mutez(500_000), max_qty=0, min_bps=0, _sender=bob)
+    c.set_listing(token_id=0, price=sp.tez(2), max_qty=0, min_bps=0, _sender=alice)
+    c.buy_many(
+        items=[
+            sp.record(owner=bob.address, token_id=0, qty=2),
+            sp.record(owner=bob.address, token_id=1, qty=1),
+            sp.record(owner=alice.address, token_id=0, qty=1),
+        ],
+        expected_total=sp.mutez(4_500_000),
+        _sender=admin,
+        _amount=sp.mutez(4_500_000),
+    )
+    scenario.verify(c.data.ledger[sp.record(owner=admin.address, token_id=0)] == 3)
+    scenario.verify(~c.data.listings.contains(sp.record(owner=alice.address, token_id=0)))
+    scenario.verify(c.data.claimable[bob.address] == sp.mutez(2_375_000))
+
+    c.make_offer(token_id=0, qty=2, expiry=sp.timestamp(1000), _sender=alice, _amount=sp.tez(1))
+    c.make_offer(token_id=1, qty=2, expiry=sp.timestamp(1000), _sender=alice, _amount=sp.tez(1))
+    c.accept_offers(
+        [sp.record(offer_id=0, accept_qty=2), sp.record(offer_id=1, accept_qty=2)],
+        _sender=admin,
+        _valid=False,
+        _exception="LOW_BAL",
+    )
+    c.accept_offers(
+        [sp.record(offer_id=0, accept_qty=2), sp.record(offer_id=1, accept_qty=1)],
+        _sender=admin,
+    )
+    scenario.verify(c.data.ledger[sp.record(owner=admin.address, token_id=0)] == 1)
+    scenario.verify(~c.data.ledger.contains(sp.record(owner=admin.address, token_id=1)))
+    scenario.verify(c.data.offers[1].remaining_qty == 1)
+
+
+@sp.add_test()
+def test_base_uri():
+    # With a base URI set, new tokens store only a suffix (or nothing) and their
+    # TZIP-12 metadata is rebuilt by the token_metadata off-chain view.
+    scenario = sp.test_scenario("BowersOpenEdition_base_uri", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    c = main.BowersOpenEditionFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmFull"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(100000),
+        _sender=admin,
+    )
+
+    base = bytes_of_string("ipfs://QmBase/")
+    c.set_base_uri(base, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_base_uri(base, _sender=admin)
+    for _ in range(11):
+        c.create_token(
+            metadata_uri=sp.bytes("0x"),
+            creator=alice.address,
+            mint_price=sp.tez(1),
+            mint_end=None,
+            max_supply=None,
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            min_offer_per_unit_mutez=sp.mutez(100000),
+            _sender=admin,
+        )
+    c.create_token(
+        metadata_uri=bytes_of_string("custom.json"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(100000),
+        _sender=admin,
+    )
+
+    scenario.verify(c.token_metadata(0).token_info[""] == bytes_of_string("ipfs://QmFull"))
+    scenario.verify(~c.data.token_metadata.contains(1))
+    scenario.verify(~c.data.token_uri_suffix.contains(1))
+    scenario.verify(c.token_metadata(1).token_info[""] == base + bytes_of_string("1"))
+    scenario.verify(c.token_metadata(11).token_info[""] == base + bytes_of_string("11"))
+    scenario.verify(c.token_metadata(11).token_info["decimals"] == sp.bytes("0x30"))
+    scenario.verify(c.token_metadata(12).token_info[""] == base + bytes_of_string("custom.json"))
+
+
+@sp.add_test()
+def test_withdraw_for():
+    # Sale proceeds and creators' mint proceeds are paid out by anyone; a contract royalty
+    # recipient is skipped and keeps its balance for withdraw.
+    scenario = sp.test_scenario("BowersOpenEditionFA2_withdraw_for", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersOpenEditionFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmOE"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        royalty_recipient=c.address,
+        royalty_bps=1000,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, _sender=bob, _amount=sp.tez(1))
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy(owner=bob.address, token_id=0, qty=1, _sender=alice, _amount=sp.tez(1))
+
+    c.withdraw_for([bob.address], _sender=alice, _amount=sp.tez(1), _valid=False, _exception="NO_TEZ")
+    # Bob's resale proceeds and Alice's mint revenue go out; the contract's royalty stays.
+    c.withdraw_for([bob.address, alice.address, c.address, bob.address], _sender=alice)
+    scenario.verify(~c.data.claimable.contains(bob.address))
+    scenario.verify(~c.data.claimable.contains(alice.address))
+    scenario.verify(c.data.claimable[c.address] == sp.mutez(100000))
+    scenario.verify(c.balance == sp.mutez(100000))
+
+
+@sp.add_test()
+def test_prune_offers():
+    # Bids on an edition that outlive their expiry are deleted by any caller; the bidder's
+    # escrow is credited once, and offers still open are left alone.
+    scenario = sp.test_scenario("BowersOpenEditionFA2_prune_offers", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersOpenEditionFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmOE"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        royalty_recipient=alice.address,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.make_offer(token_id=0, qty=2, expiry=sp.timestamp(100), _sender=bob, _amount=sp.tez(2))
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(100), _sender=bob, _amount=sp.tez(1))
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(500), _sender=alice, _amount=sp.tez(1))
+
+    c.prune_offers([0, 1, 2, 3], _sender=alice, _now=sp.timestamp(200))
+    scenario.verify(~c.data.offers.contains(0))
+    scenario.verify(~c.data.offers.contains(1))
+    scenario.verify(c.data.offers[2].remaining_qty == 1)
+    scenario.verify(c.data.claimable[bob.address] == sp.tez(3))
+    scenario.verify(~c.data.claimable.contains(alice.address))
+    # Pruning again is a no-op rather than an error.
+    c.prune_offers([0, 1], _sender=alice, _now=sp.timestamp(200))
+    scenario.verify(c.data.claimable[bob.address] == sp.tez(3))
+
+
+@sp.add_test()
+def test_token_proceeds():
+    # With accrual on, single and cart mints add to each token's proceeds instead of claimable,
+    # and a creator sweeps several tokens in one payment.
+    scenario = sp.test_scenario("BowersOpenEditionFA2_token_proceeds", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersOpenEditionFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    for creator in [alice, alice, bob]:
+        c.create_token(
+            metadata_uri=bytes_of_string("ipfs://QmOE"),
+            creator=creator.address,
+            mint_price=sp.tez(1),
+            mint_end=None,
+            max_supply=None,
+            royalty_recipient=creator.address,
+            royalty_bps=500,
+            min_offer_per_unit_mutez=sp.mutez(500),
+            _sender=admin,
+        )
+
+    c.set_accrue_proceeds(True, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_accrue_proceeds(True, _sender=admin)
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, _sender=bob, _amount=sp.tez(2))
+    c.mint_editions_batch(
+        [sp.record(token_id=1, qty=3, to_=bob.address), sp.record(token_id=2, qty=1, to_=alice.address)],
+        _sender=bob,
+        _amount=sp.tez(4),
+    )
+    scenario.verify(~c.data.claimable.contains(alice.address))
+    scenario.verify(~c.data.claimable.contains(bob.address))
+    scenario.verify(c.data.token_state[1].proceeds == sp.tez(3))
+
+    c.withdraw_token_proceeds([0, 2], _sender=alice, _valid=False, _exception="NOT_CREATOR")
+    c.withdraw_token_proceeds([0, 1], _sender=alice)
+    scenario.verify(c.data.token_state[0].proceeds == sp.mutez(0))
+    scenario.verify(c.balance == sp.tez(1))
+    c.withdraw_token_proceeds([1], _sender=alice, _valid=False, _exception="NO_FUNDS")
+
+    # Back in claimable mode, new mints credit the creator; the accrued tez are still swept.
+    c.set_accrue_proceeds(False, _sender=admin)
+    c.mint_editions(token_id=2, qty=1, to_=alice.address, _sender=alice, _amount=sp.tez(1))
+    scenario.verify(c.data.claimable[bob.address] == sp.tez(1))
+    scenario.verify(c.data.token_state[2].proceeds == sp.tez(1))
+    c.withdraw_token_proceeds([2], _sender=bob)
+    scenario.verify(c.balance == sp.tez(1))
+
+
+@sp.add_test()
+def test_direct_payout():
+    # Direct mode pays sales out at once but leaves mint proceeds in claimable; a creator who
+    # is both seller and royalty recipient is paid once.
+    scenario = sp.test_scenario("BowersOpenEditionFA2_direct_payout", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersOpenEditionFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    for royalty_recipient in [alice.address, c.address]:
+        c.create_token(
+            metadata_uri=bytes_of_string("ipfs://QmOE"),
+            creator=alice.address,
+            mint_price=sp.tez(1),
+            mint_end=None,
+            max_supply=None,
+            royalty_recipient=royalty_recipient,
+            royalty_bps=1000,
+            min_offer_per_unit_mutez=sp.mutez(500),
+            _sender=admin,
+        )
+    c.set_direct_payout(True, _sender=admin)
+    c.mint_editions_batch(
+        [sp.record(token_id=0, qty=2, to_=alice.address), sp.record(token_id=1, qty=2, to_=alice.address)],
+        _sender=alice,
+        _amount=sp.tez(4),
+    )
+    scenario.verify(c.data.claimable[alice.address] == sp.tez(4))
+
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=alice)
+    c.set_listing(token_id=1, price=sp.tez(1), max_qty=0, min_bps=0, _sender=alice)
+    c.buy(owner=alice.address, token_id=0, qty=1, _sender=bob, _amount=sp.tez(1))
+    c.buy_many(
+        items=[sp.record(owner=alice.address, token_id=1, qty=1)],
+        expected_total=sp.tez(1),
+        _sender=bob,
+        _amount=sp.tez(1),
+    )
+    scenario.verify(c.data.claimable[alice.address] == sp.tez(4))
+    scenario.verify(c.data.claimable[c.address] == sp.mutez(100000))
+    scenario.verify(c.balance == sp.tez(4) + sp.mutez(100000))
+
+    c.make_offer(token_id=1, qty=1, expiry=sp.timestamp(1000), _sender=bob, _amount=sp.tez(1))
+    c.accept_offers([sp.record(offer_id=0, accept_qty=1)], _sender=alice)
+    scenario.verify(c.data.claimable[c.address] == sp.mutez(200000))
+    scenario.verify(c.balance == sp.tez(4) + sp.mutez(200000))
+
+    # A zero royalty gives a contract recipient no claimable entry.
+    vault = sp.address("KT1Tezooo1zzSmartPyzzSTATiCzzzyfC8eF")
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmOE"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        royalty_recipient=vault,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.mint_editions(token_id=2, qty=3, to_=alice.address, _sender=alice, _amount=sp.tez(3))
+    c.set_listing(token_id=2, price=sp.tez(1), max_qty=0, min_bps=0, _sender=alice)
+    c.buy(owner=alice.address, token_id=2, qty=1, _sender=bob, _amount=sp.tez(1))
+    c.buy_many(
+        items=[sp.record(owner=alice.address, token_id=2, qty=1)],
+        expected_total=sp.tez(1),
+        _sender=bob,
+        _amount=sp.tez(1),
+    )
+    c.make_offer(token_id=2, qty=1, expiry=sp.timestamp(1000), _sender=bob, _amount=sp.tez(1))
+    c.accept_offer(offer_id=1, accept_qty=1, _sender=alice)
+    scenario.verify(~c.data.claimable.contains(vault))
+    c.make_offer(token_id=2, qty=1, expiry=sp.timestamp(1000), _sender=alice, _amount=sp.tez(1))
+    c.accept_offers([], _sender=bob, _valid=False, _exception="NO_ITEMS")
+    c.accept_offers([sp.record(offer_id=2, accept_qty=1)], _sender=bob)
+    scenario.verify(~c.data.claimable.contains(vault))
+
+
+@sp.add_test()
+def test_batch_views():
+    # A storefront page is read in one call per view; tokens and keys that do not exist are
+    # None or zero rather than errors.
+    scenario = sp.test_scenario("BowersOpenEditionFA2_batch_views", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersOpenEditionFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    for price in [sp.tez(1), sp.tez(2)]:
+        c.create_token(
+            metadata_uri=bytes_of_string("ipfs://QmOE"),
+            creator=alice.address,
+            mint_price=price,
+            mint_end=None,
+            max_supply=None,
+            royalty_recipient=alice.address,
+            royalty_bps=500,
+            min_offer_per_unit_mutez=sp.mutez(500),
+            _sender=admin,
+        )
+    c.mint_editions_batch(
+        [sp.record(token_id=0, qty=2, to_=bob.address), sp.record(token_id=1, qty=1, to_=bob.address)],
+        _sender=bob,
+        _amount=sp.tez(4),
+    )
+    c.set_listing(token_id=1, price=sp.tez(3), max_qty=0, min_bps=5000, _sender=bob)
+
+    bob_0 = sp.record(owner=bob.address, token_id=0)
+    bob_1 = sp.record(owner=bob.address, token_id=1)
+    scenario.verify_equal(c.get_balances([bob_1, bob_0, sp.record(owner=alice.address, token_id=0)]), [1, 2, 0])
+    scenario.verify_equal(c.get_claimables([alice.address, bob.address]), [sp.tez(4), sp.mutez(0)])
+    scenario.verify_equal(c.get_listings([bob_0, bob_1]), [None, sp.Some(sp.record(price=sp.tez(3), max_qty=0, min_bps=5000))])
+    scenario.verify_equal(c.get_token_configs([0, 2, 1]), [sp.Some(c.get_token_config(0)), None, sp.Some(c.get_token_config(1))])
+
+
+@sp.add_test()
+def test_supply_counters():
+    # Edition mints raise supply; holders follow cart mints, transfers, sweeps and batched bid fills.
+    scenario = sp.test_scenario("BowersOpenEditionFA2_supply_counters", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersOpenEditionFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmOE"),
+        creator=alice.address,
+        mint_price=sp.tez(1),
+        mint_end=None,
+        max_supply=None,
+        royalty_recipient=alice.address,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    scenario.verify_equal(c.get_token_supplies([0]), [sp.record(total_supply=0, holders=0)])
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, _sender=bob, _amount=sp.tez(2))
+    c.mint_editions_batch(
+        [sp.record(token_id=0, qty=1, to_=bob.address), sp.record(token_id=0, qty=2, to_=carol.address)],
+        _sender=carol,
+        _amount=sp.tez(3),
+    )
+    scenario.verify_equal(c.get_token_supplies([0]), [sp.record(total_supply=5, holders=2)])
+
+    # bob -> alice -> admin in one batch: only the last owner is a new holder.
+    c.update_operators([sp.variant.add_operator(sp.record(owner=alice.address, operator=bob.address, token_id=0))], _sender=alice)
+    c.transfer(
+        [
+            sp.record(from_=bob.address, txs=[sp.record(to_=alice.address, token_id=0, amount=1)]),
+            sp.record(from_=alice.address, txs=[sp.record(to_=admin.address, token_id=0, amount=1)]),
+        ],
+        _sender=bob,
+    )
+    scenario.verify(c.data.token_supply[0].holders == 3)
+
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=carol)
+    c.buy_many(items=[sp.record(owner=carol.address, token_id=0, qty=2)], expected_total=sp.tez(2), _sender=alice, _amount=sp.tez(2))
+    scenario.verify(c.data.token_supply[0].holders == 3)
+    c.make_offer(token_id=0, qty=2, expiry=sp.timestamp(1000), _sender=carol, _amount=sp.tez(2))
+    c.accept_offers([sp.record(offer_id=0, accept_qty=2)], _sender=bob)
+    scenario.verify_equal(c.get_token_supplies([0]), [sp.record(total_supply=5, holders=3)])
+    scenario.verify(c.total_supply(0) == 5)
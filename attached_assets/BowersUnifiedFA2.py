@@ -1,9 +1,10 @@
 # BowersUnifiedFA2.py
 # Unified FA2: admin mint, open edition, bonding curve, and allowlist per-token.
-# mint_model 0 = admin-only (mint entrypoint, no token_config).
+# mint_model 0 = admin-only (mint entrypoint; stored as the admin_only variant, never mintable).
 # mint_model 1 = open edition (create_token + mint_editions, optional allowlist).
 # mint_model 2 = bonding curve (create_token + mint_editions).
 # Full marketplace: listings, offers, buy, blacklist, withdraw.
+# BowersUnifiedIndexedFA2 is the opt-in build with per-token listing and offer indexes.
 
 import smartpy as sp
 
@@ -21,29 +22,86 @@ def main():
     BalanceOfRequestType: type = sp.record(owner=sp.address, token_id=sp.nat)
     BalanceOfResponseType: type = sp.record(request=BalanceOfRequestType, balance=sp.nat)
     LedgerKeyType: type = sp.record(owner=sp.address, token_id=sp.nat)
+    SupplyType: type = sp.record(total_supply=sp.nat, holders=sp.nat)
+    # Passed to the index hook when a listing or offer opens or closes.
+    IndexChangeType: type = sp.variant(
+        listing=sp.record(key=LedgerKeyType, listed=sp.bool),
+        offer=sp.record(offer_id=sp.nat, token_id=sp.nat, open=sp.bool),
+    )
     OperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address, token_id=sp.nat)
     BlacklistKeyType: type = sp.record(owner=sp.address, token_id=sp.nat, blocked=sp.address)
-    AllowlistKeyType: type = sp.record(token_id=sp.nat, address=sp.address)
+    # epoch is the token's allowlist_epoch when the entry was written; older epochs are stale.
+    AllowlistKeyType: type = sp.record(token_id=sp.nat, epoch=sp.nat, address=sp.address)
     AllowlistEntryType: type = sp.record(
         max_qty=sp.nat,
         minted=sp.nat,
         price_override=sp.option[sp.mutez],
     )
+    # Merkle allowlist proof. The leaf is blake2b(pack((address, (max_qty, price_override))));
+    # path holds the sibling hashes from leaf to root, tagged with the side they sit on.
+    MerkleStepType: type = sp.variant(left=sp.bytes, right=sp.bytes)
+    AllowlistProofType: type = sp.record(max_qty=sp.nat, price_override=sp.option[sp.mutez], path=sp.list[MerkleStepType])
     OperatorParamType: type = sp.variant(add_operator=OperatorKeyType, remove_operator=OperatorKeyType)
+    AllOperatorKeyType: type = sp.record(owner=sp.address, operator=sp.address)
+    AllOperatorParamType: type = sp.variant(add_operator=AllOperatorKeyType, remove_operator=AllOperatorKeyType)
     TransferTxType: type = sp.record(to_=sp.address, token_id=sp.nat, amount=sp.nat)
     TransferBatchItemType: type = sp.record(from_=sp.address, txs=sp.list[TransferTxType])
+    BuyItemType: type = sp.record(owner=sp.address, token_id=sp.nat, qty=sp.nat)
+    RoyaltyType: type = sp.record(royalty_recipient=sp.address, royalty_bps=sp.nat)
+    AcceptItemType: type = sp.record(offer_id=sp.nat, accept_qty=sp.nat)
+    MintBatchItemType: type = sp.record(
+        token_id=sp.nat, qty=sp.nat, to_=sp.address, proof=sp.option[AllowlistProofType]
+    )
+
+    # Per-model mint settings: each token carries only the fields its model uses.
+    MintModelType: type = sp.variant(
+        admin_only=sp.unit,
+        open_edition=sp.record(
+            mint_price=sp.mutez,
+            max_supply=sp.option[sp.nat],
+            allowlist_end=sp.option[sp.timestamp],
+            allowlist_epoch=sp.nat,
+        ),
+        bonding_curve=sp.record(
+            base_price=sp.mutez,
+            price_increment=sp.mutez,
+            step_size=sp.nat,
+            max_supply=sp.nat,
+        ),
+    )
 
     TokenConfigType: type = sp.record(
+        creator=sp.address,
+        mint_model=MintModelType,
+        royalty_recipient=sp.address,
+        royalty_bps=sp.nat,
+        min_offer_per_unit_mutez=sp.mutez,
+    )
+
+    # Hot per-token mint state, split from token_config so a mint only rewrites this record.
+    TokenStateType: type = sp.record(minted=sp.nat, mint_paused=sp.bool, mint_end=sp.option[sp.timestamp], proceeds=sp.mutez)
+
+    # get_mint_quote result: remaining counts are before the quoted mint, None when uncapped.
+    MintQuoteType: type = sp.record(total=sp.mutez, allowlist_remaining=sp.option[sp.nat], supply_remaining=sp.option[sp.nat])
+    # _mint_check result: the quote, the allowlist entry a mint bumps (None outside the allowlist
+    # phase), and the token's creator and mint state as read for the checks.
+    MintCheckType: type = sp.record(
+        quote=MintQuoteType,
+        allowlist_key=sp.option[AllowlistKeyType],
+        creator=sp.address,
+        state=TokenStateType,
+    )
+
+    CreateTokenParamType: type = sp.record(
+        metadata_uri=sp.bytes,
         creator=sp.address,
         mint_model=sp.nat,
-        mint_end=sp.option[sp.timestamp],
-        mint_paused=sp.bool,
-        minted=sp.nat,
-        max_supply=sp.option[sp.nat],
         mint_price=sp.option[sp.mutez],
         base_price=sp.option[sp.mutez],
         price_increment=sp.option[sp.mutez],
         step_size=sp.option[sp.nat],
+        max_supply=sp.option[sp.nat],
+        mint_end=sp.option[sp.timestamp],
         allowlist_end=sp.option[sp.timestamp],
         royalty_recipient=sp.address,
         royalty_bps=sp.nat,
@@ -56,25 +114,77 @@ def main():
         price_override=sp.option[sp.mutez],
     )
 
+    # Bonding-curve pricing: edition e costs base_price + price_increment * (e // step_size).
+    # step_index_sum(n) is the sum of (e // step_size) over e in [0, n): the k complete steps
+    # contribute step_size * (0 + 1 + ... + (k - 1)) and the partial step contributes r * k.
+    def step_index_sum(p):
+        sp.cast(p, sp.record(n=sp.nat, step_size=sp.nat))
+        qr = sp.ediv(p.n, p.step_size).unwrap_some()
+        k = sp.fst(qr)
+        r = sp.snd(qr)
+        return p.step_size * sp.fst(sp.ediv(sp.as_nat(k * k - k), 2).unwrap_some()) + r * k
+
+    # Exact total for editions [minted, minted + qty), in O(1) instead of one step per edition.
+    def curve_total(p):
+        sp.cast(
+            p,
+            sp.record(
+                minted=sp.nat,
+                qty=sp.nat,
+                base_price=sp.mutez,
+                price_increment=sp.mutez,
+                step_size=sp.nat,
+            ),
+        )
+        hi = step_index_sum(sp.record(n=p.minted + p.qty, step_size=p.step_size))
+        lo = step_index_sum(sp.record(n=p.minted, step_size=p.step_size))
+        return sp.split_tokens(p.base_price, p.qty, 1) + sp.split_tokens(p.price_increment, sp.as_nat(hi - lo), 1)
+
     class BowersUnifiedFA2(sp.Contract):
         def __init__(self, admin, metadata):
             self.data.admin = admin
             self.data.metadata = metadata
             self.data.ledger = sp.cast(sp.big_map(), sp.big_map[LedgerKeyType, sp.nat])
+            self.data.token_supply = sp.cast(sp.big_map(), sp.big_map[sp.nat, SupplyType])
             self.data.token_metadata = sp.cast(
                 sp.big_map(),
                 sp.big_map[sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes])],
             )
+            # Optional shared base URI: when set, tokens store only a URI suffix (or nothing) and
+            # TZIP-12 metadata is served by the token_metadata off-chain view.
+            self.data.base_uri = sp.bytes("0x")
+            self.data.token_uri_suffix = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.bytes])
             self.data.token_config = sp.cast(sp.big_map(), sp.big_map[sp.nat, TokenConfigType])
+            self.data.token_state = sp.cast(sp.big_map(), sp.big_map[sp.nat, TokenStateType])
             self.data.token_allowlist = sp.cast(sp.big_map(), sp.big_map[AllowlistKeyType, AllowlistEntryType])
+            # Merkle allowlists: one root per token; per-address minted counts are written on first mint.
+            self.data.allowlist_root = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.bytes])
+            self.data.allowlist_minted = sp.cast(sp.big_map(), sp.big_map[AllowlistKeyType, sp.nat])
             self.data.operators = sp.cast(sp.big_map(), sp.big_map[OperatorKeyType, sp.unit])
+            self.data.all_operators = sp.cast(sp.big_map(), sp.big_map[AllOperatorKeyType, sp.unit])
             self.data.next_token_id = sp.nat(0)
             self.data.listings = sp.cast(sp.big_map(), sp.big_map[LedgerKeyType, ListingType])
             self.data.offers = sp.cast(sp.big_map(), sp.big_map[sp.nat, OfferType])
             self.data.next_offer_id = sp.nat(0)
             self.data.claimable = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.mutez])
+            # Admin switch for secondary sales, which the factory can also set at origination:
+            # implicit sellers and royalty recipients are paid in the buy or accept operation, and
+            # contract payees accumulate in claimable.
+            self.data.direct_payout = False
+            # Applies to all three mint models: while set, a mint adds its price to the token's
+            # token_state.proceeds instead of the creator's claimable, and the creator collects
+            # with withdraw_token_proceeds.
+            self.data.accrue_proceeds = False
             self.data.blacklist = sp.cast(sp.big_map(), sp.big_map[BlacklistKeyType, sp.unit])
             self.data.contract_blocklist = sp.cast(sp.big_map(), sp.big_map[sp.address, sp.unit])
+            # Compile-time: set by BowersUnifiedIndexedFA2, never stored.
+            self.private.indexed = False
+
+        # Called behind `if self.private.indexed` wherever a listing or offer opens or closes;
+        # BowersUnifiedIndexedFA2 sets the flag and overrides it to keep per-token indexes.
+        @sp.private(with_storage="read-write")
+        def index(self, change):
+            sp.cast(change, IndexChangeType)
 
         @sp.entrypoint
         def set_admin(self, new_admin):
@@ -82,6 +192,31 @@ def main():
             sp.cast(new_admin, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.admin = new_admin
+            sp.emit(new_admin, tag="admin")
+
+        @sp.entrypoint
+        def set_direct_payout(self, direct):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(direct, sp.bool)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.direct_payout = direct
+            sp.emit(direct, tag="direct_payout")
+
+        @sp.entrypoint
+        def set_accrue_proceeds(self, accrue):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(accrue, sp.bool)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.accrue_proceeds = accrue
+            sp.emit(accrue, tag="accrue_proceeds")
+
+        @sp.entrypoint
+        def set_base_uri(self, base_uri):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(base_uri, sp.bytes)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self.data.base_uri = base_uri
+            sp.emit(base_uri, tag="base_uri")
 
         # ---- Admin mint ----
 
@@ -105,55 +240,37 @@ def main():
             tid = self.data.next_token_id
             self.data.next_token_id += 1
 
-            token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
-            self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            if self.data.base_uri == sp.bytes("0x"):
+                token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
+                self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            else:
+                if params.metadata_uri != sp.bytes("0x"):
+                    self.data.token_uri_suffix[tid] = params.metadata_uri
 
-            self.data.token_config[tid] = sp.record(
+            cfg = sp.record(
                 creator=self.data.admin,
-                mint_model=sp.nat(0),
-                mint_end=None,
-                mint_paused=True,
-                minted=params.supply,
-                max_supply=sp.Some(params.supply),
-                mint_price=None,
-                base_price=None,
-                price_increment=None,
-                step_size=None,
-                allowlist_end=None,
+                mint_model=sp.variant.admin_only(()),
                 royalty_recipient=params.royalty_recipient,
                 royalty_bps=params.royalty_bps,
                 min_offer_per_unit_mutez=params.min_offer_per_unit_mutez,
             )
+            self.data.token_config[tid] = cfg
+            self.data.token_state[tid] = sp.record(minted=params.supply, mint_paused=True, mint_end=None, proceeds=sp.mutez(0))
+            sp.emit(sp.record(token_id=tid, config=cfg, mint_end=sp.cast(None, sp.option[sp.timestamp])), tag="token_created")
 
             lk = sp.record(owner=self.data.admin, token_id=tid)
             cb = self.data.ledger.get(lk, default=sp.nat(0))
             self.data.ledger[lk] = cb + params.supply
-            sp.emit(sp.record(i=tid, t=self.data.admin, s=params.supply), tag="mint")
+            self.data.token_supply[tid] = sp.record(total_supply=params.supply, holders=sp.nat(1))
+            sp.emit(sp.record(i=tid, t=self.data.admin, q=params.supply, p=sp.mutez(0), a=sp.mutez(0), c=self.data.admin), tag="mint")
 
         # ---- create_token: OE (mint_model=1) or BC (mint_model=2) ----
 
-        @sp.entrypoint
-        def create_token(self, params):
-            assert sp.amount == sp.mutez(0), "NO_TEZ"
-            sp.cast(
-                params,
-                sp.record(
-                    metadata_uri=sp.bytes,
-                    creator=sp.address,
-                    mint_model=sp.nat,
-                    mint_price=sp.option[sp.mutez],
-                    base_price=sp.option[sp.mutez],
-                    price_increment=sp.option[sp.mutez],
-                    step_size=sp.option[sp.nat],
-                    max_supply=sp.option[sp.nat],
-                    mint_end=sp.option[sp.timestamp],
-                    allowlist_end=sp.option[sp.timestamp],
-                    royalty_recipient=sp.address,
-                    royalty_bps=sp.nat,
-                    min_offer_per_unit_mutez=sp.mutez,
-                ),
-            )
-            assert sp.sender == self.data.admin, "NOT_ADMIN"
+        @sp.private(with_storage="read-write", with_operations=True)
+        def _create_token(self, params):
+            # One spec, validated and stored under next_token_id; create_token and create_tokens
+            # both go through here.
+            sp.cast(params, CreateTokenParamType)
             assert params.mint_model == 1 or params.mint_model == 2, "BAD_MINT_MODEL"
             assert params.royalty_bps <= 10_000, "BPS_TOO_HIGH"
 
@@ -163,9 +280,18 @@ def main():
             ss = params.step_size
             ms = params.max_supply
 
+            model = sp.cast(sp.variant.admin_only(()), MintModelType)
             if params.mint_model == 1:
                 assert mp.is_some(), "OE_NEEDS_MINT_PRICE"
                 assert not bp.is_some(), "OE_NO_BASE"
+                model = sp.variant.open_edition(
+                    sp.record(
+                        mint_price=mp.unwrap_some(),
+                        max_supply=ms,
+                        allowlist_end=params.allowlist_end,
+                        allowlist_epoch=sp.nat(0),
+                    )
+                )
             else:
                 assert bp.is_some(), "BC_NEEDS_BASE"
                 assert pi.is_some(), "BC_NEEDS_INC"
@@ -175,29 +301,46 @@ def main():
                 max_s = ms.unwrap_some()
                 assert step > 0, "STEP_ZERO"
                 assert max_s > 0, "ZERO_SUPPLY"
+                model = sp.variant.bonding_curve(
+                    sp.record(base_price=bp.unwrap_some(), price_increment=pi.unwrap_some(), step_size=step, max_supply=max_s)
+                )
 
             tid = self.data.next_token_id
             self.data.next_token_id += 1
 
-            token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
-            self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            if self.data.base_uri == sp.bytes("0x"):
+                token_info = {"": params.metadata_uri, "decimals": sp.bytes("0x30")}
+                self.data.token_metadata[tid] = sp.record(token_id=tid, token_info=token_info)
+            else:
+                if params.metadata_uri != sp.bytes("0x"):
+                    self.data.token_uri_suffix[tid] = params.metadata_uri
 
-            self.data.token_config[tid] = sp.record(
+            cfg = sp.record(
                 creator=params.creator,
-                mint_model=params.mint_model,
-                mint_end=params.mint_end,
-                mint_paused=False,
-                minted=sp.nat(0),
-                max_supply=params.max_supply,
-                mint_price=params.mint_price,
-                base_price=params.base_price,
-                price_increment=params.price_increment,
-                step_size=params.step_size,
-                allowlist_end=params.allowlist_end,
+                mint_model=model,
                 royalty_recipient=params.royalty_recipient,
                 royalty_bps=params.royalty_bps,
                 min_offer_per_unit_mutez=params.min_offer_per_unit_mutez,
             )
+            self.data.token_config[tid] = cfg
+            self.data.token_state[tid] = sp.record(minted=sp.nat(0), mint_paused=False, mint_end=params.mint_end, proceeds=sp.mutez(0))
+            sp.emit(sp.record(token_id=tid, config=cfg, mint_end=params.mint_end), tag="token_created")
+
+        @sp.entrypoint
+        def create_token(self, params):
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(params, CreateTokenParamType)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            self._create_token(params)
+
+        @sp.entrypoint
+        def create_tokens(self, specs):
+            # Batch create_token: consecutive ids from next_token_id.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(specs, sp.list[CreateTokenParamType])
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            for params in specs:
+                self._create_token(params)
 
         @sp.entrypoint
         def set_mint_price(self, params):
@@ -206,92 +349,187 @@ def main():
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
             cfg = self.data.token_config[params.token_id]
-            assert cfg.mint_model == 1, "NOT_OE"
-            cfg.mint_price = sp.Some(params.mint_price)
+            assert cfg.mint_model.is_variant.open_edition(), "NOT_OE"
+            oe = cfg.mint_model.unwrap.open_edition()
+            oe.mint_price = params.mint_price
+            cfg.mint_model = sp.variant.open_edition(oe)
             self.data.token_config[params.token_id] = cfg
+            sp.emit(sp.record(token_id=params.token_id, mint_price=params.mint_price), tag="mint_price")
 
         @sp.entrypoint
         def set_mint_paused(self, params):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(params, sp.record(token_id=sp.nat, paused=sp.bool))
             assert sp.sender == self.data.admin, "NOT_ADMIN"
-            assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
-            cfg = self.data.token_config[params.token_id]
-            cfg.mint_paused = params.paused
-            self.data.token_config[params.token_id] = cfg
+            assert params.token_id in self.data.token_state, "TOKEN_UNDEFINED"
+            st = self.data.token_state[params.token_id]
+            st.mint_paused = params.paused
+            self.data.token_state[params.token_id] = st
+            sp.emit(sp.record(token_id=params.token_id, paused=params.paused), tag="mint_paused")
 
         @sp.entrypoint
         def set_mint_end(self, params):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(params, sp.record(token_id=sp.nat, mint_end=sp.option[sp.timestamp]))
             assert sp.sender == self.data.admin, "NOT_ADMIN"
-            assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
-            cfg = self.data.token_config[params.token_id]
-            cfg.mint_end = params.mint_end
-            self.data.token_config[params.token_id] = cfg
-
-        @sp.entrypoint
-        def mint_editions(self, params):
-            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, to_=sp.address))
+            assert params.token_id in self.data.token_state, "TOKEN_UNDEFINED"
+            st = self.data.token_state[params.token_id]
+            st.mint_end = params.mint_end
+            self.data.token_state[params.token_id] = st
+            sp.emit(sp.record(token_id=params.token_id, mint_end=params.mint_end), tag="mint_end")
+
+        @sp.private(with_storage="read-only")
+        def _mint_check(self, params):
+            # Everything a mint checks before payment, for buyer: mint model and window, supply cap,
+            # allowlist entry or Merkle proof, and the price. get_mint_quote returns the quote as is;
+            # mints also use allowlist_key, the entry whose minted count they must bump.
+            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, buyer=sp.address, proof=sp.option[AllowlistProofType]))
             assert params.qty > 0, "BAD_QTY"
-            assert not (params.to_ in self.data.contract_blocklist), "BLOCKED"
             assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
             cfg = self.data.token_config[params.token_id]
-            assert cfg.mint_model == 1 or cfg.mint_model == 2, "ADMIN_ONLY"
-
-            me = cfg.mint_end
+            assert not cfg.mint_model.is_variant.admin_only(), "ADMIN_ONLY"
+            st = self.data.token_state[params.token_id]
+            me = st.mint_end
             if me.is_some():
                 assert sp.now <= me.unwrap_some(), "MINT_CLOSED"
-            assert not cfg.mint_paused, "MINT_CLOSED"
+            assert not st.mint_paused, "MINT_CLOSED"
 
             total = sp.mutez(0)
+            allowlist_remaining = sp.cast(None, sp.option[sp.nat])
+            supply_remaining = sp.cast(None, sp.option[sp.nat])
+            allowlist_key = sp.cast(None, sp.option[AllowlistKeyType])
+            match cfg.mint_model:
+                case open_edition(oe):
+                    if oe.max_supply.is_some():
+                        cap = oe.max_supply.unwrap_some()
+                        assert st.minted + params.qty <= cap, "MAX_SUPPLY"
+                        supply_remaining = sp.Some(sp.as_nat(cap - st.minted))
+                    price_per = oe.mint_price
+                    al_end = oe.allowlist_end
+                    if al_end.is_some():
+                        if sp.now < al_end.unwrap_some():
+                            key = sp.record(token_id=params.token_id, epoch=oe.allowlist_epoch, address=params.buyer)
+                            max_qty = sp.nat(0)
+                            al_minted = sp.nat(0)
+                            po = sp.cast(None, sp.option[sp.mutez])
+                            if params.proof.is_some():
+                                proof = params.proof.unwrap_some()
+                                node = sp.blake2b(sp.pack((params.buyer, (proof.max_qty, proof.price_override))))
+                                for step in proof.path:
+                                    match step:
+                                        case left(h):
+                                            node = sp.blake2b(h + node)
+                                        case right(h):
+                                            node = sp.blake2b(node + h)
+                                assert self.data.allowlist_root.get(params.token_id, error="NOT_ALLOWLISTED") == node, "BAD_PROOF"
+                                max_qty = proof.max_qty
+                                al_minted = self.data.allowlist_minted.get(key, default=sp.nat(0))
+                                po = proof.price_override
+                            else:
+                                assert key in self.data.token_allowlist, "NOT_ALLOWLISTED"
+                                entry = self.data.token_allowlist[key]
+                                max_qty = entry.max_qty
+                                al_minted = entry.minted
+                                po = entry.price_override
+                            assert al_minted + params.qty <= max_qty, "ALLOWLIST_CAP"
+                            allowlist_remaining = sp.Some(sp.as_nat(max_qty - al_minted))
+                            allowlist_key = sp.Some(key)
+                            if po.is_some():
+                                price_per = po.unwrap_some()
+                    total = sp.split_tokens(price_per, params.qty, 1)
+
+                case bonding_curve(bc):
+                    assert st.minted + params.qty <= bc.max_supply, "MAX_SUPPLY"
+                    supply_remaining = sp.Some(sp.as_nat(bc.max_supply - st.minted))
+                    total = curve_total(
+                        sp.record(
+                            minted=st.minted,
+                            qty=params.qty,
+                            base_price=bc.base_price,
+                            price_increment=bc.price_increment,
+                            step_size=bc.step_size,
+                        )
+                    )
+            return sp.cast(
+                sp.record(
+                    quote=sp.record(total=total, allowlist_remaining=allowlist_remaining, supply_remaining=supply_remaining),
+                    allowlist_key=allowlist_key,
+                    creator=cfg.creator,
+                    state=st,
+                ),
+                MintCheckType,
+            )
 
-            if cfg.mint_model == 1:
-                ms_opt = cfg.max_supply
-                if ms_opt.is_some():
-                    cap = ms_opt.unwrap_some()
-                    assert cfg.minted + params.qty <= cap, "MAX_SUPPLY"
-
-                price_per = cfg.mint_price.unwrap_some()
-                al_end = cfg.allowlist_end
-                if al_end.is_some():
-                    if sp.now < al_end.unwrap_some():
-                        key = sp.record(token_id=params.token_id, address=sp.sender)
-                        assert key in self.data.token_allowlist, "NOT_ALLOWLISTED"
-                        entry = self.data.token_allowlist[key]
-                        assert entry.minted + params.qty <= entry.max_qty, "ALLOWLIST_CAP"
-                        po = entry.price_override
-                        if po.is_some():
-                            price_per = po.unwrap_some()
-                        entry.minted = entry.minted + params.qty
-                        self.data.token_allowlist[key] = entry
-                total = sp.split_tokens(price_per, params.qty, 1)
-
-            else:
-                ms2 = cfg.max_supply.unwrap_some()
-                assert cfg.minted + params.qty <= ms2, "MAX_SUPPLY"
-                bp = cfg.base_price.unwrap_some()
-                inc = cfg.price_increment.unwrap_some()
-                ss = cfg.step_size.unwrap_some()
-                i = sp.nat(0)
-                while i < params.qty:
-                    edition_index = cfg.minted + i
-                    step_index = sp.fst(sp.ediv(edition_index, ss).unwrap_some())
-                    total = total + bp + sp.split_tokens(inc, step_index, 1)
-                    i += 1
+        @sp.private(with_storage="read-write", with_operations=True)
+        def _mint_apply(self, params):
+            # Writes one checked mint for mint_editions and mint_editions_batch: the allowlist
+            # count, ledger, supply counters, mint state and event. Payment and claimable are left
+            # to the caller, which may merge them across a batch.
+            sp.cast(params, sp.record(item=MintBatchItemType, check=MintCheckType))
+            item = params.item
+            chk = params.check
+            total = chk.quote.total
+
+            if chk.allowlist_key.is_some():
+                key = chk.allowlist_key.unwrap_some()
+                if item.proof.is_some():
+                    self.data.allowlist_minted[key] = self.data.allowlist_minted.get(key, default=sp.nat(0)) + item.qty
+                else:
+                    entry = self.data.token_allowlist[key]
+                    entry.minted += item.qty
+                    self.data.token_allowlist[key] = entry
+
+            st = chk.state
+            lk = sp.record(owner=item.to_, token_id=item.token_id)
+            lb = self.data.ledger.get(lk, default=sp.nat(0))
+            self.data.ledger[lk] = lb + item.qty
+            sup = self.data.token_supply.get(item.token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0)))
+            sup.total_supply += item.qty
+            if lb == 0:
+                sup.holders += 1
+            self.data.token_supply[item.token_id] = sup
+            if self.data.accrue_proceeds:
+                st.proceeds += total
+            st.minted = st.minted + item.qty
+            self.data.token_state[item.token_id] = st
+            sp.emit(sp.record(i=item.token_id, t=item.to_, q=item.qty, p=total, a=sp.fst(sp.ediv(total, item.qty).unwrap_some()), c=chk.creator), tag="mint")
 
+        @sp.entrypoint
+        def mint_editions(self, params):
+            sp.cast(params, MintBatchItemType)
+            assert not (params.to_ in self.data.contract_blocklist), "BLOCKED"
+            chk = self._mint_check(sp.record(token_id=params.token_id, qty=params.qty, buyer=sp.sender, proof=params.proof))
+            total = chk.quote.total
             assert sp.amount == total, "BAD_PAYMENT"
+            self._mint_apply(sp.record(item=params, check=chk))
+            if not self.data.accrue_proceeds:
+                self.data.claimable[chk.creator] = (
+                    self.data.claimable.get(chk.creator, default=sp.mutez(0)) + total
+                )
 
-            lk = sp.record(owner=params.to_, token_id=params.token_id)
-            self.data.ledger[lk] = (
-                self.data.ledger.get(lk, default=sp.nat(0)) + params.qty
-            )
-            self.data.claimable[cfg.creator] = (
-                self.data.claimable.get(cfg.creator, default=sp.mutez(0)) + total
-            )
-            cfg.minted = cfg.minted + params.qty
-            self.data.token_config[params.token_id] = cfg
-            sp.emit(sp.record(token_id=params.token_id, to_=params.to_, qty=params.qty, paid=total), tag="mint")
+        @sp.entrypoint
+        def mint_editions_batch(self, items):
+            # Cart checkout: one payment for the summed price, one claimable write per distinct
+            # creator, and each recipient checked against the blocklist once.
+            sp.cast(items, sp.list[MintBatchItemType])
+            cleared = sp.cast(set(), sp.set[sp.address])
+            credits = sp.cast({}, sp.map[sp.address, sp.mutez])
+            grand_total = sp.mutez(0)
+            for item in items:
+                if not (item.to_ in cleared):
+                    assert not (item.to_ in self.data.contract_blocklist), "BLOCKED"
+                    cleared.add(item.to_)
+                chk = self._mint_check(sp.record(token_id=item.token_id, qty=item.qty, buyer=sp.sender, proof=item.proof))
+                self._mint_apply(sp.record(item=item, check=chk))
+                if not self.data.accrue_proceeds:
+                    credits[chk.creator] = credits.get(chk.creator, default=sp.mutez(0)) + chk.quote.total
+                grand_total += chk.quote.total
+
+            assert sp.amount == grand_total, "BAD_PAYMENT"
+            for credit in credits.items():
+                self.data.claimable[credit.key] = (
+                    self.data.claimable.get(credit.key, default=sp.mutez(0)) + credit.value
+                )
 
         # ---- Allowlist ----
 
@@ -301,23 +539,52 @@ def main():
             sp.cast(params, sp.record(token_id=sp.nat, entries=sp.list[AllowlistEntryParam]))
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
+            cfg = self.data.token_config[params.token_id]
+            assert cfg.mint_model.is_variant.open_edition(), "NOT_OE"
+            epoch = cfg.mint_model.unwrap.open_edition().allowlist_epoch
             for e in params.entries:
-                key = sp.record(token_id=params.token_id, address=e.address)
+                key = sp.record(token_id=params.token_id, epoch=epoch, address=e.address)
                 self.data.token_allowlist[key] = sp.record(
                     max_qty=e.max_qty,
                     minted=sp.nat(0),
                     price_override=e.price_override,
                 )
+            sp.emit(sp.record(token_id=params.token_id, epoch=epoch, entries=params.entries), tag="allowlist")
 
         @sp.entrypoint
         def clear_allowlist(self, token_id):
+            # Ends the allowlist phase. The epoch bump orphans every entry and minted count at once
+            # (stale keys can be pruned); a Merkle root is dropped.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(token_id, sp.nat)
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            assert token_id in self.data.token_config, "TOKEN_UNDEFINED"
+            cfg = self.data.token_config[token_id]
+            assert cfg.mint_model.is_variant.open_edition(), "NOT_OE"
+            oe = cfg.mint_model.unwrap.open_edition()
+            oe.allowlist_end = None
+            oe.allowlist_epoch += 1
+            cfg.mint_model = sp.variant.open_edition(oe)
+            self.data.token_config[token_id] = cfg
+            if token_id in self.data.allowlist_root:
+                del self.data.allowlist_root[token_id]
+            sp.emit(sp.record(token_id=token_id, epoch=oe.allowlist_epoch), tag="allowlist_cleared")
+
+        @sp.entrypoint
+        def reset_allowlist(self, token_id):
+            # Restarts the allowlist phase: a new epoch resets every minted count and per-address
+            # entry in one write. A Merkle root is kept, so the same list can run again.
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(token_id, sp.nat)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             assert token_id in self.data.token_config, "TOKEN_UNDEFINED"
             cfg = self.data.token_config[token_id]
-            cfg.allowlist_end = None
+            assert cfg.mint_model.is_variant.open_edition(), "NOT_OE"
+            oe = cfg.mint_model.unwrap.open_edition()
+            oe.allowlist_epoch += 1
+            cfg.mint_model = sp.variant.open_edition(oe)
             self.data.token_config[token_id] = cfg
+            sp.emit(sp.record(token_id=token_id, epoch=oe.allowlist_epoch), tag="allowlist_reset")
 
         @sp.entrypoint
         def set_allowlist_end(self, params):
@@ -326,8 +593,39 @@ def main():
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
             cfg = self.data.token_config[params.token_id]
-            cfg.allowlist_end = params.allowlist_end
+            assert cfg.mint_model.is_variant.open_edition(), "NOT_OE"
+            oe = cfg.mint_model.unwrap.open_edition()
+            oe.allowlist_end = params.allowlist_end
+            cfg.mint_model = sp.variant.open_edition(oe)
             self.data.token_config[params.token_id] = cfg
+            sp.emit(sp.record(token_id=params.token_id, allowlist_end=params.allowlist_end), tag="allowlist_end")
+
+        @sp.entrypoint
+        def set_allowlist_root(self, params):
+            # Merkle mode: one root replaces per-address entries; None removes it.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(params, sp.record(token_id=sp.nat, root=sp.option[sp.bytes]))
+            assert sp.sender == self.data.admin, "NOT_ADMIN"
+            assert params.token_id in self.data.token_config, "TOKEN_UNDEFINED"
+            if params.root.is_some():
+                self.data.allowlist_root[params.token_id] = params.root.unwrap_some()
+            else:
+                del self.data.allowlist_root[params.token_id]
+            sp.emit(sp.record(token_id=params.token_id, root=params.root), tag="allowlist_root")
+
+        @sp.entrypoint
+        def prune_allowlist(self, keys):
+            # Permissionless cleanup of entries and minted counts left behind by a past epoch.
+            # Keys from the current epoch or for unknown tokens are skipped.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(keys, sp.list[AllowlistKeyType])
+            for key in keys:
+                if key.token_id in self.data.token_config:
+                    match self.data.token_config[key.token_id].mint_model:
+                        case open_edition(oe):
+                            if key.epoch < oe.allowlist_epoch:
+                                del self.data.token_allowlist[key]
+                                del self.data.allowlist_minted[key]
 
         # ---- FA2 ----
 
@@ -358,33 +656,90 @@ def main():
                         assert op in self.data.operators, "NO_OP"
                         del self.data.operators[op]
 
+        @sp.entrypoint
+        def update_all_operators(self, actions):
+            # Owner-level operators: one entry approves the operator for all of the owner's tokens.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(actions, sp.list[AllOperatorParamType])
+            for action in actions:
+                match action:
+                    case add_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        self.data.all_operators[op] = ()
+                    case remove_operator(op):
+                        assert op.owner == sp.sender, "NOT_OWNER"
+                        assert op in self.data.all_operators, "NO_OP"
+                        del self.data.all_operators[op]
+
         @sp.entrypoint
         def transfer(self, batch):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(batch, sp.list[TransferBatchItemType])
+            # Balances touched by the batch are read from the ledger once and written back once at
+            # the end; addresses cleared against contract_blocklist are not looked up again.
+            balances = sp.cast({}, sp.map[LedgerKeyType, sp.nat])
+            # Keys that had no balance when the batch first read them. Admin-minted and edition
+            # tokens alike are settled at write-back: a fresh non-zero key adds a holder, and an
+            # emptied key that was not fresh removes one.
+            fresh = sp.cast(set(), sp.set[LedgerKeyType])
+            cleared = sp.cast(set(), sp.set[sp.address])
             for item in batch:
                 from_ = item.from_
-                for tx in item.txs:
+                if not (from_ in cleared):
                     assert not (from_ in self.data.contract_blocklist), "BLOCKED"
-                    assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
-                    if from_ != sp.sender:
-                        assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                    cleared.add(from_)
+                # Checked once per batch item; per-token entries are only read without an owner-level
+                # operator, once per token.
+                all_tokens = from_ == sp.sender
+                if not all_tokens:
+                    all_tokens = sp.record(owner=from_, operator=sp.sender) in self.data.all_operators
+                approved = sp.cast(set(), sp.set[sp.nat])
+                for tx in item.txs:
+                    if not (tx.to_ in cleared):
+                        assert not (tx.to_ in self.data.contract_blocklist), "BLOCKED"
+                        cleared.add(tx.to_)
+                    if not all_tokens:
+                        if not (tx.token_id in approved):
+                            assert sp.record(owner=from_, operator=sp.sender, token_id=tx.token_id) in self.data.operators, "NOT_OPERATOR"
+                            approved.add(tx.token_id)
                     assert tx.amount > 0, "BAD_AMOUNT"
                     fk = sp.record(owner=from_, token_id=tx.token_id)
-                    fb = self.data.ledger.get(fk, default=sp.nat(0))
+                    fb = balances.get(fk, default=sp.nat(0))
+                    if not (fk in balances):
+                        fb = self.data.ledger.get(fk, default=sp.nat(0))
                     assert fb >= tx.amount, "LOW_BAL"
                     nfb = sp.as_nat(fb - tx.amount)
+                    balances[fk] = nfb
                     if nfb == 0:
-                        if fk in self.data.ledger:
-                            del self.data.ledger[fk]
                         if fk in self.data.listings:
                             del self.data.listings[fk]
-                    else:
-                        self.data.ledger[fk] = nfb
+                            if self.private.indexed:
+                                self.index(sp.variant.listing(sp.record(key=fk, listed=False)))
                     tk = sp.record(owner=tx.to_, token_id=tx.token_id)
-                    tb = self.data.ledger.get(tk, default=sp.nat(0))
-                    self.data.ledger[tk] = tb + tx.amount
-                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, a=tx.amount), tag="xfer")
+                    tb = balances.get(tk, default=sp.nat(0))
+                    if not (tk in balances):
+                        tb = self.data.ledger.get(tk, default=sp.nat(0))
+                        if tb == 0:
+                            fresh.add(tk)
+                    balances[tk] = tb + tx.amount
+                    # Activity events (xfer, mint, buy, accept, list, offer, close) share one set of short keys;
+                    # event-schemas.json maps each to its field name.
+                    sp.emit(sp.record(f=from_, t=tx.to_, i=tx.token_id, q=tx.amount), tag="xfer")
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            for entry in balances.items():
+                tid = entry.key.token_id
+                if entry.value == 0:
+                    del self.data.ledger[entry.key]
+                    if not (entry.key in fresh):
+                        holders[tid] = holders.get(tid, default=0) - 1
+                else:
+                    self.data.ledger[entry.key] = entry.value
+                    if entry.key in fresh:
+                        holders[tid] = holders.get(tid, default=0) + 1
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
 
         # ---- Marketplace ----
 
@@ -397,9 +752,15 @@ def main():
             if params.price == sp.mutez(0):
                 if pk in self.data.listings:
                     del self.data.listings[pk]
+                    if self.private.indexed:
+                        self.index(sp.variant.listing(sp.record(key=pk, listed=False)))
             else:
                 assert params.min_bps <= 10_000, "BPS_TOO_HIGH"
                 self.data.listings[pk] = sp.record(price=params.price, max_qty=params.max_qty, min_bps=params.min_bps)
+                if self.private.indexed:
+                    self.index(sp.variant.listing(sp.record(key=pk, listed=True)))
+            # A zero price is a delisting.
+            sp.emit(sp.record(o=sp.sender, i=params.token_id, u=params.price, m=params.max_qty, n=params.min_bps), tag="list")
 
         @sp.entrypoint
         def buy(self, params):
@@ -420,20 +781,106 @@ def main():
             rr = cfg.royalty_recipient
             ry = sp.split_tokens(tp, cfg.royalty_bps, 10_000)
             po = tp - ry
-            self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
-            self.data.claimable[params.owner] = self.data.claimable.get(params.owner, default=sp.mutez(0)) + po
+            if self.data.direct_payout:
+                # Seller and royalty recipient are summed first, so one transfer covers both when
+                # they are the same implicit account; contracts are credited instead.
+                payouts = sp.cast({}, sp.map[sp.address, sp.mutez])
+                if ry > sp.mutez(0):
+                    payouts[rr] = ry
+                payouts[params.owner] = payouts.get(params.owner, default=sp.mutez(0)) + po
+                for payout in payouts.items():
+                    if payout.value > sp.mutez(0):
+                        if sp.is_implicit_account(payout.key).is_some():
+                            sp.send(payout.key, payout.value)
+                        else:
+                            self.data.claimable[payout.key] = self.data.claimable.get(payout.key, default=sp.mutez(0)) + payout.value
+            else:
+                self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
+                self.data.claimable[params.owner] = self.data.claimable.get(params.owner, default=sp.mutez(0)) + po
             nfb = sp.as_nat(fb - params.qty)
             if nfb == 0:
                 if pk in self.data.ledger:
                     del self.data.ledger[pk]
                 if pk in self.data.listings:
                     del self.data.listings[pk]
+                    if self.private.indexed:
+                        self.index(sp.variant.listing(sp.record(key=pk, listed=False)))
             else:
                 self.data.ledger[pk] = nfb
             tk = sp.record(owner=sp.sender, token_id=params.token_id)
             tb = self.data.ledger.get(tk, default=sp.nat(0))
             self.data.ledger[tk] = tb + params.qty
-            sp.emit(sp.record(b=sp.sender, o=params.owner, i=params.token_id, q=params.qty), tag="buy")
+            if (nfb == 0) != (tb == 0):
+                sup = self.data.token_supply[params.token_id]
+                if tb == 0:
+                    sup.holders += 1
+                else:
+                    sup.holders = sp.as_nat(sup.holders - 1)
+                self.data.token_supply[params.token_id] = sup
+            # u: unit price, p: total paid, r / y: royalty recipient / amount (also on "accept").
+            sp.emit(sp.record(b=sp.sender, o=params.owner, i=params.token_id, q=params.qty, u=lst.price, p=tp, r=rr, y=ry), tag="buy")
+
+        @sp.entrypoint
+        def buy_many(self, params):
+            # One cart across every mint model's tokens: all items fill or the call fails.
+            # token_config is read once per token, and each payee is credited or paid once.
+            sp.cast(params, sp.record(items=sp.list[BuyItemType], expected_total=sp.mutez))
+            assert not (sp.sender in self.data.contract_blocklist), "BLOCKED"
+            assert sp.amount == params.expected_total, "WRONG_PRICE"
+            royalties = sp.cast({}, sp.map[sp.nat, RoyaltyType])
+            credits = sp.cast({}, sp.map[sp.address, sp.mutez])
+            bought = sp.cast({}, sp.map[sp.nat, sp.nat])
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            total = sp.mutez(0)
+            for item in params.items:
+                assert item.qty > 0, "BAD_QTY"
+                assert not (sp.record(owner=item.owner, token_id=item.token_id, blocked=sp.sender) in self.data.blacklist), "BLACKLISTED"
+                pk = sp.record(owner=item.owner, token_id=item.token_id)
+                assert pk in self.data.listings, "NOT_FOR_SALE"
+                lst = self.data.listings[pk]
+                if lst.max_qty > 0:
+                    assert item.qty <= lst.max_qty, "MAX_QTY"
+                fb = self.data.ledger.get(pk, default=sp.nat(0))
+                assert fb >= item.qty, "NO_BAL"
+                tp = sp.split_tokens(lst.price, item.qty, 1)
+                if not (item.token_id in royalties):
+                    rc = self.data.token_config[item.token_id]
+                    royalties[item.token_id] = sp.record(royalty_recipient=rc.royalty_recipient, royalty_bps=rc.royalty_bps)
+                roy = royalties[item.token_id]
+                ry = sp.split_tokens(tp, roy.royalty_bps, 10_000)
+                credits[roy.royalty_recipient] = credits.get(roy.royalty_recipient, default=sp.mutez(0)) + ry
+                credits[item.owner] = credits.get(item.owner, default=sp.mutez(0)) + (tp - ry)
+                total += tp
+                nfb = sp.as_nat(fb - item.qty)
+                if nfb == 0:
+                    holders[item.token_id] = holders.get(item.token_id, default=0) - 1
+                    if pk in self.data.ledger:
+                        del self.data.ledger[pk]
+                    if pk in self.data.listings:
+                        del self.data.listings[pk]
+                        if self.private.indexed:
+                            self.index(sp.variant.listing(sp.record(key=pk, listed=False)))
+                else:
+                    self.data.ledger[pk] = nfb
+                bought[item.token_id] = bought.get(item.token_id, default=sp.nat(0)) + item.qty
+                sp.emit(sp.record(b=sp.sender, o=item.owner, i=item.token_id, q=item.qty, u=lst.price, p=tp, r=roy.royalty_recipient, y=ry), tag="buy")
+            assert total == params.expected_total, "WRONG_PRICE"
+            for credit in credits.items():
+                if credit.value > sp.mutez(0):
+                    if self.data.direct_payout and sp.is_implicit_account(credit.key).is_some():
+                        sp.send(credit.key, credit.value)
+                    else:
+                        self.data.claimable[credit.key] = self.data.claimable.get(credit.key, default=sp.mutez(0)) + credit.value
+            for b in bought.items():
+                tk = sp.record(owner=sp.sender, token_id=b.key)
+                tb = self.data.ledger.get(tk, default=sp.nat(0))
+                if tb == 0:
+                    holders[b.key] = holders.get(b.key, default=0) + 1
+                self.data.ledger[tk] = tb + b.value
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
 
         @sp.entrypoint
         def make_offer(self, params):
@@ -451,26 +898,50 @@ def main():
             self.data.offers[oid] = sp.record(
                 token_id=params.token_id, buyer=sp.sender, unit_price=up,
                 remaining_qty=params.qty, expiry=params.expiry)
+            if self.private.indexed:
+                self.index(sp.variant.offer(sp.record(offer_id=oid, token_id=params.token_id, open=True)))
+            sp.emit(sp.record(id=oid, b=sp.sender, i=params.token_id, u=up, q=params.qty, e=params.expiry), tag="offer")
 
         @sp.entrypoint
         def close_offer(self, offer_id):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(offer_id, sp.nat)
-            o = self.data.offers[offer_id]
-            assert o.remaining_qty > 0, "NOT_ACTIVE"
+            o = self.data.offers.get(offer_id, error="NOT_ACTIVE")
             if o.buyer != sp.sender:
                 assert sp.now > o.expiry, "NO_AUTH"
             refund = sp.split_tokens(o.unit_price, o.remaining_qty, 1)
             self.data.claimable[o.buyer] = self.data.claimable.get(o.buyer, default=sp.mutez(0)) + refund
-            o.remaining_qty = sp.nat(0)
-            self.data.offers[offer_id] = o
+            del self.data.offers[offer_id]
+            if self.private.indexed:
+                self.index(sp.variant.offer(sp.record(offer_id=offer_id, token_id=o.token_id, open=False)))
+            sp.emit(sp.record(id=offer_id, b=o.buyer, p=refund), tag="close")
+
+        @sp.entrypoint
+        def prune_offers(self, offer_ids):
+            # Deletes expired offers for any caller and refunds their escrow, one claimable write per
+            # bidder. Missing and live ids are skipped rather than failing the call.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(offer_ids, sp.list[sp.nat])
+            refunds = sp.cast({}, sp.map[sp.address, sp.mutez])
+            for oid in offer_ids:
+                if oid in self.data.offers:
+                    o = self.data.offers[oid]
+                    if o.remaining_qty == 0 or sp.now > o.expiry:
+                        refund = sp.split_tokens(o.unit_price, o.remaining_qty, 1)
+                        refunds[o.buyer] = refunds.get(o.buyer, default=sp.mutez(0)) + refund
+                        del self.data.offers[oid]
+                        if self.private.indexed:
+                            self.index(sp.variant.offer(sp.record(offer_id=oid, token_id=o.token_id, open=False)))
+                        sp.emit(sp.record(id=oid, b=o.buyer, p=refund), tag="close")
+            for r in refunds.items():
+                if r.value > sp.mutez(0):
+                    self.data.claimable[r.key] = self.data.claimable.get(r.key, default=sp.mutez(0)) + r.value
 
         @sp.entrypoint
         def accept_offer(self, params):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             sp.cast(params, sp.record(offer_id=sp.nat, accept_qty=sp.nat))
-            o = self.data.offers[params.offer_id]
-            assert o.remaining_qty > 0, "NOT_ACTIVE"
+            o = self.data.offers.get(params.offer_id, error="NOT_ACTIVE")
             assert sp.now <= o.expiry, "OFFER_EXPIRED"
             assert params.accept_qty > 0, "BAD_ACCEPT_QTY"
             assert params.accept_qty <= o.remaining_qty, "OVER_QTY"
@@ -492,22 +963,130 @@ def main():
             rr = cfg.royalty_recipient
             ry = sp.split_tokens(pt, cfg.royalty_bps, 10_000)
             po = pt - ry
-            self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
-            self.data.claimable[sp.sender] = self.data.claimable.get(sp.sender, default=sp.mutez(0)) + po
+            if self.data.direct_payout:
+                # Paid out of the offer's escrow in this operation; a contract payee, which might
+                # refuse tez, is credited instead.
+                payouts = sp.cast({}, sp.map[sp.address, sp.mutez])
+                if ry > sp.mutez(0):
+                    payouts[rr] = ry
+                payouts[sp.sender] = payouts.get(sp.sender, default=sp.mutez(0)) + po
+                for payout in payouts.items():
+                    if payout.value > sp.mutez(0):
+                        if sp.is_implicit_account(payout.key).is_some():
+                            sp.send(payout.key, payout.value)
+                        else:
+                            self.data.claimable[payout.key] = self.data.claimable.get(payout.key, default=sp.mutez(0)) + payout.value
+            else:
+                self.data.claimable[rr] = self.data.claimable.get(rr, default=sp.mutez(0)) + ry
+                self.data.claimable[sp.sender] = self.data.claimable.get(sp.sender, default=sp.mutez(0)) + po
             nfb = sp.as_nat(fb - params.accept_qty)
             if nfb == 0:
                 if fk in self.data.ledger:
                     del self.data.ledger[fk]
                 if fk in self.data.listings:
                     del self.data.listings[fk]
+                    if self.private.indexed:
+                        self.index(sp.variant.listing(sp.record(key=fk, listed=False)))
             else:
                 self.data.ledger[fk] = nfb
             tk = sp.record(owner=o.buyer, token_id=tid)
             tb = self.data.ledger.get(tk, default=sp.nat(0))
             self.data.ledger[tk] = tb + params.accept_qty
+            if (nfb == 0) != (tb == 0):
+                sup = self.data.token_supply[tid]
+                if tb == 0:
+                    sup.holders += 1
+                else:
+                    sup.holders = sp.as_nat(sup.holders - 1)
+                self.data.token_supply[tid] = sup
             o.remaining_qty = sp.as_nat(o.remaining_qty - params.accept_qty)
-            self.data.offers[params.offer_id] = o
-            sp.emit(sp.record(id=params.offer_id, o=sp.sender, q=params.accept_qty), tag="accept")
+            if o.remaining_qty == 0:
+                del self.data.offers[params.offer_id]
+                if self.private.indexed:
+                    self.index(sp.variant.offer(sp.record(offer_id=params.offer_id, token_id=o.token_id, open=False)))
+            else:
+                self.data.offers[params.offer_id] = o
+            sp.emit(sp.record(id=params.offer_id, o=sp.sender, q=params.accept_qty, b=o.buyer, i=tid, u=o.unit_price, p=pt, r=rr, y=ry), tag="accept")
+
+        @sp.entrypoint
+        def accept_offers(self, items):
+            # The seller's side of a sweep: several bids filled at once, with the balance checked
+            # per token against the summed quantity and ledger / claimable writes merged per key.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(items, sp.list[AcceptItemType])
+            assert sp.len(items) > 0, "NO_ITEMS"
+            royalties = sp.cast({}, sp.map[sp.nat, RoyaltyType])
+            credits = sp.cast({}, sp.map[sp.address, sp.mutez])
+            sold = sp.cast({}, sp.map[sp.nat, sp.nat])
+            deliveries = sp.cast({}, sp.map[LedgerKeyType, sp.nat])
+            holders = sp.cast({}, sp.map[sp.nat, sp.int])
+            proceeds = sp.mutez(0)
+            for item in items:
+                o = self.data.offers.get(item.offer_id, error="NOT_ACTIVE")
+                assert sp.now <= o.expiry, "OFFER_EXPIRED"
+                assert item.accept_qty > 0, "BAD_ACCEPT_QTY"
+                assert item.accept_qty <= o.remaining_qty, "OVER_QTY"
+                tid = o.token_id
+                assert not (o.buyer in self.data.contract_blocklist), "BLOCKED"
+                assert not (sp.record(owner=sp.sender, token_id=tid, blocked=o.buyer) in self.data.blacklist), "BLACKLISTED"
+                pt = sp.split_tokens(o.unit_price, item.accept_qty, 1)
+                assert pt > sp.mutez(0), "PAY_ZERO"
+                fk = sp.record(owner=sp.sender, token_id=tid)
+                if fk in self.data.listings:
+                    lst = self.data.listings[fk]
+                    if lst.min_bps > 0:
+                        lt = sp.split_tokens(lst.price, item.accept_qty, 1)
+                        ft = sp.split_tokens(lt, lst.min_bps, 10_000)
+                        assert pt >= ft, "LOW_BID"
+                if not (tid in royalties):
+                    rc = self.data.token_config[tid]
+                    royalties[tid] = sp.record(royalty_recipient=rc.royalty_recipient, royalty_bps=rc.royalty_bps)
+                roy = royalties[tid]
+                ry = sp.split_tokens(pt, roy.royalty_bps, 10_000)
+                credits[roy.royalty_recipient] = credits.get(roy.royalty_recipient, default=sp.mutez(0)) + ry
+                proceeds += pt - ry
+                sold[tid] = sold.get(tid, default=sp.nat(0)) + item.accept_qty
+                tk = sp.record(owner=o.buyer, token_id=tid)
+                deliveries[tk] = deliveries.get(tk, default=sp.nat(0)) + item.accept_qty
+                o.remaining_qty = sp.as_nat(o.remaining_qty - item.accept_qty)
+                if o.remaining_qty == 0:
+                    del self.data.offers[item.offer_id]
+                    if self.private.indexed:
+                        self.index(sp.variant.offer(sp.record(offer_id=item.offer_id, token_id=o.token_id, open=False)))
+                else:
+                    self.data.offers[item.offer_id] = o
+                sp.emit(sp.record(id=item.offer_id, o=sp.sender, q=item.accept_qty, b=o.buyer, i=tid, u=o.unit_price, p=pt, r=roy.royalty_recipient, y=ry), tag="accept")
+            credits[sp.sender] = credits.get(sp.sender, default=sp.mutez(0)) + proceeds
+            for s in sold.items():
+                fk = sp.record(owner=sp.sender, token_id=s.key)
+                fb = self.data.ledger.get(fk, default=sp.nat(0))
+                assert fb >= s.value, "LOW_BAL"
+                nfb = sp.as_nat(fb - s.value)
+                if nfb == 0:
+                    holders[s.key] = holders.get(s.key, default=0) - 1
+                    if fk in self.data.ledger:
+                        del self.data.ledger[fk]
+                    if fk in self.data.listings:
+                        del self.data.listings[fk]
+                        if self.private.indexed:
+                            self.index(sp.variant.listing(sp.record(key=fk, listed=False)))
+                else:
+                    self.data.ledger[fk] = nfb
+            for d in deliveries.items():
+                db = self.data.ledger.get(d.key, default=sp.nat(0))
+                if db == 0:
+                    holders[d.key.token_id] = holders.get(d.key.token_id, default=0) + 1
+                self.data.ledger[d.key] = db + d.value
+            for h in holders.items():
+                sup = self.data.token_supply[h.key]
+                sup.holders = sp.as_nat(sp.to_int(sup.holders) + h.value)
+                self.data.token_supply[h.key] = sup
+            for credit in credits.items():
+                if credit.value > sp.mutez(0):
+                    if self.data.direct_payout and sp.is_implicit_account(credit.key).is_some():
+                        sp.send(credit.key, credit.value)
+                    else:
+                        self.data.claimable[credit.key] = self.data.claimable.get(credit.key, default=sp.mutez(0)) + credit.value
 
         @sp.entrypoint
         def block_address(self, address):
@@ -515,6 +1094,7 @@ def main():
             sp.cast(address, sp.address)
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             self.data.contract_blocklist[address] = ()
+            sp.emit(sp.record(address=address, blocked=True), tag="blocklist")
 
         @sp.entrypoint
         def unblock_address(self, address):
@@ -523,6 +1103,7 @@ def main():
             assert sp.sender == self.data.admin, "NOT_ADMIN"
             if address in self.data.contract_blocklist:
                 del self.data.contract_blocklist[address]
+            sp.emit(sp.record(address=address, blocked=False), tag="blocklist")
 
         @sp.entrypoint
         def blacklist_address(self, params):
@@ -530,6 +1111,7 @@ def main():
             sp.cast(params, sp.record(token_id=sp.nat, blocked=sp.address))
             assert self.data.ledger.get(sp.record(owner=sp.sender, token_id=params.token_id), default=sp.nat(0)) > 0, "NOT_OWNER"
             self.data.blacklist[sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked)] = ()
+            sp.emit(sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked, active=True), tag="blacklist")
 
         @sp.entrypoint
         def unblacklist_address(self, params):
@@ -539,22 +1121,102 @@ def main():
             key = sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked)
             if key in self.data.blacklist:
                 del self.data.blacklist[key]
+            sp.emit(sp.record(owner=sp.sender, token_id=params.token_id, blocked=params.blocked, active=False), tag="blacklist")
 
         @sp.entrypoint
         def withdraw(self):
             assert sp.amount == sp.mutez(0), "NO_TEZ"
             amount = self.data.claimable.get(sp.sender, default=sp.mutez(0))
             assert amount > sp.mutez(0), "NO_FUNDS"
-            self.data.claimable[sp.sender] = sp.mutez(0)
+            del self.data.claimable[sp.sender]
+            sp.send(sp.sender, amount)
+
+        @sp.entrypoint
+        def withdraw_for(self, recipients):
+            # Permissionless batch payout of whole claimable balances, covering sale proceeds,
+            # royalties, refunds and mint proceeds for any mint model. Only implicit accounts are
+            # paid: a contract with a unit default entrypoint could still fail on receipt and
+            # revert the batch, so contracts are skipped and call withdraw themselves.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(recipients, sp.list[sp.address])
+            for recipient in recipients:
+                if sp.is_implicit_account(recipient).is_some():
+                    if recipient in self.data.claimable:
+                        amount = self.data.claimable[recipient]
+                        del self.data.claimable[recipient]
+                        if amount > sp.mutez(0):
+                            sp.send(recipient, amount)
+
+        @sp.entrypoint
+        def withdraw_token_proceeds(self, token_ids):
+            # Collects what the given tokens accrued, whatever their mint model, in one transfer to
+            # their creator.
+            assert sp.amount == sp.mutez(0), "NO_TEZ"
+            sp.cast(token_ids, sp.list[sp.nat])
+            amount = sp.mutez(0)
+            for token_id in token_ids:
+                assert token_id in self.data.token_state, "TOKEN_UNDEFINED"
+                assert self.data.token_config[token_id].creator == sp.sender, "NOT_CREATOR"
+                st = self.data.token_state[token_id]
+                amount += st.proceeds
+                st.proceeds = sp.mutez(0)
+                self.data.token_state[token_id] = st
+            assert amount > sp.mutez(0), "NO_FUNDS"
             sp.send(sp.sender, amount)
 
         # ---- Views ----
 
+        @sp.offchain_view
+        def token_metadata(self, token_id):
+            """TZIP-12 token metadata: the stored token_info, else base_uri + suffix (default: the decimal token id)."""
+            sp.cast(token_id, sp.nat)
+            if token_id in self.data.token_metadata:
+                return self.data.token_metadata[token_id]
+            else:
+                assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+                suffix = self.data.token_uri_suffix.get(token_id, default=sp.bytes("0x"))
+                if suffix == sp.bytes("0x"):
+                    digits = sp.bytes("0x30313233343536373839")
+                    qr = sp.ediv(token_id, 10).unwrap_some()
+                    suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some()
+                    n = sp.fst(qr)
+                    while n > 0:
+                        qr = sp.ediv(n, 10).unwrap_some()
+                        suffix = sp.slice(sp.snd(qr), 1, digits).unwrap_some() + suffix
+                        n = sp.fst(qr)
+                return sp.record(
+                    token_id=token_id,
+                    token_info={"": self.data.base_uri + suffix, "decimals": sp.bytes("0x30")},
+                )
+
         @sp.onchain_view
         def get_balance(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat))
             return self.data.ledger.get(sp.record(owner=params.owner, token_id=params.token_id), default=sp.nat(0))
 
+        @sp.onchain_view
+        def get_balances(self, requests):
+            sp.cast(requests, sp.list[LedgerKeyType])
+            balances = []
+            for req in requests:
+                balances.push(self.data.ledger.get(req, default=sp.nat(0)))
+            return reversed(balances)
+
+        @sp.onchain_view
+        def total_supply(self, token_id):
+            sp.cast(token_id, sp.nat)
+            assert token_id < self.data.next_token_id, "FA2_TOKEN_UNDEFINED"
+            return self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))).total_supply
+
+        @sp.onchain_view
+        def get_token_supplies(self, token_ids):
+            # For each token, total supply and the number of addresses holding it; zero for unknown ids.
+            sp.cast(token_ids, sp.list[sp.nat])
+            supplies = []
+            for token_id in token_ids:
+                supplies.push(self.data.token_supply.get(token_id, default=sp.record(total_supply=sp.nat(0), holders=sp.nat(0))))
+            return reversed(supplies)
+
         @sp.onchain_view
         def get_offer(self, offer_id):
             sp.cast(offer_id, sp.nat)
@@ -563,18 +1225,37 @@ def main():
         @sp.onchain_view
         def is_operator(self, params):
             sp.cast(params, sp.record(owner=sp.address, operator=sp.address, token_id=sp.nat))
-            return sp.record(owner=params.owner, operator=params.operator, token_id=params.token_id) in self.data.operators
+            return (sp.record(owner=params.owner, operator=params.operator) in self.data.all_operators) or (
+                sp.record(owner=params.owner, operator=params.operator, token_id=params.token_id) in self.data.operators
+            )
 
         @sp.onchain_view
         def get_listing(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat))
             return self.data.listings[sp.record(owner=params.owner, token_id=params.token_id)]
 
+        @sp.onchain_view
+        def get_listings(self, keys):
+            # As get_listing for a list of keys, in order, with None for an unlisted key instead of an error.
+            sp.cast(keys, sp.list[LedgerKeyType])
+            listings = []
+            for key in keys:
+                listings.push(self.data.listings.get_opt(key))
+            return reversed(listings)
+
         @sp.onchain_view
         def get_claimable(self, addr):
             sp.cast(addr, sp.address)
             return self.data.claimable.get(addr, default=sp.mutez(0))
 
+        @sp.onchain_view
+        def get_claimables(self, addrs):
+            sp.cast(addrs, sp.list[sp.address])
+            amounts = []
+            for addr in addrs:
+                amounts.push(self.data.claimable.get(addr, default=sp.mutez(0)))
+            return reversed(amounts)
+
         @sp.onchain_view
         def is_blacklisted(self, params):
             sp.cast(params, sp.record(owner=sp.address, token_id=sp.nat, blocked=sp.address))
@@ -585,30 +1266,40 @@ def main():
             sp.cast(token_id, sp.nat)
             return self.data.token_config[token_id]
 
+        @sp.onchain_view
+        def get_token_configs(self, token_ids):
+            sp.cast(token_ids, sp.list[sp.nat])
+            configs = []
+            for token_id in token_ids:
+                configs.push(self.data.token_config.get_opt(token_id))
+            return reversed(configs)
+
+        @sp.onchain_view
+        def get_token_state(self, token_id):
+            sp.cast(token_id, sp.nat)
+            return self.data.token_state[token_id]
+
         @sp.onchain_view
         def get_current_price(self, token_id):
             sp.cast(token_id, sp.nat)
             result = sp.mutez(0)
             if token_id in self.data.token_config:
-                cfg = self.data.token_config[token_id]
-                mp = cfg.mint_price
-                if cfg.mint_model == 1 and mp.is_some():
-                    result = mp.unwrap_some()
-                else:
-                    bp_opt = cfg.base_price
-                    ss_opt = cfg.step_size
-                    pi_opt = cfg.price_increment
-                    if cfg.mint_model == 2 and bp_opt.is_some() and ss_opt.is_some():
-                        ss = ss_opt.unwrap_some()
-                        inc = pi_opt.unwrap_some()
-                        step_index = sp.fst(sp.ediv(cfg.minted, ss).unwrap_some())
-                        result = bp_opt.unwrap_some() + sp.split_tokens(inc, step_index, 1)
+                match self.data.token_config[token_id].mint_model:
+                    case open_edition(oe):
+                        result = oe.mint_price
+                    case bonding_curve(bc):
+                        step_index = sp.fst(sp.ediv(self.data.token_state[token_id].minted, bc.step_size).unwrap_some())
+                        result = bc.base_price + sp.split_tokens(bc.price_increment, step_index, 1)
             return result
 
         @sp.onchain_view
         def get_allowlist_entry(self, params):
             sp.cast(params, sp.record(token_id=sp.nat, address=sp.address))
-            key = sp.record(token_id=params.token_id, address=params.address)
+            epoch = sp.nat(0)
+            match self.data.token_config[params.token_id].mint_model:
+                case open_edition(oe):
+                    epoch = oe.allowlist_epoch
+            key = sp.record(token_id=params.token_id, epoch=epoch, address=params.address)
             result = sp.cast(None, sp.option[AllowlistEntryType])
             if key in self.data.token_allowlist:
                 result = sp.Some(self.data.token_allowlist[key])
@@ -617,14 +1308,145 @@ def main():
         @sp.onchain_view
         def is_allowlisted(self, params):
             sp.cast(params, sp.record(token_id=sp.nat, address=sp.address))
-            key = sp.record(token_id=params.token_id, address=params.address)
+            epoch = sp.nat(0)
+            match self.data.token_config[params.token_id].mint_model:
+                case open_edition(oe):
+                    epoch = oe.allowlist_epoch
+            key = sp.record(token_id=params.token_id, epoch=epoch, address=params.address)
             return key in self.data.token_allowlist
 
+        @sp.onchain_view
+        def get_allowlist_minted(self, params):
+            sp.cast(params, sp.record(token_id=sp.nat, address=sp.address))
+            epoch = sp.nat(0)
+            match self.data.token_config[params.token_id].mint_model:
+                case open_edition(oe):
+                    epoch = oe.allowlist_epoch
+            key = sp.record(token_id=params.token_id, epoch=epoch, address=params.address)
+            return self.data.allowlist_minted.get(key, default=sp.nat(0))
+
+        @sp.onchain_view
+        def get_mint_quote(self, params):
+            """What mint_editions would charge buyer for qty editions now, failing where it would."""
+            sp.cast(params, sp.record(token_id=sp.nat, qty=sp.nat, buyer=sp.address, proof=sp.option[AllowlistProofType]))
+            return self._mint_check(params).quote
+
+    # Opt-in build (scripts/compile_unified.py --indexed) for mirror nodes and light clients:
+    # per-token indexes of listing owners and open offer ids, read a page at a time through
+    # on-chain views.
+    # A position in a token's index; positions 0 .. count - 1 are filled.
+    IndexPositionType: type = sp.record(token_id=sp.nat, position=sp.nat)
+    OfferIndexKeyType: type = sp.record(token_id=sp.nat, offer_id=sp.nat)
+
+    # Each index is three big_maps: a per-token count, the entry at each position, and the position
+    # of each entry. Opening appends at position count; closing moves the last entry into the freed
+    # position. Either way a change costs a fixed number of big_map accesses however many listings
+    # or offers the token has, and a view reads one entry per result. Closing reorders the last
+    # entry, so a client paging while the index changes may see it twice or miss it once.
+    class BowersUnifiedIndexedFA2(BowersUnifiedFA2):
+        def __init__(self, admin, metadata):
+            BowersUnifiedFA2.__init__(self, admin, metadata)
+            self.private.indexed = True
+            self.data.listing_count = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.nat])
+            self.data.listing_at = sp.cast(sp.big_map(), sp.big_map[IndexPositionType, sp.address])
+            self.data.listing_position = sp.cast(sp.big_map(), sp.big_map[LedgerKeyType, sp.nat])
+            self.data.offer_count = sp.cast(sp.big_map(), sp.big_map[sp.nat, sp.nat])
+            self.data.offer_at = sp.cast(sp.big_map(), sp.big_map[IndexPositionType, sp.nat])
+            self.data.offer_position = sp.cast(sp.big_map(), sp.big_map[OfferIndexKeyType, sp.nat])
+
+        @sp.private(with_storage="read-write")
+        def index(self, change):
+            sp.cast(change, IndexChangeType)
+            match change:
+                case listing(l):
+                    tid = l.key.token_id
+                    count = self.data.listing_count.get(tid, default=sp.nat(0))
+                    if l.listed:
+                        # A price update of an open listing is already indexed.
+                        if not (l.key in self.data.listing_position):
+                            self.data.listing_at[sp.record(token_id=tid, position=count)] = l.key.owner
+                            self.data.listing_position[l.key] = count
+                            self.data.listing_count[tid] = count + 1
+                    else:
+                        if l.key in self.data.listing_position:
+                            position = self.data.listing_position[l.key]
+                            last = sp.as_nat(count - 1)
+                            if position != last:
+                                moved = self.data.listing_at[sp.record(token_id=tid, position=last)]
+                                self.data.listing_at[sp.record(token_id=tid, position=position)] = moved
+                                self.data.listing_position[sp.record(owner=moved, token_id=tid)] = position
+                            del self.data.listing_at[sp.record(token_id=tid, position=last)]
+                            del self.data.listing_position[l.key]
+                            if last == 0:
+                                del self.data.listing_count[tid]
+                            else:
+                                self.data.listing_count[tid] = last
+                case offer(o):
+                    key = sp.record(token_id=o.token_id, offer_id=o.offer_id)
+                    count = self.data.offer_count.get(o.token_id, default=sp.nat(0))
+                    if o.open:
+                        self.data.offer_at[sp.record(token_id=o.token_id, position=count)] = o.offer_id
+                        self.data.offer_position[key] = count
+                        self.data.offer_count[o.token_id] = count + 1
+                    else:
+                        position = self.data.offer_position[key]
+                        last = sp.as_nat(count - 1)
+                        if position != last:
+                            moved = self.data.offer_at[sp.record(token_id=o.token_id, position=last)]
+                            self.data.offer_at[sp.record(token_id=o.token_id, position=position)] = moved
+                            self.data.offer_position[sp.record(token_id=o.token_id, offer_id=moved)] = position
+                        del self.data.offer_at[sp.record(token_id=o.token_id, position=last)]
+                        del self.data.offer_position[key]
+                        if last == 0:
+                            del self.data.offer_count[o.token_id]
+                        else:
+                            self.data.offer_count[o.token_id] = last
+
+        @sp.onchain_view
+        def get_token_listings(self, params):
+            # The listings of a token at index positions offset .. offset + limit - 1, and the total.
+            sp.cast(params, sp.record(token_id=sp.nat, offset=sp.nat, limit=sp.nat))
+            total = self.data.listing_count.get(params.token_id, default=sp.nat(0))
+            end = params.offset + params.limit
+            if end > total:
+                end = total
+            page = []
+            i = params.offset
+            while i < end:
+                owner = self.data.listing_at[sp.record(token_id=params.token_id, position=i)]
+                page.push(sp.record(owner=owner, listing=self.data.listings[sp.record(owner=owner, token_id=params.token_id)]))
+                i += 1
+            return sp.record(total=total, page=reversed(page))
+
+        @sp.onchain_view
+        def get_token_offers(self, params):
+            # The open offers on a token at index positions offset .. offset + limit - 1, and the total.
+            sp.cast(params, sp.record(token_id=sp.nat, offset=sp.nat, limit=sp.nat))
+            total = self.data.offer_count.get(params.token_id, default=sp.nat(0))
+            end = params.offset + params.limit
+            if end > total:
+                end = total
+            page = []
+            i = params.offset
+            while i < end:
+                oid = self.data.offer_at[sp.record(token_id=params.token_id, position=i)]
+                page.push(sp.record(offer_id=oid, offer=self.data.offers[oid]))
+                i += 1
+            return sp.record(total=total, page=reversed(page))
+
 
 def bytes_of_string(s):
     return sp.bytes("0x" + s.encode("utf-8").hex())
 
 
+def loop_curve_total(minted, qty, base_price, price_increment, step_size):
+    # Reference: the per-edition loop mint_editions used before the closed-form sum (mutez).
+    total = 0
+    for i in range(qty):
+        total += base_price + price_increment * ((minted + i) // step_size)
+    return total
+
+
 @sp.add_test()
 def test():
     scenario = sp.test_scenario("BowersUnifiedFA2", main)
@@ -683,5 +1505,1043 @@ def test():
         _sender=admin,
     )
 
-    c.mint_editions(token_id=1, qty=2, to_=bob.address, _sender=bob, _amount=sp.tez(2))
-    c.mint_editions(token_id=2, qty=10, to_=bob.address, _sender=bob, _amount=sp.tez(10))
+    c.mint_editions(token_id=1, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(2))
+    c.mint_editions(token_id=2, qty=10, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(10))
+
+    # Cart checkout: OE + BC in one operation; BC editions 10..14 sit on step 1.
+    c.mint_editions_batch(
+        [
+            sp.record(token_id=1, qty=3, to_=bob.address, proof=None),
+            sp.record(token_id=2, qty=5, to_=bob.address, proof=None),
+        ],
+        _sender=bob,
+        _amount=sp.tez(8) + sp.mutez(400_000),
+        _valid=False,
+        _exception="BAD_PAYMENT",
+    )
+    c.mint_editions_batch(
+        [
+            sp.record(token_id=1, qty=3, to_=bob.address, proof=None),
+            sp.record(token_id=2, qty=5, to_=bob.address, proof=None),
+        ],
+        _sender=bob,
+        _amount=sp.tez(8) + sp.mutez(500_000),
+    )
+    scenario.verify(c.data.claimable[alice.address] == sp.tez(20) + sp.mutez(500_000))
+    scenario.verify(c.data.ledger[sp.record(owner=bob.address, token_id=1)] == 5)
+    scenario.verify(c.data.token_state[2].minted == 15)
+    c.mint_editions_batch(
+        [sp.record(token_id=0, qty=1, to_=bob.address, proof=None)],
+        _sender=bob,
+        _valid=False,
+        _exception="ADMIN_ONLY",
+    )
+
+    oe_spec = sp.record(
+        metadata_uri=bytes_of_string("ipfs://QmBatchOE"),
+        creator=alice.address,
+        mint_model=1,
+        mint_price=sp.Some(sp.tez(2)),
+        base_price=None,
+        price_increment=None,
+        step_size=None,
+        max_supply=None,
+        mint_end=None,
+        allowlist_end=None,
+        royalty_recipient=alice.address,
+        royalty_bps=1000,
+        min_offer_per_unit_mutez=sp.mutez(500),
+    )
+    bc_spec = sp.record(
+        metadata_uri=bytes_of_string("ipfs://QmBatchBC"),
+        creator=alice.address,
+        mint_model=2,
+        mint_price=None,
+        base_price=sp.Some(sp.tez(1)),
+        price_increment=sp.Some(sp.mutez(100_000)),
+        step_size=sp.Some(10),
+        max_supply=sp.Some(100),
+        mint_end=None,
+        allowlist_end=None,
+        royalty_recipient=alice.address,
+        royalty_bps=750,
+        min_offer_per_unit_mutez=sp.mutez(2000),
+    )
+    bc_missing_step = sp.record(
+        metadata_uri=bytes_of_string("ipfs://QmBatchBad"),
+        creator=alice.address,
+        mint_model=2,
+        mint_price=None,
+        base_price=sp.Some(sp.tez(1)),
+        price_increment=sp.Some(sp.mutez(100_000)),
+        step_size=None,
+        max_supply=sp.Some(100),
+        mint_end=None,
+        allowlist_end=None,
+        royalty_recipient=alice.address,
+        royalty_bps=750,
+        min_offer_per_unit_mutez=sp.mutez(2000),
+    )
+    c.create_tokens([oe_spec, bc_missing_step], _sender=admin, _valid=False, _exception="BC_NEEDS_STEP")
+    c.create_tokens([oe_spec, bc_spec, oe_spec], _sender=admin)
+    scenario.verify(c.data.next_token_id == 6)
+    scenario.verify(
+        c.data.token_config[4].mint_model
+        == sp.variant.bonding_curve(
+            sp.record(base_price=sp.tez(1), price_increment=sp.mutez(100_000), step_size=10, max_supply=100)
+        )
+    )
+    scenario.verify(
+        c.data.token_config[5].mint_model
+        == sp.variant.open_edition(sp.record(mint_price=sp.tez(2), max_supply=None, allowlist_end=None, allowlist_epoch=0))
+    )
+
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=admin)
+    c.set_listing(token_id=1, price=sp.tez(2), max_qty=0, min_bps=0, _sender=bob)
+    sweep = [
+        sp.record(owner=admin.address, token_id=0, qty=2),
+        sp.record(owner=bob.address, token_id=1, qty=3),
+    ]
+    c.buy_many(items=sweep, expected_total=sp.tez(7), _sender=alice, _amount=sp.tez(8), _valid=False, _exception="WRONG_PRICE")
+    c.buy_many(items=sweep, expected_total=sp.tez(8), _sender=alice, _amount=sp.tez(8))
+    scenario.verify(c.data.claimable[admin.address] == sp.tez(2))
+    scenario.verify(c.data.claimable[bob.address] == sp.mutez(5_400_000))
+    scenario.verify(c.data.claimable[alice.address] == sp.mutez(21_100_000))
+    scenario.verify(c.data.ledger[sp.record(owner=alice.address, token_id=1)] == 3)
+
+    # Bob (2x token 1, 15x token 2) fills several bids in one operation.
+    c.make_offer(token_id=1, qty=2, expiry=sp.timestamp(1000), _sender=alice, _amount=sp.tez(2))
+    c.make_offer(token_id=2, qty=4, expiry=sp.timestamp(1000), _sender=alice, _amount=sp.tez(2))
+    c.make_offer(token_id=1, qty=1, expiry=sp.timestamp(1000), _sender=admin, _amount=sp.tez(1))
+    c.accept_offers(
+        [sp.record(offer_id=0, accept_qty=2), sp.record(offer_id=2, accept_qty=1)],
+        _sender=bob,
+        _valid=False,
+        _exception="LOW_BAL",
+    )
+    c.accept_offers(
+        [sp.record(offer_id=1, accept_qty=5)],
+        _sender=bob,
+        _valid=False,
+        _exception="OVER_QTY",
+    )
+    c.accept_offers(
+        [sp.record(offer_id=0, accept_qty=2), sp.record(offer_id=1, accept_qty=4)],
+        _sender=bob,
+    )
+    scenario.verify(~c.data.ledger.contains(sp.record(owner=bob.address, token_id=1)))
+    scenario.verify(~c.data.listings.contains(sp.record(owner=bob.address, token_id=1)))
+    scenario.verify(c.data.ledger[sp.record(owner=bob.address, token_id=2)] == 11)
+    scenario.verify(c.data.ledger[sp.record(owner=alice.address, token_id=1)] == 5)
+    scenario.verify(c.data.ledger[sp.record(owner=alice.address, token_id=2)] == 4)
+    scenario.verify(~c.data.offers.contains(1))
+    scenario.verify(c.data.claimable[bob.address] == sp.mutez(9_050_000))
+    scenario.verify(c.data.claimable[alice.address] == sp.mutez(21_450_000))
+
+    # Anyone may prune; live offers and unknown ids are skipped, expired ones refunded.
+    c.prune_offers([0, 2, 99], _sender=bob)
+    scenario.verify(c.data.offers.contains(2))
+    c.prune_offers([2], _sender=bob, _now=sp.timestamp(1001))
+    scenario.verify(~c.data.offers.contains(2))
+    scenario.verify(c.data.claimable[admin.address] == sp.tez(3))
+
+
+@sp.add_test()
+def test_curve_pricing():
+    # Closed-form curve_total must charge exactly what the old per-edition loop charged,
+    # across step sizes and for mints that start and end mid-step.
+    scenario = sp.test_scenario("BowersUnifiedFA2_curve_pricing", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    c = main.BowersUnifiedFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    base_price = 1_234_567
+    price_increment = 98_765
+    token_id = 0
+    for step_size in [1, 2, 3, 7, 10, 64]:
+        c.create_token(
+            metadata_uri=bytes_of_string("ipfs://QmCurve"),
+            creator=alice.address,
+            mint_model=2,
+            mint_price=None,
+            base_price=sp.Some(sp.mutez(base_price)),
+            price_increment=sp.Some(sp.mutez(price_increment)),
+            step_size=sp.Some(step_size),
+            max_supply=sp.Some(200),
+            mint_end=None,
+            allowlist_end=None,
+            royalty_recipient=alice.address,
+            royalty_bps=750,
+            min_offer_per_unit_mutez=sp.mutez(2000),
+            _sender=admin,
+        )
+        minted = 0
+        for qty in [1, 2, 5, 9, 13, 30, 64]:
+            total = loop_curve_total(minted, qty, base_price, price_increment, step_size)
+            c.mint_editions(
+                token_id=token_id, qty=qty, to_=alice.address, proof=None,
+                _sender=alice, _amount=sp.mutez(total - 1), _valid=False, _exception="BAD_PAYMENT",
+            )
+            c.mint_editions(token_id=token_id, qty=qty, to_=alice.address, proof=None, _sender=alice, _amount=sp.mutez(total))
+            minted += qty
+        scenario.verify(c.data.token_state[token_id].minted == minted)
+        token_id += 1
+
+
+@sp.add_test()
+def test_base_uri():
+    # With a base URI set, new tokens store only a suffix (or nothing) and their
+    # TZIP-12 metadata is rebuilt by the token_metadata off-chain view.
+    scenario = sp.test_scenario("BowersUnifiedFA2_base_uri", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    c = main.BowersUnifiedFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.mint(
+        metadata_uri=bytes_of_string("ipfs://QmFull"),
+        supply=10,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(1000),
+        _sender=admin,
+    )
+
+    base = bytes_of_string("ipfs://QmBase/")
+    c.set_base_uri(base, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_base_uri(base, _sender=admin)
+    for _ in range(11):
+        c.mint(
+            metadata_uri=sp.bytes("0x"),
+            supply=10,
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            min_offer_per_unit_mutez=sp.mutez(1000),
+            _sender=admin,
+        )
+    c.mint(
+        metadata_uri=bytes_of_string("custom.json"),
+        supply=10,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(1000),
+        _sender=admin,
+    )
+
+    scenario.verify(c.token_metadata(0).token_info[""] == bytes_of_string("ipfs://QmFull"))
+    scenario.verify(~c.data.token_metadata.contains(1))
+    scenario.verify(~c.data.token_uri_suffix.contains(1))
+    scenario.verify(c.token_metadata(1).token_info[""] == base + bytes_of_string("1"))
+    scenario.verify(c.token_metadata(11).token_info[""] == base + bytes_of_string("11"))
+    scenario.verify(c.token_metadata(11).token_info["decimals"] == sp.bytes("0x30"))
+    scenario.verify(c.token_metadata(12).token_info[""] == base + bytes_of_string("custom.json"))
+
+
+@sp.add_test()
+def test_merkle_allowlist():
+    # Merkle mode: one root per token, proofs supplied at mint, minted counts written lazily.
+    scenario = sp.test_scenario("BowersUnifiedFA2_merkle_allowlist", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersUnifiedFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmOE"),
+        creator=alice.address,
+        mint_model=1,
+        mint_price=sp.Some(sp.tez(1)),
+        base_price=None,
+        price_increment=None,
+        step_size=None,
+        max_supply=sp.Some(10),
+        mint_end=None,
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=alice.address,
+        royalty_bps=750,
+        min_offer_per_unit_mutez=sp.mutez(2000),
+        _sender=admin,
+    )
+
+    def leaf(account, max_qty, price_override):
+        return scenario.compute(sp.blake2b(sp.pack((account.address, (sp.nat(max_qty), price_override)))))
+
+    free = sp.Some(sp.tez(0))
+    full = sp.cast(None, sp.option[sp.mutez])
+    l_bob, l_alice, l_carol = leaf(bob, 2, free), leaf(alice, 1, full), leaf(carol, 1, full)
+    # Three leaves: the odd one is promoted unchanged to the next level.
+    n_01 = scenario.compute(sp.blake2b(l_bob + l_alice))
+    root = scenario.compute(sp.blake2b(n_01 + l_carol))
+    bob_proof = sp.record(max_qty=2, price_override=free, path=[sp.variant.right(l_alice), sp.variant.right(l_carol)])
+    alice_proof = sp.record(max_qty=1, price_override=full, path=[sp.variant.left(l_bob), sp.variant.right(l_carol)])
+    carol_proof = sp.record(max_qty=1, price_override=full, path=[sp.variant.left(n_01)])
+
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=sp.Some(bob_proof), _sender=bob, _valid=False, _exception="NOT_ALLOWLISTED")
+    c.set_allowlist_root(token_id=0, root=sp.Some(root), _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_allowlist_root(token_id=0, root=sp.Some(root), _sender=admin)
+
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=sp.Some(bob_proof), _sender=bob, _amount=sp.mutez(0))
+    scenario.verify(c.data.allowlist_minted[sp.record(token_id=0, epoch=0, address=bob.address)] == 2)
+    scenario.verify(~c.data.token_allowlist.contains(sp.record(token_id=0, epoch=0, address=bob.address)))
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=sp.Some(bob_proof), _sender=bob, _valid=False, _exception="ALLOWLIST_CAP")
+
+    # A proof only verifies for the sender and the exact (max_qty, price_override) it was built for.
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=sp.Some(bob_proof), _sender=alice, _valid=False, _exception="BAD_PROOF")
+    c.mint_editions(
+        token_id=0, qty=1, to_=alice.address, proof=sp.Some(sp.record(max_qty=5, price_override=full, path=alice_proof.path)),
+        _sender=alice, _amount=sp.tez(1), _valid=False, _exception="BAD_PROOF",
+    )
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=sp.Some(alice_proof), _sender=alice, _amount=sp.mutez(0), _valid=False, _exception="BAD_PAYMENT")
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=sp.Some(alice_proof), _sender=alice, _amount=sp.tez(1))
+    c.mint_editions(token_id=0, qty=1, to_=carol.address, proof=sp.Some(carol_proof), _sender=carol, _amount=sp.tez(1))
+    scenario.verify(c.data.ledger[sp.record(owner=carol.address, token_id=0)] == 1)
+
+    # Without a proof the per-address big_map is consulted as before.
+    c.mint_editions(token_id=0, qty=1, to_=carol.address, proof=None, _sender=carol, _amount=sp.tez(1), _valid=False, _exception="NOT_ALLOWLISTED")
+    c.set_allowlist_root(token_id=0, root=None, _sender=admin)
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=sp.Some(bob_proof), _sender=bob, _valid=False, _exception="NOT_ALLOWLISTED")
+
+
+@sp.add_test()
+def test_allowlist_epochs():
+    # Entries and minted counts are keyed by the token's allowlist epoch: reset and clear are O(1),
+    # stale keys are ignored and can be pruned by anyone.
+    scenario = sp.test_scenario("BowersUnifiedFA2_allowlist_epochs", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersUnifiedFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmOE"),
+        creator=alice.address,
+        mint_model=1,
+        mint_price=sp.Some(sp.tez(1)),
+        base_price=None,
+        price_increment=None,
+        step_size=None,
+        max_supply=sp.Some(10),
+        mint_end=None,
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=alice.address,
+        royalty_bps=750,
+        min_offer_per_unit_mutez=sp.mutez(2000),
+        _sender=admin,
+    )
+
+    c.set_allowlist(
+        token_id=0,
+        entries=[sp.record(address=bob.address, max_qty=2, price_override=sp.Some(sp.tez(0)))],
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.mutez(0))
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _valid=False, _exception="ALLOWLIST_CAP")
+
+    c.reset_allowlist(0, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.reset_allowlist(0, _sender=admin)
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _valid=False, _exception="NOT_ALLOWLISTED")
+    c.set_allowlist(
+        token_id=0,
+        entries=[sp.record(address=bob.address, max_qty=1, price_override=sp.Some(sp.tez(0)))],
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.mutez(0))
+    scenario.verify(c.data.token_allowlist[sp.record(token_id=0, epoch=1, address=bob.address)].minted == 1)
+
+    # A Merkle root survives reset_allowlist, so the same list runs again with fresh counts.
+    full = sp.cast(None, sp.option[sp.mutez])
+    root = scenario.compute(sp.blake2b(sp.pack((alice.address, (sp.nat(1), full)))))
+    alice_proof = sp.Some(sp.record(max_qty=1, price_override=full, path=[]))
+    c.set_allowlist_root(token_id=0, root=sp.Some(root), _sender=admin)
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=alice_proof, _sender=alice, _amount=sp.tez(1))
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=alice_proof, _sender=alice, _amount=sp.tez(1), _valid=False, _exception="ALLOWLIST_CAP")
+    c.reset_allowlist(0, _sender=admin)
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=alice_proof, _sender=alice, _amount=sp.tez(1))
+    scenario.verify(c.data.allowlist_minted[sp.record(token_id=0, epoch=2, address=alice.address)] == 1)
+
+    # Stale keys are removed; current-epoch keys and unknown tokens are skipped.
+    c.prune_allowlist(
+        [
+            sp.record(token_id=0, epoch=0, address=bob.address),
+            sp.record(token_id=0, epoch=1, address=bob.address),
+            sp.record(token_id=0, epoch=1, address=alice.address),
+            sp.record(token_id=0, epoch=2, address=alice.address),
+            sp.record(token_id=7, epoch=0, address=bob.address),
+        ],
+        _sender=carol,
+    )
+    scenario.verify(~c.data.token_allowlist.contains(sp.record(token_id=0, epoch=0, address=bob.address)))
+    scenario.verify(~c.data.token_allowlist.contains(sp.record(token_id=0, epoch=1, address=bob.address)))
+    scenario.verify(~c.data.allowlist_minted.contains(sp.record(token_id=0, epoch=1, address=alice.address)))
+    scenario.verify(c.data.allowlist_minted[sp.record(token_id=0, epoch=2, address=alice.address)] == 1)
+
+    # clear_allowlist ends the phase and drops the root; minting falls back to the public price.
+    c.clear_allowlist(0, _sender=admin)
+    scenario.verify(~c.data.allowlist_root.contains(0))
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(1))
+
+
+@sp.add_test()
+def test_all_operators():
+    # An owner-level operator moves any of the owner's tokens without per-token entries.
+    scenario = sp.test_scenario("BowersUnifiedFA2_all_operators", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    market = sp.test_account("market")
+    c = main.BowersUnifiedFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    for uri in ["ipfs://QmA", "ipfs://QmB"]:
+        c.mint(
+            metadata_uri=bytes_of_string(uri),
+            supply=5,
+            royalty_recipient=admin.address,
+            royalty_bps=500,
+            min_offer_per_unit_mutez=sp.mutez(1000),
+            _sender=admin,
+        )
+    c.transfer(
+        [sp.record(from_=admin.address, txs=[sp.record(to_=alice.address, token_id=0, amount=5), sp.record(to_=alice.address, token_id=1, amount=5)])],
+        _sender=admin,
+    )
+
+    batch = [sp.record(from_=alice.address, txs=[sp.record(to_=bob.address, token_id=0, amount=1), sp.record(to_=bob.address, token_id=1, amount=1)])]
+    c.transfer(batch, _sender=market, _valid=False, _exception="NOT_OPERATOR")
+    scenario.verify(~c.is_operator(sp.record(owner=alice.address, operator=market.address, token_id=1)))
+
+    op = sp.record(owner=alice.address, operator=market.address)
+    c.update_all_operators([sp.variant.add_operator(op)], _sender=market, _valid=False, _exception="NOT_OWNER")
+    c.update_all_operators([sp.variant.add_operator(op)], _sender=alice)
+    scenario.verify(c.is_operator(sp.record(owner=alice.address, operator=market.address, token_id=1)))
+    c.transfer(batch, _sender=market)
+    scenario.verify(c.data.ledger[sp.record(owner=bob.address, token_id=1)] == 1)
+
+    c.update_all_operators([sp.variant.remove_operator(op)], _sender=alice)
+    c.update_all_operators([sp.variant.remove_operator(op)], _sender=alice, _valid=False, _exception="NO_OP")
+    c.transfer(batch, _sender=market, _valid=False, _exception="NOT_OPERATOR")
+
+    # Per-token operators still work on their own.
+    c.update_operators([sp.variant.add_operator(sp.record(owner=alice.address, operator=market.address, token_id=0))], _sender=alice)
+    c.transfer([sp.record(from_=alice.address, txs=[sp.record(to_=bob.address, token_id=0, amount=1)])], _sender=market)
+    c.transfer(batch, _sender=market, _valid=False, _exception="NOT_OPERATOR")
+
+
+@sp.add_test()
+def test_transfer_batch():
+    # Balances are cached across the batch: later txs see earlier credits and debits, and
+    # repeated (owner, token_id) pairs are written back once.
+    scenario = sp.test_scenario("BowersUnifiedFA2_transfer_batch", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersUnifiedFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.mint(
+        metadata_uri=bytes_of_string("ipfs://QmBatch"),
+        supply=5,
+        royalty_recipient=admin.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(1000),
+        _sender=admin,
+    )
+    c.transfer([sp.record(from_=admin.address, txs=[sp.record(to_=alice.address, token_id=0, amount=5)])], _sender=admin)
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=5, min_bps=0, _sender=alice)
+
+    c.update_all_operators([sp.variant.add_operator(sp.record(owner=bob.address, operator=alice.address))], _sender=bob)
+    c.transfer(
+        [
+            sp.record(from_=alice.address, txs=[sp.record(to_=bob.address, token_id=0, amount=2), sp.record(to_=bob.address, token_id=0, amount=3)]),
+            sp.record(from_=bob.address, txs=[sp.record(to_=carol.address, token_id=0, amount=4), sp.record(to_=alice.address, token_id=0, amount=1)]),
+        ],
+        _sender=alice,
+    )
+    scenario.verify(~c.data.ledger.contains(sp.record(owner=bob.address, token_id=0)))
+    scenario.verify(c.data.ledger[sp.record(owner=alice.address, token_id=0)] == 1)
+    scenario.verify(c.data.ledger[sp.record(owner=carol.address, token_id=0)] == 4)
+    # Alice's balance reached zero mid-batch, so her listing is gone.
+    scenario.verify(~c.data.listings.contains(sp.record(owner=alice.address, token_id=0)))
+
+    c.transfer(
+        [sp.record(from_=carol.address, txs=[sp.record(to_=bob.address, token_id=0, amount=3), sp.record(to_=bob.address, token_id=0, amount=2)])],
+        _sender=carol,
+        _valid=False,
+        _exception="LOW_BAL",
+    )
+    c.block_address(carol.address, _sender=admin)
+    c.transfer(
+        [sp.record(from_=alice.address, txs=[sp.record(to_=bob.address, token_id=0, amount=1), sp.record(to_=carol.address, token_id=0, amount=1)])],
+        _sender=alice,
+        _valid=False,
+        _exception="BLOCKED",
+    )
+
+
+@sp.add_test()
+def test_token_proceeds():
+    # In accrue mode mint proceeds stay in token_state and the creator sweeps them per token.
+    scenario = sp.test_scenario("BowersUnifiedFA2_token_proceeds", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersUnifiedFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    for creator in [alice, alice, bob]:
+        c.create_token(
+            metadata_uri=bytes_of_string("ipfs://QmOE"),
+            creator=creator.address,
+            mint_model=1,
+            mint_price=sp.Some(sp.tez(1)),
+            base_price=None,
+            price_increment=None,
+            step_size=None,
+            max_supply=None,
+            mint_end=None,
+            allowlist_end=None,
+            royalty_recipient=creator.address,
+            royalty_bps=500,
+            min_offer_per_unit_mutez=sp.mutez(500),
+            _sender=admin,
+        )
+
+    c.set_accrue_proceeds(True, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_accrue_proceeds(True, _sender=admin)
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(2))
+    c.mint_editions_batch(
+        [
+            sp.record(token_id=1, qty=3, to_=bob.address, proof=None),
+            sp.record(token_id=2, qty=1, to_=bob.address, proof=None),
+        ],
+        _sender=bob,
+        _amount=sp.tez(4),
+    )
+    scenario.verify(~c.data.claimable.contains(alice.address))
+    scenario.verify(c.data.token_state[0].proceeds == sp.tez(2))
+    scenario.verify(c.data.token_state[1].proceeds == sp.tez(3))
+
+    c.withdraw_token_proceeds([0, 2], _sender=alice, _valid=False, _exception="NOT_CREATOR")
+    c.withdraw_token_proceeds([0, 1], _sender=alice)
+    scenario.verify(c.data.token_state[0].proceeds == sp.mutez(0))
+    scenario.verify(c.data.token_state[1].proceeds == sp.mutez(0))
+    scenario.verify(c.balance == sp.tez(1))
+    c.withdraw_token_proceeds([0, 1], _sender=alice, _valid=False, _exception="NO_FUNDS")
+
+    # Switching back credits claimable again; tokens keep what they already accrued.
+    c.set_accrue_proceeds(False, _sender=admin)
+    c.mint_editions(token_id=2, qty=1, to_=alice.address, proof=None, _sender=alice, _amount=sp.tez(1))
+    scenario.verify(c.data.claimable[bob.address] == sp.tez(1))
+    c.withdraw_token_proceeds([2], _sender=bob)
+    scenario.verify(c.balance == sp.tez(1))
+
+
+@sp.add_test()
+def test_direct_payout():
+    # In direct mode sales pay implicit accounts in the same operation; contracts still go to claimable.
+    scenario = sp.test_scenario("BowersUnifiedFA2_direct_payout", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersUnifiedFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    for royalty_recipient in [alice.address, c.address]:
+        c.create_token(
+            metadata_uri=bytes_of_string("ipfs://QmOE"),
+            creator=alice.address,
+            mint_model=1,
+            mint_price=sp.Some(sp.tez(1)),
+            base_price=None,
+            price_increment=None,
+            step_size=None,
+            max_supply=None,
+            mint_end=None,
+            allowlist_end=None,
+            royalty_recipient=royalty_recipient,
+            royalty_bps=1000,
+            min_offer_per_unit_mutez=sp.mutez(500),
+            _sender=admin,
+        )
+    c.mint_editions_batch(
+        [
+            sp.record(token_id=0, qty=2, to_=bob.address, proof=None),
+            sp.record(token_id=1, qty=1, to_=bob.address, proof=None),
+        ],
+        _sender=bob,
+        _amount=sp.tez(3),
+    )
+    scenario.verify(c.data.claimable[alice.address] == sp.tez(3))
+
+    c.set_direct_payout(True, _sender=alice, _valid=False, _exception="NOT_ADMIN")
+    c.set_direct_payout(True, _sender=admin)
+
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy(owner=bob.address, token_id=0, qty=1, _sender=carol, _amount=sp.tez(1))
+    scenario.verify(c.data.claimable[alice.address] == sp.tez(3))
+    scenario.verify(~c.data.claimable.contains(bob.address))
+    scenario.verify(c.balance == sp.tez(3))
+
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(1000), _sender=carol, _amount=sp.tez(2))
+    c.accept_offer(offer_id=0, accept_qty=1, _sender=bob)
+    scenario.verify(~c.data.claimable.contains(bob.address))
+    scenario.verify(c.balance == sp.tez(3))
+
+    # A contract royalty recipient is credited instead of paid.
+    c.set_listing(token_id=1, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy(owner=bob.address, token_id=1, qty=1, _sender=carol, _amount=sp.tez(1))
+    scenario.verify(c.data.claimable[c.address] == sp.mutez(100000))
+    scenario.verify(c.balance == sp.tez(3) + sp.mutez(100000))
+
+    # A zero royalty gives a contract recipient no claimable entry.
+    vault = sp.address("KT1Tezooo1zzSmartPyzzSTATiCzzzyfC8eF")
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmOE"),
+        creator=alice.address,
+        mint_model=1,
+        mint_price=sp.Some(sp.tez(1)),
+        base_price=None,
+        price_increment=None,
+        step_size=None,
+        max_supply=None,
+        mint_end=None,
+        allowlist_end=None,
+        royalty_recipient=vault,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.mint_editions(token_id=2, qty=3, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(3))
+    c.set_listing(token_id=2, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy(owner=bob.address, token_id=2, qty=1, _sender=carol, _amount=sp.tez(1))
+    c.buy_many(
+        items=[sp.record(owner=bob.address, token_id=2, qty=1)],
+        expected_total=sp.tez(1),
+        _sender=carol,
+        _amount=sp.tez(1),
+    )
+    c.make_offer(token_id=2, qty=1, expiry=sp.timestamp(1000), _sender=carol, _amount=sp.tez(1))
+    c.accept_offer(offer_id=1, accept_qty=1, _sender=bob)
+    scenario.verify(~c.data.claimable.contains(vault))
+    c.make_offer(token_id=2, qty=1, expiry=sp.timestamp(1000), _sender=bob, _amount=sp.tez(1))
+    c.accept_offers([], _sender=carol, _valid=False, _exception="NO_ITEMS")
+    c.accept_offers([sp.record(offer_id=2, accept_qty=1)], _sender=carol)
+    scenario.verify(~c.data.claimable.contains(vault))
+
+
+@sp.add_test()
+def test_withdraw_for():
+    # Anyone can pay out a list of claimable balances; drained entries are removed.
+    scenario = sp.test_scenario("BowersUnifiedFA2_withdraw_for", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersUnifiedFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmOE"),
+        creator=alice.address,
+        mint_model=1,
+        mint_price=sp.Some(sp.tez(1)),
+        base_price=None,
+        price_increment=None,
+        step_size=None,
+        max_supply=None,
+        mint_end=None,
+        allowlist_end=None,
+        royalty_recipient=c.address,
+        royalty_bps=1000,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(1))
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy(owner=bob.address, token_id=0, qty=1, _sender=carol, _amount=sp.tez(1))
+
+    c.withdraw_for([alice.address], _sender=carol, _amount=sp.tez(1), _valid=False, _exception="NO_TEZ")
+    # Repeats and addresses with nothing to claim are skipped; the contract royalty recipient
+    # is not an implicit account, so its balance stays.
+    c.withdraw_for([alice.address, bob.address, carol.address, c.address, alice.address], _sender=carol)
+    scenario.verify(~c.data.claimable.contains(alice.address))
+    scenario.verify(~c.data.claimable.contains(bob.address))
+    scenario.verify(c.data.claimable[c.address] == sp.mutez(100000))
+    scenario.verify(c.balance == sp.mutez(100000))
+
+
+@sp.add_test()
+def test_batch_views():
+    # List-in, list-out views answer in request order; missing keys come back as None.
+    scenario = sp.test_scenario("BowersUnifiedFA2_batch_views", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersUnifiedFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmOE"),
+        creator=alice.address,
+        mint_model=1,
+        mint_price=sp.Some(sp.tez(1)),
+        base_price=None,
+        price_increment=None,
+        step_size=None,
+        max_supply=None,
+        mint_end=None,
+        allowlist_end=None,
+        royalty_recipient=alice.address,
+        royalty_bps=500,
+        min_offer_per_unit_mutez=sp.mutez(500),
+        _sender=admin,
+    )
+    c.mint_editions(token_id=0, qty=3, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(3))
+    c.set_listing(token_id=0, price=sp.tez(2), max_qty=0, min_bps=0, _sender=bob)
+
+    bob_0 = sp.record(owner=bob.address, token_id=0)
+    alice_0 = sp.record(owner=alice.address, token_id=0)
+    scenario.verify_equal(c.get_balances([bob_0, alice_0, bob_0]), [3, 0, 3])
+    scenario.verify_equal(c.get_claimables([bob.address, alice.address]), [sp.mutez(0), sp.tez(3)])
+    scenario.verify_equal(c.get_listings([alice_0, bob_0]), [None, sp.Some(sp.record(price=sp.tez(2), max_qty=0, min_bps=0))])
+    scenario.verify_equal(c.get_token_configs([1, 0]), [None, sp.Some(c.get_token_config(0))])
+
+
+@sp.add_test()
+def test_mint_quote():
+    # get_mint_quote returns the exact amount mint_editions demands, with allowlist and supply headroom.
+    scenario = sp.test_scenario("BowersUnifiedFA2_mint_quote", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersUnifiedFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmOE"),
+        creator=alice.address,
+        mint_model=1,
+        mint_price=sp.Some(sp.tez(1)),
+        base_price=None,
+        price_increment=None,
+        step_size=None,
+        max_supply=sp.Some(10),
+        mint_end=None,
+        allowlist_end=sp.Some(sp.timestamp(100)),
+        royalty_recipient=alice.address,
+        royalty_bps=750,
+        min_offer_per_unit_mutez=sp.mutez(2000),
+        _sender=admin,
+    )
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmCurve"),
+        creator=alice.address,
+        mint_model=2,
+        mint_price=None,
+        base_price=sp.Some(sp.mutez(1_000_000)),
+        price_increment=sp.Some(sp.mutez(100_000)),
+        step_size=sp.Some(3),
+        max_supply=sp.Some(20),
+        mint_end=None,
+        allowlist_end=None,
+        royalty_recipient=alice.address,
+        royalty_bps=750,
+        min_offer_per_unit_mutez=sp.mutez(2000),
+        _sender=admin,
+    )
+    c.set_allowlist(
+        token_id=0,
+        entries=[sp.record(address=bob.address, max_qty=3, price_override=sp.Some(sp.mutez(500_000)))],
+        _sender=admin,
+    )
+    full = sp.cast(None, sp.option[sp.mutez])
+    root = scenario.compute(sp.blake2b(sp.pack((carol.address, (sp.nat(2), full)))))
+    carol_proof = sp.Some(sp.record(max_qty=2, price_override=full, path=[]))
+    c.set_allowlist_root(token_id=0, root=sp.Some(root), _sender=admin)
+
+    c.mint_editions(token_id=0, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.mutez(500_000))
+    scenario.verify_equal(
+        c.get_mint_quote(sp.record(token_id=0, qty=2, buyer=bob.address, proof=None)),
+        sp.record(total=sp.tez(1), allowlist_remaining=sp.Some(2), supply_remaining=sp.Some(9)),
+    )
+    scenario.verify_equal(
+        c.get_mint_quote(sp.record(token_id=0, qty=2, buyer=carol.address, proof=carol_proof)),
+        sp.record(total=sp.tez(2), allowlist_remaining=sp.Some(2), supply_remaining=sp.Some(9)),
+    )
+    c.mint_editions(token_id=0, qty=2, to_=carol.address, proof=carol_proof, _sender=carol, _amount=sp.tez(2))
+
+    c.mint_editions(token_id=1, qty=4, to_=bob.address, proof=None, _sender=bob, _amount=sp.mutez(loop_curve_total(0, 4, 1_000_000, 100_000, 3)))
+    total = loop_curve_total(4, 5, 1_000_000, 100_000, 3)
+    scenario.verify_equal(
+        c.get_mint_quote(sp.record(token_id=1, qty=5, buyer=bob.address, proof=None)),
+        sp.record(total=sp.mutez(total), allowlist_remaining=None, supply_remaining=sp.Some(16)),
+    )
+    c.mint_editions(token_id=1, qty=5, to_=bob.address, proof=None, _sender=bob, _amount=sp.mutez(total))
+
+    # After the allowlist phase the quote is the public price.
+    c.mint_editions(token_id=0, qty=1, to_=alice.address, proof=None, _sender=alice, _amount=sp.tez(1), _now=sp.timestamp(100))
+    scenario.verify_equal(
+        c.get_mint_quote(sp.record(token_id=0, qty=3, buyer=bob.address, proof=None)),
+        sp.record(total=sp.tez(3), allowlist_remaining=None, supply_remaining=sp.Some(6)),
+    )
+
+
+@sp.add_test()
+def test_state_events():
+    # Listing, offer, allowlist and config changes each emit an event; the log shows the
+    # sequence an indexer would replay.
+    scenario = sp.test_scenario("BowersUnifiedFA2_state_events", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    c = main.BowersUnifiedFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmOE"),
+        creator=alice.address,
+        mint_model=1,
+        mint_price=sp.Some(sp.tez(1)),
+        base_price=None,
+        price_increment=None,
+        step_size=None,
+        max_supply=None,
+        mint_end=None,
+        allowlist_end=None,
+        royalty_recipient=alice.address,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(0),
+        _sender=admin,
+    )
+    c.set_mint_price(token_id=0, mint_price=sp.tez(2), _sender=admin)
+    c.set_mint_end(token_id=0, mint_end=sp.Some(sp.timestamp(1000)), _sender=admin)
+    c.set_allowlist(token_id=0, entries=[sp.record(address=bob.address, max_qty=1, price_override=None)], _sender=admin)
+    c.set_allowlist_end(token_id=0, allowlist_end=sp.Some(sp.timestamp(10)), _sender=admin)
+    c.set_allowlist_root(token_id=0, root=sp.Some(sp.bytes("0x00")), _sender=admin)
+    c.reset_allowlist(0, _sender=admin)
+    c.clear_allowlist(0, _sender=admin)
+    c.set_mint_paused(token_id=0, paused=True, _sender=admin)
+    c.set_mint_paused(token_id=0, paused=False, _sender=admin)
+    c.mint_editions(token_id=0, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(4))
+
+    c.set_listing(token_id=0, price=sp.tez(3), max_qty=1, min_bps=0, _sender=bob)
+    scenario.verify(c.data.listings.contains(sp.record(owner=bob.address, token_id=0)))
+    c.set_listing(token_id=0, price=sp.mutez(0), max_qty=0, min_bps=0, _sender=bob)
+    scenario.verify(~c.data.listings.contains(sp.record(owner=bob.address, token_id=0)))
+
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(100), _sender=alice, _amount=sp.tez(1))
+    c.make_offer(token_id=0, qty=2, expiry=sp.timestamp(100), _sender=alice, _amount=sp.tez(2))
+    c.close_offer(0, _sender=alice)
+    c.prune_offers([1], _sender=bob, _now=sp.timestamp(101))
+    scenario.verify(~c.data.offers.contains(0) & ~c.data.offers.contains(1))
+
+    c.block_address(bob.address, _sender=admin)
+    c.unblock_address(bob.address, _sender=admin)
+    c.blacklist_address(token_id=0, blocked=alice.address, _sender=bob)
+    c.unblacklist_address(token_id=0, blocked=alice.address, _sender=bob)
+    c.set_base_uri(bytes_of_string("ipfs://QmBase/"), _sender=admin)
+    c.set_admin(alice.address, _sender=admin)
+    scenario.verify(c.data.admin == alice.address)
+
+
+@sp.add_test()
+def test_supply_counters():
+    # Total supply grows with each mint; a holder is counted when its ledger entry is created
+    # and dropped when it is deleted, through transfers, sales and accepted offers.
+    scenario = sp.test_scenario("BowersUnifiedFA2_supply_counters", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersUnifiedFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.mint(
+        metadata_uri=bytes_of_string("ipfs://QmAdmin"),
+        supply=10,
+        royalty_recipient=admin.address,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(0),
+        _sender=admin,
+    )
+    c.create_token(
+        metadata_uri=bytes_of_string("ipfs://QmOE"),
+        creator=alice.address,
+        mint_model=1,
+        mint_price=sp.Some(sp.tez(1)),
+        base_price=None,
+        price_increment=None,
+        step_size=None,
+        max_supply=None,
+        mint_end=None,
+        allowlist_end=None,
+        royalty_recipient=alice.address,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(0),
+        _sender=admin,
+    )
+    scenario.verify_equal(c.get_token_supplies([0, 1, 2]), [
+        sp.record(total_supply=10, holders=1),
+        sp.record(total_supply=0, holders=0),
+        sp.record(total_supply=0, holders=0),
+    ])
+    c.mint_editions(token_id=1, qty=2, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(2))
+    c.mint_editions(token_id=1, qty=1, to_=bob.address, proof=None, _sender=bob, _amount=sp.tez(1))
+    c.mint_editions_batch(
+        [sp.record(token_id=1, qty=1, to_=alice.address, proof=None), sp.record(token_id=1, qty=1, to_=carol.address, proof=None)],
+        _sender=alice,
+        _amount=sp.tez(2),
+    )
+    scenario.verify(c.total_supply(1) == 5)
+    scenario.verify(c.data.token_supply[1].holders == 3)
+
+    # Moving a whole balance keeps the count; splitting one adds a holder.
+    c.transfer([sp.record(from_=admin.address, txs=[sp.record(to_=alice.address, token_id=0, amount=10)])], _sender=admin)
+    scenario.verify(c.data.token_supply[0].holders == 1)
+    c.transfer(
+        [sp.record(from_=alice.address, txs=[sp.record(to_=bob.address, token_id=0, amount=4), sp.record(to_=bob.address, token_id=1, amount=1)])],
+        _sender=alice,
+    )
+    scenario.verify_equal(c.get_token_supplies([0, 1]), [
+        sp.record(total_supply=10, holders=2),
+        sp.record(total_supply=5, holders=2),
+    ])
+
+    # A buyer new to the token is added; a seller who sells out is dropped.
+    c.set_listing(token_id=1, price=sp.tez(1), max_qty=0, min_bps=0, _sender=carol)
+    c.buy(owner=carol.address, token_id=1, qty=1, _sender=alice, _amount=sp.tez(1))
+    scenario.verify(c.data.token_supply[1].holders == 2)
+    c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=bob)
+    c.buy_many(
+        items=[sp.record(owner=bob.address, token_id=0, qty=4)],
+        expected_total=sp.tez(4),
+        _sender=carol,
+        _amount=sp.tez(4),
+    )
+    scenario.verify(c.data.token_supply[0].holders == 2)
+
+    c.make_offer(token_id=1, qty=2, expiry=sp.timestamp(1000), _sender=carol, _amount=sp.tez(2))
+    c.accept_offer(offer_id=0, accept_qty=1, _sender=bob)
+    scenario.verify(c.data.token_supply[1].holders == 3)
+    c.accept_offers([sp.record(offer_id=0, accept_qty=1)], _sender=alice)
+    scenario.verify_equal(c.get_token_supplies([0, 1]), [
+        sp.record(total_supply=10, holders=2),
+        sp.record(total_supply=5, holders=2),
+    ])
+
+
+@sp.add_test()
+def test_indexed_build():
+    # The indexes follow every path that opens or closes a listing or offer; the views page
+    # through them by position.
+    scenario = sp.test_scenario("BowersUnifiedFA2_indexed_build", main)
+    admin = sp.test_account("admin")
+    alice = sp.test_account("alice")
+    bob = sp.test_account("bob")
+    carol = sp.test_account("carol")
+    c = main.BowersUnifiedIndexedFA2(
+        admin=admin.address,
+        metadata=sp.scenario_utils.metadata_of_url("https://example.com"),
+    )
+    scenario += c
+
+    c.mint(
+        metadata_uri=bytes_of_string("ipfs://QmAdmin"),
+        supply=10,
+        royalty_recipient=admin.address,
+        royalty_bps=0,
+        min_offer_per_unit_mutez=sp.mutez(0),
+        _sender=admin,
+    )
+    c.transfer(
+        [sp.record(from_=admin.address, txs=[sp.record(to_=alice.address, token_id=0, amount=2), sp.record(to_=bob.address, token_id=0, amount=2)])],
+        _sender=admin,
+    )
+    for account in [admin, alice, bob]:
+        c.set_listing(token_id=0, price=sp.tez(1), max_qty=0, min_bps=0, _sender=account)
+    # Repricing an open listing keeps its position.
+    c.set_listing(token_id=0, price=sp.tez(2), max_qty=0, min_bps=0, _sender=alice)
+    scenario.verify(c.data.listing_count[0] == 3)
+    page = c.get_token_listings(sp.record(token_id=0, offset=1, limit=1))
+    scenario.verify(page.total == 3)
+    scenario.verify_equal(page.page, [sp.record(owner=alice.address, listing=sp.record(price=sp.tez(2), max_qty=0, min_bps=0))])
+    scenario.verify(sp.len(c.get_token_listings(sp.record(token_id=0, offset=2, limit=5)).page) == 1)
+    scenario.verify(sp.len(c.get_token_listings(sp.record(token_id=0, offset=3, limit=5)).page) == 0)
+
+    # Delisting, selling out and transferring out each close a listing; the last entry fills the gap.
+    c.set_listing(token_id=0, price=sp.mutez(0), max_qty=0, min_bps=0, _sender=admin)
+    scenario.verify(c.data.listing_at[sp.record(token_id=0, position=0)] == bob.address)
+    scenario.verify(c.data.listing_position[sp.record(owner=bob.address, token_id=0)] == 0)
+    c.buy(owner=alice.address, token_id=0, qty=2, _sender=carol, _amount=sp.tez(4))
+    scenario.verify(c.data.listing_count[0] == 1)
+    scenario.verify(~c.data.listing_at.contains(sp.record(token_id=0, position=1)))
+    c.transfer([sp.record(from_=bob.address, txs=[sp.record(to_=carol.address, token_id=0, amount=2)])], _sender=bob)
+    scenario.verify(~c.data.listing_count.contains(0))
+    scenario.verify(~c.data.listing_position.contains(sp.record(owner=bob.address, token_id=0)))
+
+    c.make_offer(token_id=0, qty=2, expiry=sp.timestamp(100), _sender=alice, _amount=sp.tez(2))
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(100), _sender=bob, _amount=sp.tez(1))
+    c.make_offer(token_id=0, qty=1, expiry=sp.timestamp(100), _sender=bob, _amount=sp.tez(1))
+    offers = c.get_token_offers(sp.record(token_id=0, offset=0, limit=2))
+    scenario.verify(offers.total == 3)
+    scenario.verify_equal(offers.page, [
+        sp.record(offer_id=0, offer=c.data.offers[0]),
+        sp.record(offer_id=1, offer=c.data.offers[1]),
+    ])
+    # A partial fill keeps the offer open; filling, closing and pruning remove it.
+    c.accept_offer(offer_id=0, accept_qty=1, _sender=carol)
+    scenario.verify(c.data.offer_count[0] == 3)
+    c.accept_offers([sp.record(offer_id=0, accept_qty=1)], _sender=carol)
+    scenario.verify(c.data.offer_at[sp.record(token_id=0, position=0)] == 2)
+    c.close_offer(1, _sender=bob)
+    scenario.verify(c.data.offer_count[0] == 1)
+    c.prune_offers([2], _sender=alice, _now=sp.timestamp(101))
+    scenario.verify(~c.data.offer_count.contains(0))
+    scenario.verify(~c.data.offer_position.contains(sp.record(token_id=0, offer_id=2)))
@@ -0,0 +1 @@
+[sp.record(allowlist_end = sp.Some(sp.timestamp(100)), creator = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), max_supply = sp.Some(10), metadata_uri = sp.bytes('0x697066733a2f2f516d426174636830'), min_offer_per_unit_mutez = sp.mutez(100000), mint_end = None, mint_price = sp.tez(1), royalty_bps = 500, royalty_recipient = sp.address('tz1UyQDepgtUBnWjyzzonqeDwaiWoQzRKSP5')), sp.record(allowlist_end = sp.Some(sp.timestamp(100)), creator = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), max_supply = sp.Some(11), metadata_uri = sp.bytes('0x697066733a2f2f516d426174636831'), min_offer_per_unit_mutez = sp.mutez(100000), mint_end = None, mint_price = sp.tez(1), royalty_bps = 500, royalty_recipient = sp.address('tz1UyQDepgtUBnWjyzzonqeDwaiWoQzRKSP5')), sp.record(allowlist_end = sp.Some(sp.timestamp(100)), creator = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), max_supply = sp.Some(12), metadata_uri = sp.bytes('0x697066733a2f2f516d426174636832'), min_offer_per_unit_mutez = sp.mutez(100000), mint_end = None, mint_price = sp.tez(1), royalty_bps = 500, royalty_recipient = sp.address('tz1UyQDepgtUBnWjyzzonqeDwaiWoQzRKSP5'))]
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(expected_total = sp.tez(2), items = [sp.record(owner = sp.address('tz1hJgZdhnRGvg5XD6pYxRCsbWh4jg5HQ476'), qty = 1, token_id = 0), sp.record(owner = sp.address('tz1hJgZdhnRGvg5XD6pYxRCsbWh4jg5HQ476'), qty = 1, token_id = 0)])
\ No newline at end of file
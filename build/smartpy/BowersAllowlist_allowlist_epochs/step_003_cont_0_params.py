@@ -0,0 +1 @@
+sp.record(entries = [sp.record(address = sp.address('tz1hJgZdhnRGvg5XD6pYxRCsbWh4jg5HQ476'), max_qty = 2, price_override = sp.Some(sp.tez(0)))], token_id = 0)
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(root = sp.Some(sp.bytes('0x1667ce7b9481757099acab56b71c96da311dabf561358b5cd019af3d5086b333')), token_id = 0)
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(proof = sp.Some(sp.record(max_qty = 1, path = [], price_override = None)), qty = 1, to_ = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), token_id = 0)
\ No newline at end of file
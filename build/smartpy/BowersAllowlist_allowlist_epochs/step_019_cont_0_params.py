@@ -0,0 +1 @@
+[sp.record(address = sp.address('tz1hJgZdhnRGvg5XD6pYxRCsbWh4jg5HQ476'), epoch = 0, token_id = 0), sp.record(address = sp.address('tz1hJgZdhnRGvg5XD6pYxRCsbWh4jg5HQ476'), epoch = 1, token_id = 0), sp.record(address = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), epoch = 1, token_id = 0), sp.record(address = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), epoch = 2, token_id = 0), sp.record(address = sp.address('tz1hJgZdhnRGvg5XD6pYxRCsbWh4jg5HQ476'), epoch = 0, token_id = 7)]
\ No newline at end of file
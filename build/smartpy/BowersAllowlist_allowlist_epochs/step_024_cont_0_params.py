@@ -0,0 +1 @@
+0
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(accrue_proceeds = False, admin = sp.address('tz1UyQDepgtUBnWjyzzonqeDwaiWoQzRKSP5'), all_operators = {}, allowlist_minted = {}, allowlist_root = {}, base_uri = sp.bytes('0x'), blacklist = {}, claimable = {}, contract_blocklist = {}, direct_payout = False, ledger = {}, listings = {}, metadata = {'' : sp.bytes('0x68747470733a2f2f6578616d706c652e636f6d')}, next_offer_id = 0, next_token_id = 0, offers = {}, operators = {}, token_allowlist = {}, token_config = {}, token_metadata = {}, token_state = {}, token_supply = {}, token_uri_suffix = {})
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(root = sp.Some(sp.bytes('0x4367d9c9a86f20c00d78a66512835cce30d87ac3e6848df6b3a8b64821813689')), token_id = 0)
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(proof = sp.Some(sp.record(max_qty = 2, path = [right(sp.bytes('0x1667ce7b9481757099acab56b71c96da311dabf561358b5cd019af3d5086b333')), right(sp.bytes('0x1656a64c4606c4be29a2f795d9779bb751da878c33c142ff6bbd85af0fe802be'))], price_override = sp.Some(sp.tez(0)))), qty = 1, to_ = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), token_id = 0)
\ No newline at end of file
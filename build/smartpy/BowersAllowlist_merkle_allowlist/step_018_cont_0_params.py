@@ -0,0 +1 @@
+sp.record(proof = sp.Some(sp.record(max_qty = 1, path = [left(sp.bytes('0xbd68a4b8f1532e1dbd03cda47b90e67cf142adffd9b8dd27d0604a968b993ca0')), right(sp.bytes('0x1656a64c4606c4be29a2f795d9779bb751da878c33c142ff6bbd85af0fe802be'))], price_override = None)), qty = 1, to_ = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), token_id = 0)
\ No newline at end of file
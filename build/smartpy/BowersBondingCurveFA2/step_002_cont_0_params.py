@@ -0,0 +1 @@
+sp.record(base_price = sp.tez(1), creator = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), max_supply = 100, metadata_uri = sp.bytes('0x697066733a2f2f516d4578616d706c65'), min_offer_per_unit_mutez = sp.mutez(1000), mint_end = None, price_increment = sp.mutez(100000), royalty_bps = 500, royalty_recipient = sp.address('tz1UyQDepgtUBnWjyzzonqeDwaiWoQzRKSP5'), step_size = 10)
\ No newline at end of file
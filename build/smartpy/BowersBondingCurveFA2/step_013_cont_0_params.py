@@ -0,0 +1 @@
+sp.record(expected_total = sp.tez(4), items = [sp.record(owner = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), qty = 3, token_id = 0), sp.record(owner = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), qty = 1, token_id = 0)])
\ No newline at end of file
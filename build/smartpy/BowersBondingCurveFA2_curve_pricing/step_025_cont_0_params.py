@@ -0,0 +1 @@
+sp.record(qty = 9, to_ = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), token_id = 1)
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(base_price = sp.mutez(1234567), creator = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), max_supply = 200, metadata_uri = sp.bytes('0x697066733a2f2f516d4375727665'), min_offer_per_unit_mutez = sp.mutez(1000), mint_end = None, price_increment = sp.mutez(98765), royalty_bps = 500, royalty_recipient = sp.address('tz1UyQDepgtUBnWjyzzonqeDwaiWoQzRKSP5'), step_size = 3)
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(metadata_uri = sp.bytes('0x697066733a2f2f516d546f6b656e'), min_offer_per_unit_mutez = sp.mutez(1000), royalty_bps = 1000, royalty_recipient = sp.address('tz1L6Bnhoej3PgskRUDzuE4at1cdAZTEGL5L'), supply = 10)
\ No newline at end of file
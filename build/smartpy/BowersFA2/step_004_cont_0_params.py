@@ -0,0 +1 @@
+[sp.record(from_ = sp.address('tz1UyQDepgtUBnWjyzzonqeDwaiWoQzRKSP5'), txs = [sp.record(amount = 4, to_ = sp.address('tz1hJgZdhnRGvg5XD6pYxRCsbWh4jg5HQ476'), token_id = 0)])]
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(max_qty = 2, min_bps = 0, price = sp.tez(3), token_id = 1)
\ No newline at end of file
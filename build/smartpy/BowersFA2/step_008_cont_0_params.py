@@ -0,0 +1 @@
+sp.record(expected_total = sp.tez(11), items = [sp.record(owner = sp.address('tz1UyQDepgtUBnWjyzzonqeDwaiWoQzRKSP5'), qty = 3, token_id = 0), sp.record(owner = sp.address('tz1hJgZdhnRGvg5XD6pYxRCsbWh4jg5HQ476'), qty = 2, token_id = 0), sp.record(owner = sp.address('tz1UyQDepgtUBnWjyzzonqeDwaiWoQzRKSP5'), qty = 2, token_id = 1)])
\ No newline at end of file
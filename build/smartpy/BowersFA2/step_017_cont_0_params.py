@@ -0,0 +1 @@
+sp.record(expiry = sp.timestamp(1000), qty = 3, token_id = 0)
\ No newline at end of file
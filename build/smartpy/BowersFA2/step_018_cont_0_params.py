@@ -0,0 +1 @@
+sp.record(expiry = sp.timestamp(1000), qty = 1, token_id = 1)
\ No newline at end of file
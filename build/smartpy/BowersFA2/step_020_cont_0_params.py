@@ -0,0 +1 @@
+[sp.record(accept_qty = 3, offer_id = 0), sp.record(accept_qty = 3, offer_id = 2)]
\ No newline at end of file
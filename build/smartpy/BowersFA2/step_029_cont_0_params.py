@@ -0,0 +1 @@
+2
\ No newline at end of file
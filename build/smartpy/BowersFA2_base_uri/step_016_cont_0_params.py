@@ -0,0 +1 @@
+sp.record(metadata_uri = sp.bytes('0x637573746f6d2e6a736f6e'), min_offer_per_unit_mutez = sp.mutez(1000), royalty_bps = 1000, royalty_recipient = sp.address('tz1L6Bnhoej3PgskRUDzuE4at1cdAZTEGL5L'), supply = 1)
\ No newline at end of file
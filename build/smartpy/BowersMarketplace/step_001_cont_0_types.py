@@ -0,0 +1,6 @@
+import smartpy as sp
+
+tstorage = sp.record(admin=sp.address, all_operators=sp.big_map[sp.record(operator=sp.address, owner=sp.address).layout(("operator", "owner")), sp.unit], base_uri=sp.bytes, blacklist=sp.big_map[sp.record(blocked=sp.address, owner=sp.address, token_id=sp.nat).layout(("blocked", ("owner", "token_id"))), sp.unit], claimable=sp.big_map[sp.address, sp.mutez], contract_blocklist=sp.big_map[sp.address, sp.unit], direct_payout=sp.bool, ledger=sp.big_map[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), sp.nat], listings=sp.big_map[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), sp.record(max_qty=sp.nat, min_bps=sp.nat, price=sp.mutez).layout(("max_qty", ("min_bps", "price")))], metadata=sp.big_map[sp.string, sp.bytes], next_offer_id=sp.nat, next_token_id=sp.nat, offers=sp.big_map[sp.nat, sp.record(buyer=sp.address, expiry=sp.timestamp, remaining_qty=sp.nat, token_id=sp.nat, unit_price=sp.mutez).layout(("buyer", ("expiry", ("remaining_qty", ("token_id", "unit_price")))))], operators=sp.big_map[sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id"))), sp.unit], token_market=sp.big_map[sp.nat, sp.record(min_offer_per_unit_mutez=sp.mutez, royalty_bps=sp.nat, royalty_recipient=sp.address).layout(("min_offer_per_unit_mutez", ("royalty_bps", "royalty_recipient")))], token_metadata=sp.big_map[sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes]).layout(("token_id", "token_info"))], token_supply=sp.big_map[sp.nat, sp.record(holders=sp.nat, total_supply=sp.nat).layout(("holders", "total_supply"))], token_uri_suffix=sp.big_map[sp.nat, sp.bytes]).layout(("admin", ("all_operators", ("base_uri", ("blacklist", ("claimable", ("contract_blocklist", ("direct_payout", ("ledger", ("listings", ("metadata", ("next_offer_id", ("next_token_id", ("offers", ("operators", ("token_market", ("token_metadata", ("token_supply", "token_uri_suffix"))))))))))))))))))
+tparameter = sp.variant(accept_offer=sp.record(accept_qty=sp.nat, offer_id=sp.nat).layout(("accept_qty", "offer_id")), accept_offers=sp.list[sp.record(accept_qty=sp.nat, offer_id=sp.nat).layout(("accept_qty", "offer_id"))], balance_of=sp.record(callback=sp.contract[sp.list[sp.record(balance=sp.nat, request=sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id"))).layout(("balance", "request"))]], requests=sp.list[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id"))]).layout(("callback", "requests")), blacklist_address=sp.record(blocked=sp.address, token_id=sp.nat).layout(("blocked", "token_id")), block_address=sp.address, buy=sp.record(owner=sp.address, qty=sp.nat, token_id=sp.nat).layout(("owner", ("qty", "token_id"))), buy_many=sp.record(expected_total=sp.mutez, items=sp.list[sp.record(owner=sp.address, qty=sp.nat, token_id=sp.nat).layout(("owner", ("qty", "token_id")))]).layout(("expected_total", "items")), close_offer=sp.nat, make_offer=sp.record(expiry=sp.timestamp, qty=sp.nat, token_id=sp.nat).layout(("expiry", ("qty", "token_id"))), mint=sp.record(metadata_uri=sp.bytes, min_offer_per_unit_mutez=sp.mutez, royalty_bps=sp.nat, royalty_recipient=sp.address, supply=sp.nat).layout(("metadata_uri", ("min_offer_per_unit_mutez", ("royalty_bps", ("royalty_recipient", "supply"))))), prune_offers=sp.list[sp.nat], set_base_uri=sp.bytes, set_direct_payout=sp.bool, set_listing=sp.record(max_qty=sp.nat, min_bps=sp.nat, price=sp.mutez, token_id=sp.nat).layout(("max_qty", ("min_bps", ("price", "token_id")))), transfer=sp.list[sp.record(from_=sp.address, txs=sp.list[sp.record(amount=sp.nat, to_=sp.address, token_id=sp.nat).layout(("amount", ("to_", "token_id")))]).layout(("from_", "txs"))], unblacklist_address=sp.record(blocked=sp.address, token_id=sp.nat).layout(("blocked", "token_id")), unblock_address=sp.address, update_all_operators=sp.list[sp.variant(add_operator=sp.record(operator=sp.address, owner=sp.address).layout(("operator", "owner")), remove_operator=sp.record(operator=sp.address, owner=sp.address).layout(("operator", "owner"))).layout(("add_operator", "remove_operator"))], update_operators=sp.list[sp.variant(add_operator=sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id"))), remove_operator=sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id")))).layout(("add_operator", "remove_operator"))], withdraw=sp.unit, withdraw_for=sp.list[sp.address]).layout((((("accept_offer", "accept_offers"), ("balance_of", ("blacklist_address", "block_address"))), (("buy", "buy_many"), ("close_offer", ("make_offer", "mint")))), ((("prune_offers", "set_base_uri"), ("set_direct_payout", ("set_listing", "transfer"))), (("unblacklist_address", ("unblock_address", "update_all_operators")), ("update_operators", ("withdraw", "withdraw_for"))))))
+tprivates = { }
+tviews = { "get_balance": (sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), sp.nat), "get_balances": (sp.list[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id"))], sp.list[sp.nat]), "total_supply": (sp.nat, sp.nat), "get_token_supplies": (sp.list[sp.nat], sp.list[sp.record(holders=sp.nat, total_supply=sp.nat).layout(("holders", "total_supply"))]), "get_offer": (sp.nat, sp.record(buyer=sp.address, expiry=sp.timestamp, remaining_qty=sp.nat, token_id=sp.nat, unit_price=sp.mutez).layout(("buyer", ("expiry", ("remaining_qty", ("token_id", "unit_price")))))), "is_operator": (sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id"))), sp.bool), "get_listing": (sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), sp.record(max_qty=sp.nat, min_bps=sp.nat, price=sp.mutez).layout(("max_qty", ("min_bps", "price")))), "get_listings": (sp.list[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id"))], sp.list[sp.option[sp.record(max_qty=sp.nat, min_bps=sp.nat, price=sp.mutez).layout(("max_qty", ("min_bps", "price")))]]), "get_claimable": (sp.address, sp.mutez), "get_claimables": (sp.list[sp.address], sp.list[sp.mutez]), "is_blacklisted": (sp.record(blocked=sp.address, owner=sp.address, token_id=sp.nat).layout(("blocked", ("owner", "token_id"))), sp.bool), "get_token_market": (sp.nat, sp.record(min_offer_per_unit_mutez=sp.mutez, royalty_bps=sp.nat, royalty_recipient=sp.address).layout(("min_offer_per_unit_mutez", ("royalty_bps", "royalty_recipient")))), "get_token_markets": (sp.list[sp.nat], sp.list[sp.option[sp.record(min_offer_per_unit_mutez=sp.mutez, royalty_bps=sp.nat, royalty_recipient=sp.address).layout(("min_offer_per_unit_mutez", ("royalty_bps", "royalty_recipient")))]]), "token_metadata": (sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes]).layout(("token_id", "token_info"))) }
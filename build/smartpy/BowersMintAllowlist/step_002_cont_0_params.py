@@ -0,0 +1 @@
+sp.record(allowlist_end = sp.Some(sp.timestamp(100)), creator = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), max_supply = sp.Some(10), metadata_uri = sp.bytes('0x697066733a2f2f516d4578616d706c65'), mint_end = None, mint_price = sp.tez(1), royalty_bps = 500, royalty_recipient = sp.address('tz1UyQDepgtUBnWjyzzonqeDwaiWoQzRKSP5'))
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(proof = None, qty = 2, to_ = sp.address('tz1hJgZdhnRGvg5XD6pYxRCsbWh4jg5HQ476'), token_id = 0)
\ No newline at end of file
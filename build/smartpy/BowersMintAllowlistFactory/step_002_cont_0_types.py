@@ -0,0 +1,6 @@
+import smartpy as sp
+
+tstorage = sp.unit
+tparameter = sp.variant(create_collection=sp.record(admin=sp.address, base_uri=sp.bytes, metadata=sp.map[sp.string, sp.bytes]).layout(("admin", ("base_uri", "metadata")))).layout("create_collection")
+tprivates = { }
+tviews = { }
@@ -0,0 +1,6 @@
+import smartpy as sp
+
+tstorage = sp.record(admin=sp.address, all_operators=sp.big_map[sp.record(operator=sp.address, owner=sp.address).layout(("operator", "owner")), sp.unit], allowlist_minted=sp.big_map[sp.record(address=sp.address, epoch=sp.nat, token_id=sp.nat).layout(("address", ("epoch", "token_id"))), sp.nat], allowlist_root=sp.big_map[sp.nat, sp.bytes], base_uri=sp.bytes, claimable=sp.big_map[sp.address, sp.mutez], contract_blocklist=sp.big_map[sp.address, sp.unit], ledger=sp.big_map[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), sp.nat], metadata=sp.big_map[sp.string, sp.bytes], next_token_id=sp.nat, operators=sp.big_map[sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id"))), sp.unit], token_allowlist=sp.big_map[sp.record(address=sp.address, epoch=sp.nat, token_id=sp.nat).layout(("address", ("epoch", "token_id"))), sp.record(max_qty=sp.nat, minted=sp.nat, price_override=sp.option[sp.mutez]).layout(("max_qty", ("minted", "price_override")))], token_config=sp.big_map[sp.nat, sp.record(allowlist_end=sp.option[sp.timestamp], allowlist_epoch=sp.nat, creator=sp.address, max_supply=sp.option[sp.nat], mint_end=sp.option[sp.timestamp], mint_paused=sp.bool, mint_price=sp.mutez, minted=sp.nat, royalty_bps=sp.nat, royalty_recipient=sp.address).layout(("allowlist_end", ("allowlist_epoch", ("creator", ("max_supply", ("mint_end", ("mint_paused", ("mint_price", ("minted", ("royalty_bps", "royalty_recipient"))))))))))], token_metadata=sp.big_map[sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes]).layout(("token_id", "token_info"))], token_supply=sp.big_map[sp.nat, sp.record(holders=sp.nat, total_supply=sp.nat).layout(("holders", "total_supply"))], token_uri_suffix=sp.big_map[sp.nat, sp.bytes]).layout(("admin", ("all_operators", ("allowlist_minted", ("allowlist_root", ("base_uri", ("claimable", ("contract_blocklist", ("ledger", ("metadata", ("next_token_id", ("operators", ("token_allowlist", ("token_config", ("token_metadata", ("token_supply", "token_uri_suffix"))))))))))))))))
+tparameter = sp.variant(balance_of=sp.record(callback=sp.contract[sp.list[sp.record(balance=sp.nat, request=sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id"))).layout(("balance", "request"))]], requests=sp.list[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id"))]).layout(("callback", "requests")), block_address=sp.address, clear_allowlist=sp.nat, create_token=sp.record(allowlist_end=sp.option[sp.timestamp], creator=sp.address, max_supply=sp.option[sp.nat], metadata_uri=sp.bytes, mint_end=sp.option[sp.timestamp], mint_price=sp.mutez, royalty_bps=sp.nat, royalty_recipient=sp.address).layout(("allowlist_end", ("creator", ("max_supply", ("metadata_uri", ("mint_end", ("mint_price", ("royalty_bps", "royalty_recipient")))))))), mint_editions=sp.record(proof=sp.option[sp.record(max_qty=sp.nat, path=sp.list[sp.variant(left=sp.bytes, right=sp.bytes).layout(("left", "right"))], price_override=sp.option[sp.mutez]).layout(("max_qty", ("path", "price_override")))], qty=sp.nat, to_=sp.address, token_id=sp.nat).layout(("proof", ("qty", ("to_", "token_id")))), prune_allowlist=sp.list[sp.record(address=sp.address, epoch=sp.nat, token_id=sp.nat).layout(("address", ("epoch", "token_id")))], reset_allowlist=sp.nat, set_admin=sp.address, set_allowlist=sp.record(entries=sp.list[sp.record(address=sp.address, max_qty=sp.nat, price_override=sp.option[sp.mutez]).layout(("address", ("max_qty", "price_override")))], token_id=sp.nat).layout(("entries", "token_id")), set_allowlist_end=sp.record(allowlist_end=sp.option[sp.timestamp], token_id=sp.nat).layout(("allowlist_end", "token_id")), set_allowlist_root=sp.record(root=sp.option[sp.bytes], token_id=sp.nat).layout(("root", "token_id")), set_base_uri=sp.bytes, set_mint_end=sp.record(mint_end=sp.option[sp.timestamp], token_id=sp.nat).layout(("mint_end", "token_id")), set_mint_paused=sp.record(paused=sp.bool, token_id=sp.nat).layout(("paused", "token_id")), set_mint_price=sp.record(mint_price=sp.mutez, token_id=sp.nat).layout(("mint_price", "token_id")), transfer=sp.list[sp.record(from_=sp.address, txs=sp.list[sp.record(amount=sp.nat, to_=sp.address, token_id=sp.nat).layout(("amount", ("to_", "token_id")))]).layout(("from_", "txs"))], unblock_address=sp.address, update_all_operators=sp.list[sp.variant(add_operator=sp.record(operator=sp.address, owner=sp.address).layout(("operator", "owner")), remove_operator=sp.record(operator=sp.address, owner=sp.address).layout(("operator", "owner"))).layout(("add_operator", "remove_operator"))], update_operators=sp.list[sp.variant(add_operator=sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id"))), remove_operator=sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id")))).layout(("add_operator", "remove_operator"))], withdraw=sp.unit, withdraw_for=sp.list[sp.address]).layout((((("balance_of", "block_address"), ("clear_allowlist", ("create_token", "mint_editions"))), (("prune_allowlist", "reset_allowlist"), ("set_admin", ("set_allowlist", "set_allowlist_end")))), ((("set_allowlist_root", "set_base_uri"), ("set_mint_end", ("set_mint_paused", "set_mint_price"))), (("transfer", ("unblock_address", "update_all_operators")), ("update_operators", ("withdraw", "withdraw_for"))))))
+tprivates = { }
+tviews = { "get_balance": (sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), sp.nat), "get_balances": (sp.list[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id"))], sp.list[sp.nat]), "total_supply": (sp.nat, sp.nat), "get_token_supplies": (sp.list[sp.nat], sp.list[sp.record(holders=sp.nat, total_supply=sp.nat).layout(("holders", "total_supply"))]), "get_claimable": (sp.address, sp.mutez), "get_claimables": (sp.list[sp.address], sp.list[sp.mutez]), "get_token_config": (sp.nat, sp.record(allowlist_end=sp.option[sp.timestamp], allowlist_epoch=sp.nat, creator=sp.address, max_supply=sp.option[sp.nat], mint_end=sp.option[sp.timestamp], mint_paused=sp.bool, mint_price=sp.mutez, minted=sp.nat, royalty_bps=sp.nat, royalty_recipient=sp.address).layout(("allowlist_end", ("allowlist_epoch", ("creator", ("max_supply", ("mint_end", ("mint_paused", ("mint_price", ("minted", ("royalty_bps", "royalty_recipient"))))))))))), "get_token_configs": (sp.list[sp.nat], sp.list[sp.option[sp.record(allowlist_end=sp.option[sp.timestamp], allowlist_epoch=sp.nat, creator=sp.address, max_supply=sp.option[sp.nat], mint_end=sp.option[sp.timestamp], mint_paused=sp.bool, mint_price=sp.mutez, minted=sp.nat, royalty_bps=sp.nat, royalty_recipient=sp.address).layout(("allowlist_end", ("allowlist_epoch", ("creator", ("max_supply", ("mint_end", ("mint_paused", ("mint_price", ("minted", ("royalty_bps", "royalty_recipient"))))))))))]]), "is_allowlisted": (sp.record(address=sp.address, token_id=sp.nat).layout(("address", "token_id")), sp.bool), "get_allowlist_minted": (sp.record(address=sp.address, token_id=sp.nat).layout(("address", "token_id")), sp.nat), "token_metadata": (sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes]).layout(("token_id", "token_info"))) }
@@ -0,0 +1 @@
+sp.record(proof = sp.Some(sp.record(max_qty = 1, path = [left(sp.bytes('0xb44e34ac182fa57156d83b9cec542c02d65999ba0465cd005a32c4e89a8b2b2d'))], price_override = None)), qty = 1, to_ = sp.address('tz1L6Bnhoej3PgskRUDzuE4at1cdAZTEGL5L'), token_id = 0)
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(proof = None, qty = 1, to_ = sp.address('tz1L6Bnhoej3PgskRUDzuE4at1cdAZTEGL5L'), token_id = 0)
\ No newline at end of file
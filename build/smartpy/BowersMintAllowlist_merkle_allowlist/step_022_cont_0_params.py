@@ -0,0 +1 @@
+sp.record(root = None, token_id = 0)
\ No newline at end of file
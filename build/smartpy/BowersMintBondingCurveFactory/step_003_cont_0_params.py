@@ -0,0 +1 @@
+sp.record(admin = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), base_uri = sp.bytes('0x'), metadata = {'' : sp.bytes('0x74657a6f732d73746f726167653a636f6e74656e74')})
\ No newline at end of file
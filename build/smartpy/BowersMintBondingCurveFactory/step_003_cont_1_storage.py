@@ -0,0 +1 @@
+sp.record(admin = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), all_operators = {}, base_uri = sp.bytes('0x'), claimable = {}, contract_blocklist = {}, ledger = {}, metadata = {'' : sp.bytes('0x74657a6f732d73746f726167653a636f6e74656e74')}, next_token_id = 0, operators = {}, token_config = {}, token_metadata = {}, token_supply = {}, token_uri_suffix = {})
\ No newline at end of file
@@ -0,0 +1 @@
+sp.bytes('0x697066733a2f2f516d426173652f')
\ No newline at end of file
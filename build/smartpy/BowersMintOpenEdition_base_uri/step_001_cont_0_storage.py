@@ -0,0 +1 @@
+sp.record(admin = sp.address('tz1UyQDepgtUBnWjyzzonqeDwaiWoQzRKSP5'), all_operators = {}, base_uri = sp.bytes('0x'), claimable = {}, contract_blocklist = {}, ledger = {}, metadata = {'' : sp.bytes('0x68747470733a2f2f6578616d706c652e636f6d')}, next_token_id = 0, operators = {}, token_config = {}, token_metadata = {}, token_supply = {}, token_uri_suffix = {})
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(accrue_proceeds = False, admin = sp.address('tz1VSUr8wwNhLAzempoch5d6hLRiTh8Cjcjb'), all_operators = {}, base_uri = sp.bytes('0x'), blacklist = {}, claimable = {}, contract_blocklist = {}, direct_payout = False, ledger = {}, listings = {}, metadata = {'' : sp.bytes('0x')}, next_offer_id = 0, next_token_id = 0, offers = {}, operators = {}, token_config = {}, token_metadata = {}, token_state = {}, token_supply = {}, token_uri_suffix = {})
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(paused = True, token_id = 0)
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(paused = False, token_id = 0)
\ No newline at end of file
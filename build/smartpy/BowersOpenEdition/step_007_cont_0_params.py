@@ -0,0 +1 @@
+sp.record(creator = sp.address('tz1h4EsGunH2Ue1T2uNs8mfKZ8XZoQji3HcK'), max_supply = sp.Some(4), metadata_uri = sp.bytes('0x697066733a2f2f516d5365636f6e64434944'), min_offer_per_unit_mutez = sp.mutez(100000), mint_end = None, mint_price = sp.mutez(250000), royalty_bps = 500, royalty_recipient = sp.address('tz1UyQDepgtUBnWjyzzonqeDwaiWoQzRKSP5'))
\ No newline at end of file
@@ -0,0 +1 @@
+[sp.record(qty = 1, to_ = sp.address('tz1hJgZdhnRGvg5XD6pYxRCsbWh4jg5HQ476'), token_id = 1)]
\ No newline at end of file
@@ -0,0 +1 @@
+sp.record(max_qty = 0, min_bps = 0, price = sp.mutez(500000), token_id = 1)
\ No newline at end of file
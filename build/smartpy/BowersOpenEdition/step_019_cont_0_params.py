@@ -0,0 +1 @@
+sp.record(max_qty = 0, min_bps = 0, price = sp.tez(2), token_id = 0)
\ No newline at end of file
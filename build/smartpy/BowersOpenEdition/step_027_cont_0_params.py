@@ -0,0 +1 @@
+[sp.record(accept_qty = 2, offer_id = 0), sp.record(accept_qty = 1, offer_id = 1)]
\ No newline at end of file
@@ -0,0 +1,6 @@
+import smartpy as sp
+
+tstorage = sp.record(accrue_proceeds=sp.bool, admin=sp.address, all_operators=sp.big_map[sp.record(operator=sp.address, owner=sp.address).layout(("operator", "owner")), sp.unit], allowlist_minted=sp.big_map[sp.record(address=sp.address, epoch=sp.nat, token_id=sp.nat).layout(("address", ("epoch", "token_id"))), sp.nat], allowlist_root=sp.big_map[sp.nat, sp.bytes], base_uri=sp.bytes, blacklist=sp.big_map[sp.record(blocked=sp.address, owner=sp.address, token_id=sp.nat).layout(("blocked", ("owner", "token_id"))), sp.unit], claimable=sp.big_map[sp.address, sp.mutez], contract_blocklist=sp.big_map[sp.address, sp.unit], direct_payout=sp.bool, ledger=sp.big_map[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), sp.nat], listings=sp.big_map[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), sp.record(max_qty=sp.nat, min_bps=sp.nat, price=sp.mutez).layout(("max_qty", ("min_bps", "price")))], metadata=sp.big_map[sp.string, sp.bytes], next_offer_id=sp.nat, next_token_id=sp.nat, offers=sp.big_map[sp.nat, sp.record(buyer=sp.address, expiry=sp.timestamp, remaining_qty=sp.nat, token_id=sp.nat, unit_price=sp.mutez).layout(("buyer", ("expiry", ("remaining_qty", ("token_id", "unit_price")))))], operators=sp.big_map[sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id"))), sp.unit], token_allowlist=sp.big_map[sp.record(address=sp.address, epoch=sp.nat, token_id=sp.nat).layout(("address", ("epoch", "token_id"))), sp.record(max_qty=sp.nat, minted=sp.nat, price_override=sp.option[sp.mutez]).layout(("max_qty", ("minted", "price_override")))], token_config=sp.big_map[sp.nat, sp.record(creator=sp.address, min_offer_per_unit_mutez=sp.mutez, mint_model=sp.variant(admin_only=sp.unit, bonding_curve=sp.record(base_price=sp.mutez, max_supply=sp.nat, price_increment=sp.mutez, step_size=sp.nat).layout(("base_price", ("max_supply", ("price_increment", "step_size")))), open_edition=sp.record(allowlist_end=sp.option[sp.timestamp], allowlist_epoch=sp.nat, max_supply=sp.option[sp.nat], mint_price=sp.mutez).layout(("allowlist_end", ("allowlist_epoch", ("max_supply", "mint_price"))))).layout(("admin_only", ("bonding_curve", "open_edition"))), royalty_bps=sp.nat, royalty_recipient=sp.address).layout(("creator", ("min_offer_per_unit_mutez", ("mint_model", ("royalty_bps", "royalty_recipient")))))], token_metadata=sp.big_map[sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes]).layout(("token_id", "token_info"))], token_state=sp.big_map[sp.nat, sp.record(mint_end=sp.option[sp.timestamp], mint_paused=sp.bool, minted=sp.nat, proceeds=sp.mutez).layout(("mint_end", ("mint_paused", ("minted", "proceeds"))))], token_supply=sp.big_map[sp.nat, sp.record(holders=sp.nat, total_supply=sp.nat).layout(("holders", "total_supply"))], token_uri_suffix=sp.big_map[sp.nat, sp.bytes]).layout(("accrue_proceeds", ("admin", ("all_operators", ("allowlist_minted", ("allowlist_root", ("base_uri", ("blacklist", ("claimable", ("contract_blocklist", ("direct_payout", ("ledger", ("listings", ("metadata", ("next_offer_id", ("next_token_id", ("offers", ("operators", ("token_allowlist", ("token_config", ("token_metadata", ("token_state", ("token_supply", "token_uri_suffix")))))))))))))))))))))))
+tparameter = sp.variant(accept_offer=sp.record(accept_qty=sp.nat, offer_id=sp.nat).layout(("accept_qty", "offer_id")), accept_offers=sp.list[sp.record(accept_qty=sp.nat, offer_id=sp.nat).layout(("accept_qty", "offer_id"))], balance_of=sp.record(callback=sp.contract[sp.list[sp.record(balance=sp.nat, request=sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id"))).layout(("balance", "request"))]], requests=sp.list[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id"))]).layout(("callback", "requests")), blacklist_address=sp.record(blocked=sp.address, token_id=sp.nat).layout(("blocked", "token_id")), block_address=sp.address, buy=sp.record(owner=sp.address, qty=sp.nat, token_id=sp.nat).layout(("owner", ("qty", "token_id"))), buy_many=sp.record(expected_total=sp.mutez, items=sp.list[sp.record(owner=sp.address, qty=sp.nat, token_id=sp.nat).layout(("owner", ("qty", "token_id")))]).layout(("expected_total", "items")), clear_allowlist=sp.nat, close_offer=sp.nat, create_token=sp.record(allowlist_end=sp.option[sp.timestamp], base_price=sp.option[sp.mutez], creator=sp.address, max_supply=sp.option[sp.nat], metadata_uri=sp.bytes, min_offer_per_unit_mutez=sp.mutez, mint_end=sp.option[sp.timestamp], mint_model=sp.nat, mint_price=sp.option[sp.mutez], price_increment=sp.option[sp.mutez], royalty_bps=sp.nat, royalty_recipient=sp.address, step_size=sp.option[sp.nat]).layout(("allowlist_end", ("base_price", ("creator", ("max_supply", ("metadata_uri", ("min_offer_per_unit_mutez", ("mint_end", ("mint_model", ("mint_price", ("price_increment", ("royalty_bps", ("royalty_recipient", "step_size"))))))))))))), create_tokens=sp.list[sp.record(allowlist_end=sp.option[sp.timestamp], base_price=sp.option[sp.mutez], creator=sp.address, max_supply=sp.option[sp.nat], metadata_uri=sp.bytes, min_offer_per_unit_mutez=sp.mutez, mint_end=sp.option[sp.timestamp], mint_model=sp.nat, mint_price=sp.option[sp.mutez], price_increment=sp.option[sp.mutez], royalty_bps=sp.nat, royalty_recipient=sp.address, step_size=sp.option[sp.nat]).layout(("allowlist_end", ("base_price", ("creator", ("max_supply", ("metadata_uri", ("min_offer_per_unit_mutez", ("mint_end", ("mint_model", ("mint_price", ("price_increment", ("royalty_bps", ("royalty_recipient", "step_size")))))))))))))], make_offer=sp.record(expiry=sp.timestamp, qty=sp.nat, token_id=sp.nat).layout(("expiry", ("qty", "token_id"))), mint=sp.record(metadata_uri=sp.bytes, min_offer_per_unit_mutez=sp.mutez, royalty_bps=sp.nat, royalty_recipient=sp.address, supply=sp.nat).layout(("metadata_uri", ("min_offer_per_unit_mutez", ("royalty_bps", ("royalty_recipient", "supply"))))), mint_editions=sp.record(proof=sp.option[sp.record(max_qty=sp.nat, path=sp.list[sp.variant(left=sp.bytes, right=sp.bytes).layout(("left", "right"))], price_override=sp.option[sp.mutez]).layout(("max_qty", ("path", "price_override")))], qty=sp.nat, to_=sp.address, token_id=sp.nat).layout(("proof", ("qty", ("to_", "token_id")))), mint_editions_batch=sp.list[sp.record(proof=sp.option[sp.record(max_qty=sp.nat, path=sp.list[sp.variant(left=sp.bytes, right=sp.bytes).layout(("left", "right"))], price_override=sp.option[sp.mutez]).layout(("max_qty", ("path", "price_override")))], qty=sp.nat, to_=sp.address, token_id=sp.nat).layout(("proof", ("qty", ("to_", "token_id"))))], prune_allowlist=sp.list[sp.record(address=sp.address, epoch=sp.nat, token_id=sp.nat).layout(("address", ("epoch", "token_id")))], prune_offers=sp.list[sp.nat], reset_allowlist=sp.nat, set_accrue_proceeds=sp.bool, set_admin=sp.address, set_allowlist=sp.record(entries=sp.list[sp.record(address=sp.address, max_qty=sp.nat, price_override=sp.option[sp.mutez]).layout(("address", ("max_qty", "price_override")))], token_id=sp.nat).layout(("entries", "token_id")), set_allowlist_end=sp.record(allowlist_end=sp.option[sp.timestamp], token_id=sp.nat).layout(("allowlist_end", "token_id")), set_allowlist_root=sp.record(root=sp.option[sp.bytes], token_id=sp.nat).layout(("root", "token_id")), set_base_uri=sp.bytes, set_direct_payout=sp.bool, set_listing=sp.record(max_qty=sp.nat, min_bps=sp.nat, price=sp.mutez, token_id=sp.nat).layout(("max_qty", ("min_bps", ("price", "token_id")))), set_mint_end=sp.record(mint_end=sp.option[sp.timestamp], token_id=sp.nat).layout(("mint_end", "token_id")), set_mint_paused=sp.record(paused=sp.bool, token_id=sp.nat).layout(("paused", "token_id")), set_mint_price=sp.record(mint_price=sp.mutez, token_id=sp.nat).layout(("mint_price", "token_id")), transfer=sp.list[sp.record(from_=sp.address, txs=sp.list[sp.record(amount=sp.nat, to_=sp.address, token_id=sp.nat).layout(("amount", ("to_", "token_id")))]).layout(("from_", "txs"))], unblacklist_address=sp.record(blocked=sp.address, token_id=sp.nat).layout(("blocked", "token_id")), unblock_address=sp.address, update_all_operators=sp.list[sp.variant(add_operator=sp.record(operator=sp.address, owner=sp.address).layout(("operator", "owner")), remove_operator=sp.record(operator=sp.address, owner=sp.address).layout(("operator", "owner"))).layout(("add_operator", "remove_operator"))], update_operators=sp.list[sp.variant(add_operator=sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id"))), remove_operator=sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id")))).layout(("add_operator", "remove_operator"))], withdraw=sp.unit, withdraw_for=sp.list[sp.address], withdraw_token_proceeds=sp.list[sp.nat]).layout(((((("accept_offer", "accept_offers"), ("balance_of", "blacklist_address")), (("block_address", "buy"), ("buy_many", ("clear_allowlist", "close_offer")))), ((("create_token", "create_tokens"), ("make_offer", "mint")), (("mint_editions", "mint_editions_batch"), ("prune_allowlist", ("prune_offers", "reset_allowlist"))))), (((("set_accrue_proceeds", "set_admin"), ("set_allowlist", "set_allowlist_end")), (("set_allowlist_root", "set_base_uri"), ("set_direct_payout", ("set_listing", "set_mint_end")))), ((("set_mint_paused", "set_mint_price"), ("transfer", ("unblacklist_address", "unblock_address"))), (("update_all_operators", "update_operators"), ("withdraw", ("withdraw_for", "withdraw_token_proceeds")))))))
+tprivates = { "index": sp.lambda_(sp.variant(listing=sp.record(key=sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), listed=sp.bool).layout(("key", "listed")), offer=sp.record(offer_id=sp.nat, open=sp.bool, token_id=sp.nat).layout(("offer_id", ("open", "token_id")))).layout(("listing", "offer")), sp.unit, with_storage="read-write", tstorage=sp.record(accrue_proceeds=sp.bool, admin=sp.address, all_operators=sp.big_map[sp.record(operator=sp.address, owner=sp.address).layout(("operator", "owner")), sp.unit], allowlist_minted=sp.big_map[sp.record(address=sp.address, epoch=sp.nat, token_id=sp.nat).layout(("address", ("epoch", "token_id"))), sp.nat], allowlist_root=sp.big_map[sp.nat, sp.bytes], base_uri=sp.bytes, blacklist=sp.big_map[sp.record(blocked=sp.address, owner=sp.address, token_id=sp.nat).layout(("blocked", ("owner", "token_id"))), sp.unit], claimable=sp.big_map[sp.address, sp.mutez], contract_blocklist=sp.big_map[sp.address, sp.unit], direct_payout=sp.bool, ledger=sp.big_map[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), sp.nat], listings=sp.big_map[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), sp.record(max_qty=sp.nat, min_bps=sp.nat, price=sp.mutez).layout(("max_qty", ("min_bps", "price")))], metadata=sp.big_map[sp.string, sp.bytes], next_offer_id=sp.nat, next_token_id=sp.nat, offers=sp.big_map[sp.nat, sp.record(buyer=sp.address, expiry=sp.timestamp, remaining_qty=sp.nat, token_id=sp.nat, unit_price=sp.mutez).layout(("buyer", ("expiry", ("remaining_qty", ("token_id", "unit_price")))))], operators=sp.big_map[sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id"))), sp.unit], token_allowlist=sp.big_map[sp.record(address=sp.address, epoch=sp.nat, token_id=sp.nat).layout(("address", ("epoch", "token_id"))), sp.record(max_qty=sp.nat, minted=sp.nat, price_override=sp.option[sp.mutez]).layout(("max_qty", ("minted", "price_override")))], token_config=sp.big_map[sp.nat, sp.record(creator=sp.address, min_offer_per_unit_mutez=sp.mutez, mint_model=sp.variant(admin_only=sp.unit, bonding_curve=sp.record(base_price=sp.mutez, max_supply=sp.nat, price_increment=sp.mutez, step_size=sp.nat).layout(("base_price", ("max_supply", ("price_increment", "step_size")))), open_edition=sp.record(allowlist_end=sp.option[sp.timestamp], allowlist_epoch=sp.nat, max_supply=sp.option[sp.nat], mint_price=sp.mutez).layout(("allowlist_end", ("allowlist_epoch", ("max_supply", "mint_price"))))).layout(("admin_only", ("bonding_curve", "open_edition"))), royalty_bps=sp.nat, royalty_recipient=sp.address).layout(("creator", ("min_offer_per_unit_mutez", ("mint_model", ("royalty_bps", "royalty_recipient")))))], token_metadata=sp.big_map[sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes]).layout(("token_id", "token_info"))], token_state=sp.big_map[sp.nat, sp.record(mint_end=sp.option[sp.timestamp], mint_paused=sp.bool, minted=sp.nat, proceeds=sp.mutez).layout(("mint_end", ("mint_paused", ("minted", "proceeds"))))], token_supply=sp.big_map[sp.nat, sp.record(holders=sp.nat, total_supply=sp.nat).layout(("holders", "total_supply"))], token_uri_suffix=sp.big_map[sp.nat, sp.bytes]).layout(("accrue_proceeds", ("admin", ("all_operators", ("allowlist_minted", ("allowlist_root", ("base_uri", ("blacklist", ("claimable", ("contract_blocklist", ("direct_payout", ("ledger", ("listings", ("metadata", ("next_offer_id", ("next_token_id", ("offers", ("operators", ("token_allowlist", ("token_config", ("token_metadata", ("token_state", ("token_supply", "token_uri_suffix"))))))))))))))))))))))), with_operations=False, with_exceptions=True, with_mutez_overflow=True, with_mutez_underflow=True, with_index_address=False) }
+tviews = { "get_balance": (sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), sp.nat), "get_balances": (sp.list[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id"))], sp.list[sp.nat]), "total_supply": (sp.nat, sp.nat), "get_token_supplies": (sp.list[sp.nat], sp.list[sp.record(holders=sp.nat, total_supply=sp.nat).layout(("holders", "total_supply"))]), "get_offer": (sp.nat, sp.record(buyer=sp.address, expiry=sp.timestamp, remaining_qty=sp.nat, token_id=sp.nat, unit_price=sp.mutez).layout(("buyer", ("expiry", ("remaining_qty", ("token_id", "unit_price")))))), "is_operator": (sp.record(operator=sp.address, owner=sp.address, token_id=sp.nat).layout(("operator", ("owner", "token_id"))), sp.bool), "get_listing": (sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id")), sp.record(max_qty=sp.nat, min_bps=sp.nat, price=sp.mutez).layout(("max_qty", ("min_bps", "price")))), "get_listings": (sp.list[sp.record(owner=sp.address, token_id=sp.nat).layout(("owner", "token_id"))], sp.list[sp.option[sp.record(max_qty=sp.nat, min_bps=sp.nat, price=sp.mutez).layout(("max_qty", ("min_bps", "price")))]]), "get_claimable": (sp.address, sp.mutez), "get_claimables": (sp.list[sp.address], sp.list[sp.mutez]), "is_blacklisted": (sp.record(blocked=sp.address, owner=sp.address, token_id=sp.nat).layout(("blocked", ("owner", "token_id"))), sp.bool), "get_token_config": (sp.nat, sp.record(creator=sp.address, min_offer_per_unit_mutez=sp.mutez, mint_model=sp.variant(admin_only=sp.unit, bonding_curve=sp.record(base_price=sp.mutez, max_supply=sp.nat, price_increment=sp.mutez, step_size=sp.nat).layout(("base_price", ("max_supply", ("price_increment", "step_size")))), open_edition=sp.record(allowlist_end=sp.option[sp.timestamp], allowlist_epoch=sp.nat, max_supply=sp.option[sp.nat], mint_price=sp.mutez).layout(("allowlist_end", ("allowlist_epoch", ("max_supply", "mint_price"))))).layout(("admin_only", ("bonding_curve", "open_edition"))), royalty_bps=sp.nat, royalty_recipient=sp.address).layout(("creator", ("min_offer_per_unit_mutez", ("mint_model", ("royalty_bps", "royalty_recipient")))))), "get_token_configs": (sp.list[sp.nat], sp.list[sp.option[sp.record(creator=sp.address, min_offer_per_unit_mutez=sp.mutez, mint_model=sp.variant(admin_only=sp.unit, bonding_curve=sp.record(base_price=sp.mutez, max_supply=sp.nat, price_increment=sp.mutez, step_size=sp.nat).layout(("base_price", ("max_supply", ("price_increment", "step_size")))), open_edition=sp.record(allowlist_end=sp.option[sp.timestamp], allowlist_epoch=sp.nat, max_supply=sp.option[sp.nat], mint_price=sp.mutez).layout(("allowlist_end", ("allowlist_epoch", ("max_supply", "mint_price"))))).layout(("admin_only", ("bonding_curve", "open_edition"))), royalty_bps=sp.nat, royalty_recipient=sp.address).layout(("creator", ("min_offer_per_unit_mutez", ("mint_model", ("royalty_bps", "royalty_recipient")))))]]), "get_token_state": (sp.nat, sp.record(mint_end=sp.option[sp.timestamp], mint_paused=sp.bool, minted=sp.nat, proceeds=sp.mutez).layout(("mint_end", ("mint_paused", ("minted", "proceeds"))))), "get_current_price": (sp.nat, sp.mutez), "get_allowlist_entry": (sp.record(address=sp.address, token_id=sp.nat).layout(("address", "token_id")), sp.option[sp.record(max_qty=sp.nat, minted=sp.nat, price_override=sp.option[sp.mutez]).layout(("max_qty", ("minted", "price_override")))]), "is_allowlisted": (sp.record(address=sp.address, token_id=sp.nat).layout(("address", "token_id")), sp.bool), "get_allowlist_minted": (sp.record(address=sp.address, token_id=sp.nat).layout(("address", "token_id")), sp.nat), "get_mint_quote": (sp.record(buyer=sp.address, proof=sp.option[sp.record(max_qty=sp.nat, path=sp.list[sp.variant(left=sp.bytes, right=sp.bytes).layout(("left", "right"))], price_override=sp.option[sp.mutez]).layout(("max_qty", ("path", "price_override")))], qty=sp.nat, token_id=sp.nat).layout(("buyer", ("proof", ("qty", "token_id")))), sp.record(allowlist_remaining=sp.option[sp.nat], supply_remaining=sp.option[sp.nat], total=sp.mutez).layout(("allowlist_remaining", ("supply_remaining", "total")))), "token_metadata": (sp.nat, sp.record(token_id=sp.nat, token_info=sp.map[sp.string, sp.bytes]).layout(("token_id", "token_info"))) }